@@ -6,17 +6,64 @@ Implements LP-based battery optimization for one month at a time with:
 - Battery SOC (State of Charge) limits and dynamics
 - Charge/discharge power limits
 - Peak power tracking with linear incremental formulation
-- Power tariff cost modeling
+- Power tariff cost modeling (progressive brackets, or the exact step
+  function by bracket enumeration with tariff_mode='exact')
 
 Uses scipy.optimize.linprog with HiGHS solver for fast, reliable LP solving.
+
+The constraint matrices and bounds only depend on the horizon length and the
+battery/tariff parameters, not on the input series. They are built once per
+shape as a sparse LP template and shared by every LP of that shape in the
+process (all 31-day months, all weeks of a yearly run, and every scenario of
+a batch run with the same battery), so a solve only fills in the right-hand
+side and the objective.
 """
 
+import logging
+import threading
+from collections import OrderedDict
+
 import numpy as np
 import pandas as pd
+from scipy import sparse
 from scipy.optimize import linprog
 from typing import Dict, Tuple, Optional
 from dataclasses import dataclass
 
+from core.solve_profile import PhaseTimer, SolveTimings
+from core.step_tariff import (
+    bracket_caps, cheapest_bracket, solve_brackets, step_tariff_cost, validate_tariff_mode
+)
+
+logger = logging.getLogger(__name__)
+
+# LP templates by structure key, shared by all optimizers of the process
+_TEMPLATE_CACHE_SIZE = 32
+_templates: "OrderedDict[tuple, LPTemplate]" = OrderedDict()
+_templates_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class LPTemplate:
+    """
+    Data-independent part of a month LP with T timesteps.
+
+    b_eq holds zeros in the rows filled per solve: the energy balance
+    (load - pv) and the rows whose right-hand side is +/- E_initial.
+    The arrays are read-only; optimize_month copies b_eq before filling it.
+    """
+    A_eq: sparse.csr_matrix
+    b_eq: np.ndarray
+    A_ub: sparse.csr_matrix
+    b_ub: np.ndarray
+    bounds: Tuple[Tuple[float, Optional[float]], ...]
+
+
+def clear_lp_templates() -> None:
+    """Drop all cached LP templates (e.g. to measure cold-start build times)."""
+    with _templates_lock:
+        _templates.clear()
+
 
 @dataclass
 class MonthlyLPResult:
@@ -50,6 +97,16 @@ class MonthlyLPResult:
     DP_total: Optional[np.ndarray] = None     # Total degradation per timestep [%]
     degradation_cost: float = 0.0             # Battery degradation cost component [NOK]
 
+    # Dual values per constraint block (only when optimize_month(return_duals=True))
+    duals: Optional[Dict[str, np.ndarray]] = None
+
+    # d objective / d (E_initial, E_final) [NOK/kWh] (progressive tariff mode;
+    # E_final marginal is 0 when the end-of-month energy is free)
+    soc_marginals: Optional[Tuple[float, float]] = None
+
+    # Per-phase timings, model size and HiGHS iterations of this solve
+    timings: Optional[SolveTimings] = None
+
 
 class MonthlyLPOptimizer:
     """
@@ -61,7 +118,8 @@ class MonthlyLPOptimizer:
     - Constraints: energy balance, battery dynamics, SOC limits, power limits, peak tracking
     """
 
-    def __init__(self, config, resolution='PT60M', battery_kwh=None, battery_kw=None):
+    def __init__(self, config, resolution='PT60M', battery_kwh=None, battery_kw=None,
+                 tariff_mode='progressive', tariff_workers=None):
         """
         Initialize optimizer with system configuration and time resolution.
 
@@ -70,6 +128,10 @@ class MonthlyLPOptimizer:
             resolution: Time resolution - 'PT60M' (hourly) or 'PT15M' (15-minute)
             battery_kwh: Battery energy capacity [kWh] (optional, overrides config)
             battery_kw: Battery power rating [kW] (optional, overrides config)
+            tariff_mode: 'progressive' (bracket fill approximation, one LP) or
+                'exact' (step-function tariff, one LP per candidate bracket)
+            tariff_workers: Threads for the bracket LPs in exact mode
+                (default: one per bracket, 1 = sequential)
         """
         # Validate resolution
         if resolution not in ['PT60M', 'PT15M']:
@@ -79,12 +141,14 @@ class MonthlyLPOptimizer:
 
         self.config = config
         self.resolution = resolution
+        self.tariff_mode = validate_tariff_mode(tariff_mode)
+        self.tariff_workers = tariff_workers
 
         # Calculate timestep in hours for battery dynamics
         self.timestep_hours = 0.25 if resolution == 'PT15M' else 1.0
 
-        print(f"Initializing LP optimizer with {resolution} resolution")
-        print(f"  Timestep: {self.timestep_hours} hours")
+        logger.debug("Initializing LP optimizer with %s resolution (timestep %s hours)",
+                     resolution, self.timestep_hours)
 
         # Battery parameters (with optional override)
         if battery_kwh is not None:
@@ -134,20 +198,17 @@ class MonthlyLPOptimizer:
                 self.eol_degradation = degradation_config.eol_degradation_percent  # End-of-life threshold (20%)
                 self.C_bat = battery_config.get_battery_cost()  # NOK/kWh (battery cells only)
 
-                print(f"\n{'='*70}")
-                print(f"Battery Degradation Modeling: ENABLED (LFP)")
-                print(f"{'='*70}")
-                print(f"  Cycle life: {degradation_config.cycle_life_full_dod:,} cycles @ 100% DOD")
-                print(f"  Calendar life: {degradation_config.calendar_life_years:.1f} years")
-                print(f"  EOL threshold: {self.eol_degradation:.1f}% degradation (80% SOH)")
-                print(f"  ρ_constant: {self.rho_constant:.6f} %/cycle")
-                print(f"  DP_cal: {self.dp_cal_per_timestep:.6f} %/timestep")
-                print(f"  C_bat: {self.C_bat:,.0f} NOK/kWh (battery cells only)")
-                print(f"{'='*70}\n")
+                logger.debug(
+                    "Battery degradation modeling: enabled (LFP), cycle life %s cycles @ 100%% DOD, "
+                    "calendar life %.1f years, EOL %.1f%% degradation, rho %.6f %%/cycle, "
+                    "DP_cal %.6f %%/timestep, C_bat %.0f NOK/kWh (cells only)",
+                    degradation_config.cycle_life_full_dod, degradation_config.calendar_life_years,
+                    self.eol_degradation, self.rho_constant, self.dp_cal_per_timestep, self.C_bat
+                )
             else:
-                print(f"Battery Degradation Modeling: DISABLED")
+                logger.debug("Battery degradation modeling: disabled")
         else:
-            print(f"Battery Degradation Modeling: DISABLED (no degradation config)")
+            logger.debug("Battery degradation modeling: disabled (no degradation config)")
 
         # Setup power tariff data (convert to incremental formulation)
         self.setup_power_tariff_incremental()
@@ -176,6 +237,7 @@ class MonthlyLPOptimizer:
         else:
             brackets = tariff_config.power_brackets
 
+        self.power_brackets = [tuple(b) for b in brackets]
         self.N_trinn = len(brackets)
         self.p_trinn = []
         self.c_trinn = []
@@ -198,9 +260,8 @@ class MonthlyLPOptimizer:
         self.p_trinn = np.array(self.p_trinn)
         self.c_trinn = np.array(self.c_trinn)
 
-        print(f"Power tariff: {self.N_trinn} brackets configured")
-        print(f"  p_trinn: {self.p_trinn}")
-        print(f"  c_trinn: {self.c_trinn}")
+        logger.debug("Power tariff: %d brackets configured (p_trinn %s, c_trinn %s)",
+                     self.N_trinn, self.p_trinn, self.c_trinn)
 
     def get_energy_costs(self, timestamps: pd.DatetimeIndex, spot_prices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -253,7 +314,11 @@ class MonthlyLPOptimizer:
                        load_consumption: np.ndarray,
                        spot_prices: np.ndarray,
                        timestamps: pd.DatetimeIndex,
-                       E_initial: float = None) -> MonthlyLPResult:
+                       E_initial: float = None,
+                       return_duals: bool = False,
+                       timestep_weights: Optional[np.ndarray] = None,
+                       period_length: Optional[int] = None,
+                       E_final: Optional[float] = None) -> MonthlyLPResult:
         """
         Solve LP optimization for one month.
 
@@ -264,6 +329,16 @@ class MonthlyLPOptimizer:
             spot_prices: Spot prices [NOK/kWh], shape (T,)
             timestamps: DatetimeIndex for the month
             E_initial: Initial battery energy [kWh], defaults to 50% SOC
+            return_duals: Attach HiGHS dual values per constraint block to the result
+            timestep_weights: Objective weight per timestep, shape (T,). Used for
+                representative periods where one timestep stands for several
+                calendar timesteps. Scales energy and degradation costs.
+            period_length: Timesteps per representative period. When set, every
+                period must end at the SOC it started with (SOC linking), so a
+                weighted period is energy-neutral and can be repeated.
+            E_final: Battery energy at the end of the month [kWh] (default: free).
+                Used by the annual decomposition, which couples months through
+                their boundary energies.
 
         Returns:
             MonthlyLPResult with optimal schedule and costs
@@ -273,18 +348,15 @@ class MonthlyLPOptimizer:
         if E_initial is None:
             E_initial = 0.5 * self.E_nom
 
-        print(f"\n{'='*70}")
-        print(f"Optimizing Month {month_idx} - LP Formulation ({self.resolution})")
-        print(f"{'='*70}")
-        print(f"Time horizon: {T} intervals ({T * self.timestep_hours:.0f} hours)")
-        if self.E_nom > 0:
-            print(f"Initial battery energy: {E_initial:.2f} kWh ({E_initial/self.E_nom*100:.1f}% SOC)")
-        else:
-            print(f"No battery (reference scenario)")
-        print(f"Resolution: {self.resolution} (Δt = {self.timestep_hours} hours)")
+        logger.debug("Optimizing month %d - LP formulation (%s): %d intervals (%.0f hours), %s",
+                     month_idx, self.resolution, T, T * self.timestep_hours,
+                     f"initial battery energy {E_initial:.2f} kWh" if self.E_nom > 0
+                     else "no battery (reference scenario)")
 
         # Get energy costs
+        timer = PhaseTimer()
         c_import, c_export = self.get_energy_costs(timestamps, spot_prices)
+        timer.lap('tariff')
 
         # Build LP problem
         # Variables depend on degradation modeling:
@@ -301,6 +373,11 @@ class MonthlyLPOptimizer:
         c = np.zeros(n_vars)
         c[2*T:3*T] = c_import * self.timestep_hours  # P_grid_import costs [kr]
         c[3*T:4*T] = -c_export * self.timestep_hours  # P_grid_export revenue [kr]
+
+        # Representative periods: each timestep counts `weight` times
+        weights = np.ones(T) if timestep_weights is None else np.asarray(timestep_weights, dtype=float)
+        c[2*T:3*T] *= weights
+        c[3*T:4*T] *= weights
         # c[5*T:6*T] = 0.0  # P_curtail has zero cost (dumped energy)
 
         if self.degradation_enabled:
@@ -309,7 +386,7 @@ class MonthlyLPOptimizer:
             # Battery is end-of-life at 20% degradation (80% SOH)
             # Cost = C_bat [NOK/kWh] × E_nom [kWh] × DP[t] / eol_degradation_percent
             # This ensures full battery cost is amortized over usable lifetime
-            c[9*T:10*T] = self.C_bat * self.E_nom / self.eol_degradation
+            c[9*T:10*T] = self.C_bat * self.E_nom / self.eol_degradation * weights
             # P_curtail at index 10*T:11*T (already zero from np.zeros)
             idx_peak = 11*T  # P_peak after curtailment
             idx_z = 11*T + 1  # z_trinn after P_peak
@@ -319,32 +396,54 @@ class MonthlyLPOptimizer:
 
         c[idx_z:idx_z + self.N_trinn] = self.c_trinn  # Power tariff costs [kr/month]
 
-        # Bounds (use helper method)
-        bounds = self._build_bounds(T)
+        # Constraint matrices and bounds from the shared template of this shape
+        template = self.lp_template(T)
+        bounds = template.bounds
+        A_eq, A_ub, b_ub = template.A_eq, template.A_ub, template.b_ub
 
-        # Build constraint matrices
-        A_eq, b_eq = self._build_equality_constraints(T, pv_production, load_consumption, E_initial)
-        A_ub, b_ub = self._build_inequality_constraints(T)
-
-        # Add degradation constraints if enabled
+        # Rows whose right-hand side is +/- E_initial (for the E_initial marginal)
+        initial_rows = {T: 1.0}
         if self.degradation_enabled:
-            A_eq_deg, b_eq_deg, A_ub_deg, b_ub_deg = self._build_degradation_constraints(T, E_initial)
-
-            # Combine constraints
-            A_eq = np.vstack([A_eq, A_eq_deg])
-            b_eq = np.concatenate([b_eq, b_eq_deg])
-            A_ub = np.vstack([A_ub, A_ub_deg])
-            b_ub = np.concatenate([b_ub, b_ub_deg])
-
-        print(f"LP problem size: {n_vars} variables, {len(b_eq)} equality constraints, {len(b_ub)} inequality constraints")
-
-        # Solve LP
-        print("Solving LP with HiGHS...")
-        result = linprog(c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq,
-                         bounds=bounds, method='highs', options={'disp': True})
+            initial_rows[2*T + 1] = -1.0
+
+        b_eq = template.b_eq.copy()
+        b_eq[:T] = load_consumption - pv_production  # Energy balance
+        for row, sign in initial_rows.items():
+            b_eq[row] = sign * E_initial
+
+        # SOC linking between representative periods (appended after all other rows)
+        if period_length is not None:
+            initial_rows[len(b_eq)] = 1.0
+            A_eq_link, b_eq_link = self._build_period_linking_constraints(
+                T, period_length, A_eq.shape[1], E_initial
+            )
+            A_eq = sparse.vstack([A_eq, sparse.csr_matrix(A_eq_link)], format='csr')
+            b_eq = np.concatenate([b_eq, b_eq_link])
+
+        # Fixed end-of-month energy (last row)
+        if E_final is not None:
+            A_eq_final = sparse.csr_matrix(([1.0], ([0], [5*T - 1])), shape=(1, A_eq.shape[1]))  # E_battery[T-1]
+            A_eq = sparse.vstack([A_eq, A_eq_final], format='csr')
+            b_eq = np.append(b_eq, E_final)
+
+        logger.debug("LP problem size: %d variables, %d equality constraints, %d inequality constraints",
+                     n_vars, len(b_eq), len(b_ub))
+
+        # Solve LP (HiGHS writes its log directly to stdout, so only at DEBUG)
+        timer.timings.set_model_size(c, A_eq, A_ub)
+        timer.lap('assembly')
+        if self.tariff_mode == 'exact':
+            result = self._solve_exact_tariff(T, c, A_ub, b_ub, A_eq, b_eq, bounds, idx_peak, idx_z,
+                                             timer.timings)
+        else:
+            result = linprog(c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq,
+                             bounds=bounds, method='highs',
+                             options={'disp': logger.isEnabledFor(logging.DEBUG)})
+            timer.timings.iterations = getattr(result, 'nit', None)
+        timer.lap('solve')
 
         if not result.success:
-            print(f"⚠ LP optimization failed: {result.message}")
+            logger.warning("LP optimization failed for month %d: %s", month_idx, result.message)
             # Calculate P_curtail to satisfy energy balance equation:
             # pv_production + P_grid_import + η_inv*P_discharge = load_consumption + P_grid_export + P_charge/η_inv + P_curtail
             # With P_charge=0, P_discharge=0, P_grid_import=load_consumption, P_grid_export=0:
@@ -352,6 +451,7 @@ class MonthlyLPOptimizer:
             # Therefore: P_curtail = pv_production (all solar gets curtailed)
             P_curtail_fallback = pv_production.copy()
 
+            timer.lap('extraction')
             return MonthlyLPResult(
                 P_charge=np.zeros(T),
                 P_discharge=np.zeros(T),
@@ -366,7 +466,8 @@ class MonthlyLPOptimizer:
                 power_cost=0,
                 success=False,
                 message=result.message,
-                E_battery_final=E_initial
+                E_battery_final=E_initial,
+                timings=timer.timings
             )
 
         # Extract solution
@@ -389,7 +490,7 @@ class MonthlyLPOptimizer:
             z_trinn = x[11*T+1:11*T+1+self.N_trinn]
 
             # Calculate degradation cost
-            degradation_cost = np.sum(DP * self.C_bat * self.E_nom / self.eol_degradation)
+            degradation_cost = np.sum(DP * weights * self.C_bat * self.E_nom / self.eol_degradation)
         else:
             DOD_abs = None
             DP_cyc = None
@@ -401,49 +502,31 @@ class MonthlyLPOptimizer:
 
         # Calculate cost breakdown
         # Energy cost must be scaled by timestep_hours (0.25 for PT15M, 1.0 for PT60M)
-        energy_cost = np.sum((c_import * P_grid_import - c_export * P_grid_export) * self.timestep_hours)
-        power_cost = np.sum(self.c_trinn * z_trinn)
-
-        print(f"✓ Optimization successful!")
-        print(f"  Objective value: {result.fun:,.2f} NOK")
-        print(f"  Energy cost: {energy_cost:,.2f} NOK")
-        print(f"  Power cost: {power_cost:,.2f} NOK")
-        if self.degradation_enabled:
-            print(f"  Degradation cost: {degradation_cost:,.2f} NOK")
-            print(f"  Total degradation: {np.sum(DP):.4f}%")
-            print(f"  Cyclic degradation: {np.sum(DP_cyc):.4f}%")
-            print(f"  Calendar degradation: {self.dp_cal_per_timestep * T:.4f}%")
-
-            # Validate equivalent cycles
-            equivalent_cycles = np.sum(DOD_abs)
-            cycles_per_year = equivalent_cycles * (8760.0 / T)  # Extrapolate to annual
-
-            print(f"  Equivalent cycles (this period): {equivalent_cycles:.1f}")
-            print(f"  Extrapolated annual rate: {cycles_per_year:.0f} cycles/year")
-
-            # Warnings
-            if cycles_per_year > 400:
-                print(f"  ⚠️  WARNING: Very high cycle rate!")
-                print(f"      Expected for peak shaving: 100-200 cycles/year")
-                print(f"      Current rate suggests aggressive arbitrage trading")
-
-            # Compare cyclic vs calendar
-            cyclic_monthly = np.sum(DP_cyc)
-            calendar_monthly = self.dp_cal_per_timestep * T
-
-            if cyclic_monthly < calendar_monthly * 0.5:
-                print(f"  ⚠️  Battery under-utilized (calendar degradation dominates)")
-            elif cyclic_monthly > calendar_monthly * 5:
-                print(f"  ⚠️  Battery over-utilized (cyclic degradation dominates)")
-
-        print(f"  Peak power: {P_peak:.2f} kW")
-        print(f"  Final SOC: {E_battery[-1]/self.E_nom*100:.1f}%")
-
-        # Report curtailment if any
-        total_curtailment = np.sum(P_curtail) * self.timestep_hours
-        if total_curtailment > 0.1:  # Only report if significant
-            print(f"  Solar curtailment: {total_curtailment:.1f} kWh ({total_curtailment/(np.sum(pv_production)*self.timestep_hours)*100:.1f}% of solar)")
-
+        energy_cost = np.sum((c_import * P_grid_import - c_export * P_grid_export) * weights * self.timestep_hours)
+        objective_value = result.fun
+        if self.tariff_mode == 'exact':
+            # Untaxed peak variable may sit anywhere below the cap: report the peak reached
+            P_peak = float(P_grid_import.max())
+            bracket_start = np.concatenate([[0.0], np.cumsum(self.p_trinn)[:-1]])
+            z_trinn = np.clip((P_peak - bracket_start) / self.p_trinn, 0.0, 1.0)
+            power_cost = step_tariff_cost(self.power_brackets, P_peak)
+            objective_value += power_cost
+        else:
+            power_cost = np.sum(self.c_trinn * z_trinn)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            self._log_solution_summary(result, T, energy_cost, power_cost, degradation_cost,
+                                       DP, DP_cyc, DOD_abs, P_peak, E_battery, P_curtail, pv_production)
+
+        duals = self._extract_duals(result, T) if return_duals else None
+        soc_marginals = None
+        if self.tariff_mode == 'progressive':
+            eq = result.eqlin.marginals
+            soc_marginals = (
+                float(sum(sign * eq[row] for row, sign in initial_rows.items())),
+                float(eq[-1]) if E_final is not None else 0.0,
+            )
+        timer.lap('extraction')
         return MonthlyLPResult(
             P_charge=P_charge,
             P_discharge=P_discharge,
@@ -457,15 +540,127 @@ class MonthlyLPOptimizer:
             DP_cyc=DP_cyc,
             DP_cal=self.dp_cal_per_timestep if self.degradation_enabled else None,
             DP_total=DP,
-            objective_value=result.fun,
+            objective_value=objective_value,
             energy_cost=energy_cost,
             power_cost=power_cost,
             degradation_cost=degradation_cost,
             success=True,
             message="Optimal solution found",
-            E_battery_final=E_battery[-1]
+            E_battery_final=E_battery[-1],
+            duals=duals,
+            soc_marginals=soc_marginals,
+            timings=timer.timings
         )
 
+    def _solve_exact_tariff(self, T: int, c: np.ndarray, A_ub, b_ub, A_eq, b_eq, bounds: list,
+                            idx_peak: int, idx_z: int, timings: SolveTimings):
+        """
+        Solve the month with the step-function power tariff exactly.
+
+        The assembled matrices are shared by all bracket LPs; each drops the
+        tariff term and caps P_peak at its bracket edge. The lowest LP cost
+        plus step tariff of the peak reached wins.
+
+        Args:
+            T: Number of timesteps
+            c: Objective with progressive tariff costs on z
+            idx_peak: Index of P_peak
+            idx_z: Index of the first z_trinn variable
+            timings: Receives HiGHS iterations summed over brackets
+
+        Returns:
+            scipy OptimizeResult of the cheapest bracket LP
+        """
+        c_energy = c.copy()
+        c_energy[idx_z:idx_z + self.N_trinn] = 0.0
+        caps = bracket_caps(self.power_brackets, 0.0, self.P_grid_import_limit)
+
+        def solve(cap):
+            capped = list(bounds)
+            capped[idx_peak] = (0, cap)
+            return linprog(c_energy, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq,
+                           bounds=capped, method='highs')
+
+        solved = solve_brackets(solve, caps, self.tariff_workers)
+        costs = [
+            result.fun + step_tariff_cost(self.power_brackets, result.x[2*T:3*T].max())
+            if result.success else float('inf')
+            for result in solved
+        ]
+        timings.iterations = sum(getattr(result, 'nit', 0) or 0 for result in solved)
+
+        best = cheapest_bracket(costs)
+        logger.debug("Exact step tariff: %d bracket LPs (peak caps %s kW), costs %s NOK",
+                     len(caps), np.round(caps, 1), np.round(costs, 2))
+        return solved[best]  # -1: all infeasible, report the widest cap
+
+    def _log_solution_summary(self, result, T: int, energy_cost: float, power_cost: float,
+                              degradation_cost: float, DP, DP_cyc, DOD_abs, P_peak: float,
+                              E_battery: np.ndarray, P_curtail: np.ndarray,
+                              pv_production: np.ndarray) -> None:
+        """Cost breakdown and degradation diagnostics of a solved month (DEBUG)."""
+        logger.debug("Optimization successful: objective %.2f NOK, energy cost %.2f NOK, power cost %.2f NOK, "
+                     "peak power %.2f kW, final SOC %.1f%%",
+                     result.fun, energy_cost, power_cost, P_peak,
+                     E_battery[-1] / self.E_nom * 100 if self.E_nom > 0 else 0.0)
+
+        if self.degradation_enabled:
+            # Validate equivalent cycles
+            equivalent_cycles = np.sum(DOD_abs)
+            cycles_per_year = equivalent_cycles * (8760.0 / T)  # Extrapolate to annual
+            cyclic_monthly = np.sum(DP_cyc)
+            calendar_monthly = self.dp_cal_per_timestep * T
+
+            logger.debug("Degradation cost %.2f NOK: total %.4f%% (cyclic %.4f%%, calendar %.4f%%), "
+                         "%.1f equivalent cycles, extrapolated %.0f cycles/year",
+                         degradation_cost, np.sum(DP), cyclic_monthly, calendar_monthly,
+                         equivalent_cycles, cycles_per_year)
+            if cycles_per_year > 400:
+                logger.debug("Very high cycle rate (peak shaving expects 100-200 cycles/year): "
+                             "suggests aggressive arbitrage trading")
+            if cyclic_monthly < calendar_monthly * 0.5:
+                logger.debug("Battery under-utilized (calendar degradation dominates)")
+            elif cyclic_monthly > calendar_monthly * 5:
+                logger.debug("Battery over-utilized (cyclic degradation dominates)")
+
+        # Report curtailment if any
+        total_curtailment = np.sum(P_curtail) * self.timestep_hours
+        if total_curtailment > 0.1:  # Only report if significant
+            logger.debug("Solar curtailment: %.1f kWh (%.1f%% of solar)", total_curtailment,
+                         total_curtailment / (np.sum(pv_production) * self.timestep_hours) * 100)
+
+    def _extract_duals(self, result, T: int) -> Dict[str, np.ndarray]:
+        """
+        Slice HiGHS marginals into named constraint blocks.
+
+        Signs are normalized to the marginal value [NOK] of relaxing each
+        constraint by one unit, matching RollingHorizonOptimizer._extract_duals().
+        Base rows come first in both matrices (degradation rows are appended), so
+        the layout is A_eq = [balance (T), dynamics (T), peak definition (1), ...]
+        and A_ub = [peak tracking (T), z ordering (N_trinn-1), ...].
+
+        Args:
+            result: scipy OptimizeResult from linprog(method='highs')
+            T: Number of timesteps in the month
+
+        Returns:
+            Dict keyed like DualVariables fields
+        """
+        eq = result.eqlin.marginals
+        ub = result.ineqlin.marginals
+
+        return {
+            'peak_constraints': -ub[0:T],
+            # Dynamics row t adds its right-hand side to E[t]
+            'soc_dynamics': -eq[T:2*T],
+            'soc_upper_bounds': -result.upper.marginals[4*T:5*T],
+            'soc_lower_bounds': result.lower.marginals[4*T:5*T],
+            'export_limits': -result.upper.marginals[3*T:4*T],
+            'energy_balance': eq[0:T] / self.timestep_hours,
+            'charge_limits': -result.upper.marginals[0:T],
+            'discharge_limits': -result.upper.marginals[T:2*T],
+        }
+
     def get_power_tariff_peak(self, P_grid_import: np.ndarray, timestamps: pd.DatetimeIndex) -> float:
         """
         Calculate the peak power for tariff billing with resolution awareness.
@@ -494,6 +689,58 @@ class MonthlyLPOptimizer:
         hourly_peaks = aggregate_15min_to_hourly_peak(P_grid_import, timestamps)
         return hourly_peaks.max() if isinstance(hourly_peaks, np.ndarray) else hourly_peaks.values.max()
 
+    def lp_template(self, T: int) -> LPTemplate:
+        """
+        Constraint matrices and bounds of a T-step month LP (cached).
+
+        Templates are keyed by every parameter the matrices and bounds depend
+        on, so optimizers with equal parameters share them, also across
+        optimizer instances and threads.
+        """
+        key = self._template_key(T)
+        with _templates_lock:
+            template = _templates.get(key)
+            if template is not None:
+                _templates.move_to_end(key)
+                return template
+
+        zeros = np.zeros(T)
+        A_eq, b_eq = self._build_equality_constraints(T, zeros, zeros, 0.0)
+        A_ub, b_ub = self._build_inequality_constraints(T)
+        if self.degradation_enabled:
+            A_eq_deg, b_eq_deg, A_ub_deg, b_ub_deg = self._build_degradation_constraints(T, 0.0)
+            A_eq = np.vstack([A_eq, A_eq_deg])
+            b_eq = np.concatenate([b_eq, b_eq_deg])
+            A_ub = np.vstack([A_ub, A_ub_deg])
+            b_ub = np.concatenate([b_ub, b_ub_deg])
+        b_eq.flags.writeable = False
+        b_ub.flags.writeable = False
+        template = LPTemplate(
+            A_eq=sparse.csr_matrix(A_eq),
+            b_eq=b_eq,
+            A_ub=sparse.csr_matrix(A_ub),
+            b_ub=b_ub,
+            bounds=tuple(self._build_bounds(T)),
+        )
+
+        with _templates_lock:
+            _templates[key] = template
+            while len(_templates) > _TEMPLATE_CACHE_SIZE:
+                _templates.popitem(last=False)
+        return template
+
+    def _template_key(self, T: int) -> tuple:
+        """Parameters the LP template of a T-step month depends on."""
+        key = (
+            T, self.timestep_hours, self.E_nom, self.P_max_charge, self.P_max_discharge,
+            self.eta_charge, self.eta_discharge, self.eta_inv, self.SOC_min, self.SOC_max,
+            self.P_grid_import_limit, self.P_grid_export_limit, tuple(self.p_trinn),
+            self.degradation_enabled,
+        )
+        if self.degradation_enabled:
+            key += (self.rho_constant, self.dp_cal_per_timestep)
+        return key
+
     def _build_equality_constraints(self, T: int, pv: np.ndarray, load: np.ndarray,
                                     E_initial: float) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -553,6 +800,39 @@ class MonthlyLPOptimizer:
 
         return A_eq, b_eq
 
+    def _build_period_linking_constraints(self, T: int, period_length: int, n_vars: int,
+                                          E_initial: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Build SOC linking constraints for concatenated representative periods.
+
+        Period p covers timesteps [p*L, (p+1)*L). It starts from the energy left
+        by period p-1 (E_initial for p=0) and must return to that level:
+            E[(p+1)*L - 1] = E[p*L - 1]    (p > 0)
+            E[L - 1] = E_initial           (p = 0)
+
+        Args:
+            T: Total number of timesteps (multiple of period_length)
+            period_length: Timesteps per representative period
+            n_vars: Number of LP variables (matches A_eq columns)
+            E_initial: Initial battery energy [kWh]
+        """
+        if period_length <= 0 or T % period_length != 0:
+            raise ValueError(f"period_length={period_length} must divide T={T}")
+
+        n_periods = T // period_length
+        A_link = np.zeros((n_periods, n_vars))
+        b_link = np.zeros(n_periods)
+
+        for p in range(n_periods):
+            end = (p + 1) * period_length - 1
+            A_link[p, 4*T + end] = 1.0  # E_battery at end of period
+            if p == 0:
+                b_link[p] = E_initial
+            else:
+                A_link[p, 4*T + p*period_length - 1] = -1.0  # E_battery at end of previous period
+
+        return A_link, b_link
+
     def _build_inequality_constraints(self, T: int) -> Tuple[np.ndarray, np.ndarray]:
         """
         Build inequality constraint matrices A_ub x <= b_ub for:
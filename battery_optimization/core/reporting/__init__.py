@@ -11,6 +11,8 @@ from .plotly_report_generator import PlotlyReportGenerator
 from .matplotlib_report_generator import MatplotlibReportGenerator
 from .factory import ReportFactory
 from .battery_operation_report import BatteryOperationReport
+from .aggregates import AggregateCube, get_aggregate_cube, clear_aggregate_cache
+from .parallel import ReportJob, render_reports
 
 __all__ = [
     'SimulationResult',
@@ -20,4 +22,9 @@ __all__ = [
     'MatplotlibReportGenerator',
     'ReportFactory',
     'BatteryOperationReport',
+    'AggregateCube',
+    'get_aggregate_cube',
+    'clear_aggregate_cache',
+    'ReportJob',
+    'render_reports',
 ]
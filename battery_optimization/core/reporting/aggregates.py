@@ -0,0 +1,190 @@
+"""
+Shared aggregate cube for report generation.
+
+Report panels (daily tables, weekly tables, monthly summaries) used to
+resample the trajectory separately, with Python lambdas per group. The cube
+computes additive daily statistics once per trajectory with vectorized named
+aggregations; weekly and monthly views are roll-ups of the daily rows, and a
+period slice is a row selection. Cubes are cached per result, so several
+reports on the same result (or a regenerated report set after a sizing sweep)
+aggregate each trajectory only once per process.
+
+**Usage:**
+    from core.reporting.aggregates import get_aggregate_cube
+
+    cube = get_aggregate_cube(result).slice(start, end)
+    weekly = cube.rollup('W')   # production_kwh, charge_kwh, soc_mean_kwh, ...
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .result_models import SimulationResult
+
+
+# Cubes kept in memory per process
+CUBE_CACHE_SIZE = 64
+
+_SUM_COLUMNS = [
+    'production_kwh',
+    'consumption_kwh',
+    'grid_import_kwh',
+    'grid_export_kwh',
+    'charge_kwh',
+    'discharge_kwh',
+    'curtailment_kwh',
+    'energy_cost_nok',
+    'soc_sum_kwh',
+    'n_steps',
+]
+_MAX_COLUMNS = ['peak_import_kw', 'peak_production_kw', 'soc_max_kwh']
+_MIN_COLUMNS = ['soc_min_kwh']
+
+
+def _timestep_hours(index: pd.DatetimeIndex) -> float:
+    if len(index) < 2:
+        return 1.0
+    return float(pd.Series(index).diff().median().total_seconds() / 3600)
+
+
+@dataclass
+class AggregateCube:
+    """
+    Additive daily statistics of one trajectory.
+
+    Energy columns are in kWh (power × timestep), so roll-ups are sums and are
+    correct at any resolution. Means are derived from sum and count columns.
+
+    Attributes:
+        daily: One row per calendar day (sum, max and min columns)
+        timestep_hours: Trajectory resolution [h]
+    """
+    daily: pd.DataFrame
+    timestep_hours: float
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'AggregateCube':
+        """
+        Aggregate a trajectory (SimulationResult.to_dataframe() columns).
+
+        Args:
+            df: Trajectory with DatetimeIndex
+
+        Returns:
+            AggregateCube with one row per day
+        """
+        dt = _timestep_hours(df.index)
+        grid = df['grid_power_kw'].to_numpy()
+        battery = df['battery_power_ac_kw'].to_numpy()
+        grid_import = np.maximum(grid, 0.0)
+        grid_export = np.maximum(-grid, 0.0)
+
+        steps = pd.DataFrame({
+            'production_kwh': df['production_ac_kw'].to_numpy() * dt,
+            'consumption_kwh': df['consumption_kw'].to_numpy() * dt,
+            'grid_import_kwh': grid_import * dt,
+            'grid_export_kwh': grid_export * dt,
+            'charge_kwh': np.maximum(battery, 0.0) * dt,
+            'discharge_kwh': np.maximum(-battery, 0.0) * dt,
+            'curtailment_kwh': df['curtailment_kw'].to_numpy() * dt,
+            'energy_cost_nok': (grid_import - grid_export) * df['spot_price'].to_numpy() * dt,
+            'soc_kwh': df['battery_soc_kwh'].to_numpy(),
+            'grid_import_kw': grid_import,
+            'production_kw': df['production_ac_kw'].to_numpy(),
+        }, index=df.index)
+
+        daily = steps.resample('D').agg(
+            **{column: (column, 'sum') for column in _SUM_COLUMNS[:-2]},
+            soc_sum_kwh=('soc_kwh', 'sum'),
+            n_steps=('soc_kwh', 'count'),
+            peak_import_kw=('grid_import_kw', 'max'),
+            peak_production_kw=('production_kw', 'max'),
+            soc_max_kwh=('soc_kwh', 'max'),
+            soc_min_kwh=('soc_kwh', 'min'),
+        )
+        daily = daily[daily['n_steps'] > 0]
+        return cls(daily=daily, timestep_hours=dt)
+
+    def slice(self, start: Optional[pd.Timestamp] = None, end: Optional[pd.Timestamp] = None) -> 'AggregateCube':
+        """Days with start <= day < end (day-aligned report periods)."""
+        mask = np.ones(len(self.daily), dtype=bool)
+        if start is not None:
+            mask &= self.daily.index >= pd.Timestamp(start).floor('D')
+        if end is not None:
+            mask &= self.daily.index < pd.Timestamp(end)
+        return AggregateCube(daily=self.daily[mask], timestep_hours=self.timestep_hours)
+
+    def rollup(self, freq: str = 'D') -> pd.DataFrame:
+        """
+        Aggregate to a coarser calendar period.
+
+        Args:
+            freq: Pandas offset alias ('D', 'W', 'MS', ...)
+
+        Returns:
+            DataFrame with energy sums, peaks, SOC min/mean/max and
+            equivalent full cycles per period
+        """
+        if freq == 'D':
+            table = self.daily.copy()
+        else:
+            table = self.daily.resample(freq).agg(
+                {**{c: 'sum' for c in _SUM_COLUMNS},
+                 **{c: 'max' for c in _MAX_COLUMNS},
+                 **{c: 'min' for c in _MIN_COLUMNS}}
+            )
+            table = table[table['n_steps'] > 0]
+
+        table['soc_mean_kwh'] = table['soc_sum_kwh'] / table['n_steps']
+        return table.drop(columns=['soc_sum_kwh'])
+
+    def totals(self) -> pd.Series:
+        """Whole-period sums and extremes."""
+        totals = self.daily[_SUM_COLUMNS].sum()
+        for column in _MAX_COLUMNS:
+            totals[column] = self.daily[column].max()
+        for column in _MIN_COLUMNS:
+            totals[column] = self.daily[column].min()
+        return totals
+
+
+def result_cache_key(result: SimulationResult) -> str:
+    """Cache key: the catalog result ID if present, else scenario and creation time."""
+    metadata = result.simulation_metadata
+    if metadata.get('result_id'):
+        return str(metadata['result_id'])
+    return f"{result.scenario_name}|{metadata.get('creation_date', '')}|{len(result.timestamp)}"
+
+
+_cube_cache: 'OrderedDict[str, AggregateCube]' = OrderedDict()
+
+
+def get_aggregate_cube(result: SimulationResult) -> AggregateCube:
+    """
+    Aggregate cube of a result's full trajectory, cached by result ID.
+
+    Args:
+        result: SimulationResult to aggregate
+
+    Returns:
+        AggregateCube (shared; slice() and rollup() return new objects)
+    """
+    key = result_cache_key(result)
+    cube = _cube_cache.get(key)
+    if cube is None:
+        cube = AggregateCube.from_dataframe(result.to_dataframe())
+        _cube_cache[key] = cube
+        if len(_cube_cache) > CUBE_CACHE_SIZE:
+            _cube_cache.popitem(last=False)
+    else:
+        _cube_cache.move_to_end(key)
+    return cube
+
+
+def clear_aggregate_cache() -> None:
+    """Drop all cached cubes."""
+    _cube_cache.clear()
@@ -21,6 +21,8 @@ import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from .aggregates import AggregateCube, get_aggregate_cube
+from .downsampling import downsample_indices, point_budget, scatter_class, zoom_resampling_script
 from .plotly_report_generator import PlotlyReportGenerator
 from .result_models import SimulationResult
 from .factory import ReportFactory
@@ -46,6 +48,8 @@ class BatteryOperationReport(PlotlyReportGenerator):
     - Norsk Solkraft themed visualizations
     - Interactive zoom, pan, hover tooltips
     - Multiple export formats (HTML, PNG via kaleido)
+    - MinMax-LTTB downsampling and WebGL traces for long periods (a year at
+      PT15M renders as quickly as three weeks), optional zoom-level resampling
 
     Layout: 2 columns × 6 rows (12 subplots total)
 
@@ -56,6 +60,8 @@ class BatteryOperationReport(PlotlyReportGenerator):
         export_png: Whether to export static PNG in addition to HTML
         battery_kwh: Battery capacity (auto-detected from metadata if not specified)
         battery_kw: Battery power rating (auto-detected from metadata if not specified)
+        max_points: Points per timeseries trace after downsampling (None: no downsampling)
+        zoom_resampling: Whether zooming re-resamples the visible range from full-resolution data
     """
 
     PERIOD_CONFIGS = {
@@ -74,7 +80,10 @@ class BatteryOperationReport(PlotlyReportGenerator):
         end_date: Optional[str] = None,
         export_png: bool = False,
         battery_kwh: Optional[float] = None,
-        battery_kw: Optional[float] = None
+        battery_kw: Optional[float] = None,
+        downsample: bool = True,
+        points_per_pixel: float = 2.0,
+        zoom_resampling: bool = False
     ):
         """
         Initialize battery operation report generator.
@@ -88,6 +97,10 @@ class BatteryOperationReport(PlotlyReportGenerator):
             export_png: Whether to export static PNG (requires kaleido)
             battery_kwh: Battery capacity override (auto-detected if None)
             battery_kw: Battery power rating override (auto-detected if None)
+            downsample: Reduce each timeseries trace to the points-per-pixel budget
+            points_per_pixel: Points per horizontal pixel of a subplot
+            zoom_resampling: Embed full-resolution data and resample the visible
+                range on zoom (larger HTML, full detail when zoomed in)
 
         Raises:
             ValueError: If period is invalid or custom period missing dates
@@ -123,6 +136,14 @@ class BatteryOperationReport(PlotlyReportGenerator):
         # Prepare trajectory data
         self.df = self._prepare_data()
 
+        # Daily/weekly aggregates, shared with other reports on the same result
+        self.aggregates: AggregateCube = get_aggregate_cube(result).slice(self.period_start, self.period_end)
+
+        # Downsampling budget and full-resolution series for zoom resampling
+        self.max_points = point_budget(points_per_pixel=points_per_pixel) if downsample else None
+        self.zoom_resampling = zoom_resampling
+        self._zoom_series: Dict[int, np.ndarray] = {}
+
     def _prepare_data(self) -> pd.DataFrame:
         """
         Prepare trajectory data for visualization.
@@ -137,6 +158,7 @@ class BatteryOperationReport(PlotlyReportGenerator):
 
         # Determine time range
         start, end = self._get_time_range(df.index)
+        self.period_start, self.period_end = start, end
 
         # Filter to period
         df_filtered = df[(df.index >= start) & (df.index < end)].copy()
@@ -194,6 +216,50 @@ class BatteryOperationReport(PlotlyReportGenerator):
 
         return start, end
 
+    def _add_series(
+        self,
+        fig: go.Figure,
+        y,
+        row: int,
+        col: int,
+        bar: bool = False,
+        secondary_y: Optional[bool] = None,
+        **trace_kwargs
+    ):
+        """
+        Add a full-period timeseries trace, downsampled to the point budget.
+
+        Lines use Scattergl above the WebGL threshold (stacked areas stay SVG,
+        Scattergl has no stackgroup).
+
+        Args:
+            fig: Figure to add the trace to
+            y: Values aligned with self.df.index
+            row, col: Subplot position
+            bar: Bar trace instead of a line
+            secondary_y: Passed to fig.add_trace for secondary-axis subplots
+            **trace_kwargs: Trace properties (name, line, fill, hovertemplate, ...)
+        """
+        y = np.asarray(y, dtype=float)
+        if self.max_points is not None:
+            idx = downsample_indices(y, self.max_points, x=self.df.index)
+        else:
+            idx = np.arange(len(y))
+
+        if bar:
+            trace_cls = go.Bar
+        elif 'stackgroup' in trace_kwargs:
+            trace_cls = go.Scatter
+        else:
+            trace_cls = scatter_class(len(idx))
+
+        add_kwargs = {} if secondary_y is None else {'secondary_y': secondary_y}
+        fig.add_trace(trace_cls(x=self.df.index[idx], y=y[idx], **trace_kwargs),
+                      row=row, col=col, **add_kwargs)
+
+        if self.zoom_resampling and self.max_points is not None:
+            self._zoom_series[len(fig.data) - 1] = y
+
     def _create_figure(self) -> go.Figure:
         """
         Create comprehensive Plotly figure with 6 rows × 2 columns layout.
@@ -234,6 +300,8 @@ class BatteryOperationReport(PlotlyReportGenerator):
             row_heights=[0.16, 0.16, 0.16, 0.16, 0.16, 0.20]
         )
 
+        self._zoom_series = {}
+
         # Apply Norsk Solkraft light theme (inherited from PlotlyReportGenerator)
         self.apply_theme(fig, height=2400, hovermode='x unified')
 
@@ -270,17 +338,13 @@ class BatteryOperationReport(PlotlyReportGenerator):
     def _add_soc_subplot(self, fig: go.Figure, row: int, col: int):
         """Add Battery State of Charge subplot (Row 1, Col 1)"""
         # SOC area fill
-        fig.add_trace(
-            go.Scatter(
-                x=self.df.index,
-                y=self.df['soc_pct'],
-                fill='tozeroy',
-                fillcolor='rgba(76, 175, 80, 0.3)',  # Green with transparency
-                line=dict(color='#4CAF50', width=2),
-                name='SOC',
-                hovertemplate='%{y:.1f}%<extra></extra>'
-            ),
-            row=row, col=col
+        self._add_series(
+            fig, self.df['soc_pct'], row, col,
+            fill='tozeroy',
+            fillcolor='rgba(76, 175, 80, 0.3)',  # Green with transparency
+            line=dict(color='#4CAF50', width=2),
+            name='SOC',
+            hovertemplate='%{y:.1f}%<extra></extra>'
         )
 
         # Min/Max SOC limits
@@ -303,17 +367,13 @@ class BatteryOperationReport(PlotlyReportGenerator):
 
     def _add_curtailment_subplot(self, fig: go.Figure, row: int, col: int):
         """Add Curtailed Power subplot (Row 1, Col 2)"""
-        fig.add_trace(
-            go.Scatter(
-                x=self.df.index,
-                y=self.df['curtailment_kw'],
-                fill='tozeroy',
-                fillcolor='rgba(198, 40, 40, 0.3)',  # Red with transparency
-                line=dict(color='#C62828', width=1.5),
-                name='Curtailment',
-                hovertemplate='%{y:.1f} kW<extra></extra>'
-            ),
-            row=row, col=col
+        self._add_series(
+            fig, self.df['curtailment_kw'], row, col,
+            fill='tozeroy',
+            fillcolor='rgba(198, 40, 40, 0.3)',  # Red with transparency
+            line=dict(color='#C62828', width=1.5),
+            name='Curtailment',
+            hovertemplate='%{y:.1f} kW<extra></extra>'
         )
 
         fig.update_yaxes(title_text='Curtailed Power (kW)', row=row, col=col)
@@ -325,27 +385,19 @@ class BatteryOperationReport(PlotlyReportGenerator):
         discharge_power = np.where(self.df['battery_power_ac_kw'] < 0, self.df['battery_power_ac_kw'], 0)
 
         # Charge (positive, green)
-        fig.add_trace(
-            go.Bar(
-                x=self.df.index,
-                y=charge_power,
-                marker_color='#00897B',
-                name='Charge',
-                hovertemplate='Charge: %{y:.1f} kW<extra></extra>'
-            ),
-            row=row, col=col
+        self._add_series(
+            fig, charge_power, row, col, bar=True,
+            marker_color='#00897B',
+            name='Charge',
+            hovertemplate='Charge: %{y:.1f} kW<extra></extra>'
         )
 
         # Discharge (negative, red)
-        fig.add_trace(
-            go.Bar(
-                x=self.df.index,
-                y=discharge_power,
-                marker_color='#C62828',
-                name='Discharge',
-                hovertemplate='Discharge: %{y:.1f} kW<extra></extra>'
-            ),
-            row=row, col=col
+        self._add_series(
+            fig, discharge_power, row, col, bar=True,
+            marker_color='#C62828',
+            name='Discharge',
+            hovertemplate='Discharge: %{y:.1f} kW<extra></extra>'
         )
 
         # Power limits
@@ -363,15 +415,11 @@ class BatteryOperationReport(PlotlyReportGenerator):
         # Calculate C-rate: power / capacity
         c_rate = np.abs(self.df['battery_power_ac_kw']) / self.battery_kwh
 
-        fig.add_trace(
-            go.Scatter(
-                x=self.df.index,
-                y=c_rate,
-                line=dict(color='#1B263B', width=1.5),
-                name='C-Rate',
-                hovertemplate='C-Rate: %{y:.2f}<extra></extra>'
-            ),
-            row=row, col=col
+        self._add_series(
+            fig, c_rate, row, col,
+            line=dict(color='#1B263B', width=1.5),
+            name='C-Rate',
+            hovertemplate='C-Rate: %{y:.2f}<extra></extra>'
         )
 
         # Reference line at 1C
@@ -390,31 +438,23 @@ class BatteryOperationReport(PlotlyReportGenerator):
         grid_export = np.where(self.df['grid_power_kw'] < 0, self.df['grid_power_kw'], 0)
 
         # Import (positive, red)
-        fig.add_trace(
-            go.Scatter(
-                x=self.df.index,
-                y=grid_import,
-                fill='tozeroy',
-                fillcolor='rgba(255, 143, 0, 0.3)',  # Amber
-                line=dict(color='#FF8F00', width=1.5),
-                name='Grid Import',
-                hovertemplate='Import: %{y:.1f} kW<extra></extra>'
-            ),
-            row=row, col=col
+        self._add_series(
+            fig, grid_import, row, col,
+            fill='tozeroy',
+            fillcolor='rgba(255, 143, 0, 0.3)',  # Amber
+            line=dict(color='#FF8F00', width=1.5),
+            name='Grid Import',
+            hovertemplate='Import: %{y:.1f} kW<extra></extra>'
         )
 
         # Export (negative, green)
-        fig.add_trace(
-            go.Scatter(
-                x=self.df.index,
-                y=grid_export,
-                fill='tozeroy',
-                fillcolor='rgba(0, 137, 123, 0.3)',  # Teal
-                line=dict(color='#00897B', width=1.5),
-                name='Grid Export',
-                hovertemplate='Export: %{y:.1f} kW<extra></extra>'
-            ),
-            row=row, col=col
+        self._add_series(
+            fig, grid_export, row, col,
+            fill='tozeroy',
+            fillcolor='rgba(0, 137, 123, 0.3)',  # Teal
+            line=dict(color='#00897B', width=1.5),
+            name='Grid Export',
+            hovertemplate='Export: %{y:.1f} kW<extra></extra>'
         )
 
         # Grid limit reference
@@ -433,27 +473,19 @@ class BatteryOperationReport(PlotlyReportGenerator):
         peak_mask = self.df['is_peak']
 
         # Peak hours (red)
-        fig.add_trace(
-            go.Bar(
-                x=self.df.index,
-                y=peak_mask.astype(int),
-                marker_color='#C62828',
-                name='Peak Hours',
-                hovertemplate='Peak Tariff<extra></extra>'
-            ),
-            row=row, col=col
+        self._add_series(
+            fig, peak_mask.astype(int), row, col, bar=True,
+            marker_color='#C62828',
+            name='Peak Hours',
+            hovertemplate='Peak Tariff<extra></extra>'
         )
 
         # Off-peak hours (green)
-        fig.add_trace(
-            go.Bar(
-                x=self.df.index,
-                y=(~peak_mask).astype(int),
-                marker_color='#00897B',
-                name='Off-Peak Hours',
-                hovertemplate='Off-Peak Tariff<extra></extra>'
-            ),
-            row=row, col=col
+        self._add_series(
+            fig, (~peak_mask).astype(int), row, col, bar=True,
+            marker_color='#00897B',
+            name='Off-Peak Hours',
+            hovertemplate='Off-Peak Tariff<extra></extra>'
         )
 
         fig.update_yaxes(title_text='Tariff Zone', showticklabels=False, row=row, col=col)
@@ -461,32 +493,24 @@ class BatteryOperationReport(PlotlyReportGenerator):
     def _add_spot_price_subplot(self, fig: go.Figure, row: int, col: int):
         """Add Spot Price subplot (Row 4, Col 1) with dual y-axis"""
         # Spot price (primary y-axis)
-        fig.add_trace(
-            go.Scatter(
-                x=self.df.index,
-                y=self.df['spot_price'],
-                line=dict(color='#4CAF50', width=2.5),  # Thick green line
-                name='Spot Price',
-                hovertemplate='Price: %{y:.3f} NOK/kWh<extra></extra>'
-            ),
-            row=row, col=col, secondary_y=False
+        self._add_series(
+            fig, self.df['spot_price'], row, col, secondary_y=False,
+            line=dict(color='#4CAF50', width=2.5),  # Thick green line
+            name='Spot Price',
+            hovertemplate='Price: %{y:.3f} NOK/kWh<extra></extra>'
         )
 
         fig.update_yaxes(title_text='Spot Price (NOK/kWh)', row=row, col=col, secondary_y=False)
 
     def _add_solar_production_subplot(self, fig: go.Figure, row: int, col: int):
         """Add Solar Production subplot (Row 4, Col 2)"""
-        fig.add_trace(
-            go.Scatter(
-                x=self.df.index,
-                y=self.df['production_ac_kw'],
-                fill='tozeroy',
-                fillcolor='rgba(252, 200, 8, 0.3)',  # Yellow
-                line=dict(color='#FCC808', width=1.5),
-                name='Solar Production',
-                hovertemplate='Production: %{y:.1f} kW<extra></extra>'
-            ),
-            row=row, col=col
+        self._add_series(
+            fig, self.df['production_ac_kw'], row, col,
+            fill='tozeroy',
+            fillcolor='rgba(252, 200, 8, 0.3)',  # Yellow
+            line=dict(color='#FCC808', width=1.5),
+            name='Solar Production',
+            hovertemplate='Production: %{y:.1f} kW<extra></extra>'
         )
 
         fig.update_yaxes(title_text='Solar Production (kW)', row=row, col=col)
@@ -510,18 +534,14 @@ class BatteryOperationReport(PlotlyReportGenerator):
         energy_cost = grid_import_cost - grid_export_revenue
 
         # Stacked area for cost components
-        fig.add_trace(
-            go.Scatter(
-                x=self.df.index,
-                y=energy_cost,
-                fill='tozeroy',
-                fillcolor='rgba(255, 143, 0, 0.5)',
-                line=dict(width=0),
-                name='Energy Cost',
-                stackgroup='costs',
-                hovertemplate='Energy: %{y:.2f} NOK<extra></extra>'
-            ),
-            row=row, col=col
+        self._add_series(
+            fig, energy_cost, row, col,
+            fill='tozeroy',
+            fillcolor='rgba(255, 143, 0, 0.5)',
+            line=dict(width=0),
+            name='Energy Cost',
+            stackgroup='costs',
+            hovertemplate='Energy: %{y:.2f} NOK<extra></extra>'
         )
 
         fig.update_yaxes(title_text='Cost Components (NOK)', row=row, col=col)
@@ -540,35 +560,24 @@ class BatteryOperationReport(PlotlyReportGenerator):
 
         cumulative_cost = np.cumsum(cost_per_step)
 
-        fig.add_trace(
-            go.Scatter(
-                x=self.df.index,
-                y=cumulative_cost,
-                line=dict(color='#1B263B', width=2.5),
-                name='Cumulative Cost',
-                hovertemplate='Total: %{y:.0f} NOK<extra></extra>'
-            ),
-            row=row, col=col
+        self._add_series(
+            fig, cumulative_cost, row, col,
+            line=dict(color='#1B263B', width=2.5),
+            name='Cumulative Cost',
+            hovertemplate='Total: %{y:.0f} NOK<extra></extra>'
         )
 
         fig.update_yaxes(title_text='Cumulative Cost (NOK)', row=row, col=col)
 
     def _add_daily_metrics_table(self, fig: go.Figure, row: int, col: int):
         """Add Daily Metrics table (Row 6, Col 1)"""
-        # Calculate daily aggregates
-        daily = self.df.resample('D').agg({
-            'production_ac_kw': 'sum',
-            'consumption_kw': 'sum',
-            'grid_power_kw': lambda x: x[x > 0].sum(),  # Import only
-            'battery_power_ac_kw': lambda x: (x[x > 0].sum(), x[x < 0].abs().sum()),
-            'curtailment_kw': 'sum'
-        })
+        daily = self.aggregates.rollup('D')
 
         # Format for table
         dates = [d.strftime('%Y-%m-%d') for d in daily.index]
-        production = [f'{v:.0f}' for v in daily['production_ac_kw']]
-        consumption = [f'{v:.0f}' for v in daily['consumption_kw']]
-        grid_import = [f'{v:.0f}' for v in daily['grid_power_kw']]
+        production = [f'{v:.0f}' for v in daily['production_kwh']]
+        consumption = [f'{v:.0f}' for v in daily['consumption_kwh']]
+        grid_import = [f'{v:.0f}' for v in daily['grid_import_kwh']]
 
         fig.add_trace(
             go.Table(
@@ -590,22 +599,16 @@ class BatteryOperationReport(PlotlyReportGenerator):
 
     def _add_weekly_aggregates_table(self, fig: go.Figure, row: int, col: int):
         """Add Weekly Aggregates table (Row 6, Col 2)"""
-        # Calculate weekly metrics
-        weekly = self.df.resample('W').agg({
-            'production_ac_kw': 'sum',
-            'battery_power_ac_kw': lambda x: x[x > 0].sum(),  # Total charging
-            'curtailment_kw': 'sum',
-            'battery_soc_kwh': 'mean'
-        })
+        weekly = self.aggregates.rollup('W')
 
-        # Calculate equivalent cycles
-        weekly['cycles'] = weekly['battery_power_ac_kw'] / (2 * self.battery_kwh)
+        # Equivalent cycles
+        cycles_per_week = weekly['charge_kwh'] / (2 * self.battery_kwh)
 
         # Format for table
         weeks = [f'Week {i+1}' for i in range(len(weekly))]
-        production = [f'{v:.0f} kWh' for v in weekly['production_ac_kw']]
-        cycles = [f'{v:.2f}' for v in weekly['cycles']]
-        curtail = [f'{v:.0f} kWh' for v in weekly['curtailment_kw']]
+        production = [f'{v:.0f} kWh' for v in weekly['production_kwh']]
+        cycles = [f'{v:.2f}' for v in cycles_per_week]
+        curtail = [f'{v:.0f} kWh' for v in weekly['curtailment_kwh']]
 
         fig.add_trace(
             go.Table(
@@ -637,17 +640,25 @@ class BatteryOperationReport(PlotlyReportGenerator):
         print(f"  Battery: {self.battery_kwh} kWh / {self.battery_kw} kW")
         print(f"  Time range: {self.df.index[0].date()} to {self.df.index[-1].date()}")
         print(f"  Timesteps: {len(self.df)}")
+        if self.max_points is not None and len(self.df) > self.max_points:
+            print(f"  Downsampled to ~{self.max_points} points per trace"
+                  f"{' (zoom resampling)' if self.zoom_resampling else ''}")
 
         # Create figure
         fig = self._create_figure()
 
+        post_script = None
+        if self._zoom_series:
+            post_script = zoom_resampling_script(self.df.index, self._zoom_series, self.max_points)
+
         # Save using inherited PlotlyReportGenerator method
         html_path = self.save_plotly_figure(
             fig,
             filename=f'battery_operation_{self.period}',
             subdir='reports',
             title=f'Battery Operation Report ({self.period})',
-            export_png=self.export_png
+            export_png=self.export_png,
+            post_script=post_script
         )
 
         return html_path
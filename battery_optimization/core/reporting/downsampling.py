@@ -0,0 +1,270 @@
+"""
+Downsampling and WebGL helpers for dense Plotly timeseries.
+
+A year at PT15M is ~35k points per trace. Browsers cannot resolve more than a
+few points per horizontal pixel, so reports send each trace through
+MinMax-LTTB (Largest-Triangle-Three-Buckets on min/max preselected points)
+sized to a points-per-pixel budget. The global minimum and maximum of every
+trace are always kept, so peaks (which drive the power tariff) survive.
+
+Optional zoom-level resampling embeds the full-resolution series once as
+binary arrays and re-buckets the visible range in the browser on every zoom,
+so zooming into a week shows all native points without a server.
+
+**Usage:**
+    from core.reporting.downsampling import downsample_indices, scatter_class
+
+    idx = downsample_indices(y, n_out=1600, x=timestamps)
+    fig.add_trace(scatter_class(len(idx))(x=timestamps[idx], y=y[idx]))
+
+Reference: S. Steinarsson, "Downsampling Time Series for Visual
+Representation" (2013); J. Van Der Donckt et al., "MinMaxLTTB" (2023).
+"""
+
+import base64
+import json
+from typing import Dict, Optional, Sequence, Type, Union
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+
+# Traces with more points than this are rendered with WebGL
+WEBGL_THRESHOLD = 1000
+
+# Approximate plot-area width of one subplot column in the 2-column reports
+DEFAULT_PLOT_WIDTH_PX = 800
+
+# MinMax preselection keeps this many candidates per output point
+MINMAX_RATIO = 4
+
+
+def point_budget(plot_width_px: int = DEFAULT_PLOT_WIDTH_PX, points_per_pixel: float = 2.0) -> int:
+    """
+    Number of points a trace needs to look identical to the full series.
+
+    Args:
+        plot_width_px: Plot-area width in pixels
+        points_per_pixel: Points per horizontal pixel (2 keeps the min and max
+            of every pixel column)
+
+    Returns:
+        Target points per trace (at least 3)
+    """
+    return max(3, int(plot_width_px * points_per_pixel))
+
+
+def _numeric_x(x: Optional[Sequence], n: int) -> np.ndarray:
+    """x as float64 (datetimes in seconds since the first sample)."""
+    if x is None:
+        return np.arange(n, dtype=float)
+    if isinstance(x, (pd.DatetimeIndex, pd.Series)) or np.issubdtype(np.asarray(x).dtype, np.datetime64):
+        ns = pd.DatetimeIndex(x).asi8
+        return (ns - ns[0]) / 1e9
+    return np.asarray(x, dtype=float)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets point selection.
+
+    Keeps the first and last point and, from each of n_out - 2 equal-count
+    buckets, the point forming the largest triangle with the previously
+    selected point and the average of the next bucket.
+
+    Args:
+        x: Numeric x values (ascending)
+        y: y values
+        n_out: Number of points to keep
+
+    Returns:
+        Sorted indices into x/y
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x = x[hi:edges[i + 2]].mean()
+            next_y = y[hi:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+
+        area = np.abs(
+            (x[a] - next_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
+
+
+def minmax_indices(y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """
+    First and last point plus the min and max of each equal-count bucket.
+
+    Args:
+        y: y values
+        n_buckets: Number of buckets over the interior points
+
+    Returns:
+        Sorted unique indices into y
+    """
+    n = len(y)
+    interior = n - 2
+    if n_buckets <= 0 or interior <= 2 * n_buckets:
+        return np.arange(n)
+
+    size = int(np.ceil(interior / n_buckets))
+    n_buckets = int(np.ceil(interior / size))
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:interior] = y[1:n - 1]
+    blocks = padded.reshape(n_buckets, size)
+
+    offsets = np.arange(n_buckets) * size + 1
+    argmin = np.argmin(np.where(np.isnan(blocks), np.inf, blocks), axis=1) + offsets
+    argmax = np.argmax(np.where(np.isnan(blocks), -np.inf, blocks), axis=1) + offsets
+
+    return np.unique(np.concatenate(([0, n - 1], argmin, argmax)))
+
+
+def downsample_indices(y: Sequence[float], n_out: int, x: Optional[Sequence] = None) -> np.ndarray:
+    """
+    MinMax-LTTB selection that always keeps the global minimum and maximum.
+
+    Args:
+        y: y values
+        n_out: Target number of points (the result may exceed it by the two
+            global extrema)
+        x: Optional x values (numeric or datetime), default: equally spaced
+
+    Returns:
+        Sorted indices into y; all indices if len(y) <= n_out
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= n_out:
+        return np.arange(n)
+
+    x_num = _numeric_x(x, n)
+    candidates = minmax_indices(y, n_out * MINMAX_RATIO // 2)
+    idx = candidates[lttb_indices(x_num[candidates], y[candidates], n_out)]
+
+    finite = np.isfinite(y)
+    if finite.any():
+        extremes = np.flatnonzero(finite)[[np.argmin(y[finite]), np.argmax(y[finite])]]
+        idx = np.union1d(idx, extremes)
+    return idx
+
+
+def scatter_class(n_points: int, threshold: int = WEBGL_THRESHOLD) -> Type[Union[go.Scatter, go.Scattergl]]:
+    """Scattergl for dense traces, Scatter otherwise."""
+    return go.Scattergl if n_points > threshold else go.Scatter
+
+
+def _b64(values: np.ndarray, dtype: str) -> str:
+    return base64.b64encode(np.ascontiguousarray(values, dtype=dtype).tobytes()).decode('ascii')
+
+
+_ZOOM_SCRIPT = """
+(function() {
+    var gd = document.getElementById('{plot_id}');
+    var cfg = __CONFIG__;
+
+    function decode(b64, Type) {
+        var s = atob(b64), bytes = new Uint8Array(s.length);
+        for (var i = 0; i < s.length; i++) bytes[i] = s.charCodeAt(i);
+        return new Type(bytes.buffer);
+    }
+    function toMs(v) {
+        if (typeof v === 'number') return v;
+        var m = String(v).match(/^(\\d{4})-(\\d{2})-(\\d{2})(?:[ T](\\d{2})(?::(\\d{2})(?::(\\d{2}(?:\\.\\d+)?))?)?)?/);
+        var sec = parseFloat(m[6] || '0');
+        return Date.UTC(+m[1], +m[2] - 1, +m[3], +(m[4] || 0), +(m[5] || 0), Math.floor(sec), Math.round((sec % 1) * 1000));
+    }
+    function bisect(v) {
+        var lo = 0, hi = x.length;
+        while (lo < hi) { var mid = (lo + hi) >> 1; if (x[mid] < v) lo = mid + 1; else hi = mid; }
+        return lo;
+    }
+    function resample(y, i0, i1) {
+        var xs = [], ys = [], n = i1 - i0;
+        if (n <= cfg.budget) {
+            for (var i = i0; i < i1; i++) { xs.push(x[i]); ys.push(y[i]); }
+            return [xs, ys];
+        }
+        var buckets = Math.floor(cfg.budget / 2), size = n / buckets;
+        for (var b = 0; b < buckets; b++) {
+            var s = i0 + Math.floor(b * size), e = i0 + Math.floor((b + 1) * size), lo = s, hi = s;
+            for (var j = s; j < e; j++) { if (y[j] < y[lo]) lo = j; if (y[j] > y[hi]) hi = j; }
+            var first = Math.min(lo, hi), last = Math.max(lo, hi);
+            xs.push(x[first]); ys.push(y[first]);
+            if (last !== first) { xs.push(x[last]); ys.push(y[last]); }
+        }
+        return [xs, ys];
+    }
+
+    var x = decode(cfg.x, Float64Array);
+    var traces = cfg.traces.map(function(t) { return {index: t.index, y: decode(t.y, Float32Array)}; });
+
+    gd.on('plotly_relayout', function(event) {
+        var axes = {};
+        Object.keys(event).forEach(function(key) {
+            var m = key.match(/^(xaxis\\d*)\\.(range|autorange)/);
+            if (m) axes[m[1]] = true;
+        });
+        var indices = [], xs = [], ys = [];
+        traces.forEach(function(t) {
+            var axis = 'xaxis' + (gd.data[t.index].xaxis || 'x').slice(1);
+            if (!axes[axis]) return;
+            var layout = gd.layout[axis], i0 = 0, i1 = x.length;
+            if (!layout.autorange && layout.range) {
+                i0 = Math.max(0, bisect(toMs(layout.range[0])) - 1);
+                i1 = Math.min(x.length, bisect(toMs(layout.range[1])) + 1);
+            }
+            var r = resample(t.y, i0, i1);
+            indices.push(t.index); xs.push(r[0]); ys.push(r[1]);
+        });
+        if (indices.length) Plotly.restyle(gd, {x: xs, y: ys}, indices);
+    });
+})();
+"""
+
+
+def zoom_resampling_script(x: pd.DatetimeIndex, series: Dict[int, np.ndarray], n_out: int) -> str:
+    """
+    Plotly post_script that re-buckets traces to the visible x-range on zoom.
+
+    The full-resolution series are embedded once (x as float64 ms, y as
+    float32). On each zoom the visible range is split into n_out / 2 buckets
+    and the min and max of each bucket are shown, so zooming in far enough
+    shows every native point. Double-click (autorange) restores the
+    full-period view.
+
+    Args:
+        x: Shared timestamps of all resampled traces
+        series: Full-resolution y values by trace index in fig.data
+        n_out: Points per trace after each zoom
+
+    Returns:
+        JavaScript for fig.write_html(post_script=...)
+    """
+    timestamps = pd.DatetimeIndex(x)
+    if timestamps.tz is not None:
+        timestamps = timestamps.tz_localize(None)  # Plotly shows wall-clock time
+    x_ms = timestamps.asi8 / 1e6
+
+    config = {
+        'budget': int(n_out),
+        'x': _b64(x_ms, '<f8'),
+        'traces': [{'index': int(i), 'y': _b64(y, '<f4')} for i, y in series.items()],
+    }
+    return _ZOOM_SCRIPT.replace('__CONFIG__', json.dumps(config))
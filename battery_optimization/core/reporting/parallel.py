@@ -0,0 +1,89 @@
+"""
+Parallel report rendering.
+
+Figures of different results are independent, so a report set (e.g. all
+candidates of a sizing sweep) renders in a process pool. Jobs on the same
+result run in the same worker, one after another, so its aggregate cube
+(core.reporting.aggregates) is computed once and reused by every report on
+that result.
+
+**Usage:**
+    from core.reporting.parallel import ReportJob, render_reports
+
+    jobs = [
+        ReportJob('battery_operation', {'result': r, 'output_dir': out, 'period': p})
+        for r in results for p in ('3weeks', '3months')
+    ]
+    paths = render_reports(jobs, max_workers=4)
+"""
+
+import logging
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .aggregates import result_cache_key
+from .factory import ReportFactory
+from .result_models import SimulationResult
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ReportJob:
+    """One report to render: a ReportFactory name and its constructor arguments."""
+    report: str
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def group_key(self) -> str:
+        """Jobs with the same key share a worker (and its aggregate cache)."""
+        result = self.kwargs.get('result')
+        if isinstance(result, SimulationResult):
+            return result_cache_key(result)
+        return f"{self.report}:{id(self)}"
+
+
+def _render_group(jobs: Sequence[Tuple[int, ReportJob]]) -> List[Tuple[int, Path]]:
+    """Worker: render jobs on one result in order."""
+    import core.reporting  # noqa: F401  (registers report classes in spawned workers)
+
+    return [(position, ReportFactory.create(job.report, **job.kwargs).generate())
+            for position, job in jobs]
+
+
+def render_reports(
+    jobs: Sequence[ReportJob],
+    max_workers: Optional[int] = None,
+    parallel: bool = True
+) -> List[Path]:
+    """
+    Render reports, in a process pool when there is more than one result.
+
+    Args:
+        jobs: Reports to render
+        max_workers: Pool size (default: CPU count)
+        parallel: False renders sequentially in this process
+
+    Returns:
+        Paths returned by each report's generate(), in job order
+    """
+    groups: 'OrderedDict[str, List[Tuple[int, ReportJob]]]' = OrderedDict()
+    for position, job in enumerate(jobs):
+        groups.setdefault(job.group_key, []).append((position, job))
+
+    paths: List[Optional[Path]] = [None] * len(jobs)
+    if not parallel or len(groups) < 2 or max_workers == 1:
+        for group in groups.values():
+            for position, path in _render_group(group):
+                paths[position] = path
+        return paths
+
+    logger.info("Rendering %d reports for %d results in parallel", len(jobs), len(groups))
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        for rendered in pool.map(_render_group, groups.values()):
+            for position, path in rendered:
+                paths[position] = path
+    return paths
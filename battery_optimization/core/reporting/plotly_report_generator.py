@@ -160,7 +160,8 @@ class PlotlyReportGenerator(ReportGenerator):
         filename: str,
         subdir: str = '',
         title: Optional[str] = None,
-        export_png: bool = False
+        export_png: bool = False,
+        post_script: Optional[str] = None
     ) -> Path:
         """
         Save Plotly figure as HTML (and optionally PNG).
@@ -173,6 +174,8 @@ class PlotlyReportGenerator(ReportGenerator):
             subdir: Optional subdirectory within reports/ (e.g., 'battery_operation')
             title: Optional figure title (applied if not set)
             export_png: If True, also export PNG via kaleido (requires kaleido package)
+            post_script: Optional JavaScript run after the plot is created
+                ('{plot_id}' is replaced by the div id)
 
         Returns:
             Path to saved HTML file
@@ -210,7 +213,8 @@ class PlotlyReportGenerator(ReportGenerator):
         fig.write_html(
             html_path,
             include_plotlyjs='cdn',  # Lightweight, browser-cached
-            config=self.PLOTLY_CONFIG
+            config=self.PLOTLY_CONFIG,
+            post_script=post_script
         )
 
         # Track for index generation
@@ -476,7 +480,8 @@ class PlotlyReportGenerator(ReportGenerator):
     def create_plotly_index(
         self,
         title: str = "Battery Optimization Interactive Reports",
-        include_thumbnails: bool = False
+        include_thumbnails: bool = False,
+        figures: Optional[List[Path]] = None
     ) -> Path:
         """
         Generate HTML index file linking all Plotly reports.
@@ -484,6 +489,8 @@ class PlotlyReportGenerator(ReportGenerator):
         Args:
             title: Index page title
             include_thumbnails: If True, embed report thumbnails (requires screenshots)
+            figures: HTML files to link (default: figures saved by this generator;
+                pass render_reports() output for reports rendered in parallel)
 
         Returns:
             Path to generated index.html file
@@ -494,6 +501,7 @@ class PlotlyReportGenerator(ReportGenerator):
             ...     include_thumbnails=False
             ... )
         """
+        figures = self.plotly_figures if figures is None else list(figures)
         timestamp_str = self.report_timestamp.strftime('%Y-%m-%d_%H%M%S')
         index_path = self.output_dir / 'reports' / f"{timestamp_str}_index.html"
 
@@ -554,14 +562,14 @@ class PlotlyReportGenerator(ReportGenerator):
     <div class="header">
         <h1>{title}</h1>
         <p><strong>Generated:</strong> {self.report_timestamp.strftime('%Y-%m-%d %H:%M:%S')}</p>
-        <p><strong>Total Reports:</strong> {len(self.plotly_figures)}</p>
+        <p><strong>Total Reports:</strong> {len(figures)}</p>
     </div>
 
     <div class="report-grid">
 """
 
         # Add report cards
-        for fig_path in self.plotly_figures:
+        for fig_path in figures:
             rel_path = fig_path.relative_to(self.output_dir / 'reports')
             report_name = fig_path.stem.replace('_', ' ').title()
             file_size_mb = fig_path.stat().st_size / (1024 * 1024)
@@ -62,18 +62,18 @@ class RepresentativeDatasetGenerator:
         logger.info(f"  Typical days: {self.n_typical}")
         logger.info(f"  Extreme days: {self.n_extreme}")
 
+        # Integer day index per timestep (0 = first day in dataset)
+        day_index, day_starts = pd.factorize(pd.DatetimeIndex(timestamps).normalize())
+
         # Create DataFrame for analysis
         df = pd.DataFrame({
-            'timestamp': timestamps,
+            'day': day_index,
+            'month': day_starts.month[day_index],
             'pv': pv_production,
             'load': load_consumption,
             'spot': spot_prices
         })
 
-        df['date'] = df['timestamp'].dt.date
-        df['month'] = df['timestamp'].dt.month
-        df['hour'] = df['timestamp'].dt.hour
-
         # Select typical days (1 per month)
         typical_days = self._select_typical_days(df)
 
@@ -81,36 +81,38 @@ class RepresentativeDatasetGenerator:
         extreme_days = self._select_extreme_days(df)
 
         # Combine typical and extreme days
-        selected_dates = typical_days + extreme_days
+        selected_days = typical_days + extreme_days
 
-        # Extract data for selected days
-        representative_df = df[df['date'].isin(selected_dates)].copy()
-        # Sort by timestamp (already in index, just sort the DataFrame)
-        representative_df = representative_df.sort_index()
+        # Extract data for selected days (calendar order is preserved)
+        is_selected = np.zeros(len(day_starts), dtype=bool)
+        is_selected[selected_days] = True
+        mask = is_selected[day_index]
 
         # Calculate weights for each day (for annual scaling)
         day_weights = self._calculate_day_weights(typical_days, extreme_days)
 
         # Extract arrays
-        repr_timestamps = pd.DatetimeIndex(representative_df['timestamp'])
-        repr_pv = representative_df['pv'].values
-        repr_load = representative_df['load'].values
-        repr_spot = representative_df['spot'].values
+        repr_timestamps = pd.DatetimeIndex(timestamps)[mask]
+        repr_pv = np.asarray(pv_production)[mask]
+        repr_load = np.asarray(load_consumption)[mask]
+        repr_spot = np.asarray(spot_prices)[mask]
 
         # Metadata
         metadata = {
-            'typical_days': typical_days,
-            'extreme_days': extreme_days,
+            'typical_days': [day_starts[d].date() for d in typical_days],
+            'extreme_days': [day_starts[d].date() for d in extreme_days],
+            'typical_day_indices': typical_days,
+            'extreme_day_indices': extreme_days,
             'day_weights': day_weights,
-            'compression_ratio': len(df) / len(representative_df),
+            'compression_ratio': len(df) / len(repr_timestamps),
             'original_hours': len(df),
-            'representative_hours': len(representative_df),
+            'representative_hours': len(repr_timestamps),
             'typical_weight': 365 / self.n_typical,  # Days per typical day
             'extreme_weight': 1.0  # Extreme days represent only themselves
         }
 
-        logger.info(f"  Selected {len(selected_dates)} days")
-        logger.info(f"  Compression: {len(df)} → {len(representative_df)} hours")
+        logger.info(f"  Selected {len(selected_days)} days")
+        logger.info(f"  Compression: {len(df)} → {len(repr_timestamps)} hours")
         logger.info(f"  Ratio: {metadata['compression_ratio']:.1f}x")
 
         return repr_timestamps, repr_pv, repr_load, repr_spot, metadata
@@ -120,6 +122,9 @@ class RepresentativeDatasetGenerator:
         Select typical/median days for each month.
 
         Strategy: For each month, find day closest to median for all variables.
+
+        Returns:
+            List of integer day indices
         """
         typical_days = []
 
@@ -131,7 +136,7 @@ class RepresentativeDatasetGenerator:
                 continue
 
             # Calculate daily aggregates
-            daily_agg = month_data.groupby('date').agg({
+            daily_agg = month_data.groupby('day').agg({
                 'pv': 'sum',      # Total daily PV production
                 'load': 'sum',    # Total daily consumption
                 'spot': 'mean'    # Average spot price
@@ -156,7 +161,7 @@ class RepresentativeDatasetGenerator:
 
             # Select day with minimum distance to median
             best_day = daily_agg['distance'].idxmin()
-            typical_days.append(best_day)
+            typical_days.append(int(best_day))
 
             logger.debug(f"  Month {month}: Selected {best_day} (distance: {daily_agg.loc[best_day, 'distance']:.3f})")
 
@@ -171,11 +176,14 @@ class RepresentativeDatasetGenerator:
         2. Highest spot price (arbitrage opportunity)
         3. Lowest spot price (charging opportunity)
         4. Highest peak load (peak-shaving opportunity)
+
+        Returns:
+            List of integer day indices
         """
         extreme_days = []
 
         # Calculate daily aggregates
-        daily_agg = df.groupby('date').agg({
+        daily_agg = df.groupby('day').agg({
             'pv': ['sum', 'max'],
             'load': ['sum', 'max', 'mean'],
             'spot': ['mean', 'max', 'min']
@@ -185,9 +193,7 @@ class RepresentativeDatasetGenerator:
         daily_agg.columns = ['_'.join(col).strip() for col in daily_agg.columns.values]
 
         # Calculate curtailment risk proxy (PV production when load is low)
-        daily_curtailment_risk = df.groupby('date').apply(
-            lambda x: ((x['pv'] - x['load']).clip(lower=0)).sum()
-        )
+        daily_curtailment_risk = (df['pv'] - df['load']).clip(lower=0).groupby(df['day']).sum()
 
         # Scenario 1: Highest curtailment risk
         curtailment_day = daily_curtailment_risk.idxmax()
@@ -210,14 +216,14 @@ class RepresentativeDatasetGenerator:
         logger.info(f"  Extreme 4 - Peak load: {peak_load_day} ({daily_agg.loc[peak_load_day, 'load_max']:.1f} kW)")
 
         # Remove duplicates (if same day is extreme in multiple ways)
-        extreme_days = list(set(extreme_days))
+        extreme_days = [int(d) for d in dict.fromkeys(extreme_days)]
 
         # If we lost days due to duplicates, add next-best scenarios
         while len(extreme_days) < self.n_extreme:
             # Add day with highest PV production not already selected
             remaining_days = daily_agg.index.difference(extreme_days)
             next_day = daily_agg.loc[remaining_days, 'pv_max'].idxmax()
-            extreme_days.append(next_day)
+            extreme_days.append(int(next_day))
             logger.info(f"  Extreme {len(extreme_days)} - High PV: {next_day}")
 
         return extreme_days[:self.n_extreme]
@@ -231,8 +237,8 @@ class RepresentativeDatasetGenerator:
         Calculate weights for scaling representative days to annual basis.
 
         Args:
-            typical_days: List of typical day dates
-            extreme_days: List of extreme day dates
+            typical_days: List of typical day indices
+            extreme_days: List of extreme day indices
 
         Returns:
             Dict mapping day type to weight factor
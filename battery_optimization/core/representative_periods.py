@@ -9,9 +9,10 @@ Implements hierarchical compression strategy:
 With temporal aggregation (2h, 4h blocks) for additional speedup.
 """
 
+import hashlib
 import pandas as pd
 import numpy as np
-from typing import Tuple, Dict, List
+from typing import Tuple, Dict, List, Optional
 from datetime import datetime, timedelta
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
@@ -21,14 +22,145 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 from src.config.legacy_config_adapter import get_global_legacy_config
-
-# Create module-level config reference
-config = get_global_legacy_config()
 from core.lp_monthly_optimizer import MonthlyLPOptimizer
+from core.time_aggregation import aggregate_to_blocks
 
 logger = logging.getLogger(__name__)
 
 
+def _steps_per_hour(timestamps: pd.DatetimeIndex) -> int:
+    """Number of samples per hour inferred from the first timestep."""
+    if len(timestamps) < 2:
+        return 1
+    step_hours = (timestamps[1] - timestamps[0]) / pd.Timedelta(hours=1)
+    return max(1, int(round(1 / step_hours)))
+
+
+def _period_features(
+    timestamps: pd.DatetimeIndex,
+    pv: np.ndarray,
+    load: np.ndarray,
+    spot: np.ndarray,
+    period_hours: int
+) -> Tuple[np.ndarray, pd.DatetimeIndex]:
+    """
+    Profile features per period from a single (periods, steps) reshape.
+
+    Works for any regular resolution (PT60M, PT15M, ...); energy-type
+    features are converted to kWh so they do not depend on the step size.
+
+    Args:
+        timestamps: Regular timestamps for the full dataset
+        pv, load, spot: Data arrays aligned with timestamps
+        period_hours: Period length (24 for days, 168 for weeks)
+
+    Returns:
+        (features [n_periods, 10], period start timestamps)
+    """
+    steps_per_hour = _steps_per_hour(timestamps)
+    steps = period_hours * steps_per_hour
+    n_periods = len(timestamps) // steps
+    n_steps = n_periods * steps
+    dt = 1.0 / steps_per_hour
+
+    pv_p = np.asarray(pv[:n_steps], dtype=float).reshape(n_periods, steps)
+    load_p = np.asarray(load[:n_steps], dtype=float).reshape(n_periods, steps)
+    spot_p = np.asarray(spot[:n_steps], dtype=float).reshape(n_periods, steps)
+
+    features = np.column_stack([
+        pv_p.sum(axis=1) * dt,                                # pv_total
+        pv_p.max(axis=1),                                     # pv_peak
+        pv_p.std(axis=1),                                     # pv_variability
+        load_p.mean(axis=1),                                  # load_avg
+        load_p.max(axis=1),                                   # load_peak
+        load_p.std(axis=1),                                   # load_variability
+        spot_p.mean(axis=1),                                  # spot_avg
+        spot_p.max(axis=1),                                   # spot_peak
+        spot_p.std(axis=1),                                   # spot_variability
+        np.maximum(0, pv_p - load_p - 70).sum(axis=1) * dt,   # curtailment_risk
+    ])
+
+    return features, pd.DatetimeIndex(timestamps[:n_steps:steps])
+
+
+def _cluster_periods(features: np.ndarray, n_clusters: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    K-means cluster periods and pick the member closest to each centroid.
+
+    Returns:
+        (representative period indices in calendar order, cluster labels)
+    """
+    features_normalized = StandardScaler().fit_transform(features)
+
+    kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
+    cluster_labels = kmeans.fit_predict(features_normalized)
+
+    # Distance of every period to its own centroid; argmin per cluster
+    distances = np.linalg.norm(
+        features_normalized - kmeans.cluster_centers_[cluster_labels], axis=1
+    )
+    representatives = np.array([
+        np.flatnonzero(cluster_labels == c)[np.argmin(distances[cluster_labels == c])]
+        for c in range(n_clusters)
+    ])
+
+    return np.sort(representatives), cluster_labels
+
+
+class ClusterCache:
+    """
+    On-disk memo of k-means period assignments.
+
+    Clustering only depends on the input year, not on battery size, so
+    sizing studies that re-run the same dataset load the assignment
+    instead of re-clustering. Entries are keyed by a hash of the data
+    plus period type, cluster count and aggregation.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        """
+        Initialize cluster cache.
+
+        Args:
+            cache_dir: Directory for cached assignments (default: data/cluster_cache)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else Path('data/cluster_cache')
+
+    @staticmethod
+    def make_key(
+        timestamps: pd.DatetimeIndex,
+        pv: np.ndarray,
+        load: np.ndarray,
+        spot: np.ndarray,
+        period_type: str,
+        n_clusters: int,
+        aggregation_hours: int
+    ) -> str:
+        """Hash dataset contents and clustering parameters into a cache key."""
+        digest = hashlib.sha256()
+        digest.update(pd.DatetimeIndex(timestamps).asi8.tobytes())
+        for values in (pv, load, spot):
+            digest.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+        digest.update(f"{period_type}|k={n_clusters}|agg={aggregation_hours}".encode())
+        return f"{period_type}_k{n_clusters}_agg{aggregation_hours}_{digest.hexdigest()[:16]}"
+
+    def load(self, key: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Return (representatives, cluster_labels) or None on a cache miss."""
+        cache_file = self.cache_dir / f"{key}.npz"
+        if not cache_file.exists():
+            return None
+
+        with np.load(cache_file) as data:
+            return data['representatives'], data['cluster_labels']
+
+    def store(self, key: str, representatives: np.ndarray, cluster_labels: np.ndarray):
+        """Save a cluster assignment."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        np.savez(self.cache_dir / f"{key}.npz",
+                 representatives=representatives,
+                 cluster_labels=cluster_labels)
+
+
 class TemporalAggregator:
     """Aggregate hourly data to coarser resolution (2h, 4h blocks)"""
 
@@ -69,17 +201,43 @@ class TemporalAggregator:
         load_trunc = load[:n_hours_truncated]
         spot_trunc = spot[:n_hours_truncated]
 
-        # Reshape and aggregate
+        timestamps_agg, pv_agg, load_agg, spot_agg = self.aggregate_blocks(
+            timestamps_trunc, pv_trunc, load_trunc, spot_trunc,
+            np.full(n_blocks, self.agg_hours)
+        )
+
+        logger.info(f"Aggregated {n_hours} hours → {n_blocks} blocks ({self.agg_hours}h each)")
+
+        return timestamps_agg, pv_agg, load_agg, spot_agg
+
+    @staticmethod
+    def aggregate_blocks(
+        timestamps: pd.DatetimeIndex,
+        pv: np.ndarray,
+        load: np.ndarray,
+        spot: np.ndarray,
+        block_lengths: np.ndarray
+    ) -> Tuple[pd.DatetimeIndex, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Aggregate data into blocks of varying length.
+
+        Args:
+            timestamps: Native-resolution timestamps
+            pv, load, spot: Native-resolution data arrays
+            block_lengths: Timesteps per block (e.g. from coarsening_block_lengths)
+
+        Returns:
+            Aggregated (timestamps, pv, load, spot), one entry per block
+        """
         # For power: average (represents average kW during block)
         # For spot price: average
-        pv_agg = pv_trunc.reshape(n_blocks, self.agg_hours).mean(axis=1)
-        load_agg = load_trunc.reshape(n_blocks, self.agg_hours).mean(axis=1)
-        spot_agg = spot_trunc.reshape(n_blocks, self.agg_hours).mean(axis=1)
+        pv_agg = aggregate_to_blocks(pv, block_lengths)
+        load_agg = aggregate_to_blocks(load, block_lengths)
+        spot_agg = aggregate_to_blocks(spot, block_lengths)
 
         # Timestamps: use start of each block
-        timestamps_agg = timestamps_trunc[::self.agg_hours]
-
-        logger.info(f"Aggregated {n_hours} hours → {n_blocks} blocks ({self.agg_hours}h each)")
+        starts = np.concatenate([[0], np.cumsum(block_lengths)[:-1]])
+        timestamps_agg = timestamps[starts]
 
         return timestamps_agg, pv_agg, load_agg, spot_agg
 
@@ -98,7 +256,10 @@ class RepresentativeDaysOptimizer:
         self,
         n_representative_days: int = 25,
         aggregation_hours: int = 2,
-        linking_type: str = 'hard'
+        linking_type: str = 'hard',
+        cache_dir: Optional[Path] = None,
+        use_cache: bool = True,
+        config=None
     ):
         """
         Initialize representative days optimizer.
@@ -107,11 +268,16 @@ class RepresentativeDaysOptimizer:
             n_representative_days: Number of representative days (20-30 recommended)
             aggregation_hours: Temporal aggregation (1, 2, 4 hours)
             linking_type: 'hard' (equality constraint) or 'soft' (penalty)
+            cache_dir: Directory for memoized cluster assignments
+            use_cache: Reuse cluster assignments across runs on the same data
+            config: Legacy system config for the LP (default: shared default config)
         """
         self.n_days = n_representative_days
         self.aggregator = TemporalAggregator(aggregation_hours)
         self.linking_type = linking_type
         self.agg_hours = aggregation_hours
+        self.cache = ClusterCache(cache_dir) if use_cache else None
+        self.config = config if config is not None else get_global_legacy_config()
 
     def select_representative_days(
         self,
@@ -124,91 +290,47 @@ class RepresentativeDaysOptimizer:
         Select representative days using k-means clustering.
 
         Args:
-            timestamps: Full year hourly timestamps
-            pv, load, spot: Full year hourly data
+            timestamps: Full year timestamps (hourly or finer, regular)
+            pv, load, spot: Full year data
 
         Returns:
             (representative_day_indices, cluster_labels, metadata)
         """
         logger.info(f"Selecting {self.n_days} representative days from 365 days...")
 
-        # Create daily features
-        n_hours = len(timestamps)
-        n_days = n_hours // 24
-
-        daily_features = []
-        day_indices = []
-
-        for day_idx in range(n_days):
-            start_h = day_idx * 24
-            end_h = (day_idx + 1) * 24
-
-            if end_h > n_hours:
-                break
-
-            pv_day = pv[start_h:end_h]
-            load_day = load[start_h:end_h]
-            spot_day = spot[start_h:end_h]
-
-            ts_day = timestamps[start_h]
-
-            # Feature vector for this day
-            features = {
-                'pv_total': pv_day.sum(),
-                'pv_peak': pv_day.max(),
-                'pv_variability': pv_day.std(),
-                'load_avg': load_day.mean(),
-                'load_peak': load_day.max(),
-                'load_variability': load_day.std(),
-                'spot_avg': spot_day.mean(),
-                'spot_peak': spot_day.max(),
-                'spot_variability': spot_day.std(),
-                'curtailment_risk': np.maximum(0, pv_day - load_day - 70).sum(),
-                'is_weekend': ts_day.weekday() >= 5,
-                'month': ts_day.month,
-                'day_of_year': ts_day.dayofyear
-            }
-
-            daily_features.append(list(features.values()))
-            day_indices.append(day_idx)
+        n_days = len(timestamps) // (24 * _steps_per_hour(timestamps))
 
-        # Normalize features
-        features_array = np.array(daily_features)
-        scaler = StandardScaler()
-        features_normalized = scaler.fit_transform(features_array)
-
-        # K-means clustering
-        kmeans = KMeans(n_clusters=self.n_days, random_state=42, n_init=10)
-        cluster_labels = kmeans.fit_predict(features_normalized)
-
-        # Select representative day from each cluster (closest to centroid)
-        representative_days = []
-        cluster_sizes = []
+        cache_key = None
+        cached = None
+        if self.cache is not None:
+            cache_key = ClusterCache.make_key(
+                timestamps, pv, load, spot, 'days', self.n_days, self.agg_hours
+            )
+            cached = self.cache.load(cache_key)
 
-        for cluster_id in range(self.n_days):
-            cluster_mask = cluster_labels == cluster_id
-            cluster_indices = np.where(cluster_mask)[0]
+        if cached is not None:
+            representatives, cluster_labels = cached
+            logger.info(f"  Loaded cluster assignment from cache ({cache_key})")
+        else:
+            # Daily profile features plus calendar features
+            features, day_starts = _period_features(timestamps, pv, load, spot, 24)
+            features = np.column_stack([
+                features,
+                day_starts.weekday >= 5,      # is_weekend
+                day_starts.month,
+                day_starts.dayofyear
+            ])
 
-            # Find day closest to cluster centroid
-            centroid = kmeans.cluster_centers_[cluster_id]
-            distances = np.linalg.norm(
-                features_normalized[cluster_mask] - centroid,
-                axis=1
-            )
-            closest_idx = cluster_indices[np.argmin(distances)]
+            representatives, cluster_labels = _cluster_periods(features, self.n_days)
 
-            representative_days.append(day_indices[closest_idx])
-            cluster_sizes.append(len(cluster_indices))
+            if self.cache is not None:
+                self.cache.store(cache_key, representatives, cluster_labels)
 
-        # Sort in calendar order for linking
-        representative_days.sort()
+        representative_days = [int(d) for d in representatives]
 
-        # Compute cluster weights (how many days each representative represents)
-        day_weights = np.zeros(len(representative_days))
-        for i, day_idx in enumerate(representative_days):
-            # Find which cluster this day belongs to
-            cluster_id = np.where(cluster_labels == cluster_labels[day_idx])[0]
-            day_weights[i] = cluster_sizes[cluster_labels[day_idx]]
+        # Cluster weights (how many days each representative represents)
+        cluster_sizes = np.bincount(cluster_labels, minlength=self.n_days)
+        day_weights = cluster_sizes[cluster_labels[representatives]].astype(float)
 
         metadata = {
             'representative_days': representative_days,
@@ -232,7 +354,8 @@ class RepresentativeDaysOptimizer:
         load: np.ndarray,
         spot: np.ndarray,
         battery_kwh: float,
-        battery_kw: float
+        battery_kw: float,
+        selection: Optional[Tuple[List[int], np.ndarray, Dict]] = None
     ) -> Dict:
         """
         Run LP optimization on representative days with linking.
@@ -240,6 +363,8 @@ class RepresentativeDaysOptimizer:
         Args:
             timestamps, pv, load, spot: Full year data
             battery_kwh, battery_kw: Battery configuration
+            selection: Output of select_representative_days() to reuse across
+                battery sizes (clustered here if None)
 
         Returns:
             Results dict with annual_savings, breakeven_cost, etc.
@@ -250,10 +375,10 @@ class RepresentativeDaysOptimizer:
         logger.info(f"Aggregation: {self.agg_hours}h blocks")
         logger.info("="*80)
 
-        # Step 1: Select representative days
-        rep_days, cluster_labels, metadata = self.select_representative_days(
-            timestamps, pv, load, spot
-        )
+        # Step 1: Select representative days (independent of battery size)
+        if selection is None:
+            selection = self.select_representative_days(timestamps, pv, load, spot)
+        rep_days, cluster_labels, metadata = selection
 
         # Step 2: Extract and aggregate data for representative days
         rep_data = []
@@ -289,12 +414,16 @@ class RepresentativeDaysOptimizer:
         logger.info(f"Expected speedup: ~{metadata['compression_ratio'] * (1/self.agg_hours):.1f}x")
 
         # Step 4: Run LP optimization
-        # Note: For now, we don't explicitly add linking constraints in the LP
-        # The linking happens implicitly through the concatenated time series
-        # For "hard" linking, we'd need to modify the LP optimizer
+        # Each timestep is weighted by the number of days its cluster represents.
+        # The single P_peak stands for a typical month, so weights are expressed
+        # per month (÷12) to keep energy vs power tariff balanced as in monthly LP.
+        # "hard" linking: every representative day is SOC-neutral.
+        timesteps_per_day = 24 // self.agg_hours
+        day_scale = 365 / np.sum(metadata['day_weights'])
+        timestep_weights = np.repeat(metadata['day_weights'] * day_scale / 12, timesteps_per_day)
 
         optimizer = MonthlyLPOptimizer(
-            config,
+            self.config,
             resolution='PT60M',  # Will be adjusted by aggregation
             battery_kwh=battery_kwh,
             battery_kw=battery_kw
@@ -309,11 +438,13 @@ class RepresentativeDaysOptimizer:
             load_consumption=all_load,
             spot_prices=all_spot,
             timestamps=all_timestamps,
-            E_initial=battery_kwh * 0.5
+            E_initial=battery_kwh * 0.5,
+            timestep_weights=timestep_weights,
+            period_length=timesteps_per_day if self.linking_type == 'hard' else None
         )
 
-        if result.status != 'optimal':
-            logger.warning(f"Optimization failed: {result.status}")
+        if not result.success:
+            logger.warning(f"Optimization failed: {result.message}")
             return {
                 'status': 'failed',
                 'annual_savings': 0,
@@ -321,17 +452,11 @@ class RepresentativeDaysOptimizer:
             }
 
         # Step 5: Scale to annual
-        # Energy cost scales linearly with represented days
-        # Power cost is monthly, so multiply by 12
-
-        timesteps_per_day = 24 // self.agg_hours
-        n_days_represented = len(all_timestamps) // timesteps_per_day
-
-        scale_factor = 365 / n_days_represented
-
-        annual_energy_cost = result.energy_cost * scale_factor
+        # Costs are already weighted to one typical month → multiply by 12
+        annual_energy_cost = result.energy_cost * 12
         annual_power_cost = result.power_cost * 12  # Monthly → Annual
-        annual_total_cost = annual_energy_cost + annual_power_cost
+        annual_degradation_cost = result.degradation_cost * 12
+        annual_total_cost = annual_energy_cost + annual_power_cost + annual_degradation_cost
 
         logger.info(f"\n✓ Optimization complete")
         logger.info(f"  Energy cost: {annual_energy_cost:,.0f} kr/år")
@@ -342,6 +467,7 @@ class RepresentativeDaysOptimizer:
             'status': 'optimal',
             'annual_energy_cost': annual_energy_cost,
             'annual_power_cost': annual_power_cost,
+            'annual_degradation_cost': annual_degradation_cost,
             'annual_total_cost': annual_total_cost,
             'peak_power_kw': result.P_peak,
             'metadata': metadata,
@@ -364,7 +490,10 @@ class RepresentativeWeeksOptimizer:
         self,
         n_representative_weeks: int = 12,
         aggregation_hours: int = 2,
-        linking_type: str = 'hard'
+        linking_type: str = 'hard',
+        cache_dir: Optional[Path] = None,
+        use_cache: bool = True,
+        config=None
     ):
         """
         Initialize representative weeks optimizer.
@@ -373,11 +502,16 @@ class RepresentativeWeeksOptimizer:
             n_representative_weeks: Number of representative weeks (10-15 recommended)
             aggregation_hours: Temporal aggregation (1, 2, 4 hours)
             linking_type: 'hard' (equality constraint) or 'soft' (penalty)
+            cache_dir: Directory for memoized cluster assignments
+            use_cache: Reuse cluster assignments across runs on the same data
+            config: Legacy system config for the LP (default: shared default config)
         """
         self.n_weeks = n_representative_weeks
         self.aggregator = TemporalAggregator(aggregation_hours)
         self.linking_type = linking_type
         self.agg_hours = aggregation_hours
+        self.cache = ClusterCache(cache_dir) if use_cache else None
+        self.config = config if config is not None else get_global_legacy_config()
 
     def select_representative_weeks(
         self,
@@ -390,88 +524,46 @@ class RepresentativeWeeksOptimizer:
         Select representative weeks using k-means clustering.
 
         Args:
-            timestamps: Full year hourly timestamps
-            pv, load, spot: Full year hourly data
+            timestamps: Full year timestamps (hourly or finer, regular)
+            pv, load, spot: Full year data
 
         Returns:
             (representative_week_indices, cluster_labels, metadata)
         """
         logger.info(f"Selecting {self.n_weeks} representative weeks from 52 weeks...")
 
-        # Create weekly features
-        n_hours = len(timestamps)
-        n_weeks = n_hours // 168  # 168 hours per week
-
-        weekly_features = []
-        week_indices = []
-
-        for week_idx in range(n_weeks):
-            start_h = week_idx * 168
-            end_h = (week_idx + 1) * 168
-
-            if end_h > n_hours:
-                break
-
-            pv_week = pv[start_h:end_h]
-            load_week = load[start_h:end_h]
-            spot_week = spot[start_h:end_h]
-
-            ts_week_start = timestamps[start_h]
-
-            # Feature vector for this week
-            features = {
-                'pv_total': pv_week.sum(),
-                'pv_peak': pv_week.max(),
-                'pv_variability': pv_week.std(),
-                'load_avg': load_week.mean(),
-                'load_peak': load_week.max(),
-                'load_variability': load_week.std(),
-                'spot_avg': spot_week.mean(),
-                'spot_peak': spot_week.max(),
-                'spot_variability': spot_week.std(),
-                'curtailment_risk': np.maximum(0, pv_week - load_week - 70).sum(),
-                'month': ts_week_start.month,
-                'week_of_year': ts_week_start.isocalendar()[1]
-            }
-
-            weekly_features.append(list(features.values()))
-            week_indices.append(week_idx)
-
-        # Normalize features
-        features_array = np.array(weekly_features)
-        scaler = StandardScaler()
-        features_normalized = scaler.fit_transform(features_array)
+        n_weeks = len(timestamps) // (168 * _steps_per_hour(timestamps))
 
-        # K-means clustering
-        kmeans = KMeans(n_clusters=self.n_weeks, random_state=42, n_init=10)
-        cluster_labels = kmeans.fit_predict(features_normalized)
-
-        # Select representative week from each cluster
-        representative_weeks = []
-        cluster_sizes = []
+        cache_key = None
+        cached = None
+        if self.cache is not None:
+            cache_key = ClusterCache.make_key(
+                timestamps, pv, load, spot, 'weeks', self.n_weeks, self.agg_hours
+            )
+            cached = self.cache.load(cache_key)
 
-        for cluster_id in range(self.n_weeks):
-            cluster_mask = cluster_labels == cluster_id
-            cluster_indices = np.where(cluster_mask)[0]
+        if cached is not None:
+            representatives, cluster_labels = cached
+            logger.info(f"  Loaded cluster assignment from cache ({cache_key})")
+        else:
+            # Weekly profile features plus calendar features
+            features, week_starts = _period_features(timestamps, pv, load, spot, 168)
+            features = np.column_stack([
+                features,
+                week_starts.month,
+                week_starts.isocalendar().week.to_numpy()
+            ])
 
-            # Find week closest to cluster centroid
-            centroid = kmeans.cluster_centers_[cluster_id]
-            distances = np.linalg.norm(
-                features_normalized[cluster_mask] - centroid,
-                axis=1
-            )
-            closest_idx = cluster_indices[np.argmin(distances)]
+            representatives, cluster_labels = _cluster_periods(features, self.n_weeks)
 
-            representative_weeks.append(week_indices[closest_idx])
-            cluster_sizes.append(len(cluster_indices))
+            if self.cache is not None:
+                self.cache.store(cache_key, representatives, cluster_labels)
 
-        # Sort in calendar order
-        representative_weeks.sort()
+        representative_weeks = [int(w) for w in representatives]
 
         # Compute weights
-        week_weights = np.zeros(len(representative_weeks))
-        for i, week_idx in enumerate(representative_weeks):
-            week_weights[i] = cluster_sizes[cluster_labels[week_idx]]
+        cluster_sizes = np.bincount(cluster_labels, minlength=self.n_weeks)
+        week_weights = cluster_sizes[cluster_labels[representatives]].astype(float)
 
         metadata = {
             'representative_weeks': representative_weeks,
@@ -495,7 +587,8 @@ class RepresentativeWeeksOptimizer:
         load: np.ndarray,
         spot: np.ndarray,
         battery_kwh: float,
-        battery_kw: float
+        battery_kw: float,
+        selection: Optional[Tuple[List[int], np.ndarray, Dict]] = None
     ) -> Dict:
         """
         Run LP optimization on representative weeks with linking.
@@ -503,6 +596,8 @@ class RepresentativeWeeksOptimizer:
         Args:
             timestamps, pv, load, spot: Full year data
             battery_kwh, battery_kw: Battery configuration
+            selection: Output of select_representative_weeks() to reuse across
+                battery sizes (clustered here if None)
 
         Returns:
             Results dict with annual_savings, breakeven_cost, etc.
@@ -513,10 +608,10 @@ class RepresentativeWeeksOptimizer:
         logger.info(f"Aggregation: {self.agg_hours}h blocks")
         logger.info("="*80)
 
-        # Step 1: Select representative weeks
-        rep_weeks, cluster_labels, metadata = self.select_representative_weeks(
-            timestamps, pv, load, spot
-        )
+        # Step 1: Select representative weeks (independent of battery size)
+        if selection is None:
+            selection = self.select_representative_weeks(timestamps, pv, load, spot)
+        rep_weeks, cluster_labels, metadata = selection
 
         # Step 2: Extract and aggregate data
         rep_data = []
@@ -552,8 +647,13 @@ class RepresentativeWeeksOptimizer:
         logger.info(f"Expected speedup: ~{metadata['compression_ratio'] * (1/self.agg_hours):.1f}x")
 
         # Step 4: Run LP
+        # Weighted per typical month (see RepresentativeDaysOptimizer.optimize)
+        timesteps_per_week = 168 // self.agg_hours
+        week_scale = (365 / 7) / np.sum(metadata['week_weights'])
+        timestep_weights = np.repeat(metadata['week_weights'] * week_scale / 12, timesteps_per_week)
+
         optimizer = MonthlyLPOptimizer(
-            config,
+            self.config,
             resolution='PT60M',
             battery_kwh=battery_kwh,
             battery_kw=battery_kw
@@ -567,11 +667,13 @@ class RepresentativeWeeksOptimizer:
             load_consumption=all_load,
             spot_prices=all_spot,
             timestamps=all_timestamps,
-            E_initial=battery_kwh * 0.5
+            E_initial=battery_kwh * 0.5,
+            timestep_weights=timestep_weights,
+            period_length=timesteps_per_week if self.linking_type == 'hard' else None
         )
 
-        if result.status != 'optimal':
-            logger.warning(f"Optimization failed: {result.status}")
+        if not result.success:
+            logger.warning(f"Optimization failed: {result.message}")
             return {
                 'status': 'failed',
                 'annual_savings': 0,
@@ -579,14 +681,10 @@ class RepresentativeWeeksOptimizer:
             }
 
         # Step 5: Scale to annual
-        timesteps_per_week = 168 // self.agg_hours
-        n_weeks_represented = len(all_timestamps) // timesteps_per_week
-
-        scale_factor = 52 / n_weeks_represented
-
-        annual_energy_cost = result.energy_cost * scale_factor
+        annual_energy_cost = result.energy_cost * 12
         annual_power_cost = result.power_cost * 12
-        annual_total_cost = annual_energy_cost + annual_power_cost
+        annual_degradation_cost = result.degradation_cost * 12
+        annual_total_cost = annual_energy_cost + annual_power_cost + annual_degradation_cost
 
         logger.info(f"\n✓ Optimization complete")
         logger.info(f"  Energy cost: {annual_energy_cost:,.0f} kr/år")
@@ -597,6 +695,7 @@ class RepresentativeWeeksOptimizer:
             'status': 'optimal',
             'annual_energy_cost': annual_energy_cost,
             'annual_power_cost': annual_power_cost,
+            'annual_degradation_cost': annual_degradation_cost,
             'annual_total_cost': annual_total_cost,
             'peak_power_kw': result.P_peak,
             'metadata': metadata,
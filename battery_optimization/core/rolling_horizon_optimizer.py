@@ -16,11 +16,14 @@ Key differences from Monthly LP:
 4. Designed for frequent re-optimization (every 15-60 min)
 """
 
+import logging
+
 import numpy as np
 import pandas as pd
-from scipy.optimize import linprog
-from typing import Optional
-from dataclasses import dataclass
+from scipy.optimize import OptimizeResult, linprog
+from scipy import sparse
+from typing import Optional, Dict, Sequence, Tuple
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
 
 # Import state manager for peak penalty calculation
@@ -28,6 +31,14 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 from src.operational.state_manager import BatterySystemState
+from core.time_aggregation import coarsening_block_lengths, aggregate_to_blocks
+from core.solve_profile import PhaseTimer, SolveTimings
+from core.step_tariff import (
+    bracket_caps, cheapest_bracket, solve_brackets, step_tariff_cost, validate_tariff_mode
+)
+from core.window_pruning import progressive_tariff_fill, prune_window
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -67,6 +78,25 @@ class RollingHorizonResult:
     message: str
     solve_time_seconds: float
 
+    # Dual values per constraint block (only when optimize_window(return_duals=True))
+    duals: Optional[Dict[str, np.ndarray]] = None
+
+    # Duration of each step [hours]; non-uniform when the horizon is coarsened
+    timestep_hours: Optional[np.ndarray] = None
+
+    # Per-phase timings, model size and HiGHS iterations of this solve
+    timings: Optional[SolveTimings] = None
+
+    # Set when the series are truncated (see head()): full horizon length and final energy
+    horizon_steps: Optional[int] = None
+    final_energy_kwh: Optional[float] = None
+
+    # Adaptive peak penalty coefficient of this window [NOK/kW] (diagnostic, not in the LP)
+    adaptive_peak_penalty: Optional[float] = None
+
+    # True when the LP was skipped and the schedule built by core.window_pruning
+    pruned: bool = False
+
     # Next control action (first timestep only)
     @property
     def next_battery_setpoint_kw(self) -> float:
@@ -76,8 +106,83 @@ class RollingHorizonResult:
     @property
     def E_battery_final(self) -> float:
         """Final battery SOC at end of optimization horizon."""
+        if self.final_energy_kwh is not None:
+            return self.final_energy_kwh
         return self.E_battery[-1]
 
+    def head(self, n_steps: int) -> "RollingHorizonResult":
+        """
+        Result with only the first n_steps of each series.
+
+        E_battery keeps n_steps + 1 entries (the energy after the last kept
+        step); cost scalars still cover the full horizon. The kept entries are
+        copied, so the full LP solution vector can be freed.
+        """
+        def first(values: Optional[np.ndarray], n: int = n_steps) -> Optional[np.ndarray]:
+            return None if values is None else values[:n].copy()
+
+        return replace(
+            self,
+            P_charge=first(self.P_charge),
+            P_discharge=first(self.P_discharge),
+            P_grid_import=first(self.P_grid_import),
+            P_grid_export=first(self.P_grid_export),
+            E_battery=first(self.E_battery, n_steps + 1),
+            P_curtail=first(self.P_curtail),
+            E_delta_pos=first(self.E_delta_pos),
+            E_delta_neg=first(self.E_delta_neg),
+            DOD_abs=first(self.DOD_abs),
+            DP_cyc=first(self.DP_cyc),
+            DP_total=first(self.DP_total),
+            timestep_hours=first(self.timestep_hours),
+            horizon_steps=len(self.P_charge),
+            final_energy_kwh=float(self.E_battery_final) if len(self.E_battery) else None,
+        )
+
+
+@dataclass
+class ScenarioHorizonResult:
+    """Results from scenario-based (two-stage stochastic) optimization."""
+    # Per-scenario recourse schedules, shape (S, T)
+    P_charge: np.ndarray          # Charging power [kW]
+    P_discharge: np.ndarray       # Discharging power [kW]
+    P_grid_import: np.ndarray     # Grid import [kW]
+    P_grid_export: np.ndarray     # Grid export [kW]
+    E_battery: np.ndarray         # Battery energy [kWh]
+    P_curtail: np.ndarray         # Solar curtailment [kW]
+    DP_total: np.ndarray          # Total degradation [%]
+
+    weights: np.ndarray           # Normalized scenario probabilities, shape (S,)
+    P_monthly_peak_new: np.ndarray  # Monthly peak per scenario [kW] (equal if shared)
+
+    # Expected costs over scenarios [NOK]
+    objective_value: float        # Energy + degradation + progressive peak penalty
+    energy_cost: float
+    peak_penalty_cost: float      # Progressive tariff increase over current peak
+    peak_penalty_actual: float    # Step function tariff increase over current peak
+    degradation_cost: float
+    scenario_energy_cost: np.ndarray  # Energy cost per scenario, shape (S,)
+
+    # Status
+    success: bool
+    message: str
+    solve_time_seconds: float
+
+    # Duration of each step [hours]
+    timestep_hours: Optional[np.ndarray] = None
+
+    # Per-phase timings, model size and HiGHS iterations of this solve
+    timings: Optional[SolveTimings] = None
+
+    @property
+    def n_scenarios(self) -> int:
+        return len(self.weights)
+
+    @property
+    def next_battery_setpoint_kw(self) -> float:
+        """Non-anticipative battery setpoint for the next timestep."""
+        return self.P_charge[0, 0] - self.P_discharge[0, 0]
+
 
 class RollingHorizonOptimizer:
     """
@@ -89,9 +194,36 @@ class RollingHorizonOptimizer:
     - Variables: P_charge, P_discharge, P_grid_import, P_grid_export, E_battery, P_curtail, P_peak_violation
     - Objective: minimize (energy_cost + adaptive_peak_penalty × peak_violations)
     - Constraints: energy balance, battery dynamics, SOC limits, power limits, grid limits
+
+    With compact=True the degradation chain is substituted into the LP
+    (see _solve_compact), giving the same optimum with about half the
+    variables and rows.
+
+    With a coarsening schedule the horizon keeps the native resolution near
+    term and uses longer blocks further ahead, e.g. [(6, 1), (48, 4)] gives
+    15-min steps for 6h, hourly steps to 48h and 4h blocks to the end. Only
+    the first step is executed, so it is always at native resolution.
+
+    With tariff_mode='exact' the step-function power tariff is optimized
+    exactly: one compact LP per reachable tariff bracket with the peak capped
+    at the bracket edge, solved concurrently (see core.step_tariff), and the
+    cheapest schedule under the billed step cost wins.
+
+    optimize_scenarios() solves the same problem over S weighted forecast
+    scenarios in one LP: the first battery setpoint is shared, everything
+    after it (including the monthly peak) is per-scenario recourse.
+
+    With prune_windows=True, windows where storing energy cannot pay and no
+    new monthly peak is at stake skip the LP: their optimal schedule (spend
+    the stored energy where it is worth most) is built directly, see
+    core.window_pruning.
     """
 
-    def __init__(self, config, battery_kwh: float = None, battery_kw: float = None, horizon_hours: int = 24, resolution: str = 'PT15M'):
+    def __init__(self, config, battery_kwh: float = None, battery_kw: float = None, horizon_hours: int = 24,
+                 resolution: str = 'PT15M', compact: bool = False,
+                 coarsening: Optional[Sequence[Tuple[float, float]]] = None,
+                 tariff_mode: str = 'progressive', tariff_workers: Optional[int] = None,
+                 prune_windows: bool = False):
         """
         Initialize rolling horizon optimizer.
 
@@ -101,8 +233,25 @@ class RollingHorizonOptimizer:
             battery_kw: Battery power rating [kW] (overrides config)
             horizon_hours: Optimization horizon length in hours (default 24, supports 168 for weekly)
             resolution: Time resolution - 'PT60M' (hourly) or 'PT15M' (15-minute, default)
+            compact: Use the reduced sparse LP formulation (identical optimum)
+            coarsening: Ascending (start_hour, block_hours) breakpoints for a
+                variable-step horizon (None = native resolution throughout)
+            tariff_mode: 'progressive' (bracket fill approximation, one LP) or
+                'exact' (step-function tariff, one LP per candidate bracket)
+            tariff_workers: Threads for the bracket LPs in exact mode
+                (default: one per bracket, 1 = sequential)
+            prune_windows: Skip the LP for windows whose optimum needs no solver
+                (same optimal cost; results are marked pruned)
         """
         self.config = config
+        self.compact = compact
+        self.prune_windows = prune_windows
+        self.coarsening = [tuple(b) for b in coarsening] if coarsening else None
+        self.tariff_mode = validate_tariff_mode(tariff_mode)
+        self.tariff_workers = tariff_workers
+
+        # Scenario LP constraint matrices, reused while (S, Δt) is unchanged
+        self._scenario_lp = None
 
         # Validate resolution
         if resolution not in ['PT60M', 'PT15M']:
@@ -116,13 +265,6 @@ class RollingHorizonOptimizer:
         self.horizon_hours = horizon_hours
         self.T = int(horizon_hours / self.timestep_hours)  # Number of timesteps
 
-        print(f"\n{'='*70}")
-        print(f"Rolling Horizon Optimizer")
-        print(f"{'='*70}")
-        print(f"  Horizon: {self.horizon_hours} hours")
-        print(f"  Resolution: {self.resolution} ({self.timestep_hours} hours)")
-        print(f"  Timesteps: {self.T}")
-
         # Battery parameters
         if battery_kwh is not None:
             self.E_nom = battery_kwh
@@ -160,6 +302,7 @@ class RollingHorizonOptimizer:
         tariff_config = config.tariff if hasattr(config, 'tariff') else None
         if tariff_config and hasattr(tariff_config, 'power_brackets'):
             brackets = tariff_config.power_brackets
+            self.power_brackets = [tuple(b) for b in brackets]
             self.N_trinn = len(brackets)
             self.p_trinn = []
             self.c_trinn = []
@@ -181,6 +324,7 @@ class RollingHorizonOptimizer:
         else:
             # Fallback: simple single-bracket tariff
             self.N_trinn = 1
+            self.power_brackets = [(0.0, float('inf'), 50.0)]
             self.p_trinn = np.array([100.0])  # Single 100 kW bracket
             self.c_trinn = np.array([50.0])   # 50 NOK/kW/month default
 
@@ -207,12 +351,20 @@ class RollingHorizonOptimizer:
         else:
             self.battery_cost_nok_per_kwh = 3054  # NOK/kWh (Skanbatt default)
 
-        print(f"  Battery: {self.E_nom:.1f} kWh, {self.P_max_charge:.1f} kW")
-        print(f"  SOC limits: [{self.SOC_min*100:.0f}%, {self.SOC_max*100:.0f}%]")
-        print(f"  Grid limits: Import {self.P_grid_import_limit:.0f} kW, Export {self.P_grid_export_limit:.0f} kW")
-        print(f"  Power tariff: {self.N_trinn} brackets")
-        print(f"  Degradation: LFP model (ρ={self.rho_constant:.6f}%/cycle, cal={self.dp_cal_per_hour:.8f}%/hour)")
-        print(f"{'='*70}\n")
+        # Constructed per candidate in sizing sweeps: keep the summary at DEBUG
+        if logger.isEnabledFor(logging.DEBUG):
+            n_steps = (len(coarsening_block_lengths(self.T, self.timestep_hours, self.coarsening))
+                       if self.coarsening else self.T)
+            logger.debug(
+                "Rolling horizon optimizer: %dh horizon at %s (%d timesteps, %d LP steps), %s formulation; "
+                "battery %.1f kWh / %.1f kW, SOC [%.0f%%, %.0f%%]; grid import %.0f kW, export %.0f kW; "
+                "%d tariff brackets; degradation rho=%.6f%%/cycle, calendar %.8f%%/hour",
+                self.horizon_hours, self.resolution, self.T, n_steps,
+                'compact' if self.compact else 'full',
+                self.E_nom, self.P_max_charge, self.SOC_min * 100, self.SOC_max * 100,
+                self.P_grid_import_limit, self.P_grid_export_limit,
+                self.N_trinn, self.rho_constant, self.dp_cal_per_hour
+            )
 
     def get_energy_costs(self, timestamps: pd.DatetimeIndex, spot_prices: np.ndarray):
         """
@@ -357,7 +509,8 @@ class RollingHorizonOptimizer:
 
         return np.array(A_eq_rows), np.array(b_eq_rows)
 
-    def _build_degradation_inequality_constraints(self, T: int, n_vars: int) -> tuple:
+    def _build_degradation_inequality_constraints(self, T: int, n_vars: int,
+                                                  dp_cal: Optional[np.ndarray] = None) -> tuple:
         """
         Build degradation inequality constraints for LP formulation.
 
@@ -370,10 +523,14 @@ class RollingHorizonOptimizer:
         Args:
             T: Number of timesteps
             n_vars: Total number of LP variables
+            dp_cal: Calendar degradation per step [%] (default: dp_cal_per_timestep)
 
         Returns:
             (A_ub_degradation, b_ub_degradation): Constraint matrix and RHS vector
         """
+        if dp_cal is None:
+            dp_cal = np.full(T, self.dp_cal_per_timestep)
+
         A_ub_rows = []
         b_ub_rows = []
 
@@ -392,17 +549,373 @@ class RollingHorizonOptimizer:
             row = np.zeros(n_vars)
             row[10*T + t] = -1.0  # -DP_total[t]
             A_ub_rows.append(row)
-            b_ub_rows.append(-self.dp_cal_per_timestep)
+            b_ub_rows.append(-dp_cal[t])
 
         return np.array(A_ub_rows), np.array(b_ub_rows)
 
+    def _solve_compact(self,
+                       T: int,
+                       c_import: np.ndarray,
+                       c_export: np.ndarray,
+                       pv_production: np.ndarray,
+                       load_consumption: np.ndarray,
+                       current_state: BatterySystemState,
+                       degradation_cost_per_percent: float,
+                       dt: np.ndarray,
+                       verbose: bool,
+                       timer: Optional[PhaseTimer] = None,
+                       peak_cap: Optional[float] = None) -> tuple:
+        """
+        Solve the reduced LP and reconstruct the full set of result series.
+
+        Reductions relative to the full formulation (same optimal objective):
+        - DOD_abs and DP_cyc are linear in E_delta_pos + E_delta_neg, and at the
+          optimum E_delta_pos + E_delta_neg = |E[t] - E[t-1]|. All four blocks
+          are replaced by DP_total[t] >= ±(rho/E_nom)·(E[t] - E[t-1]).
+        - The calendar floor DP_total >= dp_cal becomes a variable bound.
+        - When the export limit cannot bind (surplus pv - load + P_max_discharge
+          stays below it) and import always costs more than export earns,
+          P_grid_export and P_curtail share one surplus block priced at the
+          cheaper disposal option; the split is restored afterwards.
+        - Matrices are assembled sparse instead of dense.
+
+        Variable layout: [P_charge, P_discharge, P_grid_import, P_surplus or
+        P_grid_export, E_battery, (P_curtail), DP_total, P_monthly_peak_new, z].
+        Constraint rows keep the order of the full formulation's first blocks,
+        so _extract_duals() applies unchanged.
+
+        With peak_cap (exact tariff mode) the tariff term is dropped from the
+        objective and the new monthly peak is upper-bounded at peak_cap; the
+        reported peak is then the one actually reached.
+
+        Args:
+            dt: Step durations [hours]
+            timer: Phase timer (assembly and solve laps are recorded)
+            peak_cap: Upper bound on the new monthly peak [kW] (exact mode)
+
+        Returns:
+            (scipy OptimizeResult, solution dict or None)
+        """
+        timer = timer or PhaseTimer()
+        E_initial = current_state.current_soc_kwh
+        curtail_cost = 0.01  # Same curtailment penalty as the full formulation
+
+        export_cost = -c_export * dt
+        merge_surplus = bool(
+            np.all(c_import > c_export)
+            and np.all(pv_production - load_consumption + self.P_max_discharge <= self.P_grid_export_limit)
+        )
+
+        # Variable offsets
+        i_ch, i_dis, i_imp, i_exp, i_E = 0, T, 2*T, 3*T, 4*T
+        if merge_surplus:
+            i_curt, i_dp = None, 5*T
+        else:
+            i_curt, i_dp = 5*T, 6*T
+        i_peak = i_dp + T
+        i_z = i_peak + 1
+        n_vars = i_z + self.N_trinn
+        steps = np.arange(T)
+
+        # Objective
+        c = np.zeros(n_vars)
+        c[i_imp:i_imp + T] = c_import * dt
+        if merge_surplus:
+            c[i_exp:i_exp + T] = np.minimum(export_cost, curtail_cost)
+        else:
+            c[i_exp:i_exp + T] = export_cost
+            c[i_curt:i_curt + T] = curtail_cost
+        c[i_dp:i_dp + T] = degradation_cost_per_percent
+        if peak_cap is None:
+            c[i_z:i_z + self.N_trinn] = self.c_trinn
+
+        # Bounds
+        lower = np.zeros(n_vars)
+        upper = np.full(n_vars, np.inf)
+        upper[i_ch:i_ch + T] = self.P_max_charge
+        upper[i_dis:i_dis + T] = self.P_max_discharge
+        upper[i_imp:i_imp + T] = self.P_grid_import_limit
+        if not merge_surplus:
+            upper[i_exp:i_exp + T] = self.P_grid_export_limit
+        lower[i_E:i_E + T] = self.SOC_min * self.E_nom
+        upper[i_E:i_E + T] = self.SOC_max * self.E_nom
+        lower[i_dp:i_dp + T] = self.dp_cal_per_hour * dt
+        upper[i_dp:i_dp + T] = self.eol_degradation_pct
+        lower[i_peak] = current_state.current_monthly_peak_kw
+        if peak_cap is not None:
+            upper[i_peak] = peak_cap
+        upper[i_z:i_z + self.N_trinn] = 1.0
+
+        # Equality rows: balance (T), dynamics (T-1), initial SOC (1), peak definition (1)
+        rows, cols, vals = [], [], []
+
+        def add(r, col, v):
+            r, col = np.broadcast_arrays(r, col)
+            rows.append(r.ravel())
+            cols.append(col.ravel())
+            vals.append(np.broadcast_to(v, r.shape).ravel())
+
+        add(steps, i_imp + steps, 1.0)
+        add(steps, i_exp + steps, -1.0)
+        add(steps, i_ch + steps, -1.0)
+        add(steps, i_dis + steps, 1.0)
+        if not merge_surplus:
+            add(steps, i_curt + steps, -1.0)
+
+        dyn = steps[:-1]
+        add(T + dyn, i_E + dyn + 1, -1.0)
+        add(T + dyn, i_E + dyn, 1.0)
+        add(T + dyn, i_ch + dyn, self.eta_charge * dt[dyn])
+        add(T + dyn, i_dis + dyn, -dt[dyn] / self.eta_discharge)
+
+        add(2*T - 1, i_E, 1.0)
+
+        add(2*T, i_peak, 1.0)
+        add(np.full(self.N_trinn, 2*T), i_z + np.arange(self.N_trinn), -self.p_trinn)
+
+        A_eq = sparse.csr_matrix(
+            (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(2*T + 1, n_vars)
+        )
+        b_eq = np.concatenate([
+            load_consumption - pv_production,
+            np.zeros(T - 1),
+            [E_initial],
+            [0.0],
+        ])
+
+        # Inequality rows: peak tracking (T), bracket ordering (N_trinn-1),
+        # cyclic degradation ±(T-1)
+        rows, cols, vals = [], [], []
+        add(steps, i_imp + steps, 1.0)
+        add(steps, i_peak, -1.0)
+
+        order = np.arange(1, self.N_trinn)
+        add(T + order - 1, i_z + order, 1.0)
+        add(T + order - 1, i_z + order - 1, -1.0)
+        n_ub = T + self.N_trinn - 1
+
+        if self.E_nom > 0 and T > 1:
+            k = self.rho_constant / self.E_nom
+            t = steps[1:]
+            for sign, offset in ((1.0, n_ub), (-1.0, n_ub + T - 1)):
+                add(offset + t - 1, i_E + t, sign * k)
+                add(offset + t - 1, i_E + t - 1, -sign * k)
+                add(offset + t - 1, i_dp + t, -1.0)
+            n_ub += 2 * (T - 1)
+
+        A_ub = sparse.csr_matrix(
+            (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(n_ub, n_vars)
+        )
+        b_ub = np.zeros(n_ub)
+
+        if verbose:
+            logger.info("Compact LP: %d variables, %d eq constraints, %d ineq constraints "
+                        "(surplus merged: %s); solving with HiGHS",
+                        n_vars, A_eq.shape[0], A_ub.shape[0], merge_surplus)
+
+        timer.timings.set_model_size(c, A_eq, A_ub)
+        timer.lap('assembly')
+        result = linprog(
+            c=c,
+            A_eq=A_eq,
+            b_eq=b_eq,
+            A_ub=A_ub,
+            b_ub=b_ub,
+            bounds=np.column_stack([lower, upper]),
+            method='highs',
+            options={'disp': verbose}
+        )
+        timer.lap('solve')
+        timer.timings.iterations = getattr(result, 'nit', None)
+
+        if not result.success:
+            return result, None
+
+        x = result.x
+        E_battery = x[i_E:i_E + T]
+
+        if merge_surplus:
+            surplus = x[i_exp:i_exp + T]
+            export_preferred = export_cost <= curtail_cost
+            P_grid_export = np.where(export_preferred, surplus, 0.0)
+            P_curtail = np.where(export_preferred, 0.0, surplus)
+        else:
+            P_grid_export = x[i_exp:i_exp + T]
+            P_curtail = x[i_curt:i_curt + T]
+
+        # Reconstruct the eliminated degradation series
+        E_delta = np.diff(E_battery, prepend=E_initial)
+        E_delta_pos = np.maximum(E_delta, 0.0)
+        E_delta_neg = np.maximum(-E_delta, 0.0)
+        DOD_abs = (E_delta_pos + E_delta_neg) / self.E_nom if self.E_nom > 0 else np.zeros(T)
+        DP_cyc = self.rho_constant * DOD_abs
+
+        solution = {
+            'P_charge': x[i_ch:i_ch + T],
+            'P_discharge': x[i_dis:i_dis + T],
+            'P_grid_import': x[i_imp:i_imp + T],
+            'P_grid_export': P_grid_export,
+            'E_battery': E_battery,
+            'P_curtail': P_curtail,
+            'E_delta_pos': E_delta_pos,
+            'E_delta_neg': E_delta_neg,
+            'DOD_abs': DOD_abs,
+            'DP_cyc': DP_cyc,
+            'DP_total': np.maximum(DP_cyc, self.dp_cal_per_hour * dt),
+            'P_monthly_peak_new': x[i_peak],
+            'z': x[i_z:i_z + self.N_trinn],
+        }
+        if peak_cap is not None:
+            # Untaxed peak variable may sit anywhere below the cap
+            peak = max(current_state.current_monthly_peak_kw, float(solution['P_grid_import'].max()))
+            solution['P_monthly_peak_new'] = peak
+            solution['z'] = self._allocate_to_brackets(peak)
+        return result, solution
+
+    def _solve_exact_tariff(self,
+                            T: int,
+                            c_import: np.ndarray,
+                            c_export: np.ndarray,
+                            pv_production: np.ndarray,
+                            load_consumption: np.ndarray,
+                            current_state: BatterySystemState,
+                            degradation_cost_per_percent: float,
+                            dt: np.ndarray,
+                            verbose: bool,
+                            timer: PhaseTimer) -> tuple:
+        """
+        Minimize energy, degradation and the step-function tariff exactly.
+
+        Solves one compact LP per reachable bracket (peak capped at the bracket
+        edge) in a thread pool and keeps the schedule with the lowest LP cost
+        plus step tariff of the peak it reaches. The pool's wall time is
+        recorded as the solve phase; iterations are summed over brackets.
+
+        Returns:
+            (scipy OptimizeResult, solution dict or None) of the cheapest bracket
+        """
+        caps = bracket_caps(self.power_brackets, current_state.current_monthly_peak_kw,
+                            self.P_grid_import_limit)
+
+        def solve(cap):
+            bracket_timer = PhaseTimer()
+            result, solution = self._solve_compact(
+                T, c_import, c_export, pv_production, load_consumption, current_state,
+                degradation_cost_per_percent, dt, False, bracket_timer, peak_cap=cap
+            )
+            return result, solution, bracket_timer.timings
+
+        timer.lap('assembly')
+        solved = solve_brackets(solve, caps, self.tariff_workers)
+        timer.lap('solve')
+
+        costs = [
+            result.fun + step_tariff_cost(self.power_brackets, solution['P_monthly_peak_new'])
+            if solution is not None else float('inf')
+            for result, solution, _ in solved
+        ]
+        best = cheapest_bracket(costs)
+        result, solution, timings = solved[best]  # -1: all infeasible, report the widest cap
+
+        timer.timings.n_variables = timings.n_variables
+        timer.timings.n_eq_constraints = timings.n_eq_constraints
+        timer.timings.n_ub_constraints = timings.n_ub_constraints
+        timer.timings.n_nonzeros = timings.n_nonzeros
+        timer.timings.iterations = sum(t.iterations or 0 for _, _, t in solved)
+
+        if verbose:
+            logger.info("Exact step tariff: %d bracket LPs (peak caps %s kW), costs %s NOK, chose cap %.1f kW",
+                        len(caps), np.round(caps, 1), np.round(costs, 2), caps[best])
+        return result, solution
+
+    def _solve_pruned(self,
+                      T: int,
+                      c_import: np.ndarray,
+                      c_export: np.ndarray,
+                      pv_production: np.ndarray,
+                      load_consumption: np.ndarray,
+                      current_state: BatterySystemState,
+                      degradation_cost_per_percent: float,
+                      dt: np.ndarray) -> Optional[tuple]:
+        """
+        Optimal schedule without the LP, if the window is prunable.
+
+        Returns:
+            (OptimizeResult stand-in, solution dict) in the form of the LP
+            solves, or None if the window needs the LP
+        """
+        peak_kw = current_state.current_monthly_peak_kw
+        if peak_kw > np.sum(self.p_trinn):
+            return None
+
+        # Energy change per step covered by the calendar aging floor, and the cost beyond it
+        dp_cal = self.dp_cal_per_hour * dt
+        kwh_per_percent = self.E_nom / self.rho_constant
+        schedule = prune_window(
+            load_consumption - pv_production, c_import, c_export, dt,
+            E_initial=current_state.current_soc_kwh,
+            E_min=self.SOC_min * self.E_nom,
+            E_max=self.SOC_max * self.E_nom,
+            P_max_discharge=self.P_max_discharge,
+            eta_charge=self.eta_charge,
+            eta_discharge=self.eta_discharge,
+            import_limit_kw=self.P_grid_import_limit,
+            export_limit_kw=self.P_grid_export_limit,
+            current_peak_kw=peak_kw,
+            free_cycling_kwh=dp_cal * kwh_per_percent,
+            cycling_cost_per_kwh=degradation_cost_per_percent / kwh_per_percent,
+        )
+        if schedule is None:
+            return None
+
+        E_delta = np.diff(schedule.E_battery, prepend=current_state.current_soc_kwh)
+        E_delta_pos = np.maximum(E_delta, 0.0)
+        E_delta_neg = np.maximum(-E_delta, 0.0)
+        DOD_abs = (E_delta_pos + E_delta_neg) / self.E_nom
+        DP_cyc = self.rho_constant * DOD_abs
+        DP_total = np.maximum(DP_cyc, dp_cal)
+
+        # The peak stays at the current monthly peak; fill z as the LP would
+        if self.tariff_mode == 'exact':
+            z = self._allocate_to_brackets(peak_kw)
+        else:
+            z = progressive_tariff_fill(self.p_trinn, self.c_trinn, peak_kw)
+
+        solution = {
+            'P_charge': np.zeros(T),
+            'P_discharge': schedule.P_discharge,
+            'P_grid_import': schedule.P_grid_import,
+            'P_grid_export': schedule.P_grid_export,
+            'E_battery': schedule.E_battery,
+            'P_curtail': np.zeros(T),
+            'E_delta_pos': E_delta_pos,
+            'E_delta_neg': E_delta_neg,
+            'DOD_abs': DOD_abs,
+            'DP_cyc': DP_cyc,
+            'DP_total': DP_total,
+            'P_monthly_peak_new': peak_kw,
+            'z': z,
+        }
+        objective = (np.sum((c_import * schedule.P_grid_import - c_export * schedule.P_grid_export) * dt)
+                     + degradation_cost_per_percent * np.sum(DP_total))
+        if self.tariff_mode != 'exact':
+            objective += float(np.dot(self.c_trinn, z))
+        result = OptimizeResult(success=True, status=0, fun=objective, nit=0,
+                                message=f"Pruned: {schedule.reason}")
+        return result, solution
+
     def optimize_window(self,
                         current_state: BatterySystemState,
                         pv_production: np.ndarray,
                         load_consumption: np.ndarray,
                         spot_prices: np.ndarray,
                         timestamps: pd.DatetimeIndex,
-                        verbose: bool = False) -> RollingHorizonResult:
+                        verbose: bool = False,
+                        return_duals: bool = False,
+                        keep_steps: Optional[int] = None,
+                        peak_penalty: Optional[float] = None) -> RollingHorizonResult:
         """
         Optimize battery dispatch over configured horizon (24h or 168h).
 
@@ -413,49 +926,113 @@ class RollingHorizonOptimizer:
             spot_prices: Spot prices [NOK/kWh], shape (T,)
             timestamps: DatetimeIndex for optimization window
             verbose: Print detailed output
+            return_duals: Attach HiGHS dual values per constraint block to the result
+            keep_steps: Only return the first keep_steps steps of the schedule
+                (RollingHorizonResult.head), for callers that execute a few
+                steps per solve
+            peak_penalty: Adaptive peak penalty of this window [NOK/kW], e.g.
+                looked up in a PeakPenaltyTable (default: computed from
+                current_state and the window's net load)
 
         Returns:
-            RollingHorizonResult with optimal schedule
+            RollingHorizonResult with optimal schedule. With a coarsening
+            schedule the series hold one entry per block (see timestep_hours).
         """
-        import time
-        start_time = time.time()
+        timer = PhaseTimer()
 
         T = len(timestamps)  # Use actual window size (flexible: 24 for hourly, 96 for 15-min)
 
         if verbose:
-            print(f"\n{'='*70}")
-            print(f"Rolling Horizon Optimization - {self.horizon_hours}h Window ({self.resolution})")
-            print(f"{'='*70}")
-            print(f"  Start: {timestamps[0]}")
-            print(f"  End: {timestamps[-1]}")
-            print(f"  Timesteps: {T}")
-            print(f"  Current SOC: {current_state.current_soc_kwh:.2f} kWh ({current_state.current_soc_percent:.1f}%)")
-            print(f"  Monthly peak: {current_state.current_monthly_peak_kw:.1f} kW")
-            print(f"  Days remaining: {current_state.days_remaining_in_month}")
+            logger.info("Rolling horizon optimization - %dh window (%s): %s to %s, %d timesteps, "
+                        "SOC %.2f kWh (%.1f%%), monthly peak %.1f kW, %s days remaining in month",
+                        self.horizon_hours, self.resolution, timestamps[0], timestamps[-1], T,
+                        current_state.current_soc_kwh, current_state.current_soc_percent,
+                        current_state.current_monthly_peak_kw, current_state.days_remaining_in_month)
 
         # Get energy costs
         c_import, c_export = self.get_energy_costs(timestamps, spot_prices)
 
         # Calculate adaptive peak penalty coefficient
-        # Use first forecasted grid import as "current" (conservative)
-        P_grid_forecast_initial = load_consumption[0] - pv_production[0]  # Net import
-        P_grid_forecast_24h = load_consumption - pv_production  # Approximate forecast
+        if peak_penalty is not None:
+            adaptive_peak_penalty = peak_penalty
+        else:
+            # Use first forecasted grid import as "current" (conservative)
+            P_grid_forecast_initial = load_consumption[0] - pv_production[0]  # Net import
+            P_grid_forecast_24h = load_consumption - pv_production  # Approximate forecast
 
-        adaptive_peak_penalty = current_state.calculate_adaptive_peak_penalty(
-            current_grid_import_kw=max(0, P_grid_forecast_initial),
-            forecast_grid_import_24h=np.maximum(0, P_grid_forecast_24h)
-        )
+            adaptive_peak_penalty = current_state.calculate_adaptive_peak_penalty(
+                current_grid_import_kw=max(0, P_grid_forecast_initial),
+                forecast_grid_import_24h=np.maximum(0, P_grid_forecast_24h)
+            )
 
         if verbose:
-            print(f"  Adaptive peak penalty: {adaptive_peak_penalty:.2f} NOK/kW")
+            logger.info("Adaptive peak penalty: %.2f NOK/kW", adaptive_peak_penalty)
 
         # Calculate baseline tariff cost for current monthly peak
         z_current = self._allocate_to_brackets(current_state.current_monthly_peak_kw)
         baseline_tariff_cost = self._calculate_tariff_cost(z_current)
 
         if verbose:
-            print(f"  Current monthly peak: {current_state.current_monthly_peak_kw:.2f} kW")
-            print(f"  Baseline tariff cost: {baseline_tariff_cost:.2f} NOK/month")
+            logger.info("Current monthly peak %.2f kW, baseline tariff cost %.2f NOK/month",
+                        current_state.current_monthly_peak_kw, baseline_tariff_cost)
+
+        # Cost = (battery_cost_per_kwh * E_nom / eol_degradation_pct) NOK per % degradation
+        degradation_cost_per_percent = (self.battery_cost_nok_per_kwh * self.E_nom) / self.eol_degradation_pct
+        timer.lap('tariff')
+
+        # Per-step durations; coarsening merges later steps into longer blocks
+        dt = np.full(T, self.timestep_hours)
+        if self.coarsening:
+            blocks = coarsening_block_lengths(T, self.timestep_hours, self.coarsening)
+
+            # Block means keep energy; mean prices cost a constant block power exactly
+            pv_production = aggregate_to_blocks(pv_production, blocks)
+            load_consumption = aggregate_to_blocks(load_consumption, blocks)
+            c_import = aggregate_to_blocks(c_import, blocks)
+            c_export = aggregate_to_blocks(c_export, blocks)
+            dt = blocks * self.timestep_hours
+
+            if verbose:
+                logger.info("Coarsened horizon: %d → %d steps", T, len(blocks))
+            T = len(blocks)
+
+        if self.prune_windows and not return_duals:
+            pruned = self._solve_pruned(T, c_import, c_export, pv_production, load_consumption,
+                                        current_state, degradation_cost_per_percent, dt)
+            if pruned is not None:
+                timer.lap('assembly')
+                if verbose:
+                    logger.info("Window pruned (%s): LP skipped", pruned[0].message)
+                packaged = self._package_result(
+                    *pruned, T, c_import, c_export, degradation_cost_per_percent,
+                    baseline_tariff_cost, current_state, timer, verbose, False, dt, keep_steps,
+                    adaptive_peak_penalty
+                )
+                packaged.pruned = True
+                packaged.message = pruned[0].message
+                return packaged
+
+        if self.tariff_mode == 'exact':
+            result, solution = self._solve_exact_tariff(
+                T, c_import, c_export, pv_production, load_consumption,
+                current_state, degradation_cost_per_percent, dt, verbose, timer
+            )
+            return self._package_result(
+                result, solution, T, c_import, c_export, degradation_cost_per_percent,
+                baseline_tariff_cost, current_state, timer, verbose, return_duals, dt, keep_steps,
+                adaptive_peak_penalty
+            )
+
+        if self.compact:
+            result, solution = self._solve_compact(
+                T, c_import, c_export, pv_production, load_consumption,
+                current_state, degradation_cost_per_percent, dt, verbose, timer
+            )
+            return self._package_result(
+                result, solution, T, c_import, c_export, degradation_cost_per_percent,
+                baseline_tariff_cost, current_state, timer, verbose, return_duals, dt, keep_steps,
+                adaptive_peak_penalty
+            )
 
         # LP Problem Setup
         # Decision variables: [P_charge, P_discharge, P_grid_import, P_grid_export, E_battery, P_curtail,
@@ -475,10 +1052,10 @@ class RollingHorizonOptimizer:
         c[T:2*T] = 0
 
         # P_grid_import cost: c_import × Δt
-        c[2*T:3*T] = c_import * self.timestep_hours
+        c[2*T:3*T] = c_import * dt
 
         # P_grid_export revenue: -c_export × Δt (negative = profit)
-        c[3*T:4*T] = -c_export * self.timestep_hours
+        c[3*T:4*T] = -c_export * dt
 
         # E_battery cost: 0 (state variable)
         c[4*T:5*T] = 0
@@ -499,8 +1076,6 @@ class RollingHorizonOptimizer:
         c[9*T:10*T] = 0
 
         # DP_total cost: degradation cost per percent
-        # Cost = (battery_cost_per_kwh * E_nom / eol_degradation_pct) NOK per % degradation
-        degradation_cost_per_percent = (self.battery_cost_nok_per_kwh * self.E_nom) / self.eol_degradation_pct
         c[10*T:11*T] = degradation_cost_per_percent
 
         # P_monthly_peak_new: no direct cost (just used in constraints)
@@ -592,8 +1167,8 @@ class RollingHorizonOptimizer:
             row = np.zeros(n_vars)
             row[4*T + t + 1] = -1  # -E[t+1]
             row[4*T + t] = 1  # +E[t]
-            row[0*T + t] = self.eta_charge * self.timestep_hours  # P_charge × η × Δt
-            row[1*T + t] = -self.timestep_hours / self.eta_discharge  # -P_discharge / η × Δt
+            row[0*T + t] = self.eta_charge * dt[t]  # P_charge × η × Δt
+            row[1*T + t] = -dt[t] / self.eta_discharge  # -P_discharge / η × Δt
             A_eq_rows.append(row)
             b_eq_rows.append(0)
 
@@ -649,7 +1224,9 @@ class RollingHorizonOptimizer:
             b_ub_rows.append(0)
 
         # Degradation inequality constraints (2*T constraints)
-        A_ub_degradation, b_ub_degradation = self._build_degradation_inequality_constraints(T, n_vars)
+        A_ub_degradation, b_ub_degradation = self._build_degradation_inequality_constraints(
+            T, n_vars, self.dp_cal_per_hour * dt
+        )
         A_ub_rows.extend(A_ub_degradation)
         b_ub_rows.extend(b_ub_degradation)
 
@@ -658,9 +1235,11 @@ class RollingHorizonOptimizer:
 
         # Solve LP
         if verbose:
-            print(f"\n  LP problem: {n_vars} variables, {len(A_eq_rows)} eq constraints, {len(A_ub_rows) if A_ub_rows else 0} ineq constraints")
-            print(f"  Solving with HiGHS...")
+            logger.info("LP problem: %d variables, %d eq constraints, %d ineq constraints; solving with HiGHS",
+                        n_vars, len(A_eq_rows), len(A_ub_rows) if A_ub_rows else 0)
 
+        timer.timings.set_model_size(c, A_eq, A_ub)
+        timer.lap('assembly')
         result = linprog(
             c=c,
             A_eq=A_eq,
@@ -671,12 +1250,86 @@ class RollingHorizonOptimizer:
             method='highs',
             options={'disp': verbose}
         )
+        timer.lap('solve')
+        timer.timings.iterations = getattr(result, 'nit', None)
+
+        solution = None
+        if result.success:
+            x = result.x
+            solution = {
+                'P_charge': x[0:T],
+                'P_discharge': x[T:2*T],
+                'P_grid_import': x[2*T:3*T],
+                'P_grid_export': x[3*T:4*T],
+                'E_battery': x[4*T:5*T],
+                'P_curtail': x[5*T:6*T],
+                'E_delta_pos': x[6*T:7*T],
+                'E_delta_neg': x[7*T:8*T],
+                'DOD_abs': x[8*T:9*T],
+                'DP_cyc': x[9*T:10*T],
+                'DP_total': x[10*T:11*T],
+                'P_monthly_peak_new': x[11*T],  # Consequential monthly peak after this window
+                'z': x[11*T + 1 : 11*T + 1 + self.N_trinn],  # Bracket allocations
+            }
+
+        return self._package_result(
+            result, solution, T, c_import, c_export, degradation_cost_per_percent,
+            baseline_tariff_cost, current_state, timer, verbose, return_duals, dt, keep_steps,
+            adaptive_peak_penalty
+        )
+
+    def _package_result(self,
+                        result,
+                        solution: Optional[Dict],
+                        T: int,
+                        c_import: np.ndarray,
+                        c_export: np.ndarray,
+                        degradation_cost_per_percent: float,
+                        baseline_tariff_cost: float,
+                        current_state: BatterySystemState,
+                        timer: PhaseTimer,
+                        verbose: bool,
+                        return_duals: bool,
+                        dt: np.ndarray,
+                        keep_steps: Optional[int] = None,
+                        adaptive_peak_penalty: Optional[float] = None) -> RollingHorizonResult:
+        """
+        Compute cost breakdown and build RollingHorizonResult from a solved LP.
 
-        solve_time = time.time() - start_time
+        Shared by the full and compact formulations; `solution` holds the
+        named series (None if the solve failed) and `dt` the step durations.
+        Everything after the solve is timed as the extraction phase.
+        """
+        packaged = self._build_result(
+            result, solution, T, c_import, c_export, degradation_cost_per_percent,
+            baseline_tariff_cost, current_state, timer.timings, verbose, return_duals, dt
+        )
+        if keep_steps is not None:
+            packaged = packaged.head(keep_steps)
+        packaged.adaptive_peak_penalty = adaptive_peak_penalty
+        timer.lap('extraction')
+        packaged.timings = timer.timings
+        packaged.solve_time_seconds = timer.timings.total_seconds
+        return packaged
+
+    def _build_result(self,
+                      result,
+                      solution: Optional[Dict],
+                      T: int,
+                      c_import: np.ndarray,
+                      c_export: np.ndarray,
+                      degradation_cost_per_percent: float,
+                      baseline_tariff_cost: float,
+                      current_state: BatterySystemState,
+                      timings: SolveTimings,
+                      verbose: bool,
+                      return_duals: bool,
+                      dt: np.ndarray) -> RollingHorizonResult:
+        """Cost breakdown and result series (solve_time_seconds set by the caller)."""
+        solve_time = timings.solve_ns * 1e-9
 
         if not result.success:
-            if verbose:
-                print(f"  ❌ Optimization failed: {result.message}")
+            logger.warning("Rolling horizon optimization failed: %s", result.message)
             return RollingHorizonResult(
                 P_charge=np.zeros(T),
                 P_discharge=np.zeros(T),
@@ -699,30 +1352,27 @@ class RollingHorizonOptimizer:
                 equivalent_cycles=0.0,
                 success=False,
                 message=result.message,
-                solve_time_seconds=solve_time
+                solve_time_seconds=solve_time,
+                timestep_hours=dt
             )
 
         # Extract solution
-        x = result.x
-        P_charge = x[0:T]
-        P_discharge = x[T:2*T]
-        P_grid_import = x[2*T:3*T]
-        P_grid_export = x[3*T:4*T]
-        E_battery = x[4*T:5*T]
-        P_curtail = x[5*T:6*T]
-        E_delta_pos = x[6*T:7*T]
-        E_delta_neg = x[7*T:8*T]
-        DOD_abs = x[8*T:9*T]
-        DP_cyc = x[9*T:10*T]
-        DP_total = x[10*T:11*T]
-        P_monthly_peak_new = x[11*T]  # Scalar: consequential monthly peak after this 24h window
-
-        # Extract bracket allocations
-        idx_z = 11*T + 1  # Shifted index
-        z_new = x[idx_z : idx_z + self.N_trinn]
+        P_charge = solution['P_charge']
+        P_discharge = solution['P_discharge']
+        P_grid_import = solution['P_grid_import']
+        P_grid_export = solution['P_grid_export']
+        E_battery = solution['E_battery']
+        P_curtail = solution['P_curtail']
+        E_delta_pos = solution['E_delta_pos']
+        E_delta_neg = solution['E_delta_neg']
+        DOD_abs = solution['DOD_abs']
+        DP_cyc = solution['DP_cyc']
+        DP_total = solution['DP_total']
+        P_monthly_peak_new = solution['P_monthly_peak_new']
+        z_new = solution['z']
 
         # Calculate cost breakdown
-        energy_cost = np.sum(c_import * P_grid_import * self.timestep_hours - c_export * P_grid_export * self.timestep_hours)
+        energy_cost = np.sum((c_import * P_grid_import - c_export * P_grid_export) * dt)
 
         # Degradation cost: sum of degradation over 24h window
         degradation_cost = np.sum(degradation_cost_per_percent * DP_total)
@@ -741,22 +1391,19 @@ class RollingHorizonOptimizer:
         peak_penalty_actual = new_tariff_actual - baseline_tariff_actual
 
         if verbose:
-            print(f"\n  ✓ Optimization successful!")
-            print(f"  Objective: {result.fun:,.2f} NOK")
-            print(f"  Energy cost: {energy_cost:,.2f} NOK")
-            print(f"  Degradation cost: {degradation_cost:,.2f} NOK")
-            print(f"  Equivalent cycles (24h): {equivalent_cycles:.4f} cycles")
-            print(f"  Peak demand: {current_state.current_monthly_peak_kw:.2f} kW → {P_monthly_peak_new:.2f} kW")
-            print(f"  Baseline tariff (progressive): {baseline_tariff_cost:.2f} NOK/month")
-            print(f"  New tariff (progressive): {new_tariff_cost_progressive:.2f} NOK/month")
-            print(f"  Peak penalty (progressive): {peak_penalty_cost_progressive:,.2f} NOK")
-            print(f"  ---")
-            print(f"  Baseline tariff (actual step): {baseline_tariff_actual:.2f} NOK/month")
-            print(f"  New tariff (actual step): {new_tariff_actual:.2f} NOK/month")
-            print(f"  Peak penalty (actual step): {peak_penalty_actual:,.2f} NOK")
-            print(f"  Solve time: {solve_time:.3f} seconds")
-            print(f"  Next action: {P_charge[0] - P_discharge[0]:.2f} kW")
-            print(f"  Final SOC: {E_battery[-1]:.2f} kWh ({E_battery[-1]/self.E_nom*100:.1f}%)")
+            logger.info(
+                "Optimization successful: objective %.2f NOK, energy cost %.2f NOK, "
+                "degradation cost %.2f NOK, %.4f equivalent cycles\n"
+                "  Peak demand: %.2f kW → %.2f kW\n"
+                "  Tariff (progressive): baseline %.2f, new %.2f NOK/month, penalty %.2f NOK\n"
+                "  Tariff (actual step): baseline %.2f, new %.2f NOK/month, penalty %.2f NOK\n"
+                "  LP solve time %.3f s, next action %.2f kW, final SOC %.2f kWh (%.1f%%)",
+                result.fun, energy_cost, degradation_cost, equivalent_cycles,
+                current_state.current_monthly_peak_kw, P_monthly_peak_new,
+                baseline_tariff_cost, new_tariff_cost_progressive, peak_penalty_cost_progressive,
+                baseline_tariff_actual, new_tariff_actual, peak_penalty_actual,
+                solve_time, P_charge[0] - P_discharge[0], E_battery[-1], E_battery[-1] / self.E_nom * 100
+            )
 
         # Calculate true objective: energy cost + degradation cost + marginal peak penalty
         # Progressive LP uses approximate tariff for optimization
@@ -787,7 +1434,415 @@ class RollingHorizonOptimizer:
             equivalent_cycles=equivalent_cycles,
             success=True,
             message="Optimization successful",
-            solve_time_seconds=solve_time
+            solve_time_seconds=solve_time,
+            duals=self._extract_duals(result, T, dt) if return_duals else None,
+            timestep_hours=dt
+        )
+
+    def _extract_duals(self, result, T: int, dt: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Slice HiGHS marginals into named constraint blocks.
+
+        Signs are normalized so every entry is the marginal value [NOK] of relaxing
+        the constraint by one unit (binding limits give positive values):
+        - energy_balance[t]: marginal cost of 1 kWh extra load at t [NOK/kWh]
+        - soc_dynamics[t]: marginal value of 1 kWh stored in E[t] [NOK/kWh]
+        - peak_constraints[t]: value of relaxing P_grid_import[t] <= P_monthly_peak_new
+        - soc/export/charge/discharge: variable bound marginals
+
+        Row layout follows optimize_window(): A_eq = [balance (T), dynamics (T-1),
+        initial SOC (1), peak definition (1), degradation (3T)],
+        A_ub = [peak tracking (T), bracket ordering (N_trinn-1), degradation (2T)].
+
+        Args:
+            result: scipy OptimizeResult from linprog(method='highs')
+            T: Number of timesteps in the solved window
+            dt: Step durations [hours]
+
+        Returns:
+            Dict keyed like DualVariables fields
+        """
+        eq = result.eqlin.marginals
+        ub = result.ineqlin.marginals
+
+        # Dynamics row t removes energy from E[t+1]; initial row adds energy to E[0]
+        idx_init = 2*T - 1
+        soc_dynamics = np.concatenate([[-eq[idx_init]], eq[T:idx_init]])
+
+        return {
+            'peak_constraints': -ub[0:T],
+            'soc_dynamics': soc_dynamics,
+            'soc_upper_bounds': -result.upper.marginals[4*T:5*T],
+            'soc_lower_bounds': result.lower.marginals[4*T:5*T],
+            'export_limits': -result.upper.marginals[3*T:4*T],
+            'energy_balance': eq[0:T] / dt,
+            'charge_limits': -result.upper.marginals[0:T],
+            'discharge_limits': -result.upper.marginals[T:2*T],
+        }
+
+    def _assemble_scenario_lp(self, S: int, dt: np.ndarray, shared_peak: bool) -> tuple:
+        """
+        Sparse constraint matrices of the S-scenario LP.
+
+        The matrices depend only on S, Δt, the peak mode and the battery/tariff
+        parameters; forecasts, prices, initial SOC and current peak enter
+        through the cost vector, right-hand sides and bounds. They are
+        therefore cached and reused across re-optimizations (scipy's HiGHS
+        interface takes no initial basis, so this is the warm-start reuse
+        available here).
+
+        Variable layout: S blocks of [P_charge, P_discharge, P_grid_import,
+        P_grid_export, E_battery, P_curtail, DP_total] (7T each), followed by
+        one P_monthly_peak_new and z[0..N_trinn-1] shared by all scenarios.
+        Without a shared peak, each block ends with its own peak and z.
+
+        Rows per scenario follow the compact formulation: equality = balance
+        (T), dynamics (T-1), initial SOC (1), (peak definition); inequality =
+        peak tracking (T), cyclic degradation ±(T-1), (bracket ordering).
+        Shared rows come last: (peak definition) and non-anticipativity of
+        P_charge[0]/P_discharge[0] (equality), (bracket ordering) (inequality).
+
+        Returns:
+            (A_eq, A_ub) as CSR matrices
+        """
+        key = (S, tuple(dt), shared_peak)
+        if self._scenario_lp is not None and self._scenario_lp[0] == key:
+            return self._scenario_lp[1]
+
+        T = len(dt)
+        N = self.N_trinn
+        i_ch, i_dis, i_imp, i_exp, i_E, i_curt, i_dp = (k * T for k in range(7))
+        i_peak, i_z = 7 * T, 7 * T + 1  # Local indices of the tariff columns
+        m = 7 * T if shared_peak else 7 * T + 1 + N
+        n_vars = S * m + (1 + N if shared_peak else 0)
+        steps = np.arange(T)
+
+        def pattern():
+            rows, cols, vals = [], [], []
+
+            def add(r, col, v):
+                r, col = np.broadcast_arrays(r, col)
+                rows.append(r.ravel())
+                cols.append(col.ravel())
+                vals.append(np.broadcast_to(np.asarray(v, dtype=float), r.shape).ravel())
+
+            def arrays():
+                if not rows:
+                    return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+                return (np.concatenate(rows).astype(np.int64),
+                        np.concatenate(cols).astype(np.int64),
+                        np.concatenate(vals))
+
+            return add, arrays
+
+        def tile(rows, cols, vals, rows_per_scenario):
+            """Repeat one scenario's pattern S times, mapping shared tariff columns."""
+            offsets = np.arange(S)[:, None]
+            global_cols = cols + offsets * m
+            if shared_peak:
+                global_cols = np.where(cols >= i_peak, S * m + cols - i_peak, global_cols)
+            return (
+                (rows + offsets * rows_per_scenario).ravel(),
+                global_cols.ravel(),
+                np.broadcast_to(vals, (S, len(vals))).ravel(),
+            )
+
+        def tariff_rows(add_eq, eq_row, add_ub, ub_row, col_peak):
+            """Peak definition and bracket ordering; z follows the peak column."""
+            add_eq(eq_row, col_peak, 1.0)
+            add_eq(np.full(N, eq_row), col_peak + 1 + np.arange(N), -self.p_trinn)
+            order = np.arange(1, N)
+            add_ub(ub_row + order - 1, col_peak + 1 + order, 1.0)
+            add_ub(ub_row + order - 1, col_peak + order, -1.0)
+
+        add_eq, eq_arrays = pattern()
+        add_ub, ub_arrays = pattern()
+
+        # Rows of one scenario
+        add_eq(steps, i_imp + steps, 1.0)
+        add_eq(steps, i_exp + steps, -1.0)
+        add_eq(steps, i_ch + steps, -1.0)
+        add_eq(steps, i_dis + steps, 1.0)
+        add_eq(steps, i_curt + steps, -1.0)
+        dyn = steps[:-1]
+        add_eq(T + dyn, i_E + dyn + 1, -1.0)
+        add_eq(T + dyn, i_E + dyn, 1.0)
+        add_eq(T + dyn, i_ch + dyn, self.eta_charge * dt[dyn])
+        add_eq(T + dyn, i_dis + dyn, -dt[dyn] / self.eta_discharge)
+        add_eq(2*T - 1, i_E, 1.0)
+        n_eq = 2 * T
+
+        add_ub(steps, i_imp + steps, 1.0)
+        add_ub(steps, i_peak, -1.0)
+        n_ub = T
+        if self.E_nom > 0 and T > 1:
+            k = self.rho_constant / self.E_nom
+            t = steps[1:]
+            for sign, offset in ((1.0, n_ub), (-1.0, n_ub + T - 1)):
+                add_ub(offset + t - 1, i_E + t, sign * k)
+                add_ub(offset + t - 1, i_E + t - 1, -sign * k)
+                add_ub(offset + t - 1, i_dp + t, -1.0)
+            n_ub += 2 * (T - 1)
+
+        if not shared_peak:
+            tariff_rows(add_eq, n_eq, add_ub, n_ub, i_peak)
+            n_eq += 1
+            n_ub += N - 1
+
+        eq = tile(*eq_arrays(), n_eq)
+        ub = tile(*ub_arrays(), n_ub)
+
+        # Shared rows, at global columns
+        add_eq, eq_arrays = pattern()
+        add_ub, ub_arrays = pattern()
+        r_eq, r_ub = n_eq * S, n_ub * S
+        if shared_peak:
+            tariff_rows(add_eq, r_eq, add_ub, r_ub, S * m)
+            r_eq += 1
+            r_ub += N - 1
+
+        # Non-anticipativity: first battery setpoint equal to scenario 0's
+        s = np.arange(1, S)
+        for k, i_var in enumerate((i_ch, i_dis)):
+            r = r_eq + 2 * (s - 1) + k
+            add_eq(r, s * m + i_var, 1.0)
+            add_eq(r, i_var, -1.0)
+        r_eq += 2 * (S - 1)
+
+        def csr(blocks, n_rows):
+            rows, cols, vals = (np.concatenate(parts) for parts in zip(*blocks))
+            return sparse.csr_matrix((vals, (rows, cols)), shape=(n_rows, n_vars))
+
+        matrices = (csr([eq, eq_arrays()], r_eq), csr([ub, ub_arrays()], r_ub))
+        self._scenario_lp = (key, matrices)
+        return matrices
+
+    def optimize_scenarios(self,
+                           current_state: BatterySystemState,
+                           pv_scenarios: np.ndarray,
+                           load_scenarios: np.ndarray,
+                           spot_price_scenarios: np.ndarray,
+                           timestamps: pd.DatetimeIndex,
+                           weights: Optional[np.ndarray] = None,
+                           shared_peak: bool = False,
+                           verbose: bool = False) -> ScenarioHorizonResult:
+        """
+        Optimize over S forecast scenarios with a non-anticipative first step.
+
+        Two-stage LP: the battery setpoint of the first step is shared by all
+        scenarios, so the executed action holds whichever scenario comes true.
+        Grid exchange, curtailment and all later battery steps are
+        per-scenario recourse, weighted in the objective by scenario
+        probability. The monthly peak is recourse too, so the power tariff
+        enters as its expected value.
+
+        With shared_peak=True one monthly peak covers every scenario. That
+        commitment is robust but lets the LP fill the headroom of the worst
+        scenario in all others; in closed loop it raised realized peaks
+        (see scripts/testing/benchmark_scenario_mpc.py).
+
+        Args:
+            current_state: Current system state (SOC, monthly peak, etc.)
+            pv_scenarios: PV forecasts [kW], shape (S, T) (or (T,) if shared)
+            load_scenarios: Load forecasts [kW], shape (S, T) (or (T,) if shared)
+            spot_price_scenarios: Spot prices [NOK/kWh], shape (S, T) or (T,)
+            timestamps: DatetimeIndex for optimization window
+            weights: Scenario probabilities, shape (S,) (default: uniform)
+            shared_peak: Commit one monthly peak for all scenarios instead of a
+                per-scenario peak priced in expectation
+            verbose: Print detailed output
+
+        Returns:
+            ScenarioHorizonResult with per-scenario schedules, shape (S, T).
+            With a coarsening schedule T is the number of blocks.
+
+        Raises:
+            ValueError: If scenario shapes or weights are inconsistent
+        """
+        timer = PhaseTimer()
+
+        T = len(timestamps)
+        pv, load, spot = (np.atleast_2d(np.asarray(a, dtype=float))
+                          for a in (pv_scenarios, load_scenarios, spot_price_scenarios))
+        if any(a.shape[1] != T for a in (pv, load, spot)):
+            raise ValueError(f"Scenario arrays must have {T} timesteps (one per timestamp)")
+        try:
+            pv, load, spot = np.broadcast_arrays(pv, load, spot)
+        except ValueError:
+            raise ValueError("Scenario arrays must have the same number of scenarios (or 1)")
+        S = pv.shape[0]
+
+        if weights is None:
+            weights = np.full(S, 1.0 / S)
+        else:
+            weights = np.asarray(weights, dtype=float)
+            if weights.shape != (S,) or np.any(weights < 0) or weights.sum() <= 0:
+                raise ValueError(f"weights must be {S} non-negative values with a positive sum")
+            weights = weights / weights.sum()
+
+        # Grid tariff and taxes do not depend on the scenario
+        c_import_fixed, c_export_fixed = self.get_energy_costs(timestamps, np.zeros(T))
+        c_import = spot + c_import_fixed
+        c_export = spot + c_export_fixed
+        degradation_cost_per_percent = (self.battery_cost_nok_per_kwh * self.E_nom) / self.eol_degradation_pct
+        baseline_tariff_cost = self._calculate_tariff_cost(
+            self._allocate_to_brackets(current_state.current_monthly_peak_kw)
+        )
+        timer.lap('tariff')
+
+        dt = np.full(T, self.timestep_hours)
+        if self.coarsening:
+            blocks = coarsening_block_lengths(T, self.timestep_hours, self.coarsening)
+            pv, load, c_import, c_export = (
+                aggregate_to_blocks(a, blocks) for a in (pv, load, c_import, c_export)
+            )
+            dt = blocks * self.timestep_hours
+            T = len(blocks)
+
+        A_eq, A_ub = self._assemble_scenario_lp(S, dt, shared_peak)
+        n = 7 * T
+        N = self.N_trinn
+        m = n if shared_peak else n + 1 + N
+
+        # Objective: probability-weighted recourse costs plus tariff
+        c_scenario = np.zeros((S, 7, T))
+        c_scenario[:, 2] = c_import * dt
+        c_scenario[:, 3] = -c_export * dt
+        c_scenario[:, 5] = 0.01  # Same curtailment penalty as the full formulation
+        c_scenario[:, 6] = degradation_cost_per_percent
+        c_blocks = np.zeros((S, m))
+        c_blocks[:, :n] = (weights[:, None, None] * c_scenario).reshape(S, n)
+
+        # Bounds
+        lower_scenario = np.zeros((7, T))
+        upper_scenario = np.full((7, T), np.inf)
+        upper_scenario[0] = self.P_max_charge
+        upper_scenario[1] = self.P_max_discharge
+        upper_scenario[2] = self.P_grid_import_limit
+        upper_scenario[3] = self.P_grid_export_limit
+        lower_scenario[4] = self.SOC_min * self.E_nom
+        upper_scenario[4] = self.SOC_max * self.E_nom
+        lower_scenario[6] = self.dp_cal_per_hour * dt
+        upper_scenario[6] = self.eol_degradation_pct
+        lower_tariff = np.concatenate([[current_state.current_monthly_peak_kw], np.zeros(N)])
+        upper_tariff = np.concatenate([[np.inf], np.ones(N)])
+        lower_blocks = np.zeros((S, m))
+        upper_blocks = np.zeros((S, m))
+        lower_blocks[:, :n] = lower_scenario.ravel()
+        upper_blocks[:, :n] = upper_scenario.ravel()
+
+        # Right-hand sides: per-scenario rows (peak definition = 0), then shared rows
+        n_eq = 2 * T if shared_peak else 2 * T + 1
+        b_eq_scenario = np.zeros((S, n_eq))
+        b_eq_scenario[:, :T] = load - pv
+        b_eq_scenario[:, 2*T - 1] = current_state.current_soc_kwh
+        b_eq = np.zeros(A_eq.shape[0])
+        b_eq[:S * n_eq] = b_eq_scenario.ravel()
+        b_ub = np.zeros(A_ub.shape[0])
+
+        if shared_peak:
+            c = np.concatenate([c_blocks.ravel(), [0.0], self.c_trinn])
+            lower = np.concatenate([lower_blocks.ravel(), lower_tariff])
+            upper = np.concatenate([upper_blocks.ravel(), upper_tariff])
+        else:
+            c_blocks[:, n + 1:] = weights[:, None] * self.c_trinn
+            lower_blocks[:, n:] = lower_tariff
+            upper_blocks[:, n:] = upper_tariff
+            c, lower, upper = c_blocks.ravel(), lower_blocks.ravel(), upper_blocks.ravel()
+
+        if verbose:
+            logger.info("Scenario LP: %d scenarios × %d steps, %d variables, %d eq constraints, "
+                        "%d ineq constraints (%s peak); solving with HiGHS",
+                        S, T, A_eq.shape[1], A_eq.shape[0], A_ub.shape[0],
+                        'shared' if shared_peak else 'per-scenario')
+
+        timer.timings.set_model_size(c, A_eq, A_ub)
+        timer.lap('assembly')
+        result = linprog(
+            c=c,
+            A_eq=A_eq,
+            b_eq=b_eq,
+            A_ub=A_ub,
+            b_ub=b_ub,
+            bounds=np.column_stack([lower, upper]),
+            method='highs',
+            options={'disp': verbose}
+        )
+        timer.lap('solve')
+        timer.timings.iterations = getattr(result, 'nit', None)
+        solve_time = timer.timings.solve_ns * 1e-9
+
+        if not result.success:
+            logger.warning("Scenario optimization failed: %s", result.message)
+            empty = np.zeros((S, T))
+            timer.lap('extraction')
+            return ScenarioHorizonResult(
+                P_charge=empty, P_discharge=empty, P_grid_import=empty, P_grid_export=empty,
+                E_battery=empty, P_curtail=empty, DP_total=empty,
+                weights=weights,
+                P_monthly_peak_new=np.full(S, current_state.current_monthly_peak_kw),
+                objective_value=float('inf'),
+                energy_cost=0.0,
+                peak_penalty_cost=0.0,
+                peak_penalty_actual=0.0,
+                degradation_cost=0.0,
+                scenario_energy_cost=np.zeros(S),
+                success=False,
+                message=result.message,
+                solve_time_seconds=timer.timings.total_seconds,
+                timestep_hours=dt,
+                timings=timer.timings
+            )
+
+        blocks = result.x[:S * m].reshape(S, m)
+        x = blocks[:, :n].reshape(S, 7, T)
+        if shared_peak:
+            P_monthly_peak_new = np.full(S, result.x[S * m])
+            z_new = np.broadcast_to(result.x[S * m + 1:], (S, N))
+        else:
+            P_monthly_peak_new = blocks[:, n]
+            z_new = blocks[:, n + 1:]
+
+        scenario_energy_cost = np.sum(
+            (c_import * x[:, 2] - c_export * x[:, 3]) * dt, axis=1
+        )
+        energy_cost = float(weights @ scenario_energy_cost)
+        degradation_cost = float(weights @ (degradation_cost_per_percent * x[:, 6].sum(axis=1)))
+        peak_penalty_cost = float(weights @ (z_new @ self.c_trinn)) - baseline_tariff_cost
+        peak_penalty_actual = float(
+            weights @ [self.config.tariff.get_power_cost(p) for p in P_monthly_peak_new]
+        ) - self.config.tariff.get_power_cost(current_state.current_monthly_peak_kw)
+
+        if verbose:
+            logger.info("Scenario optimization successful: expected energy cost %.2f NOK "
+                        "(scenarios %.2f to %.2f), peak %.2f kW → %.2f-%.2f kW, "
+                        "LP solve time %.3f s, next action %.2f kW",
+                        energy_cost, scenario_energy_cost.min(), scenario_energy_cost.max(),
+                        current_state.current_monthly_peak_kw, P_monthly_peak_new.min(),
+                        P_monthly_peak_new.max(), solve_time, x[0, 0, 0] - x[0, 1, 0])
+
+        timer.lap('extraction')
+        return ScenarioHorizonResult(
+            P_charge=x[:, 0],
+            P_discharge=x[:, 1],
+            P_grid_import=x[:, 2],
+            P_grid_export=x[:, 3],
+            E_battery=x[:, 4],
+            P_curtail=x[:, 5],
+            DP_total=x[:, 6],
+            weights=weights,
+            P_monthly_peak_new=P_monthly_peak_new,
+            objective_value=energy_cost + degradation_cost + peak_penalty_cost,
+            energy_cost=energy_cost,
+            peak_penalty_cost=peak_penalty_cost,
+            peak_penalty_actual=peak_penalty_actual,
+            degradation_cost=degradation_cost,
+            scenario_energy_cost=scenario_energy_cost,
+            success=True,
+            message="Optimization successful",
+            solve_time_seconds=timer.timings.total_seconds,
+            timestep_hours=dt,
+            timings=timer.timings
         )
 
     def optimize_24h(self, *args, **kwargs) -> RollingHorizonResult:
@@ -0,0 +1,153 @@
+"""
+Per-phase timing of LP solves.
+
+Every optimizer solve is split into four phases, timed with
+time.perf_counter_ns():
+- tariff: energy cost vectors, adaptive peak penalty, baseline tariff
+- assembly: objective, bounds and constraint matrices
+- solve: the HiGHS call (scipy linprog)
+- extraction: slicing the solution and computing the cost breakdown
+
+SolveTimings holds one solve (plus model size and HiGHS iterations),
+SolveProfile aggregates many solves into p50/p95/max per phase.
+"""
+
+from dataclasses import dataclass, asdict
+from time import perf_counter_ns
+from typing import Dict, List, Optional
+
+import numpy as np
+from scipy import sparse
+
+
+PHASES = ('tariff', 'assembly', 'solve', 'extraction')
+
+
+@dataclass
+class SolveTimings:
+    """Phase durations [ns] and model size of one LP solve."""
+    tariff_ns: int = 0
+    assembly_ns: int = 0
+    solve_ns: int = 0
+    extraction_ns: int = 0
+
+    # Model size and solver effort
+    n_variables: int = 0
+    n_eq_constraints: int = 0
+    n_ub_constraints: int = 0
+    n_nonzeros: int = 0
+    iterations: Optional[int] = None  # HiGHS simplex/IPM iterations
+
+    @property
+    def total_ns(self) -> int:
+        return self.tariff_ns + self.assembly_ns + self.solve_ns + self.extraction_ns
+
+    @property
+    def total_seconds(self) -> float:
+        return self.total_ns * 1e-9
+
+    def set_model_size(self, c: np.ndarray, A_eq=None, A_ub=None) -> None:
+        """Record LP dimensions from the objective and constraint matrices."""
+        self.n_variables = len(c)
+        self.n_eq_constraints = A_eq.shape[0] if A_eq is not None else 0
+        self.n_ub_constraints = A_ub.shape[0] if A_ub is not None else 0
+        self.n_nonzeros = sum(
+            A.nnz if sparse.issparse(A) else int(np.count_nonzero(A))
+            for A in (A_eq, A_ub) if A is not None
+        )
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class PhaseTimer:
+    """
+    Lap timer filling a SolveTimings.
+
+    Usage:
+        timer = PhaseTimer()
+        c_import, c_export = ...           # tariff work
+        timer.lap('tariff')
+        A_eq, A_ub = ...                   # assembly work
+        timer.lap('assembly')
+    """
+
+    def __init__(self, timings: Optional[SolveTimings] = None):
+        self.timings = timings if timings is not None else SolveTimings()
+        self._last = perf_counter_ns()
+
+    def lap(self, phase: str) -> None:
+        """Add the time since the previous lap to `phase`."""
+        now = perf_counter_ns()
+        attr = f"{phase}_ns"
+        setattr(self.timings, attr, getattr(self.timings, attr) + now - self._last)
+        self._last = now
+
+
+class SolveProfile:
+    """Aggregated SolveTimings over a run."""
+
+    def __init__(self):
+        self._phase_ns: Dict[str, List[int]] = {p: [] for p in PHASES + ('total',)}
+        self._iterations: List[int] = []
+        self._n_variables: List[int] = []
+        self._n_nonzeros: List[int] = []
+
+    def add(self, timings: Optional[SolveTimings]) -> None:
+        """Record one solve (None is ignored, e.g. optimizers without timings)."""
+        if timings is None:
+            return
+        for phase in PHASES:
+            self._phase_ns[phase].append(getattr(timings, f"{phase}_ns"))
+        self._phase_ns['total'].append(timings.total_ns)
+        if timings.iterations is not None:
+            self._iterations.append(timings.iterations)
+        self._n_variables.append(timings.n_variables)
+        self._n_nonzeros.append(timings.n_nonzeros)
+
+    @property
+    def n_solves(self) -> int:
+        return len(self._phase_ns['total'])
+
+    def summary(self) -> Dict:
+        """
+        Per-phase statistics, JSON-serializable.
+
+        Returns:
+            Dict with n_solves, per phase {total_s, share, p50_ms, p95_ms, max_ms},
+            and model size / iteration statistics
+        """
+        summary = {'n_solves': self.n_solves}
+        if not self.n_solves:
+            return summary
+
+        total_ns = float(np.sum(self._phase_ns['total']))
+        phases = {}
+        for phase, values in self._phase_ns.items():
+            ms = np.asarray(values) * 1e-6
+            p50, p95 = np.percentile(ms, [50, 95])
+            phases[phase] = {
+                'total_s': float(ms.sum() * 1e-3),
+                'share': float(np.sum(values) / total_ns) if total_ns else 0.0,
+                'p50_ms': float(p50),
+                'p95_ms': float(p95),
+                'max_ms': float(ms.max()),
+            }
+        summary['phases'] = phases
+        summary['n_variables_max'] = int(max(self._n_variables))
+        summary['n_nonzeros_max'] = int(max(self._n_nonzeros))
+        if self._iterations:
+            summary['iterations_mean'] = float(np.mean(self._iterations))
+            summary['iterations_max'] = int(max(self._iterations))
+        return summary
+
+    def format_table(self) -> str:
+        """Human-readable per-phase table."""
+        summary = self.summary()
+        if not self.n_solves:
+            return "No solves recorded"
+        lines = [f"{'Phase':<11} {'Total s':>8} {'Share':>6} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}"]
+        for phase, s in summary['phases'].items():
+            lines.append(f"{phase:<11} {s['total_s']:>8.2f} {s['share']:>6.1%} {s['p50_ms']:>8.2f} "
+                         f"{s['p95_ms']:>8.2f} {s['max_ms']:>8.2f}")
+        return '\n'.join(lines)
@@ -0,0 +1,118 @@
+"""
+Exact step-function power tariff by bracket enumeration.
+
+The LP optimizers model the monthly power tariff progressively (bracket fill
+fractions z with incremental costs c_trinn), which is a convex piecewise-linear
+under-estimate of the billed step function: the grid operator charges the full
+cost of the bracket the monthly peak falls in.
+
+The step function is exact within one bracket: if the peak is capped below the
+bracket's upper bound, the tariff is at most that bracket's cost. So the exact
+optimum is the cheapest of one LP per candidate bracket, each with the peak
+upper-bounded at the bracket edge and no tariff term in the objective, plus the
+step cost of the peak it actually reaches. The bracket LPs are independent and
+run in a thread pool (HiGHS runs outside the GIL).
+
+**Usage:**
+    from core.step_tariff import bracket_caps, solve_brackets, step_tariff_cost
+
+    caps = bracket_caps(brackets, current_peak_kw, max_peak_kw=import_limit)
+    solved = solve_brackets(lambda cap: solve_with_peak_cap(cap), caps)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, Tuple, TypeVar
+
+import numpy as np
+
+TARIFF_MODES = ('progressive', 'exact')
+
+# Peak caps stay this far below a bracket edge ([from_kw, to_kw) brackets)
+BRACKET_EDGE_KW = 1e-3
+
+Bracket = Tuple[float, float, float]
+SolveResult = TypeVar('SolveResult')
+
+
+def validate_tariff_mode(tariff_mode: str) -> str:
+    """Raise ValueError unless tariff_mode is 'progressive' or 'exact'."""
+    if tariff_mode not in TARIFF_MODES:
+        raise ValueError(f"tariff_mode must be one of {TARIFF_MODES}, got '{tariff_mode}'")
+    return tariff_mode
+
+
+def step_tariff_cost(brackets: Sequence[Bracket], peak_kw: float) -> float:
+    """
+    Monthly power cost of the bracket the peak falls in.
+
+    Same rule as PowerTariffConfig.get_cost(): from_kw <= peak < to_kw, and
+    the highest bracket's cost above all brackets.
+
+    Args:
+        brackets: (from_kw, to_kw, cost_nok_month) tuples, ascending
+        peak_kw: Monthly peak [kW]
+
+    Returns:
+        Monthly tariff [NOK/month]
+    """
+    for from_kw, to_kw, cost in brackets:
+        if from_kw <= peak_kw < to_kw:
+            return cost
+    return brackets[-1][2]
+
+
+def bracket_caps(brackets: Sequence[Bracket], current_peak_kw: float, max_peak_kw: float) -> List[float]:
+    """
+    Peak upper bounds of the brackets the new monthly peak can end up in.
+
+    Brackets entirely below the current peak are unreachable (the peak cannot
+    decrease), and brackets above max_peak_kw (the grid import limit) cannot be
+    reached either; the bracket containing max_peak_kw is capped at it.
+
+    Args:
+        brackets: (from_kw, to_kw, cost_nok_month) tuples, ascending
+        current_peak_kw: Peak already reached this month [kW]
+        max_peak_kw: Highest possible peak [kW]
+
+    Returns:
+        Ascending peak caps [kW], one per candidate bracket
+    """
+    caps = []
+    for from_kw, to_kw, _ in brackets:
+        if to_kw <= current_peak_kw or from_kw > max_peak_kw:
+            continue
+        cap = min(to_kw - BRACKET_EDGE_KW, max_peak_kw)
+        caps.append(max(cap, current_peak_kw))
+        if to_kw > max_peak_kw:
+            break
+    return caps or [max(current_peak_kw, max_peak_kw)]
+
+
+def solve_brackets(
+    solve: Callable[[float], SolveResult],
+    caps: Sequence[float],
+    max_workers: Optional[int] = None
+) -> List[SolveResult]:
+    """
+    Solve one LP per peak cap, concurrently.
+
+    Args:
+        solve: Solves the LP with the peak upper-bounded at the given cap
+        caps: Peak caps [kW]
+        max_workers: Thread pool size (default: one per cap; 1 = sequential)
+
+    Returns:
+        solve(cap) for each cap, in cap order
+    """
+    if max_workers == 1 or len(caps) < 2:
+        return [solve(cap) for cap in caps]
+    with ThreadPoolExecutor(max_workers=max_workers or len(caps)) as pool:
+        return list(pool.map(solve, caps))
+
+
+def cheapest_bracket(costs: Sequence[float]) -> int:
+    """Index of the lowest total cost (failed solves as inf); -1 if none solved."""
+    costs = np.asarray(costs, dtype=float)
+    if not np.isfinite(costs).any():
+        return -1
+    return int(np.argmin(costs))
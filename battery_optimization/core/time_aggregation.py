@@ -10,11 +10,19 @@ Key Use Cases:
 1. Power tariff billing: Aggregate 15-min grid import to hourly peaks
 2. Data preparation: Upsample hourly PVGIS data to 15-min for optimization
 3. Mixed-resolution optimization: 15-min spot trading with hourly power tariffs
+4. Coarsened MPC horizons: fine steps near term, longer blocks further ahead
+5. Regular-grid resampling and alignment on integer epoch offsets (fast path
+   for src.data.file_loaders, with pandas as fallback for irregular input)
 """
 
+from functools import reduce
 import numpy as np
 import pandas as pd
-from typing import Tuple, Union
+from typing import List, Optional, Sequence, Tuple, Union
+
+# ISO 8601 resolutions supported by the data pipeline
+RESOLUTION_MINUTES = {'PT60M': 60, 'PT30M': 30, 'PT15M': 15, 'PT5M': 5}
+NS_PER_MINUTE = 60 * 10**9
 
 
 def aggregate_15min_to_hourly_peak(
@@ -48,12 +56,6 @@ def aggregate_15min_to_hourly_peak(
         values = power_15min
         has_index = False
 
-    # Validate length
-    if len(values) % 4 != 0:
-        raise ValueError(
-            f"15-minute data length must be divisible by 4, got {len(values)}"
-        )
-
     # Validate timestamps if provided
     if timestamps_15min is not None:
         if len(timestamps_15min) != len(values):
@@ -70,6 +72,18 @@ def aggregate_15min_to_hourly_peak(
                     f"Expected 15-minute intervals, got median {median_diff}"
                 )
 
+        # Clock-hour bins (partial hours and DST gaps included)
+        regular = resample_regular(timestamps_15min, values, 60, 'max')
+        if regular is not None:
+            hourly_index, hourly_peaks = regular
+            return pd.Series(hourly_peaks, index=hourly_index) if has_index else hourly_peaks
+
+    # Validate length
+    if len(values) % 4 != 0:
+        raise ValueError(
+            f"15-minute data length must be divisible by 4, got {len(values)}"
+        )
+
     # Reshape to (n_hours, 4) and take max along axis 1
     n_hours = len(values) // 4
     reshaped = values.reshape(n_hours, 4)
@@ -136,20 +150,8 @@ def upsample_hourly_to_15min(
 
     # Return as Series if input was Series and timestamps provided
     if has_index and timestamps_hourly is not None:
-        # Create 15-minute index
-        start = timestamps_hourly[0]
-        end = timestamps_hourly[-1] + pd.Timedelta(hours=1)
-        index_15min = pd.date_range(
-            start=start,
-            end=end,
-            freq='15min',
-            tz=timestamps_hourly.tz
-        )[:-1]  # Exclude last point (end of period)
-
-        # Trim to exact length (handle DST edge cases)
-        index_15min = index_15min[:len(upsampled)]
-
-        return pd.Series(upsampled, index=index_15min)
+        # Four quarters after each hourly timestamp (no quarters in DST gaps)
+        return pd.Series(upsampled, index=subdivide_timestamps(timestamps_hourly, 4))
 
     return upsampled
 
@@ -181,6 +183,12 @@ def aggregate_15min_to_hourly_mean(
         values = data_15min
         has_index = False
 
+    if timestamps_15min is not None:
+        regular = resample_regular(timestamps_15min, values, 60, 'mean')
+        if regular is not None:
+            hourly_index, hourly_means = regular
+            return pd.Series(hourly_means, index=hourly_index) if has_index else hourly_means
+
     # Validate length
     if len(values) % 4 != 0:
         raise ValueError(
@@ -200,6 +208,276 @@ def aggregate_15min_to_hourly_mean(
     return hourly_means
 
 
+def coarsening_block_lengths(
+    n_steps: int,
+    timestep_hours: float,
+    coarsening: Sequence[Tuple[float, float]]
+) -> np.ndarray:
+    """
+    Split a horizon into blocks that get coarser further ahead.
+
+    The native resolution is kept until the first breakpoint. From each
+    breakpoint on, blocks of the given length are used until the next one.
+    A block that would cross a breakpoint (or the horizon end) is shortened.
+
+    Args:
+        n_steps: Horizon length in native timesteps
+        timestep_hours: Native timestep length [hours]
+        coarsening: Ascending (start_hour, block_hours) breakpoints
+
+    Returns:
+        Native timesteps per block (sums to n_steps)
+
+    Example:
+        PT15M, 168h, [(6, 1), (48, 4)] → 24 × 15 min, 42 × 1h, 30 × 4h = 96 blocks
+    """
+    boundaries = [0]
+    sizes = [1]
+    for start_hour, block_hours in coarsening:
+        start = int(round(start_hour / timestep_hours))
+        size = int(round(block_hours / timestep_hours))
+        if start <= boundaries[-1]:
+            raise ValueError(
+                f"Coarsening breakpoints must be positive and ascending, got {list(coarsening)}"
+            )
+        if size < 1 or abs(size * timestep_hours - block_hours) > 1e-9:
+            raise ValueError(
+                f"Block length {block_hours}h is not a multiple of the {timestep_hours}h timestep"
+            )
+        boundaries.append(start)
+        sizes.append(size)
+    boundaries.append(n_steps)
+
+    lengths = []
+    for seg_start, seg_end, size in zip(boundaries[:-1], boundaries[1:], sizes):
+        seg_len = max(0, min(seg_end, n_steps) - seg_start)
+        n_full, remainder = divmod(seg_len, size)
+        lengths.extend([size] * n_full)
+        if remainder:
+            lengths.append(remainder)
+
+    return np.array(lengths, dtype=int)
+
+
+def aggregate_to_blocks(
+    values: np.ndarray,
+    block_lengths: np.ndarray,
+    how: str = 'mean'
+) -> np.ndarray:
+    """
+    Aggregate consecutive values into (possibly unequal) blocks.
+
+    Args:
+        values: Data at native resolution, length sum(block_lengths) along
+            the last axis (e.g. shape (S, T) for S scenarios)
+        block_lengths: Number of values per block
+        how: 'mean' (energy-preserving for power) or 'max' (peaks)
+
+    Returns:
+        One value per block along the last axis
+    """
+    values = np.asarray(values, dtype=float)
+    block_lengths = np.asarray(block_lengths, dtype=int)
+    if block_lengths.sum() != values.shape[-1]:
+        raise ValueError(
+            f"Block lengths sum to {block_lengths.sum()}, data length is {values.shape[-1]}"
+        )
+
+    starts = np.concatenate([[0], np.cumsum(block_lengths)[:-1]])
+    if how == 'mean':
+        return np.add.reduceat(values, starts, axis=-1) / block_lengths
+    elif how == 'max':
+        return np.maximum.reduceat(values, starts, axis=-1)
+    else:
+        raise ValueError(f"Invalid aggregation method: {how}")
+
+
+def grid_step_ns(timestamps: pd.DatetimeIndex) -> Optional[int]:
+    """
+    Step of the regular grid the timestamps lie on, or None.
+
+    Timestamps must be strictly increasing with every gap a whole number of
+    steps. Gaps are allowed, so naive local-time series (missing hour at the
+    spring DST change, dropped duplicate hour in autumn) still qualify;
+    tz-aware timestamps are compared in UTC.
+
+    Args:
+        timestamps: DatetimeIndex to check
+
+    Returns:
+        Smallest interval [ns], or None if the timestamps are irregular
+    """
+    if len(timestamps) < 2:
+        return None
+    diffs = np.diff(timestamps.as_unit('ns').asi8)
+    step = int(diffs.min())
+    if step <= 0 or np.any(diffs % step):
+        return None
+    return step
+
+
+def _index_from_ns(epoch_ns: np.ndarray, like: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """DatetimeIndex from epoch nanoseconds, in the timezone of `like`."""
+    index = pd.DatetimeIndex(epoch_ns.astype('datetime64[ns]'))
+    if like.tz is not None:
+        index = index.tz_localize('UTC').tz_convert(like.tz)
+    return index
+
+
+def subdivide_timestamps(timestamps: pd.DatetimeIndex, factor: int) -> pd.DatetimeIndex:
+    """
+    Split every interval into `factor` sub-intervals.
+
+    Each timestamp is followed by factor - 1 timestamps at step / factor,
+    so sub-intervals never fall into DST gaps or data gaps.
+
+    Args:
+        timestamps: Regular timestamps (interval starts)
+        factor: Sub-intervals per interval
+
+    Returns:
+        DatetimeIndex of length len(timestamps) * factor
+    """
+    step = grid_step_ns(timestamps)
+    if step is None:
+        if len(timestamps) > 1:
+            raise ValueError("Timestamps are not on a regular grid")
+        step = 60 * NS_PER_MINUTE  # Single timestamp: assume hourly
+    offsets = np.arange(factor, dtype=np.int64) * (step // factor)
+    return _index_from_ns((timestamps.as_unit('ns').asi8[:, None] + offsets).ravel(), timestamps)
+
+
+def resample_regular(
+    timestamps: pd.DatetimeIndex,
+    values: np.ndarray,
+    target_minutes: int,
+    method: str = 'mean'
+) -> Optional[Tuple[pd.DatetimeIndex, np.ndarray]]:
+    """
+    Resample a series on a regular grid with integer epoch arithmetic.
+
+    Downsampling bins by integer division of the epoch offsets (labels at bin
+    starts, like DataFrame.resample): dense, aligned series are reshaped and
+    reduced; series with gaps or NaN use bincount/reduceat (empty bins are
+    NaN, or 0 for 'sum'). Upsampling splits every interval into sub-steps:
+    'mean'/'max' hold the value, 'sum' splits it evenly and 'interpolate' is
+    linear between the original points.
+
+    Args:
+        timestamps: Original timestamps
+        values: Original values
+        target_minutes: Target step [minutes]
+        method: 'mean', 'sum', 'max' or 'interpolate'
+
+    Returns:
+        (timestamps, values), or None if the input is not on a regular grid
+        compatible with the target step (use pandas instead)
+    """
+    step = grid_step_ns(timestamps)
+    target = target_minutes * NS_PER_MINUTE
+    if step is None:
+        return None
+    values = np.asarray(values, dtype=float)
+
+    if target % step == 0 and method != 'interpolate':
+        return _downsample_regular(timestamps, values, step, target, method)
+    if step % target == 0 and step > target:
+        return _upsample_regular(timestamps, values, step // target, target, method)
+    return None
+
+
+def _downsample_regular(
+    timestamps: pd.DatetimeIndex,
+    values: np.ndarray,
+    step: int,
+    target: int,
+    method: str
+) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+    """Bin values into target-step bins (see resample_regular)."""
+    epoch = timestamps.as_unit('ns').asi8
+    first_bin = epoch[0] // target
+    bins = epoch // target - first_bin
+    n_bins = int(bins[-1]) + 1
+    factor = target // step
+    labels = _index_from_ns((first_bin + np.arange(n_bins)) * target, timestamps)
+
+    valid = np.isfinite(values)
+    if len(values) == n_bins * factor and valid.all():
+        # No gaps, starts and ends on bin edges
+        blocks = values.reshape(n_bins, factor)
+        reducer = {'mean': np.mean, 'sum': np.sum, 'max': np.max}[method]
+        return labels, reducer(blocks, axis=1)
+
+    bins, values = bins[valid], values[valid]
+    if method == 'sum':
+        return labels, np.bincount(bins, weights=values, minlength=n_bins)
+
+    result = np.full(n_bins, np.nan)
+    if method == 'mean':
+        counts = np.bincount(bins, minlength=n_bins)
+        sums = np.bincount(bins, weights=values, minlength=n_bins)
+        np.divide(sums, counts, out=result, where=counts > 0)
+    elif len(values):
+        starts = np.flatnonzero(np.r_[True, np.diff(bins) != 0])
+        result[bins[starts]] = np.maximum.reduceat(values, starts)
+    return labels, result
+
+
+def _upsample_regular(
+    timestamps: pd.DatetimeIndex,
+    values: np.ndarray,
+    factor: int,
+    target: int,
+    method: str
+) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+    """Split every interval into `factor` target steps (see resample_regular)."""
+    index = subdivide_timestamps(timestamps, factor)
+    if method in ('mean', 'max'):
+        return index, np.repeat(values, factor)
+    if method == 'sum':
+        return index, np.repeat(values / factor, factor)
+
+    # Linear between original points; offsets keep float precision
+    origin = timestamps.as_unit('ns').asi8[0]
+    valid = np.isfinite(values)
+    x = (index.as_unit('ns').asi8 - origin).astype(float)
+    xp = (timestamps.as_unit('ns').asi8[valid] - origin).astype(float)
+    result = np.interp(x, xp, values[valid]) if valid.any() else np.full(len(x), np.nan)
+    if valid.any():
+        result[x < xp[0]] = np.nan
+    return index, result
+
+
+def align_regular(
+    timestamps_list: Sequence[pd.DatetimeIndex],
+    values_list: Sequence[np.ndarray]
+) -> Optional[Tuple[pd.DatetimeIndex, List[np.ndarray]]]:
+    """
+    Align series to their common timestamps on integer epoch offsets.
+
+    Args:
+        timestamps_list: Strictly increasing DatetimeIndex per series
+        values_list: Values per series
+
+    Returns:
+        (common_timestamps, aligned values), or None if any index is unsorted
+        or has duplicates, or the timezones differ (use pandas instead)
+    """
+    if len({str(ts.tz) for ts in timestamps_list}) > 1:
+        return None
+    epochs = [ts.as_unit('ns').asi8 for ts in timestamps_list]
+    if any(len(e) > 1 and np.any(np.diff(e) <= 0) for e in epochs):
+        return None
+
+    if all(np.array_equal(epochs[0], e) for e in epochs[1:]):
+        common = epochs[0]
+        aligned = [np.asarray(v) for v in values_list]
+    else:
+        common = reduce(lambda a, b: np.intersect1d(a, b, assume_unique=True), epochs)
+        aligned = [np.asarray(v)[np.searchsorted(e, common)] for e, v in zip(epochs, values_list)]
+    return _index_from_ns(common, timestamps_list[0]), aligned
+
+
 def validate_resolution(
     data: Union[np.ndarray, pd.Series],
     timestamps: pd.DatetimeIndex,
@@ -326,13 +604,7 @@ def ensure_15min_resolution(
         if isinstance(data_15min, pd.Series):
             return data_15min.values, data_15min.index
         else:
-            # Generate 15-min timestamps
-            start = timestamps[0]
-            end = timestamps[-1] + pd.Timedelta(hours=1)
-            timestamps_15min = pd.date_range(
-                start=start, end=end, freq='15min', tz=timestamps.tz
-            )[:-1]
-            return data_15min, timestamps_15min[:len(data_15min)]
+            return data_15min, subdivide_timestamps(pd.DatetimeIndex(timestamps), 4)
     else:
         raise ValueError(f"Unknown resolution: {current_resolution}")
 
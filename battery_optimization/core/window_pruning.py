@@ -0,0 +1,227 @@
+"""
+Price-spread pruning of rolling horizon windows.
+
+Many windows have an LP optimum that needs no solver: when no energy can be
+stored at a profit and no new monthly peak is at stake, the battery only
+spends the energy it already holds where it is worth most. This module checks
+that cheaply and builds the optimal schedule directly.
+
+A window is prunable when, with the battery idle (import = max(net load, 0),
+export = max(-net load, 0)):
+- grid limits hold without curtailment and the initial energy is within the
+  SOC limits,
+- import costs and export revenues are non-negative (no value in wasting
+  energy) and import costs at least the export revenue (no value in
+  importing to export),
+- the idle imports stay at or below the current monthly peak (discharging
+  can only lower them, so the peak and its tariff term are fixed),
+- no energy stored at step t1 is worth more after round-trip losses at any
+  later step t2 than it costs at t1: eta_c·eta_d·v_out(t2) <= v_in(t1), with
+  v_in the cheapest charging source (forgone export in surplus steps, import
+  otherwise) and v_out the best use (avoided import, or export). Degradation
+  is not credited in this bound: the calendar-aging floor makes small cycles
+  free in the LP.
+
+Then charging never pays and the LP reduces to a fractional knapsack: the
+stored energy above SOC_min is discharged into the steps and segments with
+the highest value per kWh of energy drawn (avoided import, then export, less
+cycling degradation beyond the free calendar allowance). The last step moves
+no energy in the LP's battery dynamics, so it discharges to its limit for
+free. The result is the LP optimum (equal objective; ties may be broken
+differently), so pruning costs nothing.
+
+**Usage:**
+    from core.window_pruning import prune_window
+
+    schedule = prune_window(net_load, c_import, c_export, dt, ...)
+    if schedule is not None:
+        ...  # use schedule.P_discharge, schedule.E_battery, ... instead of solving
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass
+class PrunedSchedule:
+    """Optimal schedule of a prunable window (battery only discharges)."""
+    P_discharge: np.ndarray       # [kW], shape (T,)
+    P_grid_import: np.ndarray     # [kW], shape (T,)
+    P_grid_export: np.ndarray     # [kW], shape (T,)
+    E_battery: np.ndarray         # [kWh], shape (T,), E_battery[0] = initial energy
+    reason: str                   # What made the window prunable
+
+
+def storage_margin(net_load_kw: np.ndarray, c_import: np.ndarray, c_export: np.ndarray,
+                   round_trip_efficiency: float) -> float:
+    """
+    Best value of storing energy in the window [NOK/kWh charged].
+
+    max over t1 < t2 <= T-2 of round_trip_efficiency · v_out(t2) - v_in(t1):
+    energy charged at step t1 is available from step t1 + 1, and the last step
+    moves no energy. Not positive means charging never pays.
+    """
+    T = len(net_load_kw)
+    if T < 3:
+        return -np.inf
+    v_in = np.where(net_load_kw < 0, c_export, c_import)
+    v_out = np.where(net_load_kw > 0, np.maximum(c_import, c_export), c_export)
+
+    # Best use after each step: reverse running maximum over steps t1+1 .. T-2
+    best_later = np.maximum.accumulate(v_out[1:T - 1][::-1])[::-1]
+    return float(np.max(round_trip_efficiency * best_later - v_in[:T - 2]))
+
+
+def prune_window(net_load_kw: np.ndarray,
+                 c_import: np.ndarray,
+                 c_export: np.ndarray,
+                 dt: np.ndarray,
+                 E_initial: float,
+                 E_min: float,
+                 E_max: float,
+                 P_max_discharge: float,
+                 eta_charge: float,
+                 eta_discharge: float,
+                 import_limit_kw: float,
+                 export_limit_kw: float,
+                 current_peak_kw: float,
+                 free_cycling_kwh: np.ndarray,
+                 cycling_cost_per_kwh: float) -> Optional[PrunedSchedule]:
+    """
+    Optimal schedule without an LP, if the window is prunable.
+
+    Args:
+        net_load_kw: Load - PV per step [kW]
+        c_import: Import cost per step [NOK/kWh]
+        c_export: Export revenue per step [NOK/kWh]
+        dt: Step durations [hours]
+        E_initial: Battery energy at the window start [kWh]
+        E_min: Lowest allowed energy [kWh]
+        E_max: Highest allowed energy [kWh]
+        P_max_discharge: Discharge power limit [kW]
+        eta_charge: Charging efficiency
+        eta_discharge: Discharging efficiency
+        import_limit_kw: Grid import limit [kW]
+        export_limit_kw: Grid export limit [kW]
+        current_peak_kw: Monthly peak reached so far [kW]
+        free_cycling_kwh: Energy change per step covered by calendar aging [kWh]
+            (entry t covers the change from step t-1 to t)
+        cycling_cost_per_kwh: Degradation cost of energy change beyond it [NOK/kWh]
+
+    Returns:
+        PrunedSchedule, or None if the window needs the LP
+    """
+    T = len(net_load_kw)
+    import_kw = np.maximum(net_load_kw, 0.0)
+    export_kw = np.maximum(-net_load_kw, 0.0)
+
+    if T < 2 or not (E_min - 1e-9 <= E_initial <= E_max + 1e-9):
+        return None
+    if import_kw.max() > import_limit_kw or export_kw.max() > export_limit_kw:
+        return None
+    if c_export.min() < 0 or np.any(c_import < c_export):
+        return None
+    if import_kw.max() > current_peak_kw:
+        return None
+    if storage_margin(net_load_kw, c_import, c_export, eta_charge * eta_discharge) > 0:
+        return None
+
+    # Delivered energy per step, by value: avoided import, then export
+    import_room = import_kw * dt
+    export_room = (export_limit_kw - export_kw) * dt
+    power_room = P_max_discharge * dt
+
+    # Pieces (marginal value per kWh drawn, kWh drawn, step, avoids import) for steps 0..T-2;
+    # marginal values fall within a step, so sorting all pieces fills each step in order
+    pieces = []
+    for t in range(T - 1):
+        drawn = 0.0
+        power_left = power_room[t] / eta_discharge
+        for value, room, avoids_import in ((c_import[t], import_room[t], True),
+                                           (c_export[t], export_room[t], False)):
+            room = min(room / eta_discharge, power_left)
+            power_left -= room
+            # Split at the free cycling allowance
+            free = min(room, max(free_cycling_kwh[t + 1] - drawn, 0.0))
+            for amount, cost in ((free, 0.0), (room - free, cycling_cost_per_kwh)):
+                marginal = value * eta_discharge - cost
+                if amount > 0 and marginal > 0:
+                    pieces.append((marginal, amount, t, avoids_import))
+            drawn += room
+
+    # Fractional knapsack over the stored energy
+    pieces.sort(key=lambda p: -p[0])
+    budget = max(E_initial - E_min, 0.0)
+    drawn_kwh = np.zeros(T)
+    avoided_import = np.zeros(T)
+    added_export = np.zeros(T)
+    for _, amount, t, avoids_import in pieces:
+        if budget <= 0:
+            break
+        take = min(amount, budget)
+        budget -= take
+        drawn_kwh[t] += take
+        if avoids_import:
+            avoided_import[t] += take * eta_discharge
+        else:
+            added_export[t] += take * eta_discharge
+
+    # Last step: no energy moves, discharge to the limit wherever it has value
+    t = T - 1
+    avoided_import[t] = min(import_room[t], power_room[t]) if c_import[t] > 0 else 0.0
+    if c_export[t] > 0:
+        added_export[t] = min(export_room[t], power_room[t] - avoided_import[t])
+
+    return PrunedSchedule(
+        P_discharge=(avoided_import + added_export) / dt,
+        P_grid_import=import_kw - avoided_import / dt,
+        P_grid_export=export_kw + added_export / dt,
+        E_battery=E_initial - np.concatenate(([0.0], np.cumsum(drawn_kwh[:T - 1]))),
+        reason='no storage margin, peak headroom',
+    )
+
+
+def progressive_tariff_fill(p_trinn: np.ndarray, c_trinn: np.ndarray, peak_kw: float) -> np.ndarray:
+    """
+    Cheapest bracket fill fractions z for a given peak.
+
+    The progressive LP picks z minimizing Σ c_trinn·z subject to
+    Σ p_trinn·z = peak and 1 >= z[0] >= z[1] >= ... >= 0. Such z are convex
+    combinations of "first k brackets full" points, so the cost is the lower
+    convex hull of the cumulative (width, cost) points at the peak; this need
+    not be the fill-in-order allocation when incremental rates are not
+    increasing.
+
+    Raises:
+        ValueError: If the peak exceeds the total bracket width
+    """
+    widths = np.concatenate(([0.0], np.cumsum(p_trinn)))
+    costs = np.concatenate(([0.0], np.cumsum(c_trinn)))
+    if peak_kw > widths[-1] + 1e-9:
+        raise ValueError(f"Peak {peak_kw:.1f} kW exceeds the tariff brackets ({widths[-1]:.1f} kW)")
+
+    # Lower convex hull (monotone chain; widths are ascending)
+    hull = []
+    for k in range(len(widths)):
+        while len(hull) >= 2:
+            a, b = hull[-2], hull[-1]
+            cross = ((widths[b] - widths[a]) * (costs[k] - costs[a])
+                     - (costs[b] - costs[a]) * (widths[k] - widths[a]))
+            if cross > 0:
+                break
+            hull.pop()
+        hull.append(k)
+
+    # Convex combination of the two hull points around the peak
+    weights = np.zeros(len(widths))
+    for a, b in zip(hull, hull[1:]):
+        if peak_kw <= widths[b] + 1e-12:
+            share = (min(max(peak_kw, widths[a]), widths[b]) - widths[a]) / (widths[b] - widths[a])
+            weights[a] = 1.0 - share
+            weights[b] = share
+            break
+
+    # z[i] = weight of the points with bracket i full (points i+1 .. N)
+    return np.cumsum(weights[::-1])[::-1][1:]
@@ -3,16 +3,21 @@
 Battery Optimization System - Unified Entry Point
 ==================================================
 
-Unified simulation system supporting three modes:
+Unified simulation system supporting five modes:
 1. Rolling Horizon: Real-time operation with persistent state
 2. Monthly: Single or multi-month analysis
 3. Yearly: Annual investment analysis with weekly optimizations
+4. Screening: Battery sizing sweep on representative periods
+5. Annual: Annual LP by monthly decomposition (run from a config file)
 
 Usage:
     python main.py run --config configs/rolling_horizon_realtime.yaml
     python main.py rolling --battery-kwh 80 --battery-kw 60
     python main.py monthly --months 1,2,3
     python main.py yearly --resolution PT60M
+    python main.py screen --period-type days --n-periods 25
+    python main.py matrix --config configs/scenario_matrix_2023_2025.yaml
+    python main.py --verbosity quiet run --config configs/monthly_analysis.yaml
 """
 
 import sys
@@ -24,29 +29,39 @@ from typing import Optional
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.config.simulation_config import SimulationConfig
+from src.config.verbosity import VERBOSITY_LEVELS, configure_logging
 from src.simulation import (
     RollingHorizonOrchestrator,
     MonthlyOrchestrator,
     YearlyOrchestrator,
+    AnnualOrchestrator,
+    ScreeningOrchestrator,
+    ScenarioMatrixConfig,
+    ScenarioMatrixOrchestrator,
 )
 
 
-def run_from_config(config_path: Path) -> None:
+def run_from_config(config_path: Path, verbosity: Optional[str] = None) -> None:
     """
     Run simulation from YAML configuration file.
 
     Args:
         config_path: Path to YAML configuration file
+        verbosity: Overrides the config's verbosity if given
     """
     print(f"Loading configuration from: {config_path}")
 
     try:
         config = SimulationConfig.from_yaml(config_path)
+        if verbosity is not None:
+            config.verbosity = verbosity
         config.validate()
     except Exception as e:
         print(f"Error loading configuration: {e}")
         sys.exit(1)
 
+    configure_logging(config.verbosity)
+
     # Select orchestrator based on mode
     if config.mode == "rolling_horizon":
         orchestrator = RollingHorizonOrchestrator(config)
@@ -55,6 +70,10 @@ def run_from_config(config_path: Path) -> None:
         orchestrator = MonthlyOrchestrator(config)
     elif config.mode == "yearly":
         orchestrator = YearlyOrchestrator(config)
+    elif config.mode == "annual":
+        orchestrator = AnnualOrchestrator(config)
+    elif config.mode == "screening":
+        orchestrator = ScreeningOrchestrator(config)
     else:
         print(f"Error: Unknown mode '{config.mode}'")
         sys.exit(1)
@@ -78,6 +97,38 @@ def run_from_config(config_path: Path) -> None:
     print("="*70)
 
 
+def run_scenario_matrix(config_path: Path, verbosity: Optional[str] = None) -> None:
+    """
+    Run scenario matrix from YAML file and print the comparison table.
+
+    Args:
+        config_path: Path to scenario matrix YAML file
+        verbosity: Overrides the base config's verbosity if given
+    """
+    print(f"Loading scenario matrix from: {config_path}")
+
+    try:
+        matrix = ScenarioMatrixConfig.from_yaml(config_path)
+        if verbosity is not None:
+            matrix.base_config.verbosity = verbosity
+        matrix.base_config.validate()
+    except Exception as e:
+        print(f"Error loading scenario matrix: {e}")
+        sys.exit(1)
+
+    configure_logging(matrix.base_config.verbosity)
+
+    if matrix.output_file is None:
+        matrix.output_file = str(Path(matrix.base_config.output_dir) / "scenario_matrix.csv")
+
+    comparison = ScenarioMatrixOrchestrator(matrix).run()
+
+    columns = [c for c in ('price', 'profile', 'battery_kwh', 'battery_kw', 'grid_cost_nok',
+                           'savings_nok', 'error') if c in comparison]
+    print("\n" + comparison[columns].to_string(index=False))
+    print(f"\nComparison table saved to: {matrix.output_file}")
+
+
 def run_rolling_horizon(args) -> None:
     """Quick rolling horizon simulation with command-line parameters."""
     # Create config programmatically
@@ -110,6 +161,7 @@ def run_rolling_horizon(args) -> None:
             update_frequency_minutes=args.update_freq,
         ),
         output_dir=args.output_dir,
+        verbosity=args.verbosity or "info",
     )
 
     orchestrator = RollingHorizonOrchestrator(config)
@@ -153,6 +205,7 @@ def run_monthly(args) -> None:
         ),
         monthly=MonthlyModeConfig(months=months),
         output_dir=args.output_dir,
+        verbosity=args.verbosity or "info",
     )
 
     orchestrator = MonthlyOrchestrator(config)
@@ -193,6 +246,7 @@ def run_yearly(args) -> None:
             weeks=args.weeks,
         ),
         output_dir=args.output_dir,
+        verbosity=args.verbosity or "info",
     )
 
     orchestrator = YearlyOrchestrator(config)
@@ -202,6 +256,50 @@ def run_yearly(args) -> None:
     results.save_all(output_dir, save_plots=True)
 
 
+def run_screening(args) -> None:
+    """Quick representative-period sizing sweep with command-line parameters."""
+    from src.config.simulation_config import (
+        SimulationConfig,
+        DataSourceConfig,
+        DimensioningConfig,
+        ScreeningModeConfig,
+        SimulationPeriodConfig,
+    )
+
+    config = SimulationConfig(
+        mode="screening",
+        time_resolution=args.resolution,
+        simulation_period=SimulationPeriodConfig(
+            start_date=args.start_date,
+            end_date=args.end_date,
+        ),
+        data_sources=DataSourceConfig(
+            prices_file=args.prices_file,
+            production_file=args.production_file,
+            consumption_file=args.consumption_file,
+        ),
+        screening=ScreeningModeConfig(
+            period_type=args.period_type,
+            n_periods=args.n_periods,
+            aggregation_hours=args.aggregation_hours,
+            n_anchor_sizes=args.anchors,
+            top_n=args.top_n,
+        ),
+        dimensioning=DimensioningConfig(
+            energy_range_kwh=tuple(float(v) for v in args.energy_range.split(',')),
+            power_range_kw=tuple(float(v) for v in args.power_range.split(',')),
+        ),
+        output_dir=args.output_dir,
+        verbosity=args.verbosity or "info",
+    )
+
+    orchestrator = ScreeningOrchestrator(config)
+    results = orchestrator.run()
+
+    output_dir = Path(args.output_dir)
+    results.save_all(output_dir, save_plots=True)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Battery Optimization System - Unified Entry Point",
@@ -216,9 +314,16 @@ Examples:
   python main.py rolling --battery-kwh 80 --battery-kw 60
   python main.py monthly --months 1,2,3 --resolution PT60M
   python main.py yearly --weeks 52
+  python main.py screen --period-type weeks --n-periods 12 --top-n 5
+
+  # Price years x consumption profiles x battery sizes
+  python main.py matrix --config configs/scenario_matrix_2023_2025.yaml
         """
     )
 
+    parser.add_argument("--verbosity", type=str, choices=list(VERBOSITY_LEVELS), default=None,
+                        help="Console output: quiet, info or debug (default: info, or the config's value)")
+
     subparsers = parser.add_subparsers(dest="command", help="Command to run")
 
     # RUN command (from YAML config)
@@ -226,6 +331,11 @@ Examples:
     run_parser.add_argument("--config", type=str, required=True,
                            help="Path to YAML configuration file")
 
+    # MATRIX command (scenario matrix from YAML)
+    matrix_parser = subparsers.add_parser("matrix", help="Run scenario matrix from YAML file")
+    matrix_parser.add_argument("--config", type=str, required=True,
+                              help="Path to scenario matrix YAML file")
+
     # Default data paths
     default_prices = "data/spot_prices/2024_NO2_hourly.csv"
     default_production = "data/pv_profiles/pvgis_stavanger_2024.csv"
@@ -307,28 +417,69 @@ Examples:
     yearly_parser.add_argument("--output-dir", type=str, default="results/yearly",
                                help="Output directory")
 
+    # SCREEN command (representative-period sizing sweep)
+    screen_parser = subparsers.add_parser("screen", help="Quick battery sizing screening")
+    screen_parser.add_argument("--period-type", type=str, default="days",
+                              choices=["days", "weeks"],
+                              help="Representative period type")
+    screen_parser.add_argument("--n-periods", type=int, default=25,
+                              help="Number of representative periods (k-means clusters)")
+    screen_parser.add_argument("--aggregation-hours", type=int, default=1,
+                              help="Temporal aggregation inside each period (hours)")
+    screen_parser.add_argument("--anchors", type=int, default=3,
+                              help="Anchor sizes run on full year to report compression error")
+    screen_parser.add_argument("--top-n", type=int, default=5,
+                              help="Best screened sizes re-run at full resolution")
+    screen_parser.add_argument("--energy-range", type=str, default="20,201,30",
+                              help="Battery kWh grid as start,stop,step")
+    screen_parser.add_argument("--power-range", type=str, default="10,101,15",
+                              help="Battery kW grid as start,stop,step")
+    screen_parser.add_argument("--resolution", type=str, default="PT60M",
+                              choices=["PT60M", "PT15M"],
+                              help="Time resolution for full-year verification")
+    screen_parser.add_argument("--start-date", type=str, default="2024-01-01",
+                              help="Start date (YYYY-MM-DD)")
+    screen_parser.add_argument("--end-date", type=str, default="2024-12-31",
+                              help="End date (YYYY-MM-DD)")
+    screen_parser.add_argument("--prices-file", type=str, default=default_prices,
+                              help="Prices CSV file")
+    screen_parser.add_argument("--production-file", type=str, default=default_production,
+                              help="Production CSV file")
+    screen_parser.add_argument("--consumption-file", type=str, default=default_consumption,
+                              help="Consumption CSV file")
+    screen_parser.add_argument("--output-dir", type=str, default="results/screening",
+                              help="Output directory")
+
     args = parser.parse_args()
 
     if not args.command:
         print("Battery Optimization System v2.0")
         print("=================================")
-        print("\nUnified simulation system with three modes:")
+        print("\nUnified simulation system with four modes:")
         print("  1. Rolling Horizon - Real-time operation")
         print("  2. Monthly - Single/multi-month analysis")
         print("  3. Yearly - Annual investment analysis")
+        print("  4. Screening - Battery sizing on representative periods")
         print("\nUse -h for help on available commands")
         parser.print_help()
         sys.exit(1)
 
+    if args.command not in ("run", "matrix"):
+        configure_logging(args.verbosity or "info")
+
     # Route to appropriate function
     if args.command == "run":
-        run_from_config(Path(args.config))
+        run_from_config(Path(args.config), args.verbosity)
+    elif args.command == "matrix":
+        run_scenario_matrix(Path(args.config), args.verbosity)
     elif args.command == "rolling":
         run_rolling_horizon(args)
     elif args.command == "monthly":
         run_monthly(args)
     elif args.command == "yearly":
         run_yearly(args)
+    elif args.command == "screen":
+        run_screening(args)
 
 
 if __name__ == "__main__":
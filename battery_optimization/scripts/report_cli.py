@@ -12,6 +12,7 @@ Usage:
     python scripts/report_cli.py plots <result_id>       # Generate plots
     python scripts/report_cli.py export <result_id>      # Export CSV files
     python scripts/report_cli.py compare <id1> <id2>     # Compare two results
+    python scripts/report_cli.py window <id>... --start --end  # Trajectory slice across results
     python scripts/report_cli.py stats                   # Show storage statistics
 """
 
@@ -202,6 +203,40 @@ def cmd_compare(storage: ResultStorage, result_id1: str, result_id2: str) -> Non
     print("=" * 100)
 
 
+def cmd_window(
+    storage: ResultStorage,
+    result_ids: List[str],
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    output_file: Optional[str] = None
+) -> None:
+    """Summarize a trajectory window across results (reads only that slice)."""
+    start_dt = datetime.fromisoformat(start) if start else None
+    end_dt = datetime.fromisoformat(end) if end else None
+
+    window = storage.query_trajectories(
+        result_ids=result_ids or None, columns=columns, start=start_dt, end=end_dt
+    )
+
+    if window.empty:
+        print("No trajectory data in the requested window.")
+        return
+
+    summary = window.groupby('result_id').agg(['mean', 'min', 'max'])
+    print(f"\nTrajectory window {start or 'start'} → {end or 'end'} "
+          f"({window['result_id'].nunique()} result(s), {len(window)} rows)")
+    print("=" * 100)
+    print(summary.to_string(float_format=lambda v: f"{v:,.2f}"))
+    print("=" * 100)
+
+    if output_file:
+        output_path = Path(output_file)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        window.to_csv(output_path)
+        print(f"✓ Window exported to: {output_path.absolute()}")
+
+
 def cmd_stats(storage: ResultStorage) -> None:
     """Show storage statistics."""
     stats = storage.get_storage_stats()
@@ -268,6 +303,10 @@ Examples:
   # Compare two results
   python scripts/report_cli.py compare result1_id result2_id
 
+  # Compare one week of battery energy across results
+  python scripts/report_cli.py window result1_id result2_id \\
+      --start 2024-06-03 --end 2024-06-10 --columns E_battery_kwh
+
   # Show storage statistics
   python scripts/report_cli.py stats
         """
@@ -309,6 +348,14 @@ Examples:
     parser_compare.add_argument('result_id1', help='First result ID')
     parser_compare.add_argument('result_id2', help='Second result ID')
 
+    # Window command
+    parser_window = subparsers.add_parser('window', help='Trajectory slice across results')
+    parser_window.add_argument('result_ids', nargs='*', help='Result IDs (default: all)')
+    parser_window.add_argument('--start', help='Window start (ISO date, inclusive)')
+    parser_window.add_argument('--end', help='Window end (ISO date, exclusive)')
+    parser_window.add_argument('--columns', nargs='+', help='Trajectory columns to load')
+    parser_window.add_argument('-o', '--output', help='Export window to CSV')
+
     # Stats command
     parser_stats = subparsers.add_parser('stats', help='Show storage statistics')
 
@@ -340,6 +387,9 @@ Examples:
             cmd_export(storage, args.result_id, output_dir=args.output_dir)
         elif args.command == 'compare':
             cmd_compare(storage, args.result_id1, args.result_id2)
+        elif args.command == 'window':
+            cmd_window(storage, args.result_ids, start=args.start, end=args.end,
+                       columns=args.columns, output_file=args.output)
         elif args.command == 'stats':
             cmd_stats(storage)
         elif args.command == 'delete':
@@ -0,0 +1,218 @@
+"""
+Benchmark: Coarsened (multi-resolution) MPC horizon vs. full resolution
+
+Runs the same closed-loop rolling horizon simulation with a native-resolution
+168h horizon and with coarsened horizons (fine steps near term, hourly and
+4h blocks further ahead), and compares:
+- LP size (steps per re-optimization)
+- Solve time per re-optimization
+- Realized cost (energy + power tariff + degradation) and regret vs. full
+
+Every variant executes the same native-resolution steps, so cost differences
+come only from the planning horizon.
+
+Usage:
+    python scripts/testing/benchmark_coarsened_horizon.py --days 14
+    python scripts/testing/benchmark_coarsened_horizon.py --start 2024-07-01 --coarsening 6:1,48:4
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config.legacy_config_adapter import get_global_legacy_config
+from src.config.simulation_config import SimulationConfig
+from src.data.data_manager import DataManager, TimeSeriesData
+from src.operational.state_manager import BatterySystemState
+from core.rolling_horizon_optimizer import RollingHorizonOptimizer
+from core.time_aggregation import upsample_hourly_to_15min
+
+
+DEFAULT_SCHEDULES = {
+    'full': None,
+    '6h fine, then 1h': [(6, 1)],
+    '6h fine, 1h, 4h from 96h': [(6, 1), (96, 4)],
+    '6h fine, 1h, 4h from 48h': [(6, 1), (48, 4)],
+    '2h fine, 1h, 2h from 24h': [(2, 1), (24, 2)],
+}
+
+
+def parse_coarsening(spec: str):
+    """Parse '6:1,48:4' into [(6.0, 1.0), (48.0, 4.0)]."""
+    return [tuple(float(v) for v in part.split(':')) for part in spec.split(',')]
+
+
+def load_data(config_path: Path, resolution: str) -> TimeSeriesData:
+    """Load aligned hourly price/PV/load series, upsampled to 15-min if requested."""
+    config = SimulationConfig.from_yaml(config_path)
+    config.time_resolution = 'PT60M'
+    data = DataManager(config).load_data()
+    if resolution == 'PT60M':
+        return data
+
+    # Hourly values held constant over each quarter hour
+    return TimeSeriesData(
+        timestamps=pd.date_range(data.timestamps[0], periods=4 * len(data), freq='15min'),
+        prices_nok_per_kwh=upsample_hourly_to_15min(data.prices_nok_per_kwh),
+        pv_production_kw=upsample_hourly_to_15min(data.pv_production_kw),
+        consumption_kw=upsample_hourly_to_15min(data.consumption_kw),
+        resolution='PT15M',
+    )
+
+
+def simulate(data, start, days, horizon_hours, update_minutes, battery_kwh, battery_kw,
+             resolution, coarsening):
+    """
+    Closed-loop rolling horizon simulation with perfect forecasts.
+
+    Returns:
+        dict with realized cost components, LP size and solve times
+    """
+    config = get_global_legacy_config()
+    with contextlib.redirect_stdout(io.StringIO()):
+        optimizer = RollingHorizonOptimizer(
+            config, battery_kwh=battery_kwh, battery_kw=battery_kw,
+            horizon_hours=horizon_hours, resolution=resolution,
+            compact=True, coarsening=coarsening
+        )
+
+    dt = optimizer.timestep_hours
+    T = optimizer.T
+    execute_steps = int(round(update_minutes / 60 / dt))
+    if coarsening and execute_steps * dt > coarsening[0][0]:
+        raise ValueError("Executed steps must lie within the native-resolution part of the horizon")
+
+    timestamps = data.timestamps
+    first = int(np.searchsorted(timestamps, pd.Timestamp(start)))
+    n_sim = int(days * 24 / dt)
+    if first + n_sim + T > len(timestamps):
+        raise ValueError("Not enough data for the simulation period plus one horizon")
+
+    state = BatterySystemState(
+        current_soc_kwh=0.5 * battery_kwh,
+        battery_capacity_kwh=battery_kwh,
+        month_start_date=timestamps[first].to_pydatetime().replace(day=1, hour=0, minute=0),
+        last_update=timestamps[first].to_pydatetime(),
+    )
+
+    executed = {key: [] for key in ('P_grid_import', 'P_grid_export', 'E_battery')}
+    solve_times = []
+    lp_steps = None
+
+    for t0 in range(first, first + n_sim, execute_steps):
+        window = slice(t0, t0 + T)
+        start_time = time.perf_counter()
+        result = optimizer.optimize_window(
+            state,
+            data.pv_production_kw[window],
+            data.consumption_kw[window],
+            data.prices_nok_per_kwh[window],
+            timestamps[window],
+        )
+        solve_times.append(time.perf_counter() - start_time)
+        if not result.success:
+            raise RuntimeError(f"Optimization failed at {timestamps[t0]}: {result.message}")
+        lp_steps = len(result.P_charge)
+
+        # Apply the first steps of the plan (native resolution)
+        n = min(execute_steps, first + n_sim - t0)
+        for k in range(n):
+            soc_after = result.E_battery[k + 1] if k + 1 < lp_steps else result.E_battery[k]
+            state.update_from_measurement(
+                timestamps[t0 + k].to_pydatetime(), soc_after, result.P_grid_import[k]
+            )
+        executed['P_grid_import'].extend(result.P_grid_import[:n])
+        executed['P_grid_export'].extend(result.P_grid_export[:n])
+        executed['E_battery'].extend(result.E_battery[:n])
+
+    sim_ts = timestamps[first:first + n_sim]
+    P_import = np.array(executed['P_grid_import'])
+    P_export = np.array(executed['P_grid_export'])
+    E_battery = np.append(executed['E_battery'], state.current_soc_kwh)
+
+    c_import, c_export = optimizer.get_energy_costs(
+        sim_ts, data.prices_nok_per_kwh[first:first + n_sim]
+    )
+    energy_cost = np.sum((c_import * P_import - c_export * P_export) * dt)
+
+    monthly_peaks = pd.Series(P_import, index=sim_ts).groupby(sim_ts.month).max()
+    tariff_cost = sum(config.tariff.get_power_cost(peak) for peak in monthly_peaks)
+
+    dod = np.abs(np.diff(E_battery)) / battery_kwh
+    dp = np.maximum(optimizer.rho_constant * dod, optimizer.dp_cal_per_timestep)
+    degradation_cost = dp.sum() * optimizer.battery_cost_nok_per_kwh * battery_kwh / optimizer.eol_degradation_pct
+
+    return {
+        'lp_steps': lp_steps,
+        'solves': len(solve_times),
+        'solve_ms': 1000 * np.mean(solve_times),
+        'energy_cost': energy_cost,
+        'tariff_cost': tariff_cost,
+        'degradation_cost': degradation_cost,
+        'total_cost': energy_cost + tariff_cost + degradation_cost,
+        'peak_kw': monthly_peaks.max(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--config', type=Path, default=project_root / 'configs' / 'screening_2024.yaml')
+    parser.add_argument('--start', default='2024-03-04')
+    parser.add_argument('--days', type=float, default=14)
+    parser.add_argument('--horizon-hours', type=int, default=168)
+    parser.add_argument('--update-minutes', type=int, default=60)
+    parser.add_argument('--resolution', default='PT15M', choices=['PT15M', 'PT60M'])
+    parser.add_argument('--battery-kwh', type=float, default=80)
+    parser.add_argument('--battery-kw', type=float, default=40)
+    parser.add_argument('--coarsening', action='append', default=None,
+                        help="Extra schedule as start_hour:block_hours pairs, e.g. 6:1,48:4")
+    args = parser.parse_args()
+
+    schedules = dict(DEFAULT_SCHEDULES)
+    for spec in args.coarsening or []:
+        schedules[spec] = parse_coarsening(spec)
+
+    print(f"\n{'='*90}")
+    print("COARSENED HORIZON BENCHMARK")
+    print(f"{'='*90}")
+    print(f"  Period: {args.start} + {args.days:g} days, {args.resolution}, "
+          f"horizon {args.horizon_hours}h, re-optimize every {args.update_minutes} min")
+    print(f"  Battery: {args.battery_kwh:g} kWh / {args.battery_kw:g} kW")
+
+    data = load_data(args.config, args.resolution)
+
+    results = {}
+    for name, coarsening in schedules.items():
+        print(f"\nRunning '{name}'...")
+        results[name] = simulate(
+            data, args.start, args.days, args.horizon_hours, args.update_minutes,
+            args.battery_kwh, args.battery_kw, args.resolution, coarsening
+        )
+
+    reference = results['full']
+    print(f"\n{'Schedule':<26} {'Steps':>5} {'ms/solve':>8} {'Speedup':>7} {'Energy':>8} "
+          f"{'Tariff':>7} {'Degr.':>6} {'Peak kW':>7} {'Total':>8} {'Regret':>14}")
+    print('-' * 108)
+    for name, r in results.items():
+        regret = r['total_cost'] - reference['total_cost']
+        print(f"{name:<26} {r['lp_steps']:>5} {r['solve_ms']:>8.1f} "
+              f"{reference['solve_ms'] / r['solve_ms']:>6.1f}× {r['energy_cost']:>8,.0f} "
+              f"{r['tariff_cost']:>7,.0f} {r['degradation_cost']:>6,.0f} {r['peak_kw']:>7.1f} "
+              f"{r['total_cost']:>8,.0f} {regret:>7,.0f} ({100 * regret / reference['total_cost']:+.2f}%)")
+    print("\nCosts in NOK; the tariff uses the step function on realized monthly peaks.")
+
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark: Rolling horizon execution policies
+
+Runs RollingHorizonOrchestrator on the same config with different execution
+policies and compares LP solves against realized cost:
+- periodic, re-solve every timestep (reference)
+- periodic, commit the first k plan steps per solve
+- event_triggered with different maximum plan ages
+
+Cost = spot energy cost + power tariff (step function) on the realized
+monthly peaks.
+
+Usage:
+    python scripts/testing/benchmark_execution_policies.py
+    python scripts/testing/benchmark_execution_policies.py --config configs/working_config.yaml --end 2024-06-15
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config.legacy_config_adapter import get_global_legacy_config
+from src.config.simulation_config import SimulationConfig
+from src.simulation.rolling_horizon_orchestrator import RollingHorizonOrchestrator
+
+
+POLICIES = {
+    'every step': dict(execution_policy='periodic', execute_steps=1),
+    'periodic k=2': dict(execution_policy='periodic', execute_steps=2),
+    'periodic k=4': dict(execution_policy='periodic', execute_steps=4),
+    'event, max age 4h': dict(execution_policy='event_triggered', max_plan_age_hours=4),
+    'event, max age 8h': dict(execution_policy='event_triggered', max_plan_age_hours=8),
+    'event, max age 24h': dict(execution_policy='event_triggered', max_plan_age_hours=24),
+}
+
+
+def run_policy(config: SimulationConfig, settings: dict) -> dict:
+    """Run one simulation and return execution stats plus realized cost."""
+    config = copy.deepcopy(config)
+    for key, value in settings.items():
+        setattr(config.rolling_horizon, key, value)
+
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        results = RollingHorizonOrchestrator(config).run()
+
+    trajectory = results.trajectory
+    stats = results.metadata['execution_stats']
+    monthly_peaks = trajectory['P_grid_import_kw'].groupby(trajectory.index.month).max()
+    tariff = get_global_legacy_config().tariff
+    stats['power_tariff_nok'] = float(sum(tariff.get_power_cost(p) for p in monthly_peaks))
+    stats['total_cost_nok'] = stats['spot_energy_cost_nok'] + stats['power_tariff_nok']
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--config', type=Path, default=project_root / 'configs' / 'working_config.yaml')
+    parser.add_argument('--end', default=None, help="Override simulation end date (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    config = SimulationConfig.from_yaml(args.config)
+    if args.end:
+        config.simulation_period.end_date = args.end
+
+    print(f"\n{'='*100}")
+    print("EXECUTION POLICY BENCHMARK")
+    print(f"{'='*100}")
+    print(f"  Config: {args.config}")
+    print(f"  Period: {config.simulation_period.start_date} to {config.simulation_period.end_date}, "
+          f"{config.time_resolution}, horizon {config.rolling_horizon.horizon_hours}h")
+
+    results = {}
+    for name, settings in POLICIES.items():
+        print(f"  Running '{name}'...")
+        results[name] = run_policy(config, settings)
+
+    reference = results['every step']
+    print(f"\n{'Policy':<20} {'Solves':>6} {'Avoided':>8} {'Solve s':>8} {'Energy':>8} "
+          f"{'Peak kW':>7} {'Tariff':>7} {'Total':>8} {'Δ cost':>16}  Triggers")
+    print('-' * 100)
+    for name, r in results.items():
+        delta = r['total_cost_nok'] - reference['total_cost_nok']
+        triggers = ', '.join(f"{k}={v}" for k, v in sorted(r['triggers'].items()))
+        print(f"{name:<20} {r['solves']:>6} {100 * (1 - r['solve_fraction']):>7.0f}% "
+              f"{r['solve_time_s']:>8.1f} {r['spot_energy_cost_nok']:>8,.0f} {r['max_peak_kw']:>7.1f} "
+              f"{r['power_tariff_nok']:>7,.0f} {r['total_cost_nok']:>8,.0f} "
+              f"{delta:>8,.0f} ({100 * delta / abs(reference['total_cost_nok']):+.1f}%)  {triggers}")
+
+    return pd.DataFrame(results).T
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""
+Benchmark: Forecasting subsystem
+
+1. Accuracy: MAE of each forecaster over all issue steps of a year, against
+   simple baselines (persistence of the last value, seasonal naive).
+2. Speed: vectorized precompute() vs. the incremental update()/forecast()
+   loop for the same forecasts.
+3. Closed loop: rolling horizon simulation with perfect foresight vs.
+   forecast='models' (cost of forecast error and forecasting overhead).
+
+Usage:
+    python scripts/testing/benchmark_forecasting.py
+    python scripts/testing/benchmark_forecasting.py --skip-simulation
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config.legacy_config_adapter import get_global_legacy_config
+from src.config.simulation_config import SimulationConfig
+from src.data.data_manager import DataManager
+from src.forecasting import (
+    ClearSkyPersistenceForecaster,
+    DayAheadPriceForecaster,
+    SeasonalNaiveForecaster,
+    SeasonalSmoothingForecaster,
+    clear_sky_profile,
+)
+from src.simulation.rolling_horizon_orchestrator import RollingHorizonOrchestrator
+
+
+def mean_abs_error(table, values, horizon):
+    """MAE over all issue steps with a full horizon ahead."""
+    issues = range(1, len(values) - horizon)
+    return np.mean([np.abs(table.window(i, horizon) - values[i:i + horizon]).mean() for i in issues])
+
+
+def persistence_mae(values, horizon):
+    """MAE of repeating the last observation."""
+    issues = np.arange(1, len(values) - horizon)
+    errors = [np.abs(values[i:i + horizon] - values[i - 1]).mean() for i in issues]
+    return np.mean(errors)
+
+
+def time_paths(make_forecaster, values, horizon):
+    """
+    Seconds for the vectorized and incremental paths.
+
+    Returns:
+        (precompute() of all states, window() for every issue step,
+         update()/forecast() loop over every issue step)
+    """
+    n_issues = len(values) - horizon
+
+    start = time.perf_counter()
+    table = make_forecaster().precompute(values)
+    precompute_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(n_issues):
+        table.window(i, horizon)
+    windows_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    forecaster = make_forecaster()
+    for i in range(n_issues):
+        forecaster.forecast(horizon)
+        forecaster.update(values[i])
+    incremental_s = time.perf_counter() - start
+    return precompute_s, windows_s, incremental_s
+
+
+def run_simulation(config, forecast):
+    """Rolling horizon run; returns (runtime s, stats with realized cost)."""
+    config = copy.deepcopy(config)
+    config.rolling_horizon.forecast = forecast
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        results = RollingHorizonOrchestrator(config).run()
+    runtime_s = time.perf_counter() - start
+
+    trajectory = results.trajectory
+    stats = results.metadata['execution_stats']
+    monthly_peaks = trajectory['P_grid_import_kw'].groupby(trajectory.index.month).max()
+    tariff = get_global_legacy_config().tariff
+    stats['power_tariff_nok'] = float(sum(tariff.get_power_cost(p) for p in monthly_peaks))
+    stats['total_cost_nok'] = stats['spot_energy_cost_nok'] + stats['power_tariff_nok']
+    return runtime_s, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--data-config', type=Path, default=project_root / 'configs' / 'screening_2024.yaml')
+    parser.add_argument('--sim-config', type=Path, default=project_root / 'configs' / 'working_config.yaml')
+    parser.add_argument('--horizon-hours', type=int, default=24)
+    parser.add_argument('--skip-simulation', action='store_true')
+    args = parser.parse_args()
+
+    config = SimulationConfig.from_yaml(args.data_config)
+    config.time_resolution = 'PT60M'
+    data = DataManager(config).load_data()
+    H = args.horizon_hours
+
+    clear_sky = clear_sky_profile(data.timestamps, data.pv_production_kw)
+    models = {
+        'PV': (data.pv_production_kw, [
+            ('clear-sky persistence', lambda: ClearSkyPersistenceForecaster(clear_sky)),
+            ('daily naive', lambda: SeasonalNaiveForecaster(24)),
+        ]),
+        'Load': (data.consumption_kw, [
+            ('weekly smoothing', lambda: SeasonalSmoothingForecaster(168)),
+            ('weekly naive', lambda: SeasonalNaiveForecaster(168)),
+            ('daily naive', lambda: SeasonalNaiveForecaster(24)),
+        ]),
+        'Price': (data.prices_nok_per_kwh, [
+            ('day-ahead + fallback', lambda: DayAheadPriceForecaster(data.timestamps, data.prices_nok_per_kwh)),
+            ('daily naive', lambda: SeasonalNaiveForecaster(24)),
+        ]),
+    }
+
+    print(f"\n{'='*90}")
+    print("FORECASTING BENCHMARK")
+    print(f"{'='*90}")
+    print(f"  Data: {data.timestamps[0]} to {data.timestamps[-1]} ({len(data)} hourly steps), horizon {H}h")
+
+    print(f"\n{'Series':<7} {'Model':<24} {'MAE':>8} {'Precompute':>11} {'Windows':>9} {'Incremental':>12}")
+    print('-' * 90)
+    for series, (values, candidates) in models.items():
+        for name, make in candidates:
+            mae = mean_abs_error(make().precompute(values), values, H)
+            precompute_s, windows_s, incremental_s = time_paths(make, values, H)
+            print(f"{series:<7} {name:<24} {mae:>8.3f} {precompute_s * 1000:>9.1f}ms "
+                  f"{windows_s * 1000:>7.0f}ms {incremental_s * 1000:>10.0f}ms")
+        print(f"{series:<7} {'persistence':<24} {persistence_mae(values, H):>8.3f}")
+    print("\nMAE in kW (PV, load) and NOK/kWh (price). Precompute fits all states at once; "
+          "Windows slices every\nissue step from them; Incremental feeds the same steps through update()/forecast().")
+
+    if args.skip_simulation:
+        return
+
+    sim_config = SimulationConfig.from_yaml(args.sim_config)
+    print(f"\nClosed loop: {args.sim_config.name}, {sim_config.simulation_period.start_date} to "
+          f"{sim_config.simulation_period.end_date}, {sim_config.rolling_horizon.execution_policy}")
+    runs = {forecast: run_simulation(sim_config, forecast) for forecast in ('perfect', 'models')}
+    reference = runs['perfect'][1]['total_cost_nok']
+    print(f"\n{'Forecast':<10} {'Runtime':>8} {'Solves':>6} {'Energy':>8} {'Peak kW':>7} {'Tariff':>7} "
+          f"{'Total':>8} {'Δ cost':>8}")
+    print('-' * 90)
+    for forecast, (runtime_s, r) in runs.items():
+        delta = r['total_cost_nok'] - reference
+        print(f"{forecast:<10} {runtime_s:>7.1f}s {r['solves']:>6} {r['spot_energy_cost_nok']:>8,.0f} "
+              f"{r['max_peak_kw']:>7.1f} {r['power_tariff_nok']:>7,.0f} {r['total_cost_nok']:>8,.0f} "
+              f"{100 * delta / abs(reference):>+7.1f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+"""
+Benchmark: Scenario-based (stochastic) MPC vs. deterministic MPC under forecast error
+
+Runs a closed-loop rolling horizon simulation where the optimizer only sees
+noisy PV/load forecasts and the executed battery setpoint meets the realized
+data. Compares:
+- deterministic: optimize_window() on the point forecast
+- stochastic: optimize_scenarios() on S scenarios drawn around the forecast,
+  with a shared (robust) monthly peak or a per-scenario (expected) peak
+
+Forecast errors are multiplicative AR(1) paths that start at zero (the current
+timestep is measured) and grow with lead time. Both controllers see the same
+forecasts, so cost differences come only from how they use them.
+
+Also reports solve time per re-optimization for S = 1..20.
+
+Usage:
+    python scripts/testing/benchmark_scenario_mpc.py --days 14
+    python scripts/testing/benchmark_scenario_mpc.py --start 2024-01-08 --scenarios 10 --load-sigma 0.1
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config.legacy_config_adapter import get_global_legacy_config
+from src.config.simulation_config import SimulationConfig
+from src.data.data_manager import DataManager
+from src.operational.state_manager import BatterySystemState
+from core.rolling_horizon_optimizer import RollingHorizonOptimizer
+from core.time_aggregation import upsample_hourly_to_15min
+
+
+def ar1_errors(rng, n_paths, T, sigma, phi=0.9):
+    """Multiplicative AR(1) forecast errors, zero at lead time 0, shape (n_paths, T)."""
+    innovations = sigma * np.sqrt(1 - phi**2) * rng.standard_normal((n_paths, T))
+    errors = np.zeros((n_paths, T))
+    for t in range(1, T):
+        errors[:, t] = phi * errors[:, t - 1] + innovations[:, t]
+    return errors
+
+
+def simulate(data, start, days, optimizer, n_scenarios, load_sigma, pv_sigma, seed, shared_peak=False):
+    """
+    Closed-loop simulation; n_scenarios = 0 runs the deterministic controller.
+
+    Returns:
+        dict with realized cost components and solve times
+    """
+    config = get_global_legacy_config()
+    rng = np.random.default_rng(seed)
+    scenario_rng = np.random.default_rng(seed + 1)
+
+    T = optimizer.T
+    dt = optimizer.timestep_hours
+    timestamps = data.timestamps
+    first = int(np.searchsorted(timestamps, pd.Timestamp(start)))
+    n_sim = int(days * 24 / dt)
+    if first + n_sim + T > len(timestamps):
+        raise ValueError("Not enough data for the simulation period plus one horizon")
+
+    state = BatterySystemState(
+        current_soc_kwh=0.5 * optimizer.E_nom,
+        battery_capacity_kwh=optimizer.E_nom,
+        month_start_date=timestamps[first].to_pydatetime().replace(day=1, hour=0, minute=0),
+        last_update=timestamps[first].to_pydatetime(),
+    )
+
+    P_import, P_export, throughput, solve_times = [], [], [], []
+
+    for t0 in range(first, first + n_sim):
+        window = slice(t0, t0 + T)
+        load_true = data.consumption_kw[window]
+        pv_true = data.pv_production_kw[window]
+
+        # Point forecast (same draw for both controllers)
+        load_fc = load_true * (1 + ar1_errors(rng, 1, T, load_sigma)[0])
+        pv_fc = np.clip(pv_true * (1 + ar1_errors(rng, 1, T, pv_sigma)[0]), 0, None)
+
+        start_time = time.perf_counter()
+        if n_scenarios == 0:
+            result = optimizer.optimize_window(
+                state, pv_fc, load_fc, data.prices_nok_per_kwh[window], timestamps[window]
+            )
+            p_charge, p_discharge = result.P_charge[0], result.P_discharge[0]
+        else:
+            load_sc = load_fc * (1 + ar1_errors(scenario_rng, n_scenarios, T, load_sigma))
+            pv_sc = np.clip(pv_fc * (1 + ar1_errors(scenario_rng, n_scenarios, T, pv_sigma)), 0, None)
+            result = optimizer.optimize_scenarios(
+                state, pv_sc, load_sc, data.prices_nok_per_kwh[window], timestamps[window],
+                shared_peak=shared_peak
+            )
+            p_charge, p_discharge = result.P_charge[0, 0], result.P_discharge[0, 0]
+        solve_times.append(time.perf_counter() - start_time)
+        if not result.success:
+            raise RuntimeError(f"Optimization failed at {timestamps[t0]}: {result.message}")
+
+        # Execute the setpoint against realized load and PV
+        net_kw = load_true[0] - pv_true[0] + p_charge - p_discharge
+        P_import.append(max(net_kw, 0.0))
+        P_export.append(max(-net_kw, 0.0))
+        soc = (state.current_soc_kwh
+               + (optimizer.eta_charge * p_charge - p_discharge / optimizer.eta_discharge) * dt)
+        throughput.append(abs(soc - state.current_soc_kwh))
+        state.update_from_measurement(timestamps[t0].to_pydatetime(), soc, P_import[-1])
+
+    sim_ts = timestamps[first:first + n_sim]
+    P_import, P_export = np.array(P_import), np.array(P_export)
+    c_import, c_export = optimizer.get_energy_costs(sim_ts, data.prices_nok_per_kwh[first:first + n_sim])
+    energy_cost = np.sum((c_import * P_import - c_export * P_export) * dt)
+
+    monthly_peaks = pd.Series(P_import, index=sim_ts).groupby(sim_ts.month).max()
+    tariff_cost = sum(config.tariff.get_power_cost(peak) for peak in monthly_peaks)
+
+    dp = np.maximum(optimizer.rho_constant * np.array(throughput) / optimizer.E_nom,
+                    optimizer.dp_cal_per_timestep)
+    degradation_cost = dp.sum() * optimizer.battery_cost_nok_per_kwh * optimizer.E_nom / optimizer.eol_degradation_pct
+
+    return {
+        'solve_ms': 1000 * np.mean(solve_times),
+        'energy_cost': energy_cost,
+        'tariff_cost': tariff_cost,
+        'degradation_cost': degradation_cost,
+        'total_cost': energy_cost + tariff_cost + degradation_cost,
+        'peak_kw': monthly_peaks.max(),
+    }
+
+
+def time_scenario_counts(data, start, optimizer, counts, repeats=5):
+    """Mean solve time [ms] of optimize_scenarios() per scenario count (15-min optimizer)."""
+    rng = np.random.default_rng(0)
+    T = optimizer.T
+    first = int(np.searchsorted(data.timestamps, pd.Timestamp(start)))
+    hourly = slice(first, first + T // 4)
+    timestamps = pd.date_range(data.timestamps[first], periods=T, freq='15min')
+    prices = upsample_hourly_to_15min(data.prices_nok_per_kwh[hourly])
+    state = BatterySystemState(current_soc_kwh=0.5 * optimizer.E_nom, battery_capacity_kwh=optimizer.E_nom)
+    timings = {}
+    for S in counts:
+        load = upsample_hourly_to_15min(data.consumption_kw[hourly]) * (1 + ar1_errors(rng, S, T, 0.1))
+        pv = np.clip(upsample_hourly_to_15min(data.pv_production_kw[hourly])
+                     * (1 + ar1_errors(rng, S, T, 0.3)), 0, None)
+        times = []
+        for _ in range(repeats):
+            result = optimizer.optimize_scenarios(state, pv, load, prices, timestamps)
+            times.append(result.solve_time_seconds)
+        timings[S] = 1000 * np.mean(times)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--config', type=Path, default=project_root / 'configs' / 'screening_2024.yaml')
+    parser.add_argument('--start', default='2024-01-08')
+    parser.add_argument('--days', type=float, default=14)
+    parser.add_argument('--horizon-hours', type=int, default=24)
+    parser.add_argument('--battery-kwh', type=float, default=80)
+    parser.add_argument('--battery-kw', type=float, default=40)
+    parser.add_argument('--scenarios', type=int, action='append', default=None,
+                        help="Scenario counts to simulate (default: 5, 10, 20)")
+    parser.add_argument('--load-sigma', type=float, default=0.10, help="Long-lead load forecast error (relative)")
+    parser.add_argument('--pv-sigma', type=float, default=0.30, help="Long-lead PV forecast error (relative)")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    scenario_counts = args.scenarios or [5, 10, 20]
+
+    config = SimulationConfig.from_yaml(args.config)
+    config.time_resolution = 'PT60M'
+    data = DataManager(config).load_data()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        optimizer = RollingHorizonOptimizer(
+            get_global_legacy_config(), battery_kwh=args.battery_kwh, battery_kw=args.battery_kw,
+            horizon_hours=args.horizon_hours, resolution='PT60M', compact=True
+        )
+
+    print(f"\n{'='*90}")
+    print("SCENARIO MPC BENCHMARK")
+    print(f"{'='*90}")
+    print(f"  Period: {args.start} + {args.days:g} days, hourly, horizon {args.horizon_hours}h")
+    print(f"  Battery: {args.battery_kwh:g} kWh / {args.battery_kw:g} kW")
+    print(f"  Forecast error: load σ={args.load_sigma:.0%}, PV σ={args.pv_sigma:.0%} (AR(1))")
+
+    runs = {'deterministic': (0, False)}
+    for S in scenario_counts:
+        runs[f'S={S}, shared peak'] = (S, True)
+        runs[f'S={S}, expected peak'] = (S, False)
+
+    results = {}
+    for name, (S, shared_peak) in runs.items():
+        print(f"\nRunning '{name}'...")
+        results[name] = simulate(
+            data, args.start, args.days, optimizer, S, args.load_sigma, args.pv_sigma, args.seed,
+            shared_peak=shared_peak
+        )
+
+    reference = results['deterministic']
+    print(f"\n{'Controller':<22} {'ms/solve':>8} {'Energy':>8} {'Tariff':>7} {'Degr.':>6} "
+          f"{'Peak kW':>7} {'Total':>8} {'Δ vs det.':>16}")
+    print('-' * 90)
+    for name, r in results.items():
+        delta = r['total_cost'] - reference['total_cost']
+        print(f"{name:<22} {r['solve_ms']:>8.1f} {r['energy_cost']:>8,.0f} {r['tariff_cost']:>7,.0f} "
+              f"{r['degradation_cost']:>6,.0f} {r['peak_kw']:>7.1f} {r['total_cost']:>8,.0f} "
+              f"{delta:>8,.0f} ({100 * delta / reference['total_cost']:+.2f}%)")
+    print("\nCosts in NOK; the tariff uses the step function on realized monthly peaks.")
+
+    print(f"\nSolve time per re-optimization (15-min resolution, {args.horizon_hours}h horizon):")
+    with contextlib.redirect_stdout(io.StringIO()):
+        optimizer_15min = RollingHorizonOptimizer(
+            get_global_legacy_config(), battery_kwh=args.battery_kwh, battery_kw=args.battery_kw,
+            horizon_hours=args.horizon_hours, resolution='PT15M', compact=True
+        )
+    timings = time_scenario_counts(data, args.start, optimizer_15min, [1, 5, 10, 20])
+    for S, ms in timings.items():
+        print(f"  S={S:>2}: {ms:7.1f} ms")
+
+    return results
+
+
+if __name__ == '__main__':
+    main()
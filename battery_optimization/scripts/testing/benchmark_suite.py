@@ -0,0 +1,348 @@
+"""
+Benchmark suite: optimizers, orchestrators and data paths
+
+Times a fixed set of cases on deterministic synthetic inputs (seeded) and the
+bundled 2024 NO2 data, writes the timings as JSON and optionally compares them
+with an earlier run.
+
+Cases:
+- rolling_horizon.optimize_window  24h/168h × PT60M/PT15M, synthetic
+- monthly_lp.optimize_month        June at PT60M and PT15M, synthetic
+- orchestrator.<mode>              annual run on the 2024 data
+                                   (rolling horizon commits 24 steps per solve)
+- data.get_window                  all 168h windows of the 2024 data
+- economics.calculate_total_cost   annual bill of the 2024 data
+- simulator.simulate_year          rule-based strategy over the 2024 data
+
+Each case is set up once, run once to warm up, then timed `repeat` times with
+time.perf_counter_ns(). The median is the compared statistic.
+
+Usage:
+    python scripts/testing/benchmark_suite.py
+    python scripts/testing/benchmark_suite.py --filter optimize_window --repeat 10
+    python scripts/testing/benchmark_suite.py --output results/benchmarks/baseline.json
+    python scripts/testing/benchmark_suite.py --compare results/benchmarks/baseline.json --threshold 0.2
+
+With --compare the exit status is 1 if any case's median is more than
+`threshold` (relative) slower than in the baseline file.
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import scipy
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config.legacy_config_adapter import get_global_legacy_config
+from src.config.simulation_config import SimulationConfig
+from src.data.data_manager import DataManager
+from src.operational.state_manager import BatterySystemState
+from src.simulation import MonthlyOrchestrator, RollingHorizonOrchestrator, YearlyOrchestrator
+from core.battery import Battery
+from core.economic_cost import calculate_total_cost
+from core.lp_monthly_optimizer import MonthlyLPOptimizer
+from core.rolling_horizon_optimizer import RollingHorizonOptimizer
+from core.simulator import BatterySimulator
+from core.strategies import SimpleRuleStrategy
+
+
+DATA_CONFIG = project_root / 'configs' / 'screening_2024.yaml'
+RESULTS_DIR = project_root / 'results' / 'benchmarks'
+SEED = 42
+
+
+@dataclass
+class Case:
+    """One benchmark: setup() returns the zero-argument callable to time."""
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    repeat: int = 5
+
+
+CASES: List[Case] = []
+
+
+def case(name: str, repeat: int = 5):
+    """Register a setup function as a benchmark case."""
+    def register(setup):
+        CASES.append(Case(name, setup, repeat))
+        return setup
+    return register
+
+
+@contextlib.contextmanager
+def silenced():
+    """Discard Python and C-level (HiGHS) output to stdout/stderr."""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved = os.dup(1), os.dup(2)
+    with open(os.devnull, 'w') as devnull:
+        os.dup2(devnull.fileno(), 1)
+        os.dup2(devnull.fileno(), 2)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                yield
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(saved[0], 1)
+            os.dup2(saved[1], 2)
+            os.close(saved[0])
+            os.close(saved[1])
+
+
+# =============================================================================
+# Inputs
+# =============================================================================
+
+def synthetic_window(hours: int, resolution: str, start: str = '2024-06-03'):
+    """Seeded PV, load, price and timestamps with daily structure."""
+    steps_per_hour = 1 if resolution == 'PT60M' else 4
+    T = hours * steps_per_hour
+    rng = np.random.default_rng(SEED)
+    timestamps = pd.date_range(start, periods=T, freq='h' if resolution == 'PT60M' else '15min')
+    hour = timestamps.hour.values + timestamps.minute.values / 60
+    pv = np.clip(100 * np.sin((hour - 5) / 14 * np.pi), 0, None) * rng.uniform(0.5, 1.0, T)
+    load = 30 + 20 * ((hour >= 8) & (hour < 17)) + rng.uniform(0, 10, T)
+    prices = 0.6 + 0.5 * ((hour >= 17) & (hour < 21)) - 0.2 * (hour < 5) + rng.normal(0, 0.05, T)
+    return pv, load, prices, timestamps
+
+
+@lru_cache(maxsize=None)
+def annual_config() -> SimulationConfig:
+    config = SimulationConfig.from_yaml(DATA_CONFIG)
+    config.time_resolution = 'PT60M'
+    return config
+
+
+@lru_cache(maxsize=None)
+def annual_data():
+    """Bundled 2024 NO2 prices, PV and consumption at PT60M."""
+    with silenced():
+        return DataManager(annual_config()).load_data()
+
+
+# =============================================================================
+# Cases
+# =============================================================================
+
+def _optimize_window_case(hours: int, resolution: str):
+    def setup():
+        with silenced():
+            optimizer = RollingHorizonOptimizer(
+                config=get_global_legacy_config(), battery_kwh=80, battery_kw=60,
+                horizon_hours=hours, resolution=resolution
+            )
+        pv, load, prices, timestamps = synthetic_window(hours, resolution)
+        state = BatterySystemState(current_soc_kwh=40.0, battery_capacity_kwh=80,
+                                   current_monthly_peak_kw=30.0)
+        return lambda: optimizer.optimize_window(state, pv, load, prices, timestamps)
+    return setup
+
+
+for _hours in (24, 168):
+    for _resolution in ('PT60M', 'PT15M'):
+        case(f'rolling_horizon.optimize_window[{_hours}h-{_resolution}]')(
+            _optimize_window_case(_hours, _resolution)
+        )
+
+
+def _optimize_month_case(resolution: str):
+    def setup():
+        with silenced():
+            optimizer = MonthlyLPOptimizer(get_global_legacy_config(), resolution=resolution,
+                                           battery_kwh=80, battery_kw=60)
+        pv, load, prices, timestamps = synthetic_window(30 * 24, resolution, start='2024-06-01')
+        return lambda: optimizer.optimize_month(6, pv, load, prices, timestamps, E_initial=40.0)
+    return setup
+
+
+case('monthly_lp.optimize_month[PT60M]')(_optimize_month_case('PT60M'))
+case('monthly_lp.optimize_month[PT15M]', repeat=3)(_optimize_month_case('PT15M'))
+
+
+def _orchestrator_case(orchestrator_class, mode: str, **rolling_horizon):
+    def setup():
+        config = copy.deepcopy(annual_config())
+        config.mode = mode
+        for key, value in rolling_horizon.items():
+            setattr(config.rolling_horizon, key, value)
+        data = annual_data()
+
+        def run():
+            orchestrator = orchestrator_class(config)
+            orchestrator.data_manager = DataManager(config, data=data)
+            return orchestrator.run()
+        return run
+    return setup
+
+
+case('orchestrator.monthly', repeat=3)(_orchestrator_case(MonthlyOrchestrator, 'monthly'))
+case('orchestrator.yearly', repeat=3)(_orchestrator_case(YearlyOrchestrator, 'yearly'))
+case('orchestrator.rolling_horizon', repeat=3)(
+    _orchestrator_case(RollingHorizonOrchestrator, 'rolling_horizon', execute_steps=24)
+)
+
+
+@case('data.get_window')
+def _get_window():
+    data = annual_data()
+    starts = [ts.to_pydatetime() for ts in data.timestamps[:-168:24]]
+    return lambda: [data.get_window(start, 168, allow_partial=True) for start in starts]
+
+
+@case('economics.calculate_total_cost')
+def _calculate_total_cost():
+    data = annual_data()
+    net = data.consumption_kw - data.pv_production_kw
+    grid_import, grid_export = np.maximum(net, 0.0), np.maximum(-net, 0.0)
+    return lambda: calculate_total_cost(grid_import, grid_export, data.timestamps,
+                                        data.prices_nok_per_kwh)
+
+
+@case('simulator.simulate_year', repeat=3)
+def _simulate_year():
+    data = annual_data()
+    production = pd.Series(data.pv_production_kw, index=data.timestamps)
+    consumption = pd.Series(data.consumption_kw, index=data.timestamps)
+    prices = pd.Series(data.prices_nok_per_kwh, index=data.timestamps)
+    simulator = BatterySimulator(SimpleRuleStrategy(), Battery(capacity_kwh=80, power_kw=60))
+    return lambda: simulator.simulate_year(production, consumption, prices)
+
+
+# =============================================================================
+# Running and comparing
+# =============================================================================
+
+def time_case(bench: Case, repeat: Optional[int] = None) -> Dict:
+    """Warm up once, then time `repeat` runs."""
+    repeat = repeat or bench.repeat
+    with silenced():
+        run = bench.setup()
+        run()
+        samples_ns = []
+        for _ in range(repeat):
+            start = time.perf_counter_ns()
+            run()
+            samples_ns.append(time.perf_counter_ns() - start)
+
+    ms = np.asarray(samples_ns) * 1e-6
+    return {
+        'median_ms': float(np.median(ms)),
+        'min_ms': float(ms.min()),
+        'mean_ms': float(ms.mean()),
+        'stdev_ms': float(ms.std(ddof=1)) if len(ms) > 1 else 0.0,
+        'repeat': repeat,
+    }
+
+
+def environment() -> Dict:
+    """Machine and library versions stored alongside the timings."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=project_root,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Print median changes against a baseline run.
+
+    Returns:
+        Names of cases slower than the baseline by more than `threshold`
+    """
+    print(f"\n{'Case':<46} {'Baseline':>10} {'Current':>10} {'Change':>8}")
+    print('-' * 78)
+    regressions = []
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            print(f"{name:<46} {'-':>10} {result['median_ms']:>8.1f}ms {'new':>8}")
+            continue
+        change = result['median_ms'] / base['median_ms'] - 1.0
+        flag = ''
+        if change > threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:<46} {base['median_ms']:>8.1f}ms {result['median_ms']:>8.1f}ms "
+              f"{change:>+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--filter', default=None, help='Only run cases whose name contains this')
+    parser.add_argument('--repeat', type=int, default=None, help='Override timed runs per case')
+    parser.add_argument('--output', type=Path, default=None,
+                        help='JSON file (default: results/benchmarks/benchmark_<timestamp>.json)')
+    parser.add_argument('--compare', type=Path, default=None, help='Baseline JSON to compare with')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Allowed relative slowdown of the median (default 0.25)')
+    parser.add_argument('--list', action='store_true', help='List cases and exit')
+    args = parser.parse_args()
+
+    cases = [c for c in CASES if args.filter is None or args.filter in c.name]
+    if args.list:
+        print('\n'.join(c.name for c in cases))
+        return 0
+
+    print(f"\n{'='*78}")
+    print("BENCHMARK SUITE")
+    print(f"{'='*78}")
+    print(f"{'Case':<46} {'Median':>10} {'Min':>10} {'Runs':>5}")
+    print('-' * 78)
+
+    run = {'created_at': datetime.now().isoformat(timespec='seconds'), 'environment': environment(),
+           'results': {}}
+    for bench in cases:
+        result = time_case(bench, args.repeat)
+        run['results'][bench.name] = result
+        print(f"{bench.name:<46} {result['median_ms']:>8.1f}ms {result['min_ms']:>8.1f}ms "
+              f"{result['repeat']:>5}")
+
+    output = args.output or RESULTS_DIR / f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(run, indent=2))
+    print(f"\nSaved: {output}")
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare(run, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) slower than baseline by more than "
+                  f"{args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
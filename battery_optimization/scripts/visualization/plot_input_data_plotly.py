@@ -12,6 +12,7 @@ Features:
 - Tariff zone highlighting and duration curves
 - Full year analysis with monthly aggregates
 - Norsk Solkraft theme compliance
+- Annual timeseries downsampled (MinMax-LTTB) and rendered with WebGL
 
 Usage:
     python scripts/visualization/plot_input_data_plotly.py
@@ -33,6 +34,7 @@ sys.path.insert(0, str(Path(__file__).parents[2]))
 from core.pvgis_solar import PVGISProduction
 from core.price_fetcher import ENTSOEPriceFetcher
 from core.consumption_profiles import ConsumptionProfile
+from core.reporting.downsampling import downsample_indices, point_budget, scatter_class
 from src.visualization.norsk_solkraft_theme import (
     apply_light_theme,
     get_brand_colors,
@@ -164,6 +166,15 @@ def load_and_validate_input_data(year=2024):
 # VISUALIZATION COMPONENTS
 # ═══════════════════════════════════════════════════════════════════════════
 
+# Points per timeseries trace (2 per pixel of a dashboard column)
+MAX_POINTS = point_budget()
+
+
+def downsampled(series):
+    """Series reduced to MAX_POINTS, keeping its shape, minimum and maximum"""
+    return series.iloc[downsample_indices(series.values, MAX_POINTS, x=series.index)]
+
+
 def create_price_timeseries(prices, colors, grays):
     """Row 1 Left: Annual spot price timeseries with tariff zones"""
 
@@ -184,14 +195,15 @@ def create_price_timeseries(prices, colors, grays):
     )
 
     # Price line
-    fig.add_scatter(
-        x=prices.index,
-        y=prices.values,
+    prices_ds = downsampled(prices)
+    fig.add_trace(scatter_class(len(prices_ds))(
+        x=prices_ds.index,
+        y=prices_ds.values,
         mode='lines',
         name='Spot Price',
         line=dict(color=colors['oransje'], width=1.5),
         hovertemplate='<b>%{x|%d.%m.%Y %H:%M}</b><br>Price: %{y:.3f} NOK/kWh<extra></extra>'
-    )
+    ))
 
     # Mean price line
     mean_price = prices.mean()
@@ -288,19 +300,20 @@ def create_pv_timeseries(production, colors, grays):
     fig = go.Figure()
 
     # Production area chart
-    fig.add_scatter(
-        x=production.index,
-        y=production.values,
+    production_ds = downsampled(production)
+    fig.add_trace(scatter_class(len(production_ds))(
+        x=production_ds.index,
+        y=production_ds.values,
         fill='tozeroy',
         mode='lines',
         name='Solar Production',
         line=dict(color=colors['gul'], width=1),
         fillcolor=f"rgba(252, 200, 8, 0.3)",  # Transparent yellow
         hovertemplate='<b>%{x|%d.%m.%Y %H:%M}</b><br>Production: %{y:.1f} kW<extra></extra>'
-    )
+    ))
 
     # Monthly aggregates (rolling 24h average for visibility)
-    monthly_avg = production.rolling(window=24*7, min_periods=1).mean()
+    monthly_avg = downsampled(production.rolling(window=24*7, min_periods=1).mean())
     fig.add_scatter(
         x=monthly_avg.index,
         y=monthly_avg.values,
@@ -366,16 +379,17 @@ def create_consumption_timeseries(consumption, colors, grays):
     fig = go.Figure()
 
     # Consumption area chart
-    fig.add_scatter(
-        x=consumption.index,
-        y=consumption.values,
+    consumption_ds = downsampled(consumption)
+    fig.add_trace(scatter_class(len(consumption_ds))(
+        x=consumption_ds.index,
+        y=consumption_ds.values,
         fill='tozeroy',
         mode='lines',
         name='Consumption',
         line=dict(color=colors['blå'], width=1),
         fillcolor=f"rgba(0, 96, 159, 0.2)",  # Transparent blue
         hovertemplate='<b>%{x|%d.%m.%Y %H:%M}</b><br>Load: %{y:.1f} kW<extra></extra>'
-    )
+    ))
 
     # Baseload line (minimum consumption)
     baseload = consumption.quantile(0.05)  # 5th percentile as baseload
@@ -410,9 +424,10 @@ def create_duration_curve(data, title, grid_limit=None, colors=None, grays=None)
     fig = go.Figure()
 
     # Main curve
+    idx = downsample_indices(sorted_data, MAX_POINTS, x=percentiles)
     fig.add_scatter(
-        x=percentiles,
-        y=sorted_data,
+        x=percentiles[idx],
+        y=sorted_data[idx],
         mode='lines',
         name='Load',
         line=dict(width=2, color=colors['blå']),
@@ -459,12 +474,14 @@ def create_net_load_timeseries(net_load, colors, grays):
     # Separate positive and negative for different colors
     net_load_pos = net_load.copy()
     net_load_pos[net_load_pos < 0] = 0
+    net_load_pos = downsampled(net_load_pos)
 
     net_load_neg = net_load.copy()
     net_load_neg[net_load_neg > 0] = 0
+    net_load_neg = downsampled(net_load_neg)
 
     # Grid import (positive)
-    fig.add_scatter(
+    fig.add_trace(scatter_class(len(net_load_pos))(
         x=net_load_pos.index,
         y=net_load_pos.values,
         fill='tozeroy',
@@ -473,10 +490,10 @@ def create_net_load_timeseries(net_load, colors, grays):
         line=dict(color=colors['mørk_rød'], width=0.5),
         fillcolor=f"rgba(183, 28, 28, 0.3)",
         hovertemplate='<b>%{x|%d.%m.%Y %H:%M}</b><br>Import: %{y:.1f} kW<extra></extra>'
-    )
+    ))
 
     # Solar export (negative)
-    fig.add_scatter(
+    fig.add_trace(scatter_class(len(net_load_neg))(
         x=net_load_neg.index,
         y=net_load_neg.values,
         fill='tozeroy',
@@ -485,7 +502,7 @@ def create_net_load_timeseries(net_load, colors, grays):
         line=dict(color=colors['mose_grønn'], width=0.5),
         fillcolor=f"rgba(168, 216, 168, 0.3)",
         hovertemplate='<b>%{x|%d.%m.%Y %H:%M}</b><br>Excess: %{y:.1f} kW<extra></extra>'
-    )
+    ))
 
     # Zero line
     fig.add_hline(
@@ -515,7 +532,8 @@ def create_curtailment_scatter(production, consumption, colors, grays, grid_limi
 
     fig = go.Figure()
 
-    fig.add_scatter(
+    # One marker per hour: WebGL keeps the full point cloud responsive
+    fig.add_trace(scatter_class(len(consumption))(
         x=consumption.values,
         y=production.values,
         mode='markers',
@@ -528,7 +546,7 @@ def create_curtailment_scatter(production, consumption, colors, grays, grid_limi
         ),
         name='Operating Points',
         hovertemplate='Consumption: %{x:.1f} kW<br>Production: %{y:.1f} kW<extra></extra>'
-    )
+    ))
 
     # Grid limit boundary line
     fig.add_hline(
@@ -561,12 +579,30 @@ def create_curtailment_scatter(production, consumption, colors, grays, grid_limi
     return fig
 
 
-def create_monthly_balance(production, consumption, prices, colors, grays):
+def monthly_input_aggregates(production, consumption, prices, grid_limit=77):
+    """Monthly aggregates shared by the Row 5 panels (one vectorized pass)"""
+    frame = pd.DataFrame({
+        'production': production,
+        'consumption': consumption,
+        'price': prices,
+        'curtailed': (production > grid_limit).astype(int),
+    })
+    return frame.resample('ME').agg(
+        max_solar_kw=('production', 'max'),
+        max_load_kw=('consumption', 'max'),
+        avg_price=('price', 'mean'),
+        solar_kwh=('production', 'sum'),
+        load_kwh=('consumption', 'sum'),
+        curtailment_hours=('curtailed', 'sum'),
+    )
+
+
+def create_monthly_balance(monthly, colors, grays):
     """Row 5 Left: Monthly energy balance"""
 
     # Aggregate by month
-    monthly_prod = production.resample('M').sum() / 1000  # MWh
-    monthly_cons = consumption.resample('M').sum() / 1000  # MWh
+    monthly_prod = monthly['solar_kwh'] / 1000  # MWh
+    monthly_cons = monthly['load_kwh'] / 1000  # MWh
     monthly_net = monthly_cons - monthly_prod
 
     months = [m.strftime('%b') for m in monthly_prod.index]
@@ -606,25 +642,20 @@ def create_monthly_balance(production, consumption, prices, colors, grays):
     return fig
 
 
-def create_monthly_statistics_table(production, consumption, prices, colors, grays):
+def create_monthly_statistics_table(monthly, colors, grays):
     """Row 5 Right: Monthly statistics table"""
 
-    # Calculate monthly stats
     monthly_stats = pd.DataFrame({
-        'Max Solar (kW)': production.resample('M').max(),
-        'Max Load (kW)': consumption.resample('M').max(),
-        'Avg Price (NOK/kWh)': prices.resample('M').mean(),
-        'Solar Energy (MWh)': production.resample('M').sum() / 1000,
-        'Load Energy (MWh)': consumption.resample('M').sum() / 1000
+        'Max Solar (kW)': monthly['max_solar_kw'],
+        'Max Load (kW)': monthly['max_load_kw'],
+        'Avg Price (NOK/kWh)': monthly['avg_price'],
+        'Solar Energy (MWh)': monthly['solar_kwh'] / 1000,
+        'Load Energy (MWh)': monthly['load_kwh'] / 1000,
+        'Curtailment Hours': monthly['curtailment_hours'],
     })
 
     monthly_stats.index = [m.strftime('%b %Y') for m in monthly_stats.index]
 
-    # Calculate curtailment hours per month
-    curtailment = production - 77
-    curtailment_hours = (curtailment > 0).resample('M').sum()
-    monthly_stats['Curtailment Hours'] = curtailment_hours.values
-
     # Create table
     fig = go.Figure(data=[go.Table(
         header=dict(
@@ -873,13 +904,15 @@ def create_validation_dashboard(data):
         fig.add_trace(trace, row=4, col=2)
 
     print("5. Creating Row 5: Monthly Aggregates...")
+    monthly = monthly_input_aggregates(production, consumption, prices)
+
     # Row 5 Left: Monthly balance
-    monthly_bal = create_monthly_balance(production, consumption, prices, colors, grays)
+    monthly_bal = create_monthly_balance(monthly, colors, grays)
     for trace in monthly_bal.data:
         fig.add_trace(trace, row=5, col=1)
 
     # Row 5 Right: Monthly stats table
-    monthly_table = create_monthly_statistics_table(production, consumption, prices, colors, grays)
+    monthly_table = create_monthly_statistics_table(monthly, colors, grays)
     for trace in monthly_table.data:
         fig.add_trace(trace, row=5, col=2)
 
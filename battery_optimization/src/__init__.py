@@ -12,6 +12,7 @@ Main Components:
 - Simulation: Orchestration of simulations over various time horizons
 - Persistence: Result storage and metadata tracking
 - Operational: Battery state management and control
+- Forecasting: PV, load and price forecasts for rolling horizon control
 
 Quick Start:
     >>> from src.config import SimulationConfig
@@ -53,6 +54,7 @@ Public API Exports:
         - RollingHorizonOrchestrator: Rolling horizon simulation
         - MonthlyOrchestrator: Monthly simulation
         - YearlyOrchestrator: Yearly simulation
+        - ScreeningOrchestrator: Representative-period sizing sweep
 
     Persistence:
         - ResultStorage: Result storage and retrieval
@@ -118,6 +120,7 @@ from src.simulation.simulation_results import SimulationResults
 from src.simulation.rolling_horizon_orchestrator import RollingHorizonOrchestrator
 from src.simulation.monthly_orchestrator import MonthlyOrchestrator
 from src.simulation.yearly_orchestrator import YearlyOrchestrator
+from src.simulation.screening_orchestrator import ScreeningOrchestrator
 
 # Persistence
 from src.persistence import (
@@ -159,6 +162,7 @@ __all__ = [
     "RollingHorizonOrchestrator",
     "MonthlyOrchestrator",
     "YearlyOrchestrator",
+    "ScreeningOrchestrator",
 
     # Persistence
     "ResultStorage",
@@ -5,6 +5,7 @@ Provides dataclass-based configuration management with YAML support.
 
 Main Components:
     - SimulationConfig: Primary configuration dataclass
+    - configure_logging / apply_verbosity: Run-level console verbosity
 
 Usage:
     >>> from src.config import SimulationConfig
@@ -18,7 +19,11 @@ Usage:
 """
 
 from .simulation_config import SimulationConfig
+from .verbosity import VERBOSITY_LEVELS, apply_verbosity, configure_logging
 
 __all__ = [
     "SimulationConfig",
+    "VERBOSITY_LEVELS",
+    "apply_verbosity",
+    "configure_logging",
 ]
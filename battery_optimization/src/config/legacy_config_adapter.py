@@ -8,15 +8,24 @@ This adapter provides a complete legacy config structure matching the
 original config.py to ensure core/rolling_horizon_optimizer.py works.
 
 REFACTORED: Now uses unified tariff configuration from infrastructure module.
+
+Legacy config objects are frozen and picklable. Each optimizer receives its
+own config explicitly (create_legacy_config() per SimulationConfig), so
+differently configured optimizers can run side by side in threads or process
+pools; get_global_legacy_config() only returns the shared immutable default.
 """
 
 from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
 from typing import Dict, Tuple, List
 from src.config.simulation_config import SimulationConfig
 from src.infrastructure.tariffs import TariffLoader, TariffProfile
 
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
 
-@dataclass
+@dataclass(frozen=True)
 class LocationConfig:
     """Geographic and site configuration (legacy)"""
     name: str = "Stavanger"
@@ -25,7 +34,7 @@ class LocationConfig:
     timezone: str = "Europe/Oslo"
 
 
-@dataclass
+@dataclass(frozen=True)
 class SolarSystemConfig:
     """Solar PV system configuration (legacy)"""
     pv_capacity_kwp: float = 138.55
@@ -39,7 +48,7 @@ class SolarSystemConfig:
     dc_to_ac_loss: float = 0.02
 
 
-@dataclass
+@dataclass(frozen=True)
 class ConsumptionConfig:
     """Load profile configuration (legacy)"""
     annual_kwh: float = 300000
@@ -57,7 +66,7 @@ class ConsumptionConfig:
     evening_hours_end: int = 22
 
 
-@dataclass
+@dataclass(frozen=True)
 class DegradationConfig:
     """LFP battery degradation modeling parameters (legacy)"""
     enabled: bool = False
@@ -71,12 +80,12 @@ class DegradationConfig:
 
     def __post_init__(self):
         """Calculate derived degradation parameters."""
-        self.rho_constant = self.eol_degradation_percent / self.cycle_life_full_dod
         hours_per_lifetime = self.calendar_life_years * 365 * 24
-        self.dp_cal_per_hour = self.eol_degradation_percent / hours_per_lifetime
+        object.__setattr__(self, 'rho_constant', self.eol_degradation_percent / self.cycle_life_full_dod)
+        object.__setattr__(self, 'dp_cal_per_hour', self.eol_degradation_percent / hours_per_lifetime)
 
 
-@dataclass
+@dataclass(frozen=True)
 class BatteryConfig:
     """Battery system configuration (legacy)"""
     capacity_kwh: float
@@ -122,25 +131,25 @@ class BatteryConfig:
         return cell_cost + inverter_cost + control_cost
 
 
-@dataclass
+@dataclass(frozen=True)
 class GridTariffConfig:
     """Grid tariff structure (legacy) - REFACTORED to use 2024 tariffs"""
     variable_nok_per_kwh: float = 0.25
     fixed_nok_per_month: float = 500.0
 
-    # Load default 2024 tariff from infrastructure
-    _tariff: TariffProfile = field(default_factory=TariffLoader.get_default_tariff, init=False, repr=False)
+    # Tariff profile (default: 2024 Lnett tariff from infrastructure)
+    profile: TariffProfile = field(default_factory=lambda: load_tariff_profile(), repr=False, compare=False)
 
     # Energy tariffs (required by core/ optimizer) - from YAML config
     @property
     def energy_peak(self) -> float:
         """Mon-Fri 06:00-22:00 (NOK/kWh)"""
-        return self._tariff.energy.peak_rate
+        return self.profile.energy.peak_rate
 
     @property
     def energy_offpeak(self) -> float:
         """Nights/weekends (NOK/kWh)"""
-        return self._tariff.energy.offpeak_rate
+        return self.profile.energy.offpeak_rate
 
     # Power tariff brackets (from, to, cost_per_month) - UPDATED to 2024 tariffs from YAML
     @property
@@ -148,7 +157,7 @@ class GridTariffConfig:
         """2024 Lnett commercial power tariff brackets"""
         return [
             (bracket.min_kw, bracket.max_kw, bracket.cost_nok_month)
-            for bracket in self._tariff.power.brackets
+            for bracket in self.profile.power.brackets
         ]
 
     # DEPRECATED: Legacy format for backward compatibility (2023 tariffs - DO NOT USE)
@@ -175,7 +184,7 @@ class GridTariffConfig:
         Now uses 2024 tariffs from YAML configuration.
         """
         # Use tariff loader for correct 2024 calculation
-        return self._tariff.get_power_tariff(peak_kw)
+        return self.profile.get_power_tariff(peak_kw)
 
     # Alias for backward compatibility
     def get_progressive_power_cost(self, peak_kw: float) -> float:
@@ -183,7 +192,7 @@ class GridTariffConfig:
         return self.get_power_cost(peak_kw)
 
 
-@dataclass
+@dataclass(frozen=True)
 class EconomicConfig:
     """Economic analysis parameters (legacy)"""
     project_lifetime_years: int = 15
@@ -192,7 +201,7 @@ class EconomicConfig:
     eur_to_nok: float = 11.5
 
 
-@dataclass
+@dataclass(frozen=True)
 class LegacySystemConfig:
     """Legacy config object for backward compatibility with core/ optimizers."""
 
@@ -214,6 +223,24 @@ class LegacySystemConfig:
         return self.battery.power_kw
 
 
+@lru_cache(maxsize=None)
+def load_tariff_profile(tariff_file: str = "") -> TariffProfile:
+    """
+    Load a tariff profile once per process.
+
+    Args:
+        tariff_file: Tariff YAML, absolute or relative to the project root
+            ("" = default 2024 Lnett tariff)
+
+    Returns:
+        TariffProfile shared by all legacy configs using this file (read-only)
+    """
+    if not tariff_file:
+        return TariffLoader.get_default_tariff()
+    path = Path(tariff_file)
+    return TariffLoader.from_yaml(path if path.is_absolute() else PROJECT_ROOT / path)
+
+
 def create_legacy_config(sim_config: SimulationConfig) -> LegacySystemConfig:
     """
     Create legacy config object from new SimulationConfig.
@@ -222,7 +249,8 @@ def create_legacy_config(sim_config: SimulationConfig) -> LegacySystemConfig:
         sim_config: New simulation configuration
 
     Returns:
-        Legacy config object compatible with core/ optimizers
+        Legacy config object compatible with core/ optimizers, with the
+        battery limits and tariff file of sim_config
     """
     # Create battery config with degradation
     battery_config = BatteryConfig(
@@ -245,50 +273,33 @@ def create_legacy_config(sim_config: SimulationConfig) -> LegacySystemConfig:
         consumption=ConsumptionConfig(),
         degradation=DegradationConfig(),
         battery=battery_config,
-        tariff=GridTariffConfig(),
+        tariff=GridTariffConfig(profile=load_tariff_profile(sim_config.infrastructure.tariffs)),
         economic=EconomicConfig(),
     )
 
     return legacy_config
 
 
-# Global config instance for modules that import "config"
-_global_legacy_config: LegacySystemConfig = None
-
-
+@lru_cache(maxsize=1)
 def get_global_legacy_config() -> LegacySystemConfig:
     """
-    Get or create global legacy config.
-
-    Returns default legacy config if not explicitly set.
-    """
-    global _global_legacy_config
-    if _global_legacy_config is None:
-        # Create default legacy config
-        _global_legacy_config = LegacySystemConfig(
-            location=LocationConfig(),
-            solar=SolarSystemConfig(),
-            consumption=ConsumptionConfig(),
-            degradation=DegradationConfig(),
-            battery=BatteryConfig(
-                capacity_kwh=80.0,  # Default
-                power_kw=60.0,  # Default
-            ),
-            tariff=GridTariffConfig(),
-            economic=EconomicConfig(),
-        )
-    return _global_legacy_config
-
-
-def set_global_legacy_config(sim_config: SimulationConfig) -> None:
-    """
-    Set global legacy config from SimulationConfig.
+    Default legacy config (80 kWh / 60 kW, 2024 Lnett tariff).
 
-    Args:
-        sim_config: Simulation configuration to convert
+    The instance is frozen and shared; optimizers configured from a
+    SimulationConfig get their own via create_legacy_config().
     """
-    global _global_legacy_config
-    _global_legacy_config = create_legacy_config(sim_config)
+    return LegacySystemConfig(
+        location=LocationConfig(),
+        solar=SolarSystemConfig(),
+        consumption=ConsumptionConfig(),
+        degradation=DegradationConfig(),
+        battery=BatteryConfig(
+            capacity_kwh=80.0,  # Default
+            power_kw=60.0,  # Default
+        ),
+        tariff=GridTariffConfig(),
+        economic=EconomicConfig(),
+    )
 
 
 # Alias for backward compatibility
@@ -1,20 +1,23 @@
 """
 Unified simulation configuration system for battery optimization.
 
-Supports three simulation modes:
+Supports four simulation modes:
 1. Rolling Horizon: Real-time operation with 24h lookah
 
 ead
 2. Monthly: Single or multi-month optimization analysis
 3. Yearly: Annual investment analysis with weekly optimizations
+4. Screening: Battery sizing sweep on representative periods
 """
 
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Union, Literal
+from typing import Optional, List, Tuple, Union, Literal
 import yaml
 
+from .verbosity import VERBOSITY_LEVELS
+
 
 @dataclass
 class BatteryConfigSim:
@@ -84,6 +87,23 @@ class RollingHorizonModeConfig:
     horizon_hours: int = 24
     update_frequency_minutes: int = 60
     persistent_state: bool = True
+    # (start_hour, block_hours) breakpoints for a coarser far horizon, e.g. [(6, 1), (48, 4)]
+    coarsening: Optional[List[Tuple[float, float]]] = None
+    # Skip the LP for windows where storing energy cannot pay (see core.window_pruning)
+    prune_windows: bool = False
+
+    # Execution policy: 'periodic' re-solves every execute_steps timesteps,
+    # 'event_triggered' only when a trigger fires (see RollingHorizonOrchestrator)
+    execution_policy: Literal["periodic", "event_triggered"] = "periodic"
+    execute_steps: Optional[int] = None  # Plan steps committed per solve (None = update frequency)
+    deviation_threshold_kw: float = 10.0  # Net load deviation from plan that forces a re-solve
+    peak_margin_kw: float = 2.0  # Re-solve when unplanned import comes this close to the monthly peak
+    price_publication_hour: int = 13  # Day-ahead prices arrive daily at this hour
+    max_plan_age_hours: float = 4.0  # Longest time between solves (event_triggered)
+
+    # Forecasts the optimizer sees: 'perfect' uses realized data, 'models' uses
+    # src.forecasting (clear-sky PV, seasonal load, published day-ahead prices)
+    forecast: Literal["perfect", "models"] = "perfect"
 
 
 @dataclass
@@ -105,6 +125,28 @@ class YearlyModeConfig:
     weeks: int = 52
 
 
+@dataclass
+class AnnualModeConfig:
+    """Configuration specific to the annual LP by monthly decomposition."""
+    optimality_gap: float = 1e-3  # Stop at this relative gap between upper and lower bound
+    max_iterations: int = 100  # Rounds of month solves
+    workers: Optional[int] = None  # Threads for the month LPs (None = one per month)
+
+
+@dataclass
+class ScreeningModeConfig:
+    """
+    Configuration specific to representative-period screening.
+
+    Candidate sizes come from `dimensioning` grid ranges (defaults if unset).
+    """
+    period_type: Literal["days", "weeks"] = "days"
+    n_periods: int = 25  # Representative days or weeks (k-means clusters)
+    aggregation_hours: int = 1  # Temporal aggregation inside each period (2h+ loses peaks)
+    n_anchor_sizes: int = 3  # Sizes run on full year to report compression error
+    top_n: int = 5  # Best screened candidates re-run at full resolution
+
+
 @dataclass
 class DimensioningConfig:
     """
@@ -271,14 +313,16 @@ class SimulationConfig:
     """
     Master configuration for battery optimization simulations.
 
-    Supports three simulation modes:
+    Supports five simulation modes:
     - rolling_horizon: Real-time operation with persistent state
     - monthly: Single or multi-month analysis
     - yearly: Annual investment analysis with weekly optimization
+    - annual: Annual LP by monthly decomposition (benchmark for the heuristics)
+    - screening: Battery sizing sweep on representative periods
     """
 
     # Core settings
-    mode: Literal["rolling_horizon", "monthly", "yearly", "baseline"] = "rolling_horizon"
+    mode: Literal["rolling_horizon", "monthly", "yearly", "annual", "baseline", "screening"] = "rolling_horizon"
     time_resolution: str = "PT60M"  # ISO 8601 duration: PT60M (hourly) or PT15M (15-min)
 
     # Simulation period
@@ -294,6 +338,8 @@ class SimulationConfig:
     rolling_horizon: RollingHorizonModeConfig = field(default_factory=RollingHorizonModeConfig)
     monthly: MonthlyModeConfig = field(default_factory=MonthlyModeConfig)
     yearly: YearlyModeConfig = field(default_factory=YearlyModeConfig)
+    annual: AnnualModeConfig = field(default_factory=AnnualModeConfig)
+    screening: ScreeningModeConfig = field(default_factory=ScreeningModeConfig)
 
     # Dimensioning configuration (optional)
     dimensioning: Optional[DimensioningConfig] = None
@@ -312,6 +358,14 @@ class SimulationConfig:
     save_trajectory: bool = True
     save_plots: bool = True
 
+    # Console output: 'quiet', 'info' or 'debug' (see src.config.verbosity)
+    verbosity: str = "info"
+    progress_interval_percent: float = 10.0  # Orchestrator progress report interval
+
+    # Power tariff in the LPs: 'progressive' bracket approximation or the
+    # 'exact' step function (one LP per bracket, see core.step_tariff)
+    tariff_mode: str = "progressive"
+
     @classmethod
     def from_yaml(cls, yaml_path: Union[str, Path]) -> "SimulationConfig":
         """
@@ -345,6 +399,9 @@ class SimulationConfig:
             output_dir=config_dict.get('output_dir', 'results'),
             save_trajectory=config_dict.get('save_trajectory', True),
             save_plots=config_dict.get('save_plots', True),
+            verbosity=config_dict.get('verbosity', 'info'),
+            progress_interval_percent=config_dict.get('progress_interval_percent', 10.0),
+            tariff_mode=config_dict.get('tariff_mode', 'progressive'),
         )
 
         # Parse simulation period
@@ -388,6 +445,15 @@ class SimulationConfig:
                     horizon_hours=rh_dict.get('horizon_hours', 24),
                     update_frequency_minutes=rh_dict.get('update_frequency_minutes', 60),
                     persistent_state=rh_dict.get('persistent_state', True),
+                    coarsening=[tuple(b) for b in rh_dict['coarsening']] if rh_dict.get('coarsening') else None,
+                    prune_windows=rh_dict.get('prune_windows', False),
+                    execution_policy=rh_dict.get('execution_policy', 'periodic'),
+                    execute_steps=rh_dict.get('execute_steps'),
+                    deviation_threshold_kw=rh_dict.get('deviation_threshold_kw', 10.0),
+                    peak_margin_kw=rh_dict.get('peak_margin_kw', 2.0),
+                    price_publication_hour=rh_dict.get('price_publication_hour', 13),
+                    max_plan_age_hours=rh_dict.get('max_plan_age_hours', 4.0),
+                    forecast=rh_dict.get('forecast', 'perfect'),
                 )
 
             if 'monthly' in mode_specific:
@@ -402,6 +468,24 @@ class SimulationConfig:
                     weeks=yearly_dict.get('weeks', 52),
                 )
 
+            if 'annual' in mode_specific:
+                annual_dict = mode_specific['annual']
+                config.annual = AnnualModeConfig(
+                    optimality_gap=annual_dict.get('optimality_gap', 1e-3),
+                    max_iterations=annual_dict.get('max_iterations', 100),
+                    workers=annual_dict.get('workers'),
+                )
+
+            if 'screening' in mode_specific:
+                screening_dict = mode_specific['screening']
+                config.screening = ScreeningModeConfig(
+                    period_type=screening_dict.get('period_type', 'days'),
+                    n_periods=screening_dict.get('n_periods', 25),
+                    aggregation_hours=screening_dict.get('aggregation_hours', 1),
+                    n_anchor_sizes=screening_dict.get('n_anchor_sizes', 3),
+                    top_n=screening_dict.get('top_n', 5),
+                )
+
         # Parse dimensioning configuration
         if 'dimensioning' in config_dict:
             dim_dict = config_dict['dimensioning']
@@ -498,6 +582,18 @@ class SimulationConfig:
                     'horizon_hours': self.rolling_horizon.horizon_hours,
                     'update_frequency_minutes': self.rolling_horizon.update_frequency_minutes,
                     'persistent_state': self.rolling_horizon.persistent_state,
+                    'coarsening': (
+                        [list(b) for b in self.rolling_horizon.coarsening]
+                        if self.rolling_horizon.coarsening else None
+                    ),
+                    'prune_windows': self.rolling_horizon.prune_windows,
+                    'execution_policy': self.rolling_horizon.execution_policy,
+                    'execute_steps': self.rolling_horizon.execute_steps,
+                    'deviation_threshold_kw': self.rolling_horizon.deviation_threshold_kw,
+                    'peak_margin_kw': self.rolling_horizon.peak_margin_kw,
+                    'price_publication_hour': self.rolling_horizon.price_publication_hour,
+                    'max_plan_age_hours': self.rolling_horizon.max_plan_age_hours,
+                    'forecast': self.rolling_horizon.forecast,
                 },
                 'monthly': {
                     'months': self.monthly.months,
@@ -506,10 +602,25 @@ class SimulationConfig:
                     'horizon_hours': self.yearly.horizon_hours,
                     'weeks': self.yearly.weeks,
                 },
+                'annual': {
+                    'optimality_gap': self.annual.optimality_gap,
+                    'max_iterations': self.annual.max_iterations,
+                    'workers': self.annual.workers,
+                },
+                'screening': {
+                    'period_type': self.screening.period_type,
+                    'n_periods': self.screening.n_periods,
+                    'aggregation_hours': self.screening.aggregation_hours,
+                    'n_anchor_sizes': self.screening.n_anchor_sizes,
+                    'top_n': self.screening.top_n,
+                },
             },
             'output_dir': self.output_dir,
             'save_trajectory': self.save_trajectory,
             'save_plots': self.save_plots,
+            'verbosity': self.verbosity,
+            'progress_interval_percent': self.progress_interval_percent,
+            'tariff_mode': self.tariff_mode,
         }
 
         # Add dimensioning configuration if present
@@ -541,7 +652,7 @@ class SimulationConfig:
             ValueError: If configuration is invalid
         """
         # Validate mode
-        valid_modes = ["rolling_horizon", "monthly", "yearly"]
+        valid_modes = ["rolling_horizon", "monthly", "yearly", "annual", "screening"]
         if self.mode not in valid_modes:
             raise ValueError(f"Invalid mode '{self.mode}'. Must be one of: {valid_modes}")
 
@@ -550,6 +661,14 @@ class SimulationConfig:
         if self.time_resolution not in valid_resolutions:
             raise ValueError(f"Invalid time_resolution '{self.time_resolution}'. Must be one of: {valid_resolutions}")
 
+        # Validate console output settings
+        if self.verbosity not in VERBOSITY_LEVELS:
+            raise ValueError(f"Invalid verbosity '{self.verbosity}'. Must be one of: {list(VERBOSITY_LEVELS)}")
+        if not (0 < self.progress_interval_percent <= 100):
+            raise ValueError("progress_interval_percent must be in (0, 100]")
+        if self.tariff_mode not in ("progressive", "exact"):
+            raise ValueError(f"Invalid tariff_mode '{self.tariff_mode}'. Must be 'progressive' or 'exact'")
+
         # Validate battery parameters
         if self.battery.capacity_kwh <= 0:
             raise ValueError("Battery capacity_kwh must be positive")
@@ -583,6 +702,17 @@ class SimulationConfig:
                 raise ValueError("Rolling horizon horizon_hours must be positive")
             if self.rolling_horizon.update_frequency_minutes <= 0:
                 raise ValueError("Rolling horizon update_frequency_minutes must be positive")
+            if self.rolling_horizon.execution_policy not in ("periodic", "event_triggered"):
+                raise ValueError(
+                    f"Invalid execution_policy '{self.rolling_horizon.execution_policy}'. "
+                    f"Must be 'periodic' or 'event_triggered'"
+                )
+            if self.rolling_horizon.execute_steps is not None and self.rolling_horizon.execute_steps < 1:
+                raise ValueError("Rolling horizon execute_steps must be at least 1")
+            if self.rolling_horizon.forecast not in ("perfect", "models"):
+                raise ValueError(
+                    f"Invalid forecast '{self.rolling_horizon.forecast}'. Must be 'perfect' or 'models'"
+                )
 
         elif self.mode == "monthly":
             if isinstance(self.monthly.months, list):
@@ -596,7 +726,33 @@ class SimulationConfig:
             if not (1 <= self.yearly.weeks <= 53):
                 raise ValueError("Yearly weeks must be between 1 and 53")
 
-    def get_mode_config(self) -> Union[RollingHorizonModeConfig, MonthlyModeConfig, YearlyModeConfig]:
+        elif self.mode == "annual":
+            if self.tariff_mode != "progressive":
+                raise ValueError("Annual mode needs tariff_mode 'progressive' (the exact step tariff is not convex)")
+            if self.annual.optimality_gap < 0:
+                raise ValueError("Annual optimality_gap must be non-negative")
+            if self.annual.max_iterations < 1:
+                raise ValueError("Annual max_iterations must be at least 1")
+            if self.annual.workers is not None and self.annual.workers < 1:
+                raise ValueError("Annual workers must be at least 1")
+
+        elif self.mode == "screening":
+            if self.screening.period_type not in ["days", "weeks"]:
+                raise ValueError(f"Invalid screening period_type '{self.screening.period_type}'. Must be 'days' or 'weeks'")
+            if self.screening.n_periods <= 0:
+                raise ValueError("Screening n_periods must be positive")
+            period_hours = 24 if self.screening.period_type == "days" else 168
+            if self.screening.aggregation_hours <= 0 or period_hours % self.screening.aggregation_hours != 0:
+                raise ValueError(f"Screening aggregation_hours must divide {period_hours}")
+            if self.screening.n_anchor_sizes < 0:
+                raise ValueError("Screening n_anchor_sizes must be non-negative")
+            if self.screening.top_n <= 0:
+                raise ValueError("Screening top_n must be positive")
+            if self.dimensioning is not None:
+                self.dimensioning.validate()
+
+    def get_mode_config(self) -> Union[RollingHorizonModeConfig, MonthlyModeConfig, YearlyModeConfig,
+                                       AnnualModeConfig, ScreeningModeConfig]:
         """Get the mode-specific configuration object."""
         if self.mode == "rolling_horizon":
             return self.rolling_horizon
@@ -604,5 +760,9 @@ class SimulationConfig:
             return self.monthly
         elif self.mode == "yearly":
             return self.yearly
+        elif self.mode == "annual":
+            return self.annual
+        elif self.mode == "screening":
+            return self.screening
         else:
             raise ValueError(f"Unknown mode: {self.mode}")
@@ -0,0 +1,57 @@
+"""
+Run-level verbosity for console output.
+
+Simulation code logs through the `logging` module under the 'src' and 'core'
+logger hierarchies. SimulationConfig.verbosity selects their level:
+- quiet: warnings and errors only
+- info: run headers, progress and summaries (default)
+- debug: per-solve details, optimizer construction and the HiGHS log
+
+Library code only sets logger levels; attaching a handler is left to the
+application (configure_logging() does it for scripts and the CLI).
+"""
+
+import logging
+import sys
+from typing import Optional, TextIO
+
+
+VERBOSITY_LEVELS = {
+    'quiet': logging.WARNING,
+    'info': logging.INFO,
+    'debug': logging.DEBUG,
+}
+
+PACKAGE_LOGGERS = ('src', 'core')
+
+
+def apply_verbosity(verbosity: str) -> None:
+    """
+    Set the level of the package loggers.
+
+    Args:
+        verbosity: 'quiet', 'info' or 'debug'
+
+    Raises:
+        ValueError: If verbosity is unknown
+    """
+    if verbosity not in VERBOSITY_LEVELS:
+        raise ValueError(f"Invalid verbosity '{verbosity}'. Must be one of: {list(VERBOSITY_LEVELS)}")
+    for name in PACKAGE_LOGGERS:
+        logging.getLogger(name).setLevel(VERBOSITY_LEVELS[verbosity])
+
+
+def configure_logging(verbosity: str = 'info', stream: Optional[TextIO] = None) -> None:
+    """
+    Console logging for scripts and the CLI.
+
+    Adds a message-only handler to the root logger (unless one is already
+    configured) and applies the verbosity to the package loggers. Other
+    libraries stay at the root level (WARNING).
+
+    Args:
+        verbosity: 'quiet', 'info' or 'debug'
+        stream: Output stream (default: stdout)
+    """
+    logging.basicConfig(format='%(message)s', stream=stream or sys.stdout)
+    apply_verbosity(verbosity)
@@ -9,6 +9,7 @@ from .file_loaders import (
     load_price_data,
     load_production_data,
     load_consumption_data,
+    load_elhub_export,
     resample_timeseries,
 )
 
@@ -18,5 +19,6 @@ __all__ = [
     'load_price_data',
     'load_production_data',
     'load_consumption_data',
+    'load_elhub_export',
     'resample_timeseries',
 ]
@@ -1,14 +1,24 @@
 """
 File loading utilities for battery optimization data.
 
-Supports loading electricity prices, PV production, and consumption from CSV files.
+Supports loading electricity prices, PV production, and consumption from CSV files,
+including raw Elhub meter exports (Måleverdier).
 """
 
+import hashlib
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 import pandas as pd
 import numpy as np
 
+from core.time_aggregation import RESOLUTION_MINUTES, align_regular, resample_regular
+
+# Elhub meter export (Måleverdier): semicolon-separated, tz-aware local timestamps
+ELHUB_COLUMNS = ['Fra', 'Til', 'Målenavn', 'Volum', 'Enhet', 'Kvalitet', 'Registreringstidspunkt']
+ELHUB_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S%z'
+ELHUB_UNIT_TO_KWH = {'WH': 1e-3, 'KWH': 1.0, 'MWH': 1e3}
+ELHUB_CHUNK_ROWS = 200_000
+
 
 def load_price_data(file_path: str) -> Tuple[pd.DatetimeIndex, np.ndarray]:
     """
@@ -120,6 +130,9 @@ def load_consumption_data(file_path: str) -> Tuple[pd.DatetimeIndex, np.ndarray]
     - Column 1: timestamp (datetime) or index as datetime
     - Column 2: consumption in kW
 
+    Raw Elhub meter exports are also accepted (see load_elhub_export); the
+    first 'Forbruk' meter is used.
+
     Args:
         file_path: Path to CSV file with consumption data
 
@@ -134,6 +147,13 @@ def load_consumption_data(file_path: str) -> Tuple[pd.DatetimeIndex, np.ndarray]
     if not file_path.exists():
         raise FileNotFoundError(f"Consumption data file not found: {file_path}")
 
+    # Raw Elhub export: use the (first) consumption meter
+    if is_elhub_export(file_path):
+        meters = load_elhub_export(file_path)
+        meter = next((m for m in meters.columns if 'Forbruk' in m), meters.columns[0])
+        consumption = meters[meter].dropna()
+        return pd.DatetimeIndex(consumption.index), consumption.values
+
     try:
         df = pd.read_csv(file_path, parse_dates=[0], index_col=0)
     except Exception as e:
@@ -151,6 +171,154 @@ def load_consumption_data(file_path: str) -> Tuple[pd.DatetimeIndex, np.ndarray]
     return timestamps, consumption
 
 
+def is_elhub_export(file_path: str | Path) -> bool:
+    """Whether the file's header is that of an Elhub meter export."""
+    with open(file_path, encoding='utf-8-sig') as f:
+        header = f.readline().strip().split(';')
+    return header == ELHUB_COLUMNS
+
+
+def _elhub_cache_file(file_path: Path, qualities: Sequence[str], cache_dir: Optional[Path]) -> Path:
+    """Cache file for an export: keyed by the source's size, mtime and the accepted qualities."""
+    stat = file_path.stat()
+    key = f"{stat.st_size}:{stat.st_mtime_ns}:{','.join(sorted(qualities))}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+    cache_dir = cache_dir or file_path.parent / '.cache'
+    return Path(cache_dir) / f"{file_path.stem}_{digest}.parquet"
+
+
+def _parse_elhub_timestamps(values: pd.Series) -> np.ndarray:
+    """Fixed-format tz-aware strings to UTC epoch nanoseconds."""
+    return pd.to_datetime(values, format=ELHUB_TIMESTAMP_FORMAT, utc=True).values.astype(np.int64)
+
+
+def _read_elhub_readings(
+    file_path: Path,
+    qualities: Sequence[str],
+    chunksize: int
+) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Stream an export into one row per (meter, interval): the latest registration.
+
+    Chunks are reduced to integer meter codes, epoch timestamps and kW, and
+    de-duplicated whenever the pending readings outgrow the kept ones, so
+    memory is bounded by the distinct readings, not the file size.
+
+    Returns:
+        (DataFrame with meter/start_ns/kw columns, meter names by code)
+    """
+    meter_ids: Dict[str, int] = {}
+    kept = pd.DataFrame({'meter': pd.Series(dtype=np.int32), 'start_ns': pd.Series(dtype=np.int64),
+                         'registered_ns': pd.Series(dtype=np.int64), 'kw': pd.Series(dtype=float)})
+    pending: List[pd.DataFrame] = []
+    pending_rows = 0
+
+    def compact(frames: List[pd.DataFrame]) -> pd.DataFrame:
+        readings = pd.concat(frames, ignore_index=True)
+        readings = readings.sort_values('registered_ns', kind='stable')
+        return readings.drop_duplicates(['meter', 'start_ns'], keep='last')
+
+    reader = pd.read_csv(
+        file_path, sep=';', encoding='utf-8-sig', usecols=ELHUB_COLUMNS, chunksize=chunksize,
+        dtype={'Fra': str, 'Til': str, 'Målenavn': str, 'Volum': float, 'Enhet': str,
+               'Kvalitet': str, 'Registreringstidspunkt': str},
+    )
+    for chunk in reader:
+        chunk = chunk[chunk['Kvalitet'].isin(qualities)]
+        if chunk.empty:
+            continue
+
+        units = chunk['Enhet'].str.upper()
+        unknown = set(units.unique()) - set(ELHUB_UNIT_TO_KWH)
+        if unknown:
+            raise ValueError(f"Unsupported Elhub units {sorted(unknown)} in {file_path}")
+
+        for name in chunk['Målenavn'].unique():
+            meter_ids.setdefault(name, len(meter_ids))
+
+        start_ns = _parse_elhub_timestamps(chunk['Fra'])
+        hours = (_parse_elhub_timestamps(chunk['Til']) - start_ns) / 3.6e12
+        kwh = chunk['Volum'].values * units.map(ELHUB_UNIT_TO_KWH).values
+        pending.append(pd.DataFrame({
+            'meter': chunk['Målenavn'].map(meter_ids).values.astype(np.int32),
+            'start_ns': start_ns,
+            'registered_ns': _parse_elhub_timestamps(chunk['Registreringstidspunkt']),
+            'kw': kwh / hours,
+        }))
+        pending_rows += len(pending[-1])
+
+        if pending_rows > max(len(kept), chunksize):
+            kept = compact([kept] + pending)
+            pending, pending_rows = [], 0
+
+    if pending:
+        kept = compact([kept] + pending)
+    return kept, list(meter_ids)
+
+
+def load_elhub_export(
+    file_path: str | Path,
+    qualities: Sequence[str] = ('Målt',),
+    chunksize: int = ELHUB_CHUNK_ROWS,
+    cache_dir: Optional[str | Path] = None,
+    use_cache: bool = True
+) -> pd.DataFrame:
+    """
+    Load a raw Elhub meter export (Måleverdier) as kW per meter.
+
+    The export is streamed in chunks, so multi-year, multi-meter files load in
+    bounded memory. Readings outside `qualities` are dropped; for readings of
+    the same meter and interval, the latest Registreringstidspunkt wins. The
+    result is cached as Parquet and reused while the source file is unchanged.
+
+    Expected format (semicolon-separated):
+        Fra;Til;Målenavn;Volum;Enhet;Kvalitet;Registreringstidspunkt
+        2023-03-08 00:00:00+01:00;2023-03-08 01:00:00+01:00;KWH 60 Forbruk;19.2;KWH;Målt;...
+
+    Args:
+        file_path: Path to the export
+        qualities: Kvalitet values to keep (default: measured values only)
+        chunksize: Rows per chunk
+        cache_dir: Cache directory (default: .cache next to the export)
+        use_cache: False always re-reads the export (and refreshes the cache)
+
+    Returns:
+        DataFrame indexed by interval start (timezone-naive Oslo time, like
+        load_price_data) with one kW column per Målenavn; NaN where a meter
+        has no reading
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        ValueError: If the file is not an Elhub export or has unknown units
+    """
+    file_path = Path(file_path)
+    if not file_path.exists():
+        raise FileNotFoundError(f"Elhub export not found: {file_path}")
+    if not is_elhub_export(file_path):
+        raise ValueError(f"Not an Elhub export (expected columns {ELHUB_COLUMNS}): {file_path}")
+
+    cache_file = _elhub_cache_file(file_path, qualities, Path(cache_dir) if cache_dir else None)
+    if use_cache and cache_file.exists():
+        return pd.read_parquet(cache_file)
+
+    readings, meters = _read_elhub_readings(file_path, qualities, chunksize)
+    if readings.empty:
+        raise ValueError(f"No readings with quality {list(qualities)} in {file_path}")
+
+    table = readings.pivot(index='start_ns', columns='meter', values='kw').sort_index()
+    table.columns = [meters[code] for code in table.columns]
+    table.columns.name = None
+
+    # Same convention as load_price_data: Oslo local time, first of DST-duplicated hours
+    index = pd.DatetimeIndex(pd.to_datetime(table.index, utc=True))
+    table.index = index.tz_convert('Europe/Oslo').tz_localize(None).rename('timestamp')
+    table = table[~table.index.duplicated(keep='first')]
+
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    table.to_parquet(cache_file)
+    return table
+
+
 def resample_timeseries(
     timestamps: pd.DatetimeIndex,
     values: np.ndarray,
@@ -160,6 +328,12 @@ def resample_timeseries(
     """
     Resample time series to different resolution.
 
+    Regular hourly/15-min series (gaps such as DST changes allowed) are
+    resampled on integer epoch offsets; upsampling then holds the value
+    ('mean', 'max'), splits it ('sum') or interpolates linearly, with
+    sub-steps only inside the original intervals. Irregular series fall
+    back to DataFrame.resample.
+
     Args:
         timestamps: Original timestamps
         values: Original values
@@ -172,21 +346,23 @@ def resample_timeseries(
     Raises:
         ValueError: If target resolution is invalid or resampling fails
     """
-    # Convert ISO 8601 duration to pandas frequency
-    resolution_map = {
-        'PT60M': '60T',
-        'PT15M': '15T',
-        'PT30M': '30T',
-        'PT5M': '5T',
-    }
-
-    if target_resolution not in resolution_map:
+    if target_resolution not in RESOLUTION_MINUTES:
         raise ValueError(
             f"Invalid target_resolution '{target_resolution}'. "
-            f"Must be one of: {list(resolution_map.keys())}"
+            f"Must be one of: {list(RESOLUTION_MINUTES.keys())}"
         )
+    if method not in ('mean', 'sum', 'max', 'interpolate'):
+        raise ValueError(
+            f"Invalid resampling method '{method}'. "
+            f"Must be one of: ['mean', 'sum', 'max', 'interpolate']"
+        )
+
+    timestamps = pd.DatetimeIndex(timestamps)
+    regular = resample_regular(timestamps, values, RESOLUTION_MINUTES[target_resolution], method)
+    if regular is not None:
+        return regular
 
-    freq = resolution_map[target_resolution]
+    freq = f"{RESOLUTION_MINUTES[target_resolution]}min"
 
     # Create DataFrame for resampling
     df = pd.DataFrame({'value': values}, index=timestamps)
@@ -198,15 +374,10 @@ def resample_timeseries(
         resampled = df.resample(freq).sum()
     elif method == "max":
         resampled = df.resample(freq).max()
-    elif method == "interpolate":
+    else:
         # Upsample first, then interpolate
         resampled = df.resample(freq).asfreq()
         resampled = resampled.interpolate(method='linear')
-    else:
-        raise ValueError(
-            f"Invalid resampling method '{method}'. "
-            f"Must be one of: ['mean', 'sum', 'max', 'interpolate']"
-        )
 
     resampled_timestamps = pd.DatetimeIndex(resampled.index)
     resampled_values = resampled['value'].values
@@ -221,7 +392,8 @@ def align_timeseries(
     """
     Align multiple time series to common timestamp index.
 
-    Uses intersection of all timestamps.
+    Uses intersection of all timestamps (on integer epoch offsets when every
+    index is sorted and unique, otherwise via pandas reindexing).
 
     Args:
         timestamps_list: List of DatetimeIndex objects
@@ -239,6 +411,13 @@ def align_timeseries(
     if len(timestamps_list) == 0:
         raise ValueError("Cannot align empty list of time series")
 
+    # Sorted, unique indexes: intersect epoch offsets and take values by position
+    regular = align_regular([pd.DatetimeIndex(ts) for ts in timestamps_list], values_list)
+    if regular is not None:
+        if len(regular[0]) == 0:
+            raise ValueError("Time series have no overlapping timestamps")
+        return regular
+
     # Find common timestamps (intersection)
     common_timestamps = timestamps_list[0]
     for ts in timestamps_list[1:]:
@@ -0,0 +1,25 @@
+"""
+Forecasting for rolling horizon control.
+
+Lightweight PV, load and price forecasters with O(1) incremental updates for
+live operation and vectorized precomputation for backtests.
+"""
+
+from .base import Forecaster, ForecastTable, ewma
+from .load import SeasonalSmoothingForecaster, SeasonalNaiveForecaster
+from .pv import ClearSkyPersistenceForecaster, clear_sky_profile
+from .price import DayAheadPriceForecaster, known_price_end
+from .provider import ForecastProvider
+
+__all__ = [
+    "Forecaster",
+    "ForecastTable",
+    "ewma",
+    "SeasonalSmoothingForecaster",
+    "SeasonalNaiveForecaster",
+    "ClearSkyPersistenceForecaster",
+    "clear_sky_profile",
+    "DayAheadPriceForecaster",
+    "known_price_end",
+    "ForecastProvider",
+]
@@ -0,0 +1,81 @@
+"""
+Base classes for forecasters.
+
+Forecasters work on a regular time grid and are index based: after n calls
+to update() (observations 0..n-1), forecast(horizon) predicts steps
+n..n+horizon-1.
+
+Every forecaster has two equivalent paths:
+- update()/forecast(): O(1) state update per observation, for live control
+- precompute(): the state after every prefix of a whole series, computed
+  with vectorized filters, for backtests. ForecastTable.window(i, horizon)
+  then returns the forecast issued at step i without re-running the model.
+"""
+
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+class ForecastTable(ABC):
+    """Forecasts for every issue step of a backtest series."""
+
+    @abstractmethod
+    def window(self, i: int, horizon: int) -> np.ndarray:
+        """
+        Forecast issued at step i (after observing steps 0..i-1).
+
+        Args:
+            i: Issue step index
+            horizon: Number of steps to forecast
+
+        Returns:
+            Forecast for steps i..i+horizon-1, shape (horizon,)
+        """
+
+
+class Forecaster(ABC):
+    """Incrementally updatable point forecaster."""
+
+    @abstractmethod
+    def update(self, value: float) -> None:
+        """Add the observation of the next step (O(1))."""
+
+    @abstractmethod
+    def forecast(self, horizon: int) -> np.ndarray:
+        """Forecast the next `horizon` steps, shape (horizon,)."""
+
+    @abstractmethod
+    def precompute(self, values: np.ndarray) -> ForecastTable:
+        """
+        Vectorized forecasts for every issue step of a series.
+
+        Uses the forecaster's parameters, not its current state; the result
+        matches feeding `values` through update() on a fresh forecaster.
+        """
+
+
+def ewma(values: np.ndarray, alpha: float, initial: np.ndarray, axis: int = 0) -> np.ndarray:
+    """
+    Exponentially weighted moving average along an axis.
+
+    y[k] = alpha * values[k] + (1 - alpha) * y[k-1], with y[-1] = initial.
+
+    Args:
+        values: Input series
+        alpha: Smoothing factor (0-1]
+        initial: State before the first value (broadcast over other axes)
+        axis: Axis to filter along
+
+    Returns:
+        Smoothed series, same shape as values
+    """
+    from scipy.signal import lfilter
+
+    values = np.asarray(values, dtype=float)
+    if values.shape[axis] == 0:
+        return values.copy()
+    zi = np.expand_dims((1.0 - alpha) * np.asarray(initial, dtype=float), axis)
+    zi = np.broadcast_to(zi, values.shape[:axis] + (1,) + values.shape[axis + 1:])
+    smoothed, _ = lfilter([alpha], [1.0, -(1.0 - alpha)], values, axis=axis, zi=zi)
+    return smoothed
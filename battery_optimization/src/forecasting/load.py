@@ -0,0 +1,126 @@
+"""
+Seasonal forecasters for load (and as fallback for prices).
+
+SeasonalSmoothingForecaster keeps one exponentially smoothed value per
+seasonal phase (e.g. each 15-min slot of the week) plus a smoothed deviation
+of recent observations from that profile. The deviation carries short-term
+level shifts into the first hours of the forecast and decays with lead time:
+
+    forecast[t + h] = season[phase(t + h)] + deviation * damping^(h+1)
+
+SeasonalNaiveForecaster is the special case alpha=1, beta=0 (repeat the
+value one season ago).
+"""
+
+import numpy as np
+
+from .base import Forecaster, ForecastTable, ewma
+
+
+class _SeasonalSmoothingTable(ForecastTable):
+    """Seasonal/deviation states after each observation of a series."""
+
+    def __init__(self, season: np.ndarray, deviation: np.ndarray, season_steps: int, damping: float):
+        self._season = season          # Seasonal state of step k's phase after observing k
+        self._deviation = deviation    # Deviation state after observing k
+        self._m = season_steps
+        self._damping = damping
+        self._offsets = {}
+
+    def _horizon_offsets(self, horizon: int):
+        """Phase offsets and deviation decay per lead time (cached per horizon)."""
+        if horizon not in self._offsets:
+            h = np.arange(horizon)
+            self._offsets[horizon] = (h - self._m * (h // self._m + 1), self._damping ** (h + 1))
+        return self._offsets[horizon]
+
+    def window(self, i: int, horizon: int) -> np.ndarray:
+        if i == 0:
+            return np.zeros(horizon)
+        offsets, decay = self._horizon_offsets(horizon)
+
+        # Last observation before i with the same phase as target i + h (j[0] = i - m is the smallest)
+        j = i + offsets
+        if j[0] < 0:
+            # Phases not observed yet: mean of the observed seasonal states
+            seen_mean = self._season[max(0, i - self._m):i].mean()
+            forecast = np.where(j < 0, seen_mean, self._season[np.maximum(j, 0)])
+        else:
+            forecast = self._season[j]
+
+        return forecast + self._deviation[i - 1] * decay
+
+
+class SeasonalSmoothingForecaster(Forecaster):
+    """Seasonal exponential smoothing with a damped deviation term."""
+
+    def __init__(self, season_steps: int, alpha: float = 0.2, beta: float = 0.5, damping: float = 0.8):
+        """
+        Initialize forecaster.
+
+        Args:
+            season_steps: Steps per season (e.g. 168 for a weekly season at PT60M)
+            alpha: Smoothing factor of the seasonal profile
+            beta: Smoothing factor of the deviation from the profile
+            damping: Per-step decay of the deviation over the horizon
+        """
+        if season_steps < 1:
+            raise ValueError("season_steps must be at least 1")
+        if not (0 < alpha <= 1 and 0 <= beta <= 1 and 0 <= damping <= 1):
+            raise ValueError("alpha must be in (0, 1], beta and damping in [0, 1]")
+
+        self.season_steps = season_steps
+        self.alpha = alpha
+        self.beta = beta
+        self.damping = damping
+
+        self._season = np.full(season_steps, np.nan)
+        self._deviation = 0.0
+        self._n = 0
+
+    def update(self, value: float) -> None:
+        phase = self._n % self.season_steps
+        previous = self._season[phase]
+        if np.isnan(previous):
+            self._season[phase] = value
+        else:
+            self._deviation = self.beta * (value - previous) + (1 - self.beta) * self._deviation
+            self._season[phase] = self.alpha * value + (1 - self.alpha) * previous
+        self._n += 1
+
+    def forecast(self, horizon: int) -> np.ndarray:
+        h = np.arange(horizon)
+        if self._n == 0:
+            return np.zeros(horizon)
+
+        forecast = self._season[(self._n + h) % self.season_steps]
+        unseen = np.isnan(forecast)
+        if unseen.any():
+            forecast[unseen] = np.nanmean(self._season)
+
+        return forecast + self._deviation * self.damping ** (h + 1)
+
+    def precompute(self, values: np.ndarray) -> ForecastTable:
+        values = np.asarray(values, dtype=float)
+        n, m = len(values), self.season_steps
+
+        # One EWMA per phase: filter the (seasons × phases) matrix along seasons
+        n_seasons = -(-n // m)
+        padded = np.zeros(n_seasons * m)
+        padded[:n] = values
+        padded = padded.reshape(n_seasons, m)
+        season = ewma(padded, self.alpha, initial=padded[0]).ravel()[:n]
+
+        # Residual against the profile before each observation (0 in the first season)
+        residual = np.zeros(n)
+        residual[m:] = values[m:] - season[:-m]
+        deviation = ewma(residual, self.beta, initial=0.0)
+
+        return _SeasonalSmoothingTable(season, deviation, m, self.damping)
+
+
+class SeasonalNaiveForecaster(SeasonalSmoothingForecaster):
+    """Repeat the observation one season earlier."""
+
+    def __init__(self, season_steps: int):
+        super().__init__(season_steps, alpha=1.0, beta=0.0, damping=0.0)
@@ -0,0 +1,112 @@
+"""
+Day-ahead price forecaster.
+
+Spot prices for day D+1 are published around 13:00 on day D, so at any time
+the prices up to the end of today (or of tomorrow, after publication) are
+known exactly. Beyond that, a daily seasonal smoothing model fitted on the
+published prices fills the rest of the horizon.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .base import Forecaster, ForecastTable
+from .load import SeasonalSmoothingForecaster
+
+
+def known_price_end(timestamps: pd.DatetimeIndex, publication_hour: int = 13) -> np.ndarray:
+    """
+    Index of the first unpublished price for each issue step.
+
+    Args:
+        timestamps: Price timestamps
+        publication_hour: Hour at which next-day prices are published
+
+    Returns:
+        Array where prices[i:known_end[i]] are known at timestamps[i]
+    """
+    timestamps = pd.DatetimeIndex(timestamps)
+    days_known = 1 + (timestamps.hour >= publication_hour).astype(int)
+    boundary = timestamps.normalize() + pd.to_timedelta(days_known, unit='D')
+    return np.searchsorted(timestamps, boundary)
+
+
+class _DayAheadTable(ForecastTable):
+    """Published prices plus fallback forecasts beyond the publication boundary."""
+
+    def __init__(self, prices: np.ndarray, known_end: np.ndarray, fallback: ForecastTable):
+        self._prices = prices
+        self._known_end = known_end
+        self._fallback = fallback
+
+    def window(self, i: int, horizon: int) -> np.ndarray:
+        end = int(self._known_end[i])
+        known = self._prices[i:min(end, i + horizon)]
+        remaining = horizon - len(known)
+        if remaining <= 0:
+            return known.copy()
+        return np.concatenate([known, self._fallback.window(end, remaining)])
+
+
+class DayAheadPriceForecaster(Forecaster):
+    """Published day-ahead prices with a seasonal fallback beyond them."""
+
+    def __init__(
+        self,
+        timestamps: pd.DatetimeIndex,
+        prices: np.ndarray,
+        publication_hour: int = 13,
+        alpha: float = 0.3,
+        beta: float = 0.5,
+        damping: float = 0.9
+    ):
+        """
+        Initialize forecaster.
+
+        Args:
+            timestamps: Timestamps of the whole price series
+            prices: Price series; only the published part is ever read
+            publication_hour: Hour at which next-day prices are published
+            alpha, beta, damping: Parameters of the daily fallback model
+                (see SeasonalSmoothingForecaster)
+        """
+        self.timestamps = pd.DatetimeIndex(timestamps)
+        self.prices = np.asarray(prices, dtype=float)
+        self.publication_hour = publication_hour
+        self.known_end = known_price_end(self.timestamps, publication_hour)
+
+        steps_per_day = int(round(pd.Timedelta(days=1) / pd.Series(self.timestamps).diff().median()))
+        self._fallback_args = (steps_per_day, alpha, beta, damping)
+        self._fallback = SeasonalSmoothingForecaster(*self._fallback_args)
+        self._published = 0
+        self._n = 0
+        self._publish()
+
+    def _publish(self) -> None:
+        """Feed the fallback model with the prices published by the current step."""
+        end = self.known_end[self._n] if self._n < len(self.known_end) else len(self.prices)
+        while self._published < end:
+            self._fallback.update(self.prices[self._published])
+            self._published += 1
+
+    def update(self, value: float = None) -> None:
+        """
+        Advance to the next step.
+
+        Prices are published ahead of time, so the observation itself is not
+        needed.
+        """
+        self._n += 1
+        self._publish()
+
+    def forecast(self, horizon: int) -> np.ndarray:
+        known = self.prices[self._n:min(self._published, self._n + horizon)]
+        remaining = horizon - len(known)
+        if remaining <= 0:
+            return known.copy()
+        return np.concatenate([known, self._fallback.forecast(remaining)])
+
+    def precompute(self, values: np.ndarray = None) -> ForecastTable:
+        prices = self.prices if values is None else np.asarray(values, dtype=float)
+        fallback = SeasonalSmoothingForecaster(*self._fallback_args).precompute(prices)
+        return _DayAheadTable(prices, self.known_end, fallback)
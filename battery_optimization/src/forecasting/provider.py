@@ -0,0 +1,58 @@
+"""
+Forecast provider for rolling horizon backtests.
+
+Precomputes PV, load and price forecasts for every issue step of a data set
+once, so each re-optimization only slices its window.
+"""
+
+import time
+from typing import Tuple
+
+import numpy as np
+
+from src.data.data_manager import TimeSeriesData
+from .load import SeasonalSmoothingForecaster
+from .price import DayAheadPriceForecaster
+from .pv import ClearSkyPersistenceForecaster, clear_sky_profile
+
+
+class ForecastProvider:
+    """Vectorized PV, load and price forecasts over a whole backtest."""
+
+    def __init__(self, data: TimeSeriesData, publication_hour: int = 13):
+        """
+        Fit the forecasters on the data set.
+
+        Args:
+            data: Time series to forecast (realized values)
+            publication_hour: Hour at which next-day prices are published
+        """
+        start_time = time.perf_counter()
+        steps_per_hour = 1 if data.resolution == 'PT60M' else 4
+
+        clear_sky = clear_sky_profile(data.timestamps, data.pv_production_kw)
+        self.pv_forecaster = ClearSkyPersistenceForecaster(clear_sky)
+        self.load_forecaster = SeasonalSmoothingForecaster(season_steps=168 * steps_per_hour)
+        self.price_forecaster = DayAheadPriceForecaster(
+            data.timestamps, data.prices_nok_per_kwh, publication_hour=publication_hour
+        )
+
+        self._pv = self.pv_forecaster.precompute(data.pv_production_kw)
+        self._load = self.load_forecaster.precompute(data.consumption_kw)
+        self._price = self.price_forecaster.precompute()
+        self.precompute_time_s = time.perf_counter() - start_time
+
+    def window(self, i: int, horizon: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Forecasts issued at step i.
+
+        Args:
+            i: Issue step index
+            horizon: Number of steps
+
+        Returns:
+            Tuple of (pv_kw, consumption_kw, prices_nok_per_kwh), each (horizon,)
+        """
+        pv = np.maximum(self._pv.window(i, horizon), 0.0)
+        load = np.maximum(self._load.window(i, horizon), 0.0)
+        return pv, load, self._price.window(i, horizon)
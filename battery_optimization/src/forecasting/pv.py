@@ -0,0 +1,135 @@
+"""
+Clear-sky-scaled persistence for PV production.
+
+PV is split into a clear-sky envelope, which is known ahead, and a clearness
+index k = observed / clear-sky, which persists. The forecast scales the
+envelope with the recent clearness and relaxes it towards its long-run mean
+with lead time:
+
+    forecast[t + h] = clear_sky[t + h] * (k_mean + (k_recent - k_mean) * damping^(h+1))
+
+The envelope is derived from a PVGIS profile as the rolling maximum of each
+time of day over neighbouring days, i.e. the production of the clearest
+recent days.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .base import Forecaster, ForecastTable, ewma
+
+
+def clear_sky_profile(
+    timestamps: pd.DatetimeIndex,
+    pv_kw: np.ndarray,
+    window_days: int = 15
+) -> np.ndarray:
+    """
+    Clear-sky envelope of a PV profile.
+
+    Args:
+        timestamps: Timestamps of the profile
+        pv_kw: PV production (e.g. a PVGIS profile) [kW]
+        window_days: Days in the centered rolling window
+
+    Returns:
+        Envelope aligned with timestamps [kW]
+    """
+    timestamps = pd.DatetimeIndex(timestamps)
+    dates = timestamps.normalize()
+    time_of_day = timestamps - dates
+
+    table = pd.Series(np.asarray(pv_kw, dtype=float)).groupby(
+        [dates, time_of_day]
+    ).max().unstack()
+    envelope = table.rolling(window_days, center=True, min_periods=1).max()
+
+    rows = envelope.index.get_indexer(dates)
+    cols = envelope.columns.get_indexer(time_of_day)
+    return envelope.to_numpy()[rows, cols]
+
+
+class _ClearSkyTable(ForecastTable):
+    """Clearness states before each issue step."""
+
+    def __init__(self, clear_sky: np.ndarray, k_recent: np.ndarray, k_mean: np.ndarray, damping: float):
+        self._clear_sky = clear_sky
+        self._k_recent = k_recent  # State before step i, shape (n + 1,)
+        self._k_mean = k_mean
+        self._damping = damping
+        self._decay = {}
+
+    def window(self, i: int, horizon: int) -> np.ndarray:
+        if horizon not in self._decay:
+            self._decay[horizon] = self._damping ** (np.arange(horizon) + 1)
+        k = self._k_mean[i] + (self._k_recent[i] - self._k_mean[i]) * self._decay[horizon]
+        return self._clear_sky[i:i + horizon] * k
+
+
+class ClearSkyPersistenceForecaster(Forecaster):
+    """Persistence of the clearness index on a clear-sky envelope."""
+
+    def __init__(
+        self,
+        clear_sky: np.ndarray,
+        alpha: float = 0.5,
+        alpha_mean: float = 0.01,
+        damping: float = 0.9,
+        initial_clearness: float = 0.5,
+        min_clear_sky_fraction: float = 0.05
+    ):
+        """
+        Initialize forecaster.
+
+        Args:
+            clear_sky: Clear-sky envelope for the whole timeline [kW]
+            alpha: Smoothing factor of the recent clearness index
+            alpha_mean: Smoothing factor of the long-run clearness index
+            damping: Per-step relaxation of recent towards long-run clearness
+            initial_clearness: Clearness index before any observation
+            min_clear_sky_fraction: Steps with clear-sky below this fraction of
+                the envelope maximum (night, low sun) do not update clearness
+        """
+        self.clear_sky = np.asarray(clear_sky, dtype=float)
+        self.alpha = alpha
+        self.alpha_mean = alpha_mean
+        self.damping = damping
+        self.initial_clearness = initial_clearness
+        self.min_clear_sky_kw = min_clear_sky_fraction * np.nanmax(self.clear_sky)
+
+        self._k_recent = initial_clearness
+        self._k_mean = initial_clearness
+        self._n = 0
+
+    def _clearness(self, values: np.ndarray, clear_sky: np.ndarray) -> np.ndarray:
+        return np.clip(values / clear_sky, 0.0, 1.5)
+
+    def update(self, value: float) -> None:
+        clear_sky = self.clear_sky[self._n]
+        if clear_sky > self.min_clear_sky_kw:
+            k = self._clearness(value, clear_sky)
+            self._k_recent = self.alpha * k + (1 - self.alpha) * self._k_recent
+            self._k_mean = self.alpha_mean * k + (1 - self.alpha_mean) * self._k_mean
+        self._n += 1
+
+    def forecast(self, horizon: int) -> np.ndarray:
+        if self._n + horizon > len(self.clear_sky):
+            raise ValueError("Forecast horizon extends beyond the clear-sky profile")
+        h = np.arange(horizon)
+        k = self._k_mean + (self._k_recent - self._k_mean) * self.damping ** (h + 1)
+        return self.clear_sky[self._n:self._n + horizon] * k
+
+    def precompute(self, values: np.ndarray) -> ForecastTable:
+        values = np.asarray(values, dtype=float)
+        n = len(values)
+        clear_sky = self.clear_sky[:n]
+
+        # Filter clearness over daylight steps only, then hold it overnight
+        daylight = np.flatnonzero(clear_sky > self.min_clear_sky_kw)
+        k = self._clearness(values[daylight], clear_sky[daylight])
+        k_recent = np.concatenate([[self.initial_clearness], ewma(k, self.alpha, self.initial_clearness)])
+        k_mean = np.concatenate([[self.initial_clearness], ewma(k, self.alpha_mean, self.initial_clearness)])
+
+        # Number of daylight observations before each issue step 0..n
+        observed = np.searchsorted(daylight, np.arange(n + 1))
+        return _ClearSkyTable(self.clear_sky, k_recent[observed], k_mean[observed], self.damping)
@@ -9,11 +9,120 @@ PEAK_PENALTY_METHODOLOGY.md.
 import numpy as np
 import pandas as pd
 from datetime import datetime
-from typing import Optional
-from dataclasses import dataclass
+from typing import Optional, Union
+
+NS_PER_DAY = 86_400 * 10**9
+
+TimeLike = Union[datetime, pd.Timestamp, np.datetime64, int]
+
+
+def epoch_ns(value: TimeLike) -> int:
+    """
+    Wall-clock time as integer nanoseconds since 1970-01-01.
+
+    Timezone-aware values keep their local wall-clock time (the data loaders
+    return naive local time), so calendar math on the result uses local days.
+    Integers are taken as epoch nanoseconds already.
+    """
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_localize(None)
+    return timestamp.value
+
+
+def months_since_epoch(ns: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
+    """Months since 1970-01 of epoch nanoseconds (scalar or array)."""
+    months = np.asarray(ns, dtype=np.int64).view('datetime64[ns]').astype('datetime64[M]').astype(np.int64)
+    return int(months) if months.ndim == 0 else months
+
+
+def _month_day_range(ns: int) -> tuple:
+    """(first day, last day) of the month containing ns, as days since 1970-01-01."""
+    month = np.datetime64(ns, 'ns').astype('datetime64[M]')
+    first = int(month.astype('datetime64[D]').astype(np.int64))
+    last = int((month + 1).astype('datetime64[D]').astype(np.int64)) - 1
+    return first, last
+
+
+def adaptive_peak_penalty(power_tariff_rate_nok_per_kw: float,
+                          monthly_peak_kw,
+                          current_grid_import_kw,
+                          max_forecast_kw,
+                          days_remaining,
+                          days_elapsed):
+    """
+    Adaptive peak penalty [NOK/kW] from its inputs (scalars or arrays).
+
+    penalty = base × proximity_factor × forecast_risk × time_factor, see
+    BatterySystemState.calculate_adaptive_peak_penalty. Array inputs give the
+    penalty of many windows in one pass (PeakPenaltyTable).
+
+    Args:
+        power_tariff_rate_nok_per_kw: Average tariff rate [NOK/kW/month]
+        monthly_peak_kw: Peak grid import this month [kW]
+        current_grid_import_kw: Current grid import [kW]
+        max_forecast_kw: Maximum forecast grid import over the window [kW]
+        days_remaining: Days remaining until end of month
+        days_elapsed: Days elapsed since start of month
+
+    Returns:
+        Penalty coefficient [NOK/kW] (array for array inputs)
+    """
+    if power_tariff_rate_nok_per_kw == 0:
+        return np.zeros(np.broadcast(monthly_peak_kw, current_grid_import_kw, max_forecast_kw,
+                                     days_remaining, days_elapsed).shape)  # No power tariff configured
+
+    # Base penalty: proportional to remaining month cost impact
+    # If we create a new peak now, we pay for it for rest of month
+    # BUT: for a 24h rolling horizon, we only charge this window's share (1/days_left)
+    # This gives the marginal cost of a peak increase for THIS 24h period
+    days_left = np.maximum(1, days_remaining)
+    monthly_penalty = power_tariff_rate_nok_per_kw * (days_left / 30.0)
+    base_penalty = monthly_penalty / days_left  # Prorate to 1-day share
+
+    # Proximity factor: amplify if current demand is close to peak
+    # (Higher risk of accidentally exceeding)
+    has_peak = np.asarray(monthly_peak_kw) > 0
+    proximity_factor = np.where(has_peak & (current_grid_import_kw > 0.9 * np.asarray(monthly_peak_kw)), 2.0, 1.0)
+
+    # Forecast risk factor: amplify if forecast predicts peak exceedance
+    forecast_risk_factor = np.where(has_peak & (max_forecast_kw > monthly_peak_kw), 1.5, 1.0)
+
+    # Time factor: increase penalty as month progresses
+    # (Later in month = peak harder to reduce, more time to pay for it)
+    time_factor = 1.0 + 0.5 * (np.asarray(days_elapsed) / 30.0)  # 1.0 to 1.5
+
+    return base_penalty * proximity_factor * forecast_risk_factor * time_factor
+
+
+def _forward_window_max(values: np.ndarray, window_end: np.ndarray) -> np.ndarray:
+    """
+    max(values[i:window_end[i]]) for every i, with window_end[i] > i.
+
+    Sparse table of power-of-two window maxima: each query is the maximum of
+    two overlapping power-of-two windows, so all windows take O(n log n).
+    """
+    n = len(values)
+    lengths = window_end - np.arange(n)
+    result = np.empty(n)
+    if n == 0:
+        return result
+
+    levels = [values]
+    while 2 ** len(levels) <= lengths.max():
+        half = 2 ** (len(levels) - 1)
+        levels.append(np.maximum(levels[-1][:-half], levels[-1][half:]))
+
+    level_of = np.frexp(lengths)[1] - 1  # floor(log2(length))
+    for k in np.unique(level_of):
+        steps = np.flatnonzero(level_of == k)
+        table = levels[k]
+        result[steps] = np.maximum(table[steps], table[window_end[steps] - 2 ** k])
+    return result
 
 
-@dataclass
 class BatterySystemState:
     """
     Tracks real-time state of battery system for rolling horizon optimization.
@@ -22,26 +131,114 @@ class BatterySystemState:
         - Battery SOC (State of Charge)
         - Monthly peak demand tracking
         - Time within month for penalty calculation
+
+    Times are held as integer epoch nanoseconds (month_start_ns, last_update_ns)
+    with the current month's day range cached, so the per-step updates and
+    calendar properties of long simulations do no datetime arithmetic.
+    month_start_date and last_update convert to/from datetime.
     """
 
-    # Battery state
-    current_soc_kwh: float = 0.0           # Current battery energy [kWh]
-    battery_capacity_kwh: float = 0.0      # Nominal capacity [kWh]
+    __slots__ = (
+        'current_soc_kwh',
+        'battery_capacity_kwh',
+        'current_monthly_peak_kw',
+        'power_tariff_rate_nok_per_kw',
+        '_month_start_ns',
+        '_month_index',
+        '_last_update_ns',
+        '_month_first_day',
+        '_month_last_day',
+    )
+
+    def __init__(self,
+                 current_soc_kwh: float = 0.0,
+                 battery_capacity_kwh: float = 0.0,
+                 current_monthly_peak_kw: float = 0.0,
+                 month_start_date: Optional[TimeLike] = None,
+                 last_update: Optional[TimeLike] = None,
+                 power_tariff_rate_nok_per_kw: float = 0.0):
+        """
+        Initialize state.
 
-    # Monthly peak tracking
-    current_monthly_peak_kw: float = 0.0   # Peak grid import this month [kW]
-    month_start_date: Optional[datetime] = None
-    last_update: Optional[datetime] = None
+        Args:
+            current_soc_kwh: Current battery energy [kWh]
+            battery_capacity_kwh: Nominal capacity [kWh]
+            current_monthly_peak_kw: Peak grid import this month [kW]
+            month_start_date: Start of the peak tracking month (default: first
+                day of last_update's month)
+            last_update: Time of the last measurement
+            power_tariff_rate_nok_per_kw: Average tariff rate [NOK/kW/month]
+        """
+        self.current_soc_kwh = current_soc_kwh
+        self.battery_capacity_kwh = battery_capacity_kwh
+        self.current_monthly_peak_kw = current_monthly_peak_kw
+        self.power_tariff_rate_nok_per_kw = power_tariff_rate_nok_per_kw
 
-    # Tariff parameters (for penalty calculation)
-    power_tariff_rate_nok_per_kw: float = 0.0  # Average tariff rate [NOK/kW/month]
+        self._month_start_ns: Optional[int] = None
+        self._month_index: Optional[int] = None
+        self._last_update_ns: Optional[int] = None
+        self._month_first_day = 0
+        self._month_last_day = -1
 
-    def __post_init__(self):
-        """Initialize month start date if not provided."""
         # Note: Do NOT auto-initialize last_update to datetime.now() for simulations!
         # The first update_from_measurement() call will set it correctly.
-        if self.month_start_date is None and self.last_update is not None:
-            self.month_start_date = self.last_update.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        if last_update is not None:
+            self.last_update_ns = epoch_ns(last_update)
+        if month_start_date is not None:
+            self.month_start_ns = epoch_ns(month_start_date)
+        elif self._last_update_ns is not None:
+            self.month_start_ns = _month_day_range(self._last_update_ns)[0] * NS_PER_DAY
+
+    # Integer epoch times
+
+    @property
+    def month_start_ns(self) -> Optional[int]:
+        """Start of the peak tracking month [epoch ns]."""
+        return self._month_start_ns
+
+    @month_start_ns.setter
+    def month_start_ns(self, ns: Optional[int]) -> None:
+        self._month_start_ns = None if ns is None else int(ns)
+        self._month_index = None if ns is None else months_since_epoch(ns)
+
+    @property
+    def month_index(self) -> Optional[int]:
+        """Months since 1970-01 of month_start_ns (compare with months_since_epoch() of a time)."""
+        return self._month_index
+
+    @property
+    def last_update_ns(self) -> Optional[int]:
+        """Time of the last measurement [epoch ns]."""
+        return self._last_update_ns
+
+    @last_update_ns.setter
+    def last_update_ns(self, ns: Optional[int]) -> None:
+        self._last_update_ns = None if ns is None else int(ns)
+        if ns is not None and not self._in_cached_month(ns // NS_PER_DAY):
+            self._month_first_day, self._month_last_day = _month_day_range(ns)
+
+    def _in_cached_month(self, day: int) -> bool:
+        return self._month_first_day <= day <= self._month_last_day
+
+    # datetime views
+
+    @property
+    def month_start_date(self) -> Optional[datetime]:
+        """Start of the peak tracking month."""
+        return None if self._month_start_ns is None else pd.Timestamp(self._month_start_ns).to_pydatetime()
+
+    @month_start_date.setter
+    def month_start_date(self, value: Optional[TimeLike]) -> None:
+        self.month_start_ns = None if value is None else epoch_ns(value)
+
+    @property
+    def last_update(self) -> Optional[datetime]:
+        """Time of the last measurement."""
+        return None if self._last_update_ns is None else pd.Timestamp(self._last_update_ns).to_pydatetime()
+
+    @last_update.setter
+    def last_update(self, value: Optional[TimeLike]) -> None:
+        self.last_update_ns = None if value is None else epoch_ns(value)
 
     @property
     def current_soc_percent(self) -> float:
@@ -53,43 +250,36 @@ class BatterySystemState:
     @property
     def days_remaining_in_month(self) -> int:
         """Days remaining until end of current month."""
-        if self.last_update is None:
+        if self._last_update_ns is None:
             return 15  # Default mid-month
 
-        # Get last day of current month
-        if self.last_update.month == 12:
-            next_month = self.last_update.replace(year=self.last_update.year + 1, month=1, day=1)
-        else:
-            next_month = self.last_update.replace(month=self.last_update.month + 1, day=1)
-
-        month_end = next_month - pd.Timedelta(days=1)
-        days_left = (month_end.date() - self.last_update.date()).days
-
-        return max(0, days_left)
+        return max(0, self._month_last_day - self._last_update_ns // NS_PER_DAY)
 
     @property
     def days_elapsed_in_month(self) -> int:
         """Days elapsed since start of current month."""
-        if self.last_update is None or self.month_start_date is None:
+        if self._last_update_ns is None or self._month_start_ns is None:
             return 15  # Default mid-month
 
-        return (self.last_update.date() - self.month_start_date.date()).days
+        return self._last_update_ns // NS_PER_DAY - self._month_start_ns // NS_PER_DAY
 
     def update_from_measurement(self,
-                                timestamp: datetime,
+                                timestamp: TimeLike,
                                 soc_kwh: float,
                                 grid_import_power_kw: float):
         """
         Update state from real-time measurements.
 
         Args:
-            timestamp: Measurement timestamp
+            timestamp: Measurement timestamp (datetime or epoch ns)
             soc_kwh: Battery state of charge [kWh]
             grid_import_power_kw: Current grid import power [kW] (positive = import)
         """
+        ns = epoch_ns(timestamp)
+
         # Check for month boundary crossing
-        if self.last_update is not None and timestamp.month != self.last_update.month:
-            self._reset_monthly_peak(timestamp)
+        if self._last_update_ns is not None and not self._in_cached_month(ns // NS_PER_DAY):
+            self._reset_monthly_peak(ns)
 
         # Update battery SOC
         self.current_soc_kwh = soc_kwh
@@ -98,12 +288,31 @@ class BatterySystemState:
         if grid_import_power_kw > self.current_monthly_peak_kw:
             self.current_monthly_peak_kw = grid_import_power_kw
 
-        self.last_update = timestamp
+        self.last_update_ns = ns
 
-    def _reset_monthly_peak(self, new_month_timestamp: datetime):
+    def _reset_monthly_peak(self, new_month_timestamp: TimeLike):
         """Reset peak tracking at month boundary."""
         self.current_monthly_peak_kw = 0.0
-        self.month_start_date = new_month_timestamp.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        self.month_start_ns = _month_day_range(epoch_ns(new_month_timestamp))[0] * NS_PER_DAY
+
+    def __getstate__(self) -> dict:
+        return {
+            'current_soc_kwh': self.current_soc_kwh,
+            'battery_capacity_kwh': self.battery_capacity_kwh,
+            'current_monthly_peak_kw': self.current_monthly_peak_kw,
+            'power_tariff_rate_nok_per_kw': self.power_tariff_rate_nok_per_kw,
+            'month_start_date': self._month_start_ns,
+            'last_update': self._last_update_ns,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        # Also accepts pickles of the former dataclass (datetime fields)
+        self.__init__(**state)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BatterySystemState):
+            return NotImplemented
+        return self.__getstate__() == other.__getstate__()
 
     def calculate_adaptive_peak_penalty(self,
                                        current_grid_import_kw: float,
@@ -122,42 +331,15 @@ class BatterySystemState:
         Returns:
             Penalty coefficient [NOK/kW] for peak violation in LP objective
         """
-        if self.power_tariff_rate_nok_per_kw == 0:
-            return 0.0  # No power tariff configured
-
-        # Base penalty: proportional to remaining month cost impact
-        # If we create a new peak now, we pay for it for rest of month
-        # BUT: for a 24h rolling horizon, we only charge this window's share (1/days_left)
-        # This gives the marginal cost of a peak increase for THIS 24h period
-        days_left = max(1, self.days_remaining_in_month)
-        monthly_penalty = self.power_tariff_rate_nok_per_kw * (days_left / 30.0)
-        base_penalty = monthly_penalty / days_left  # Prorate to 1-day share
-
-        # Proximity factor: amplify if current demand is close to peak
-        # (Higher risk of accidentally exceeding)
-        proximity_threshold = 0.9 * self.current_monthly_peak_kw
-        if current_grid_import_kw > proximity_threshold and self.current_monthly_peak_kw > 0:
-            proximity_factor = 2.0  # Double penalty when near peak
-        else:
-            proximity_factor = 1.0
-
-        # Forecast risk factor: amplify if forecast predicts peak exceedance
-        # Check if any forecasted value exceeds current peak
         max_forecast = np.max(forecast_grid_import_24h) if len(forecast_grid_import_24h) > 0 else 0.0
-        if max_forecast > self.current_monthly_peak_kw and self.current_monthly_peak_kw > 0:
-            forecast_risk_factor = 1.5  # Increase penalty if peak violation likely
-        else:
-            forecast_risk_factor = 1.0
-
-        # Time factor: increase penalty as month progresses
-        # (Later in month = peak harder to reduce, more time to pay for it)
-        days_elapsed = self.days_elapsed_in_month
-        time_factor = 1.0 + 0.5 * (days_elapsed / 30.0)  # 1.0 to 1.5
-
-        # Combined adaptive penalty
-        penalty = base_penalty * proximity_factor * forecast_risk_factor * time_factor
-
-        return penalty
+        return float(adaptive_peak_penalty(
+            self.power_tariff_rate_nok_per_kw,
+            self.current_monthly_peak_kw,
+            current_grid_import_kw,
+            max_forecast,
+            self.days_remaining_in_month,
+            self.days_elapsed_in_month,
+        ))
 
     def get_state_summary(self) -> dict:
         """Get summary of current state for logging/debugging."""
@@ -221,3 +403,93 @@ def calculate_average_power_tariff_rate(tariff_config) -> float:
 
     avg_rate = total_cost / total_power
     return avg_rate
+
+
+class PeakPenaltyTable:
+    """
+    Adaptive peak penalty inputs for every step of a simulation period.
+
+    Precomputes in one vectorized pass what calculate_adaptive_peak_penalty
+    derives for each rolling window: the current import (net load floored at
+    0), the forward maximum of the import over the step's horizon window, and
+    the days remaining/elapsed in the step's month. Only the monthly peak
+    depends on the simulated path, so the per-window penalty is a lookup.
+
+    **Usage:**
+        table = PeakPenaltyTable(timestamps, load - pv, horizon_hours=24,
+                                 power_tariff_rate_nok_per_kw=rate)
+        penalty = table.penalty(table.step_of(window_start), state.current_monthly_peak_kw)
+    """
+
+    def __init__(self,
+                 timestamps: pd.DatetimeIndex,
+                 net_load_kw: np.ndarray,
+                 horizon_hours: float,
+                 power_tariff_rate_nok_per_kw: float):
+        """
+        Initialize table.
+
+        Args:
+            timestamps: Step start times of the period (sorted)
+            net_load_kw: Load - PV per step [kW]
+            horizon_hours: Window length of each rolling optimization
+            power_tariff_rate_nok_per_kw: Average tariff rate [NOK/kW/month]
+        """
+        timestamps = pd.DatetimeIndex(timestamps)
+        if timestamps.tz is not None:
+            timestamps = timestamps.tz_localize(None)
+        self.timestamps_ns = timestamps.as_unit('ns').asi8
+        self.power_tariff_rate_nok_per_kw = power_tariff_rate_nok_per_kw
+
+        # Window [t, t + horizon) of each step, as in TimeSeriesData.get_window
+        self.current_import_kw = np.maximum(0, np.asarray(net_load_kw, dtype=float))
+        window_end = np.searchsorted(self.timestamps_ns,
+                                     self.timestamps_ns + int(horizon_hours * 3600 * 10**9))
+        self.max_forecast_kw = _forward_window_max(self.current_import_kw, window_end)
+
+        # Month-day tables
+        days = self.timestamps_ns // NS_PER_DAY
+        months = self.timestamps_ns.view('datetime64[ns]').astype('datetime64[M]')
+        first_day = months.astype('datetime64[D]').astype(np.int64)
+        last_day = (months + 1).astype('datetime64[D]').astype(np.int64) - 1
+        self.days_remaining = last_day - days
+        self.days_elapsed = days - first_day
+
+    def __len__(self) -> int:
+        return len(self.timestamps_ns)
+
+    def step_of(self, timestamp: TimeLike) -> int:
+        """
+        Step index of a step start time.
+
+        Raises:
+            KeyError: If timestamp is not a step of the table
+        """
+        ns = epoch_ns(timestamp)
+        step = int(np.searchsorted(self.timestamps_ns, ns))
+        if step == len(self.timestamps_ns) or self.timestamps_ns[step] != ns:
+            raise KeyError(f"{pd.Timestamp(ns)} is not a step of the peak penalty table")
+        return step
+
+    def penalty(self, step: int, monthly_peak_kw: float) -> float:
+        """Penalty [NOK/kW] of the window starting at step, given the monthly peak so far."""
+        return float(adaptive_peak_penalty(
+            self.power_tariff_rate_nok_per_kw,
+            monthly_peak_kw,
+            self.current_import_kw[step],
+            self.max_forecast_kw[step],
+            self.days_remaining[step],
+            self.days_elapsed[step],
+        ))
+
+    def penalties(self, monthly_peak_kw: np.ndarray) -> np.ndarray:
+        """Penalty [NOK/kW] of the first len(monthly_peak_kw) steps, given the monthly peak before each."""
+        n = len(monthly_peak_kw)
+        return adaptive_peak_penalty(
+            self.power_tariff_rate_nok_per_kw,
+            np.asarray(monthly_peak_kw, dtype=float),
+            self.current_import_kw[:n],
+            self.max_forecast_kw[:n],
+            self.days_remaining[:n],
+            self.days_elapsed[:n],
+        )
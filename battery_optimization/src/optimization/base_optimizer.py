@@ -6,11 +6,12 @@ Defines common interface for all optimizer implementations.
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, Optional
 import pandas as pd
 import numpy as np
 
 from src.operational.state_manager import BatterySystemState
+from core.solve_profile import SolveTimings
 
 
 @dataclass
@@ -49,6 +50,21 @@ class OptimizationResult:
     # Final battery state
     E_battery_final: Optional[float] = None
 
+    # LP dual values per constraint block (optional, see DualValueAttributor)
+    duals: Optional[Dict[str, np.ndarray]] = None
+
+    # Step durations in hours (optional; non-uniform for coarsened horizons)
+    timestep_hours: Optional[np.ndarray] = None
+
+    # Per-phase solve timings (optional, see core.solve_profile)
+    timings: Optional[SolveTimings] = None
+
+    # Adaptive peak penalty of the window [NOK/kW] (optional, rolling horizon diagnostic)
+    adaptive_peak_penalty: Optional[float] = None
+
+    # True when the LP was skipped for this window (see core.window_pruning)
+    pruned: bool = False
+
     @property
     def next_battery_setpoint_kw(self) -> float:
         """Get next control action (for rolling horizon)."""
@@ -75,7 +75,8 @@ class DualValueAttributor:
     Usage:
     ------
     >>> attributor = DualValueAttributor(power_tariff_rate=60.0)
-    >>> duals = attributor.extract_duals_from_pulp(prob)
+    >>> result = optimizer.optimize_window(..., return_duals=True)
+    >>> duals = attributor.extract_duals_from_result(result)
     >>> values = attributor.attribute_weekly_value(
     ...     duals=duals,
     ...     solution_data=solution,
@@ -161,6 +162,34 @@ class DualValueAttributor:
             discharge_limits=np.array(duals['discharge_limit'])
         )
 
+    def extract_duals_from_result(self, result) -> DualVariables:
+        """
+        Extract dual variables from a solved HiGHS optimizer result.
+
+        Works with RollingHorizonResult and MonthlyLPResult produced with
+        return_duals=True, so attribution reuses the production solve instead
+        of rebuilding the problem in PuLP.
+
+        Parameters:
+        -----------
+        result : RollingHorizonResult or MonthlyLPResult
+            Optimizer result with the `duals` dict populated
+
+        Returns:
+        --------
+        DualVariables
+            Container with organized dual variables by constraint type
+        """
+        if getattr(result, 'duals', None) is None:
+            raise ValueError(
+                "Result has no dual values - re-run the optimizer with return_duals=True"
+            )
+
+        return DualVariables(**{
+            key: np.asarray(values, dtype=float)
+            for key, values in result.duals.items()
+        })
+
     def calculate_peak_shaving_value(self, duals: DualVariables,
                                      num_months: int = 12) -> float:
         """
@@ -226,18 +255,16 @@ class DualValueAttributor:
         float
             Annual value from curtailment avoidance (NOK)
         """
-        curtailment_value = 0.0
+        n = min(len(duals.export_limits), len(charge_power))
+        export_duals = np.asarray(duals.export_limits[:n])
 
-        for t, dual in enumerate(duals.export_limits):
-            if dual > 0 and t < len(charge_power):
-                # Export limit binding + battery charging = curtailment avoided
-                energy_stored = charge_power[t]  # kWh
-                price = spot_prices[t]  # NOK/kWh
+        # Export limit binding + battery charging = curtailment avoided
+        # Value = energy that would have been curtailed × its price
+        binding = export_duals > 0
+        charge = np.asarray(charge_power[:n])
+        prices = np.asarray(spot_prices[:n])
 
-                # Value = energy that would have been curtailed × its price
-                curtailment_value += energy_stored * price
-
-        return curtailment_value
+        return float(np.sum(charge[binding] * prices[binding]))
 
     def calculate_arbitrage_value(self, duals: DualVariables,
                                  charge_power: np.ndarray,
@@ -276,35 +303,31 @@ class DualValueAttributor:
         float
             Annual value from arbitrage (NOK)
         """
-        arbitrage_value = 0.0
+        soc_duals = np.asarray(duals.soc_dynamics, dtype=float)
+        T = len(soc_duals)
 
         # Need at least 2 time steps for price spreads
-        if len(duals.soc_dynamics) < 2:
+        if T < 2:
             return 0.0
 
-        for t in range(len(duals.soc_dynamics) - 1):
-            # Calculate price spread and dual spread
-            price_spread = spot_prices[t+1] - spot_prices[t]
-            dual_spread = duals.soc_dynamics[t+1] - duals.soc_dynamics[t]
-
-            # Arbitrage condition: Both spreads same sign (buy low, sell high)
-            if np.sign(price_spread) == np.sign(dual_spread) and dual_spread != 0:
+        # Calculate price spread and dual spread
+        price_spread = np.diff(np.asarray(spot_prices[:T], dtype=float))
+        dual_spread = np.diff(soc_duals)
 
-                # Charging during low prices for future discharge
-                if charge_power[t] > 0:
-                    # Check if charging from grid (not curtailment storage)
-                    grid_charge = charge_power[t] - min(charge_power[t], pv_production[t])
+        # Arbitrage condition: Both spreads same sign (buy low, sell high)
+        is_arbitrage = (np.sign(price_spread) == np.sign(dual_spread)) & (dual_spread != 0)
 
-                    if grid_charge > 0:
-                        # This is arbitrage: buying low for future high-price discharge
-                        arbitrage_value += grid_charge * abs(dual_spread)
+        charge = np.asarray(charge_power[:T-1], dtype=float)
+        discharge = np.asarray(discharge_power[:T-1], dtype=float)
+        pv = np.asarray(pv_production[:T-1], dtype=float)
 
-                # Discharging during high prices (completing arbitrage cycle)
-                elif discharge_power[t] > 0:
-                    # Value realized from previous low-price storage
-                    arbitrage_value += discharge_power[t] * abs(dual_spread)
+        # Charging during low prices: only the grid-sourced part (not curtailment storage)
+        # Discharging during high prices: value realized from previous low-price storage
+        grid_charge = np.maximum(charge - pv, 0.0)
+        shifted_energy = np.where(charge > 0, grid_charge,
+                                  np.where(discharge > 0, discharge, 0.0))
 
-        return arbitrage_value
+        return float(np.sum(shifted_energy[is_arbitrage] * np.abs(dual_spread[is_arbitrage])))
 
     def calculate_self_consumption_value(self, duals: DualVariables,
                                         discharge_power: np.ndarray,
@@ -344,38 +367,39 @@ class DualValueAttributor:
         float
             Annual value from self-consumption (NOK)
         """
-        self_consumption_value = 0.0
-
         # Simple heuristic: If battery charged during PV production hours
         # and discharges later, it's self-consumption
         lookback_window = 24  # hours
 
-        for t in range(lookback_window, len(discharge_power)):
-            if discharge_power[t] > 0:
-                # Calculate recent PV vs grid charging
-                recent_pv_charge = sum(
-                    min(charge_power[t-i], pv_production[t-i])
-                    for i in range(1, lookback_window + 1)
-                )
-                recent_grid_charge = sum(
-                    max(0, charge_power[t-i] - pv_production[t-i])
-                    for i in range(1, lookback_window + 1)
-                )
-
-                total_recent_charge = recent_pv_charge + recent_grid_charge
-                if total_recent_charge > 0:
-                    pv_fraction = recent_pv_charge / total_recent_charge
-                else:
-                    pv_fraction = 0
-
-                # Portion from PV = self-consumption value
-                self_consumption_discharge = discharge_power[t] * pv_fraction
-
-                # Value = avoided import cost
-                avoided_cost = spot_prices[t] + energy_tariff[t]
-                self_consumption_value += self_consumption_discharge * avoided_cost
-
-        return self_consumption_value
+        n = len(discharge_power)
+        if n <= lookback_window:
+            return 0.0
+
+        charge = np.asarray(charge_power[:n], dtype=float)
+        pv = np.asarray(pv_production[:n], dtype=float)
+
+        # Rolling sums over the lookback window t-L..t-1 via prefix sums
+        pv_charge_cum = np.concatenate([[0.0], np.cumsum(np.minimum(charge, pv))])
+        grid_charge_cum = np.concatenate([[0.0], np.cumsum(np.maximum(charge - pv, 0.0))])
+
+        t = np.arange(lookback_window, n)
+        recent_pv_charge = pv_charge_cum[t] - pv_charge_cum[t - lookback_window]
+        recent_grid_charge = grid_charge_cum[t] - grid_charge_cum[t - lookback_window]
+
+        total_recent_charge = recent_pv_charge + recent_grid_charge
+        pv_fraction = np.divide(recent_pv_charge, total_recent_charge,
+                                out=np.zeros_like(total_recent_charge),
+                                where=total_recent_charge > 0)
+
+        # Portion from PV = self-consumption value
+        discharge = np.asarray(discharge_power[lookback_window:n], dtype=float)
+        self_consumption_discharge = np.where(discharge > 0, discharge, 0.0) * pv_fraction
+
+        # Value = avoided import cost
+        avoided_cost = (np.asarray(spot_prices[lookback_window:n], dtype=float)
+                        + np.asarray(energy_tariff[lookback_window:n], dtype=float))
+
+        return float(np.sum(self_consumption_discharge * avoided_cost))
 
     def calculate_degradation_cost(self, charge_power: np.ndarray,
                                   discharge_power: np.ndarray,
@@ -477,6 +501,48 @@ class DualValueAttributor:
             degradation_cost=degradation
         )
 
+    def attribute_from_result(self, result,
+                              spot_prices: np.ndarray,
+                              energy_tariff: np.ndarray,
+                              pv_production: np.ndarray,
+                              battery_capacity_kwh: float) -> ValueAttribution:
+        """
+        Value attribution straight from an optimizer result (no extra solve).
+
+        Parameters:
+        -----------
+        result : RollingHorizonResult or MonthlyLPResult
+            Optimizer result solved with return_duals=True
+        spot_prices : np.ndarray
+            Spot electricity prices [NOK/kWh]
+        energy_tariff : np.ndarray
+            Energy tariff [NOK/kWh]
+        pv_production : np.ndarray
+            PV production profile [kW]
+        battery_capacity_kwh : float
+            Battery capacity [kWh]
+
+        Returns:
+        --------
+        ValueAttribution
+            Breakdown of economic value by category
+        """
+        duals = self.extract_duals_from_result(result)
+        solution_data = {
+            'P_charge': result.P_charge,
+            'P_discharge': result.P_discharge,
+            'SOC': result.E_battery
+        }
+
+        return self.attribute_weekly_value(
+            duals=duals,
+            solution_data=solution_data,
+            spot_prices=spot_prices,
+            energy_tariff=energy_tariff,
+            pv_production=pv_production,
+            battery_capacity_kwh=battery_capacity_kwh
+        )
+
     def aggregate_annual_attribution(self, weekly_attributions: List[ValueAttribution]) -> ValueAttribution:
         """
         Aggregate weekly value attributions to annual totals.
@@ -512,11 +578,11 @@ def demonstrate_dual_attribution():
         eur_to_nok=11.5
     )
 
-    # After solving weekly LP problem:
-    # prob.solve(PULP_CBC_CMD())  # or HiGHS
+    # After solving the weekly LP with duals enabled:
+    # result = optimizer.optimize_window(..., return_duals=True)
 
     # Extract duals
-    # duals = attributor.extract_duals_from_pulp(prob)
+    # duals = attributor.extract_duals_from_result(result)
 
     # Get solution data
     # solution_data = {
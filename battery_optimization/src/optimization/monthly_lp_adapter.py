@@ -17,7 +17,7 @@ from src.optimization.base_optimizer import (
     BaseOptimizer,
     OptimizationResult,
 )
-from src.config.legacy_config_adapter import get_global_legacy_config
+from src.config.legacy_config_adapter import LegacySystemConfig, get_global_legacy_config
 
 
 class MonthlyLPAdapter(BaseOptimizer):
@@ -35,7 +35,9 @@ class MonthlyLPAdapter(BaseOptimizer):
         min_soc_percent: float = 10.0,
         max_soc_percent: float = 90.0,
         resolution: str = 'PT60M',
-        use_global_config: bool = True,
+        config: Optional[LegacySystemConfig] = None,
+        return_duals: bool = False,
+        tariff_mode: str = 'progressive',
     ):
         """
         Initialize monthly LP adapter.
@@ -47,7 +49,9 @@ class MonthlyLPAdapter(BaseOptimizer):
             min_soc_percent: Minimum SOC (0-100)
             max_soc_percent: Maximum SOC (0-100)
             resolution: Time resolution ('PT60M' or 'PT15M')
-            use_global_config: Use global config object for tariffs/system params
+            config: Tariff/system parameters (default: shared default legacy config)
+            return_duals: Attach LP dual values to results (for value attribution)
+            tariff_mode: 'progressive' bracket approximation or 'exact' step tariff
         """
         super().__init__(
             battery_kwh=battery_kwh,
@@ -58,18 +62,18 @@ class MonthlyLPAdapter(BaseOptimizer):
         )
 
         self.resolution = resolution
-        self.use_global_config = use_global_config
-
-        # Initialize core optimizer with global config
-        if use_global_config:
-            self._core_optimizer = CoreMonthlyLPOptimizer(
-                config=get_global_legacy_config(),
-                resolution=resolution,
-                battery_kwh=battery_kwh,
-                battery_kw=battery_kw,
-            )
-        else:
-            raise ValueError("Non-global config mode not yet supported")
+        self.config = config if config is not None else get_global_legacy_config()
+        self.return_duals = return_duals
+        self.tariff_mode = tariff_mode
+
+        # Initialize core optimizer with this adapter's config
+        self._core_optimizer = CoreMonthlyLPOptimizer(
+            config=self.config,
+            resolution=resolution,
+            battery_kwh=battery_kwh,
+            battery_kw=battery_kw,
+            tariff_mode=tariff_mode,
+        )
 
     def optimize(
         self,
@@ -113,12 +117,17 @@ class MonthlyLPAdapter(BaseOptimizer):
                 load_consumption=consumption,
                 spot_prices=spot_prices,
                 E_initial=E_initial,
+                return_duals=self.return_duals,
             )
         except Exception as e:
             raise RuntimeError(f"Monthly LP optimization failed: {e}")
 
-        # Convert core result to unified OptimizationResult
-        unified_result = OptimizationResult(
+        return self.from_core_result(core_result)
+
+    @staticmethod
+    def from_core_result(core_result: MonthlyLPResult) -> OptimizationResult:
+        """Convert a core MonthlyLPResult to the unified OptimizationResult."""
+        return OptimizationResult(
             P_charge=core_result.P_charge,
             P_discharge=core_result.P_discharge,
             P_grid_import=core_result.P_grid_import,
@@ -136,12 +145,12 @@ class MonthlyLPAdapter(BaseOptimizer):
             DP_total=core_result.DP_total if hasattr(core_result, 'DP_total') else None,
             success=core_result.success,
             message=core_result.message,
-            solve_time_seconds=0.0,  # Not tracked in core result
+            solve_time_seconds=core_result.timings.total_seconds if core_result.timings else 0.0,
             E_battery_final=core_result.E_battery_final,
+            duals=core_result.duals,
+            timings=core_result.timings,
         )
 
-        return unified_result
-
     def get_resolution(self) -> str:
         """Get time resolution ('PT60M' or 'PT15M')."""
         return self.resolution
@@ -1,11 +1,14 @@
 """
 Factory for creating optimizer instances based on simulation configuration.
 
-Provides unified interface for creating different optimizer types.
+Provides unified interface for creating different optimizer types. Every
+optimizer gets its own frozen legacy config built from the SimulationConfig,
+so differently configured optimizers can run concurrently in one process.
 """
 
 from typing import Literal
 from src.config.simulation_config import SimulationConfig
+from src.config.legacy_config_adapter import LegacySystemConfig, create_legacy_config
 from src.optimization.base_optimizer import BaseOptimizer
 from src.optimization.rolling_horizon_adapter import RollingHorizonAdapter
 from src.optimization.monthly_lp_adapter import MonthlyLPAdapter
@@ -48,13 +51,13 @@ class OptimizerFactory:
             return OptimizerFactory._create_baseline(config)
 
         if mode == "rolling_horizon":
-            return OptimizerFactory._create_rolling_horizon(config)
+            return OptimizerFactory._create_rolling_horizon(config, create_legacy_config(config))
 
         elif mode == "monthly":
-            return OptimizerFactory._create_monthly(config)
+            return OptimizerFactory._create_monthly(config, create_legacy_config(config))
 
         elif mode == "yearly":
-            return OptimizerFactory._create_yearly(config)
+            return OptimizerFactory._create_yearly(config, create_legacy_config(config))
 
         else:
             raise ValueError(
@@ -63,12 +66,13 @@ class OptimizerFactory:
             )
 
     @staticmethod
-    def _create_rolling_horizon(config: SimulationConfig) -> RollingHorizonAdapter:
+    def _create_rolling_horizon(config: SimulationConfig, legacy_config: LegacySystemConfig) -> RollingHorizonAdapter:
         """
         Create rolling horizon optimizer.
 
         Args:
             config: Simulation configuration
+            legacy_config: Tariff/system parameters for the core optimizer
 
         Returns:
             RollingHorizonAdapter configured from config
@@ -76,8 +80,6 @@ class OptimizerFactory:
         battery_config = config.battery
         rolling_config = config.rolling_horizon
 
-        # Note: Current implementation uses 15-min resolution internally
-        # regardless of config.time_resolution
         optimizer = RollingHorizonAdapter(
             battery_kwh=battery_config.capacity_kwh,
             battery_kw=battery_config.power_kw,
@@ -85,18 +87,23 @@ class OptimizerFactory:
             min_soc_percent=battery_config.min_soc_percent,
             max_soc_percent=battery_config.max_soc_percent,
             horizon_hours=rolling_config.horizon_hours,
-            use_global_config=True,
+            resolution=config.time_resolution,
+            config=legacy_config,
+            coarsening=rolling_config.coarsening,
+            tariff_mode=config.tariff_mode,
+            prune_windows=rolling_config.prune_windows,
         )
 
         return optimizer
 
     @staticmethod
-    def _create_monthly(config: SimulationConfig) -> MonthlyLPAdapter:
+    def _create_monthly(config: SimulationConfig, legacy_config: LegacySystemConfig) -> MonthlyLPAdapter:
         """
         Create monthly optimizer.
 
         Args:
             config: Simulation configuration
+            legacy_config: Tariff/system parameters for the core optimizer
 
         Returns:
             MonthlyLPAdapter configured from config
@@ -110,18 +117,20 @@ class OptimizerFactory:
             min_soc_percent=battery_config.min_soc_percent,
             max_soc_percent=battery_config.max_soc_percent,
             resolution=config.time_resolution,
-            use_global_config=True,
+            config=legacy_config,
+            tariff_mode=config.tariff_mode,
         )
 
         return optimizer
 
     @staticmethod
-    def _create_yearly(config: SimulationConfig) -> WeeklyOptimizer:
+    def _create_yearly(config: SimulationConfig, legacy_config: LegacySystemConfig) -> WeeklyOptimizer:
         """
         Create yearly optimizer (weekly horizon).
 
         Args:
             config: Simulation configuration
+            legacy_config: Tariff/system parameters for the core optimizer
 
         Returns:
             WeeklyOptimizer configured from config
@@ -137,7 +146,8 @@ class OptimizerFactory:
             max_soc_percent=battery_config.max_soc_percent,
             resolution=config.time_resolution,
             horizon_hours=yearly_config.horizon_hours,
-            use_global_config=True,
+            config=legacy_config,
+            tariff_mode=config.tariff_mode,
         )
 
         return optimizer
@@ -153,12 +163,12 @@ class OptimizerFactory:
         Returns:
             BaselineCalculator configured from config
         """
-        # Get grid limits from global config
-        from core.config import GRID_LIMIT_IMPORT_KW, GRID_LIMIT_EXPORT_KW
+        # Same grid limits as the battery optimizers
+        solar_config = create_legacy_config(config).solar
 
         calculator = BaselineCalculator(
-            grid_limit_import_kw=GRID_LIMIT_IMPORT_KW,
-            grid_limit_export_kw=GRID_LIMIT_EXPORT_KW,
+            grid_limit_import_kw=solar_config.grid_import_limit_kw,
+            grid_limit_export_kw=solar_config.grid_export_limit_kw,
         )
 
         return calculator
@@ -168,7 +178,9 @@ class OptimizerFactory:
         """
         Create optimizer from configuration (convenience method).
 
-        Uses config.mode to determine optimizer type.
+        Uses config.mode to determine optimizer type. The optimizer holds
+        its own legacy config (battery limits and tariff file of `config`),
+        so optimizers for different scenarios are independent.
 
         Args:
             config: Simulation configuration
@@ -5,7 +5,7 @@ This adapter wraps the existing core/rolling_horizon_optimizer.py implementation
 without modifying it, allowing it to work with the new unified orchestration system.
 """
 
-from typing import Optional
+from typing import Optional, Sequence, Tuple
 import pandas as pd
 import numpy as np
 
@@ -13,12 +13,12 @@ from core.rolling_horizon_optimizer import (
     RollingHorizonOptimizer as CoreRollingHorizonOptimizer,
     RollingHorizonResult,
 )
-from src.operational.state_manager import BatterySystemState
+from src.operational.state_manager import BatterySystemState, PeakPenaltyTable
 from src.optimization.base_optimizer import (
     BaseOptimizer,
     OptimizationResult,
 )
-from src.config.legacy_config_adapter import get_global_legacy_config
+from src.config.legacy_config_adapter import LegacySystemConfig, get_global_legacy_config
 
 
 class RollingHorizonAdapter(BaseOptimizer):
@@ -38,7 +38,14 @@ class RollingHorizonAdapter(BaseOptimizer):
         max_soc_percent: float = 90.0,
         horizon_hours: int = 24,
         resolution: str = 'PT15M',
-        use_global_config: bool = True,
+        config: Optional[LegacySystemConfig] = None,
+        return_duals: bool = False,
+        compact: bool = False,
+        coarsening: Optional[Sequence[Tuple[float, float]]] = None,
+        tariff_mode: str = 'progressive',
+        keep_steps: Optional[int] = None,
+        peak_penalty_table: Optional[PeakPenaltyTable] = None,
+        prune_windows: bool = False,
     ):
         """
         Initialize rolling horizon adapter.
@@ -51,7 +58,18 @@ class RollingHorizonAdapter(BaseOptimizer):
             max_soc_percent: Maximum SOC (0-100)
             horizon_hours: Optimization horizon in hours (default: 24)
             resolution: Time resolution - 'PT60M' (hourly) or 'PT15M' (15-minute, default)
-            use_global_config: Use global config object for tariffs/system params
+            config: Tariff/system parameters (default: shared default legacy config)
+            return_duals: Attach LP dual values to results (for value attribution)
+            compact: Use the reduced LP formulation (same optimum, fewer variables)
+            coarsening: (start_hour, block_hours) breakpoints for a variable-step
+                horizon; result series then hold one entry per block
+            tariff_mode: 'progressive' bracket approximation or 'exact' step tariff
+            keep_steps: Only return the first keep_steps steps of each plan (E_battery
+                one more); cost totals still cover the full horizon
+            peak_penalty_table: Precomputed penalty inputs of the simulation period;
+                windows starting at one of its steps look the penalty up
+            prune_windows: Skip the LP for windows where storing energy cannot pay
+                (same optimal cost, see core.window_pruning)
         """
         super().__init__(
             battery_kwh=battery_kwh,
@@ -63,19 +81,27 @@ class RollingHorizonAdapter(BaseOptimizer):
 
         self.horizon_hours = horizon_hours
         self.resolution = resolution
-        self.use_global_config = use_global_config
-
-        # Initialize core optimizer with global config and configurable resolution
-        if use_global_config:
-            self._core_optimizer = CoreRollingHorizonOptimizer(
-                config=get_global_legacy_config(),
-                battery_kwh=battery_kwh,
-                battery_kw=battery_kw,
-                horizon_hours=horizon_hours,
-                resolution=resolution,
-            )
-        else:
-            raise ValueError("Non-global config mode not yet supported")
+        self.config = config if config is not None else get_global_legacy_config()
+        self.return_duals = return_duals
+        self.compact = compact
+        self.coarsening = coarsening
+        self.tariff_mode = tariff_mode
+        self.keep_steps = keep_steps
+        self.peak_penalty_table = peak_penalty_table
+        self.prune_windows = prune_windows
+
+        # Initialize core optimizer with this adapter's config and resolution
+        self._core_optimizer = CoreRollingHorizonOptimizer(
+            config=self.config,
+            battery_kwh=battery_kwh,
+            battery_kw=battery_kw,
+            horizon_hours=horizon_hours,
+            resolution=resolution,
+            compact=compact,
+            coarsening=coarsening,
+            tariff_mode=tariff_mode,
+            prune_windows=prune_windows,
+        )
 
     def optimize(
         self,
@@ -115,6 +141,11 @@ class RollingHorizonAdapter(BaseOptimizer):
                 battery_capacity_kwh=self.battery_kwh,
             )
 
+        peak_penalty = None
+        if self.peak_penalty_table is not None:
+            step = self.peak_penalty_table.step_of(timestamps[0])
+            peak_penalty = self.peak_penalty_table.penalty(step, battery_state.current_monthly_peak_kw)
+
         # Call core optimizer (method is optimize_24h in legacy code)
         try:
             core_result: RollingHorizonResult = self._core_optimizer.optimize_24h(
@@ -123,6 +154,9 @@ class RollingHorizonAdapter(BaseOptimizer):
                 load_consumption=consumption,
                 spot_prices=spot_prices,
                 timestamps=timestamps,
+                return_duals=self.return_duals,
+                keep_steps=self.keep_steps,
+                peak_penalty=peak_penalty,
             )
         except Exception as e:
             raise RuntimeError(f"Rolling horizon optimization failed: {e}")
@@ -148,6 +182,11 @@ class RollingHorizonAdapter(BaseOptimizer):
             message=core_result.message,
             solve_time_seconds=core_result.solve_time_seconds,
             E_battery_final=core_result.E_battery_final,
+            duals=core_result.duals,
+            timestep_hours=core_result.timestep_hours,
+            timings=core_result.timings,
+            adaptive_peak_penalty=core_result.adaptive_peak_penalty,
+            pruned=core_result.pruned,
         )
 
         return unified_result
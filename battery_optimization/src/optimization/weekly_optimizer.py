@@ -14,6 +14,7 @@ from src.optimization.base_optimizer import (
     OptimizationResult,
 )
 from src.optimization.monthly_lp_adapter import MonthlyLPAdapter
+from src.config.legacy_config_adapter import LegacySystemConfig
 
 
 class WeeklyOptimizer(BaseOptimizer):
@@ -33,7 +34,8 @@ class WeeklyOptimizer(BaseOptimizer):
         max_soc_percent: float = 90.0,
         resolution: str = 'PT60M',
         horizon_hours: int = 168,
-        use_global_config: bool = True,
+        config: Optional[LegacySystemConfig] = None,
+        tariff_mode: str = 'progressive',
     ):
         """
         Initialize weekly optimizer.
@@ -46,7 +48,8 @@ class WeeklyOptimizer(BaseOptimizer):
             max_soc_percent: Maximum SOC (0-100)
             resolution: Time resolution ('PT60M' or 'PT15M')
             horizon_hours: Optimization horizon in hours (default: 168 = 1 week)
-            use_global_config: Use global config object for tariffs/system params
+            config: Tariff/system parameters (default: shared default legacy config)
+            tariff_mode: 'progressive' bracket approximation or 'exact' step tariff
         """
         super().__init__(
             battery_kwh=battery_kwh,
@@ -58,7 +61,6 @@ class WeeklyOptimizer(BaseOptimizer):
 
         self.horizon_hours = horizon_hours
         self.resolution = resolution
-        self.use_global_config = use_global_config
 
         # Use MonthlyLPAdapter as the underlying optimizer
         # (it works for any time period, not just months)
@@ -69,8 +71,10 @@ class WeeklyOptimizer(BaseOptimizer):
             min_soc_percent=min_soc_percent,
             max_soc_percent=max_soc_percent,
             resolution=resolution,
-            use_global_config=use_global_config,
+            config=config,
+            tariff_mode=tariff_mode,
         )
+        self.config = self._optimizer.config
 
         # Calculate expected timesteps
         timesteps_per_hour = 1 if resolution == 'PT60M' else 4
@@ -6,9 +6,16 @@ Provides robust storage mechanisms for simulation results, enabling:
 - Reporting without re-running expensive simulations
 - Result comparison and analysis
 - Audit trail and reproducibility
+- Queryable SQLite catalog of stored results
+- Partitioned Parquet trajectory dataset for cross-run queries
 """
 
 from .result_storage import ResultStorage, StorageFormat
+from .result_catalog import ResultCatalog, ResultMetadata
+from .trajectory_store import TrajectoryStore
 from .metadata_builder import MetadataBuilder
 
-__all__ = ['ResultStorage', 'StorageFormat', 'MetadataBuilder']
+__all__ = [
+    'ResultStorage', 'StorageFormat', 'ResultCatalog', 'ResultMetadata',
+    'TrajectoryStore', 'MetadataBuilder',
+]
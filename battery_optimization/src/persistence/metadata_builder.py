@@ -17,6 +17,7 @@ from datetime import datetime
 from typing import Dict, Any, Optional
 import platform
 import sys
+import time
 from pathlib import Path
 
 
@@ -132,6 +133,7 @@ class MetadataBuilder:
         builder.start_timing()
         # ... run simulation ...
         builder.end_timing()
+        builder.set_solve_profile(results.metadata['solve_profile'])
         metadata = builder.build()
     """
 
@@ -141,9 +143,11 @@ class MetadataBuilder:
         self.data_meta: Optional[DataSourceMetadata] = None
         self.optimizer_meta: Optional[OptimizerMetadata] = None
         self.execution_meta: Optional[ExecutionMetadata] = None
+        self.solve_profile: Optional[Dict[str, Any]] = None
 
         self._start_time: Optional[datetime] = None
         self._end_time: Optional[datetime] = None
+        self._start_ns: Optional[int] = None
 
     def set_configuration(
         self,
@@ -242,6 +246,28 @@ class MetadataBuilder:
         )
         return self
 
+    def set_solve_profile(self, profile: "SolveProfile") -> "MetadataBuilder":
+        """
+        Attach per-phase solve timings aggregated over the run.
+
+        Also fills the optimizer's total solve time and mean HiGHS iterations
+        if set_optimizer() was called.
+
+        Args:
+            profile: SolveProfile (see core.solve_profile) or its summary() dict
+
+        Returns:
+            self for method chaining
+        """
+        summary = profile if isinstance(profile, dict) else profile.summary()
+        self.solve_profile = summary
+
+        if self.optimizer_meta is not None and summary.get('n_solves'):
+            self.optimizer_meta.solve_time_s = summary['phases']['total']['total_s']
+            if 'iterations_mean' in summary:
+                self.optimizer_meta.iterations = int(round(summary['iterations_mean']))
+        return self
+
     def start_timing(self) -> "MetadataBuilder":
         """
         Start execution timing.
@@ -250,6 +276,7 @@ class MetadataBuilder:
             self for method chaining
         """
         self._start_time = datetime.now()
+        self._start_ns = time.perf_counter_ns()
         return self
 
     def end_timing(self) -> "MetadataBuilder":
@@ -259,12 +286,14 @@ class MetadataBuilder:
         Returns:
             self for method chaining
         """
+        end_ns = time.perf_counter_ns()
         self._end_time = datetime.now()
 
         if self._start_time is None:
             raise RuntimeError("start_timing() must be called before end_timing()")
 
-        execution_time_s = (self._end_time - self._start_time).total_seconds()
+        # Monotonic clock for the duration; wall-clock times are kept for the record
+        execution_time_s = (end_ns - self._start_ns) * 1e-9
 
         # Get package versions
         numpy_version = None
@@ -327,6 +356,9 @@ class MetadataBuilder:
         if self.optimizer_meta is not None:
             metadata['optimizer'] = self.optimizer_meta.to_dict()
 
+        if self.solve_profile is not None:
+            metadata['solve_profile'] = self.solve_profile
+
         if self.execution_meta is not None:
             metadata['execution'] = self.execution_meta.to_dict()
         else:
@@ -0,0 +1,327 @@
+"""
+SQLite-backed catalog of stored simulation results.
+
+Replaces the monolithic result_index.json with a small SQLite database:
+- One row per result, written with a single INSERT (no full-index rewrite)
+- WAL journal so parallel sizing workers can save concurrently
+- Indexed columns for SQL filtering, sorting and pagination
+- One-time migration from the legacy JSON index
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterator
+import json
+import logging
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    result_id        TEXT PRIMARY KEY,
+    created_at       TEXT NOT NULL,
+    mode             TEXT NOT NULL,
+    start_date       TEXT NOT NULL,
+    end_date         TEXT NOT NULL,
+    battery_kwh      REAL NOT NULL,
+    battery_kw       REAL NOT NULL,
+    storage_format   TEXT NOT NULL,
+    file_path        TEXT NOT NULL,
+    file_size_mb     REAL NOT NULL,
+    optimizer_method TEXT,
+    execution_time_s REAL,
+    solve_time_s     REAL,
+    total_cost_nok   REAL,
+    notes            TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_results_mode ON results (mode);
+CREATE INDEX IF NOT EXISTS idx_results_dates ON results (start_date, end_date);
+CREATE INDEX IF NOT EXISTS idx_results_battery ON results (battery_kwh, battery_kw);
+CREATE INDEX IF NOT EXISTS idx_results_total_cost ON results (total_cost_nok);
+CREATE INDEX IF NOT EXISTS idx_results_created_at ON results (created_at);
+"""
+
+# Columns added after the first schema version (name -> SQL type)
+_ADDED_COLUMNS = {
+    'solve_time_s': 'REAL',
+}
+
+
+@dataclass
+class ResultMetadata:
+    """
+    Metadata for stored simulation results.
+
+    Used for indexing, searching, and version compatibility.
+    """
+    result_id: str              # Unique identifier (timestamp-based)
+    created_at: datetime        # When result was created
+    mode: str                   # Simulation mode ('rolling_horizon', 'monthly', etc.)
+    start_date: datetime        # Simulation start date
+    end_date: datetime          # Simulation end date
+
+    # Configuration summary
+    battery_kwh: float          # Battery capacity
+    battery_kw: float           # Battery power
+
+    # Storage info
+    storage_format: str         # 'pickle', 'json', or 'parquet'
+    file_path: str              # Relative path from results directory
+    file_size_mb: float         # File size in MB
+
+    # Optional fields
+    optimizer_method: Optional[str] = None
+    execution_time_s: Optional[float] = None
+    solve_time_s: Optional[float] = None  # Summed optimizer time over all solves
+    total_cost_nok: Optional[float] = None
+    notes: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        d = asdict(self)
+        # Convert datetime to ISO format strings
+        d['created_at'] = self.created_at.isoformat()
+        d['start_date'] = self.start_date.isoformat()
+        d['end_date'] = self.end_date.isoformat()
+        return d
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "ResultMetadata":
+        """Create from dictionary (e.g., loaded from JSON)."""
+        # Convert ISO strings back to datetime
+        d = d.copy()
+        d['created_at'] = datetime.fromisoformat(d['created_at'])
+        d['start_date'] = datetime.fromisoformat(d['start_date'])
+        d['end_date'] = datetime.fromisoformat(d['end_date'])
+        return cls(**d)
+
+
+# Columns that may be used in ORDER BY (whitelist, never interpolate user input)
+SORTABLE_COLUMNS = (
+    'created_at', 'start_date', 'end_date', 'mode',
+    'battery_kwh', 'battery_kw', 'total_cost_nok', 'solve_time_s', 'result_id'
+)
+
+
+class ResultCatalog:
+    """
+    SQLite index of ResultMetadata rows.
+
+    Each operation opens its own short-lived connection, so one catalog
+    object can be shared between threads and several processes can write
+    to the same database file.
+    """
+
+    def __init__(self, db_path: str | Path, timeout_s: float = 30.0):
+        """
+        Initialize result catalog.
+
+        Args:
+            db_path: SQLite database file (created if missing)
+            timeout_s: How long a writer waits for a competing lock
+        """
+        self.db_path = Path(db_path)
+        self.timeout_s = timeout_s
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._add_missing_columns(conn)
+
+    @staticmethod
+    def _add_missing_columns(conn: sqlite3.Connection) -> None:
+        """Upgrade catalogs created before a column was added to the schema."""
+        existing = {row['name'] for row in conn.execute("PRAGMA table_info(results)")}
+        for name, sql_type in _ADDED_COLUMNS.items():
+            if name not in existing:
+                conn.execute(f"ALTER TABLE results ADD COLUMN {name} {sql_type}")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection; commit on success, roll back on error."""
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout_s)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _to_row(metadata: ResultMetadata) -> Dict[str, Any]:
+        """Convert metadata to SQL parameters (datetimes as ISO strings)."""
+        row = metadata.to_dict()
+        for key in ('battery_kwh', 'battery_kw', 'file_size_mb',
+                    'execution_time_s', 'solve_time_s', 'total_cost_nok'):
+            if row[key] is not None:
+                row[key] = float(row[key])
+        return row
+
+    @staticmethod
+    def _from_row(row: sqlite3.Row) -> ResultMetadata:
+        """Convert a database row back to ResultMetadata."""
+        return ResultMetadata.from_dict(dict(row))
+
+    def add(self, metadata: ResultMetadata) -> None:
+        """
+        Insert or replace a single result entry.
+
+        Args:
+            metadata: Metadata for the stored result
+        """
+        self.add_many([metadata])
+
+    def add_many(self, entries: List[ResultMetadata]) -> None:
+        """Insert or replace several entries in one transaction."""
+        columns = [f.name for f in fields(ResultMetadata)]
+        sql = (
+            f"INSERT OR REPLACE INTO results ({', '.join(columns)}) "
+            f"VALUES ({', '.join(':' + c for c in columns)})"
+        )
+        with self._connect() as conn:
+            conn.executemany(sql, [self._to_row(m) for m in entries])
+
+    def get(self, result_id: str) -> Optional[ResultMetadata]:
+        """Return metadata for result_id, or None if not catalogued."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM results WHERE result_id = ?", (result_id,)
+            ).fetchone()
+        return self._from_row(row) if row is not None else None
+
+    def remove(self, result_id: str) -> bool:
+        """
+        Remove an entry.
+
+        Returns:
+            True if a row was deleted
+        """
+        with self._connect() as conn:
+            cursor = conn.execute("DELETE FROM results WHERE result_id = ?", (result_id,))
+        return cursor.rowcount > 0
+
+    def query(
+        self,
+        mode: Optional[str] = None,
+        start_date_after: Optional[datetime] = None,
+        start_date_before: Optional[datetime] = None,
+        battery_kwh_min: Optional[float] = None,
+        battery_kwh_max: Optional[float] = None,
+        battery_kw_min: Optional[float] = None,
+        battery_kw_max: Optional[float] = None,
+        max_total_cost_nok: Optional[float] = None,
+        order_by: str = 'created_at',
+        descending: bool = True,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[ResultMetadata]:
+        """
+        Filter, sort and paginate catalog entries in SQL.
+
+        Args:
+            mode: Filter by simulation mode
+            start_date_after: Results starting on/after this date
+            start_date_before: Results starting on/before this date
+            battery_kwh_min, battery_kwh_max: Battery capacity range [kWh]
+            battery_kw_min, battery_kw_max: Battery power range [kW]
+            max_total_cost_nok: Upper bound on total cost
+            order_by: Sort column (one of SORTABLE_COLUMNS)
+            descending: Sort direction
+            limit: Maximum number of rows (None = all)
+            offset: Rows to skip (for pagination)
+
+        Returns:
+            List of ResultMetadata objects
+
+        Raises:
+            ValueError: If order_by is not a sortable column
+        """
+        if order_by not in SORTABLE_COLUMNS:
+            raise ValueError(
+                f"order_by must be one of {SORTABLE_COLUMNS}, got '{order_by}'"
+            )
+
+        clauses = []
+        params: List[Any] = []
+        conditions = [
+            ("mode = ?", mode),
+            ("start_date >= ?", start_date_after.isoformat() if start_date_after else None),
+            ("start_date <= ?", start_date_before.isoformat() if start_date_before else None),
+            ("battery_kwh >= ?", battery_kwh_min),
+            ("battery_kwh <= ?", battery_kwh_max),
+            ("battery_kw >= ?", battery_kw_min),
+            ("battery_kw <= ?", battery_kw_max),
+            ("total_cost_nok <= ?", max_total_cost_nok),
+        ]
+        for clause, value in conditions:
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+
+        sql = "SELECT * FROM results"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}, result_id"
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([limit if limit is not None else -1, offset])
+
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def count(self) -> int:
+        """Number of catalogued results."""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Aggregate statistics computed in SQL.
+
+        Returns:
+            Dict with total_results, total_size_mb and results_by_mode
+        """
+        with self._connect() as conn:
+            total, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(file_size_mb), 0) FROM results"
+            ).fetchone()
+            by_mode = conn.execute(
+                "SELECT mode, COUNT(*) FROM results GROUP BY mode"
+            ).fetchall()
+
+        return {
+            'total_results': total,
+            'total_size_mb': size,
+            'results_by_mode': {mode: n for mode, n in by_mode},
+        }
+
+    def migrate_from_json(self, index_file: str | Path) -> int:
+        """
+        Import entries from a legacy result_index.json.
+
+        Existing rows with the same result_id are replaced, so running the
+        migration twice is harmless.
+
+        Args:
+            index_file: Path to the JSON index
+
+        Returns:
+            Number of entries imported
+        """
+        with open(index_file, 'r') as f:
+            index_data = json.load(f)
+
+        entries = [ResultMetadata.from_dict(meta) for meta in index_data.values()]
+        if entries:
+            self.add_many(entries)
+
+        logger.info(f"Migrated {len(entries)} entries from {index_file} to {self.db_path}")
+        return len(entries)
@@ -6,14 +6,17 @@ Supports multiple storage formats:
 - JSON: Human-readable format (limited to serializable types)
 - Parquet: Efficient columnar format for DataFrames (trajectory data)
 
+Trajectories are written to a partitioned Parquet dataset shared by all
+results (see trajectory_store.py), so cross-run queries read only the
+columns, months and runs they need.
+
 Provides:
 - Automatic compression
 - Metadata preservation
 - Version compatibility checking
-- Result indexing and search
+- Result indexing and search (SQLite catalog, see result_catalog.py)
 """
 
-from dataclasses import dataclass, asdict
 from enum import Enum
 from pathlib import Path
 from typing import Optional, Dict, Any, List
@@ -25,6 +28,9 @@ import logging
 import pandas as pd
 import numpy as np
 
+from .result_catalog import ResultCatalog, ResultMetadata
+from .trajectory_store import TrajectoryStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,54 +41,6 @@ class StorageFormat(Enum):
     PARQUET = "parquet"    # Efficient DataFrame storage
 
 
-@dataclass
-class ResultMetadata:
-    """
-    Metadata for stored simulation results.
-
-    Used for indexing, searching, and version compatibility.
-    """
-    result_id: str              # Unique identifier (timestamp-based)
-    created_at: datetime        # When result was created
-    mode: str                   # Simulation mode ('rolling_horizon', 'monthly', etc.)
-    start_date: datetime        # Simulation start date
-    end_date: datetime          # Simulation end date
-
-    # Configuration summary
-    battery_kwh: float          # Battery capacity
-    battery_kw: float           # Battery power
-
-    # Storage info
-    storage_format: str         # 'pickle', 'json', or 'parquet'
-    file_path: str              # Relative path from results directory
-    file_size_mb: float         # File size in MB
-
-    # Optional fields
-    optimizer_method: Optional[str] = None
-    execution_time_s: Optional[float] = None
-    total_cost_nok: Optional[float] = None
-    notes: Optional[str] = None
-
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
-        d = asdict(self)
-        # Convert datetime to ISO format strings
-        d['created_at'] = self.created_at.isoformat()
-        d['start_date'] = self.start_date.isoformat()
-        d['end_date'] = self.end_date.isoformat()
-        return d
-
-    @classmethod
-    def from_dict(cls, d: Dict[str, Any]) -> "ResultMetadata":
-        """Create from dictionary (e.g., loaded from JSON)."""
-        # Convert ISO strings back to datetime
-        d = d.copy()
-        d['created_at'] = datetime.fromisoformat(d['created_at'])
-        d['start_date'] = datetime.fromisoformat(d['start_date'])
-        d['end_date'] = datetime.fromisoformat(d['end_date'])
-        return cls(**d)
-
-
 class ResultStorage:
     """
     Storage manager for simulation results.
@@ -107,37 +65,33 @@ class ResultStorage:
         self.results_dir.mkdir(parents=True, exist_ok=True)
         self.default_format = default_format
 
-        # Index file for quick metadata lookup
+        # SQLite catalog for metadata lookup (safe for concurrent writers)
+        self.catalog = ResultCatalog(self.results_dir / "result_catalog.sqlite")
+
+        # Partitioned trajectory dataset (result_id/year/month)
+        self.trajectories = TrajectoryStore(self.results_dir / "trajectories")
+
+        # Legacy JSON index from earlier versions
         self.index_file = self.results_dir / "result_index.json"
-        self._load_index()
-
-    def _load_index(self) -> None:
-        """Load result index from disk."""
-        if self.index_file.exists():
-            try:
-                with open(self.index_file, 'r') as f:
-                    index_data = json.load(f)
-                    self.index = {
-                        rid: ResultMetadata.from_dict(meta)
-                        for rid, meta in index_data.items()
-                    }
-            except Exception as e:
-                logger.warning(f"Failed to load result index: {e}")
-                self.index = {}
-        else:
-            self.index = {}
-
-    def _save_index(self) -> None:
-        """Save result index to disk."""
+        self._migrate_json_index()
+
+    def _migrate_json_index(self) -> None:
+        """Import a legacy result_index.json into the catalog (once)."""
+        if not self.index_file.exists():
+            return
+
         try:
-            index_data = {
-                rid: meta.to_dict()
-                for rid, meta in self.index.items()
-            }
-            with open(self.index_file, 'w') as f:
-                json.dump(index_data, f, indent=2)
+            self.catalog.migrate_from_json(self.index_file)
+            self.index_file.replace(self.index_file.with_suffix('.json.migrated'))
+        except FileNotFoundError:
+            pass  # Another worker migrated it first
         except Exception as e:
-            logger.error(f"Failed to save result index: {e}")
+            logger.warning(f"Failed to migrate result index: {e}")
+
+    @property
+    def index(self) -> Dict[str, ResultMetadata]:
+        """Snapshot of all catalog entries keyed by result ID."""
+        return {meta.result_id: meta for meta in self.catalog.query()}
 
     def _generate_result_id(self, mode: str, start_date: datetime) -> str:
         """
@@ -156,6 +110,12 @@ class ResultStorage:
         date_str = start_date.strftime("%Y%m%d")
         return f"{mode}_{date_str}_{timestamp}"
 
+    @staticmethod
+    def _total_solve_time(metadata: Dict[str, Any]) -> Optional[float]:
+        """Summed optimizer time from a run's solve profile, if recorded."""
+        profile = metadata.get('solve_profile') or {}
+        return profile.get('phases', {}).get('total', {}).get('total_s')
+
     def save(
         self,
         results: "SimulationResults",  # Forward reference
@@ -192,6 +152,10 @@ class ResultStorage:
         result_dir = self.results_dir / result_id
         result_dir.mkdir(parents=True, exist_ok=True)
 
+        # Trajectory goes to the partitioned dataset for every format, so all
+        # stored runs can be queried together (Pickle keeps its own full copy)
+        self.trajectories.write(result_id, results.trajectory)
+
         # Save based on format
         if format == StorageFormat.PICKLE:
             file_path = result_dir / "results.pkl"
@@ -202,8 +166,6 @@ class ResultStorage:
             # JSON format: Save DataFrames separately as CSV, metadata as JSON
             file_path = result_dir / "results.json"
 
-            # Save trajectory as Parquet (more efficient than CSV)
-            results.trajectory.to_parquet(result_dir / "trajectory.parquet")
             results.monthly_summary.to_parquet(result_dir / "monthly_summary.parquet")
 
             # Save metadata and metrics as JSON
@@ -219,7 +181,6 @@ class ResultStorage:
 
         elif format == StorageFormat.PARQUET:
             # Parquet format: Everything as Parquet files
-            results.trajectory.to_parquet(result_dir / "trajectory.parquet")
             results.monthly_summary.to_parquet(result_dir / "monthly_summary.parquet")
 
             # Metadata as JSON
@@ -230,12 +191,14 @@ class ResultStorage:
                 'economic_metrics': results.economic_metrics,
                 'metadata': results.metadata,
             }
-            with open(result_dir / "metadata.json", 'w') as f:
+            file_path = result_dir / "metadata.json"
+            with open(file_path, 'w') as f:
                 json.dump(json_data, f, indent=2)
-            file_path = result_dir / "trajectory.parquet"
 
         # Get file size
         file_size_mb = file_path.stat().st_size / (1024 * 1024)
+        if format != StorageFormat.PICKLE:
+            file_size_mb += self.trajectories.size_mb(result_id)
 
         # Create metadata for index
         metadata = ResultMetadata(
@@ -251,13 +214,13 @@ class ResultStorage:
             file_size_mb=file_size_mb,
             optimizer_method=results.metadata.get('optimizer_method'),
             execution_time_s=results.metadata.get('execution_time_s'),
+            solve_time_s=self._total_solve_time(results.metadata),
             total_cost_nok=results.economic_metrics.get('total_cost_nok'),
             notes=notes
         )
 
         # Update index
-        self.index[result_id] = metadata
-        self._save_index()
+        self.catalog.add(metadata)
 
         logger.info(
             f"Saved result '{result_id}' ({format.value}, {file_size_mb:.2f} MB) "
@@ -284,10 +247,10 @@ class ResultStorage:
             >>> storage = ResultStorage()
             >>> results = storage.load("rolling_horizon_20241001_120000")
         """
-        if result_id not in self.index:
+        metadata = self.catalog.get(result_id)
+        if metadata is None:
             raise KeyError(f"Result ID '{result_id}' not found in index")
 
-        metadata = self.index[result_id]
         result_dir = self.results_dir / result_id
 
         # Load based on storage format
@@ -302,7 +265,7 @@ class ResultStorage:
                 json_data = json.load(f)
 
             # Load DataFrames
-            trajectory = pd.read_parquet(result_dir / "trajectory.parquet")
+            trajectory = self._load_trajectory(result_id)
             monthly_summary = pd.read_parquet(result_dir / "monthly_summary.parquet")
 
             # Reconstruct SimulationResults
@@ -319,7 +282,7 @@ class ResultStorage:
 
         elif metadata.storage_format == "parquet":
             # Load Parquet files
-            trajectory = pd.read_parquet(result_dir / "trajectory.parquet")
+            trajectory = self._load_trajectory(result_id)
             monthly_summary = pd.read_parquet(result_dir / "monthly_summary.parquet")
 
             # Load metadata
@@ -341,19 +304,78 @@ class ResultStorage:
         logger.info(f"Loaded result '{result_id}' ({metadata.storage_format})")
         return results
 
+    def _load_trajectory(self, result_id: str) -> pd.DataFrame:
+        """Full trajectory from the dataset (or a legacy per-result file)."""
+        legacy_file = self.results_dir / result_id / "trajectory.parquet"
+        if legacy_file.exists():
+            return pd.read_parquet(legacy_file)
+        return self.trajectories.read(result_id)
+
+    def query_trajectories(
+        self,
+        result_ids: Optional[List[str]] = None,
+        columns: Optional[List[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """
+        Load a slice of trajectory data across stored results.
+
+        Only the requested columns, months and result partitions are read,
+        so a one-week comparison across many sizing runs stays cheap.
+
+        Args:
+            result_ids: Results to include (None = all stored trajectories)
+            columns: Trajectory columns (None = all)
+            start: Inclusive start of time window
+            end: Exclusive end of time window
+
+        Returns:
+            Long-format DataFrame indexed by timestamp with a result_id column
+
+        Example:
+            >>> storage = ResultStorage()
+            >>> ids = [m.result_id for m in storage.list_results(mode="monthly")]
+            >>> week = storage.query_trajectories(
+            ...     ids, columns=["E_battery_kwh", "P_grid_import_kw"],
+            ...     start=datetime(2024, 6, 3), end=datetime(2024, 6, 10))
+            >>> soc = week.pivot(columns="result_id", values="E_battery_kwh")
+        """
+        return self.trajectories.query(
+            result_ids=result_ids, columns=columns, start=start, end=end
+        )
+
     def list_results(
         self,
         mode: Optional[str] = None,
         start_date_after: Optional[datetime] = None,
-        start_date_before: Optional[datetime] = None
+        start_date_before: Optional[datetime] = None,
+        battery_kwh_min: Optional[float] = None,
+        battery_kwh_max: Optional[float] = None,
+        battery_kw_min: Optional[float] = None,
+        battery_kw_max: Optional[float] = None,
+        max_total_cost_nok: Optional[float] = None,
+        order_by: str = 'created_at',
+        descending: bool = True,
+        limit: Optional[int] = None,
+        offset: int = 0
     ) -> List[ResultMetadata]:
         """
         List available results with optional filtering.
 
+        Filtering, sorting and pagination run in SQL against the catalog.
+
         Args:
             mode: Filter by simulation mode
             start_date_after: Filter results starting after this date
             start_date_before: Filter results starting before this date
+            battery_kwh_min, battery_kwh_max: Battery capacity range [kWh]
+            battery_kw_min, battery_kw_max: Battery power range [kW]
+            max_total_cost_nok: Only results with total cost at or below this
+            order_by: Sort column (default: created_at, newest first)
+            descending: Sort direction
+            limit: Maximum number of results (None = all)
+            offset: Results to skip (for pagination)
 
         Returns:
             List of ResultMetadata objects matching filters
@@ -363,23 +385,23 @@ class ResultStorage:
             >>> results = storage.list_results(mode="rolling_horizon")
             >>> for meta in results:
             >>>     print(f"{meta.result_id}: {meta.total_cost_nok:.2f} NOK")
+            >>> cheapest = storage.list_results(order_by="total_cost_nok",
+            ...                                 descending=False, limit=10)
         """
-        results = list(self.index.values())
-
-        # Apply filters
-        if mode is not None:
-            results = [r for r in results if r.mode == mode]
-
-        if start_date_after is not None:
-            results = [r for r in results if r.start_date >= start_date_after]
-
-        if start_date_before is not None:
-            results = [r for r in results if r.start_date <= start_date_before]
-
-        # Sort by created_at (newest first)
-        results.sort(key=lambda r: r.created_at, reverse=True)
-
-        return results
+        return self.catalog.query(
+            mode=mode,
+            start_date_after=start_date_after,
+            start_date_before=start_date_before,
+            battery_kwh_min=battery_kwh_min,
+            battery_kwh_max=battery_kwh_max,
+            battery_kw_min=battery_kw_min,
+            battery_kw_max=battery_kw_max,
+            max_total_cost_nok=max_total_cost_nok,
+            order_by=order_by,
+            descending=descending,
+            limit=limit,
+            offset=offset
+        )
 
     def delete(self, result_id: str) -> None:
         """
@@ -391,7 +413,7 @@ class ResultStorage:
         Raises:
             KeyError: If result_id not found
         """
-        if result_id not in self.index:
+        if self.catalog.get(result_id) is None:
             raise KeyError(f"Result ID '{result_id}' not found")
 
         # Remove files
@@ -400,9 +422,10 @@ class ResultStorage:
             import shutil
             shutil.rmtree(result_dir)
 
+        self.trajectories.delete(result_id)
+
         # Remove from index
-        del self.index[result_id]
-        self._save_index()
+        self.catalog.remove(result_id)
 
         logger.info(f"Deleted result '{result_id}'")
 
@@ -419,10 +442,11 @@ class ResultStorage:
         Raises:
             KeyError: If result_id not found
         """
-        if result_id not in self.index:
+        metadata = self.catalog.get(result_id)
+        if metadata is None:
             raise KeyError(f"Result ID '{result_id}' not found")
 
-        return self.index[result_id]
+        return metadata
 
     def get_storage_stats(self) -> Dict[str, Any]:
         """
@@ -431,15 +455,6 @@ class ResultStorage:
         Returns:
             Dictionary with storage statistics
         """
-        total_size_mb = sum(meta.file_size_mb for meta in self.index.values())
-
-        modes = {}
-        for meta in self.index.values():
-            modes[meta.mode] = modes.get(meta.mode, 0) + 1
-
-        return {
-            'total_results': len(self.index),
-            'total_size_mb': total_size_mb,
-            'results_by_mode': modes,
-            'storage_dir': str(self.results_dir.absolute())
-        }
+        stats = self.catalog.stats()
+        stats['storage_dir'] = str(self.results_dir.absolute())
+        return stats
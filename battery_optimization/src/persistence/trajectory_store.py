@@ -0,0 +1,259 @@
+"""
+Partitioned Parquet store for simulation trajectories.
+
+Trajectories of all stored results live in one Hive-partitioned dataset:
+
+    trajectories/result_id=<id>/year=<yyyy>/month=<m>/part-0.parquet
+
+Queries select columns, a time range and a set of result_ids, and go
+through pyarrow datasets. Only the matching partitions, columns and row
+groups are read, so comparing one week across many sizing runs no longer
+loads every full-year trajectory.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Sequence
+import logging
+import shutil
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+logger = logging.getLogger(__name__)
+
+
+PARTITION_SCHEMA = pa.schema([
+    ('result_id', pa.string()),
+    ('year', pa.int16()),
+    ('month', pa.int8()),
+])
+
+
+class TrajectoryStore:
+    """
+    Hive-partitioned (result_id/year/month) trajectory dataset.
+
+    Numeric trajectory columns are stored as float64 and timestamps as
+    naive timestamp[ns] so every partition shares one schema.
+    """
+
+    def __init__(self, root: str | Path, compression: str = 'zstd'):
+        """
+        Initialize trajectory store.
+
+        Args:
+            root: Dataset root directory
+            compression: Parquet compression codec
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.compression = compression
+        self._partitioning = ds.partitioning(PARTITION_SCHEMA, flavor='hive')
+
+    def _result_dir(self, result_id: str) -> Path:
+        return self.root / f"result_id={result_id}"
+
+    @staticmethod
+    def _to_table(trajectory: pd.DataFrame, result_id: str) -> pa.Table:
+        """Convert a trajectory to an Arrow table with the canonical schema."""
+        timestamps = pd.DatetimeIndex(trajectory.index)
+        if timestamps.tz is not None:
+            # Keep local wall-clock time, as the data loaders do
+            timestamps = timestamps.tz_localize(None)
+
+        df = trajectory.reset_index(drop=True)
+        for col in df.columns:
+            if pd.api.types.is_numeric_dtype(df[col]) or pd.api.types.is_bool_dtype(df[col]):
+                df[col] = df[col].astype(np.float64)
+
+        df.insert(0, 'timestamp', timestamps.astype('datetime64[ns]'))
+        df['result_id'] = result_id
+        df['year'] = timestamps.year.astype(np.int16)
+        df['month'] = timestamps.month.astype(np.int8)
+
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+    def write(self, result_id: str, trajectory: pd.DataFrame) -> None:
+        """
+        Write (or overwrite) the trajectory of one result.
+
+        Args:
+            result_id: Result identifier (partition key)
+            trajectory: DataFrame indexed by timestamp
+        """
+        table = self._to_table(trajectory, result_id)
+
+        # Drop any previous version so stale months do not linger
+        self.delete(result_id)
+
+        ds.write_dataset(
+            table,
+            self.root,
+            format='parquet',
+            partitioning=self._partitioning,
+            basename_template='part-{i}.parquet',
+            existing_data_behavior='delete_matching',
+            file_options=ds.ParquetFileFormat().make_write_options(
+                compression=self.compression
+            ),
+        )
+
+        logger.debug(f"Wrote trajectory '{result_id}' ({table.num_rows} rows)")
+
+    def delete(self, result_id: str) -> None:
+        """Remove all partitions of a result (no-op if absent)."""
+        result_dir = self._result_dir(result_id)
+        if result_dir.exists():
+            shutil.rmtree(result_dir)
+
+    def exists(self, result_id: str) -> bool:
+        """Check if a trajectory is stored for result_id."""
+        return self._result_dir(result_id).exists()
+
+    def result_ids(self) -> List[str]:
+        """List result IDs present in the store."""
+        return sorted(
+            p.name.split('=', 1)[1]
+            for p in self.root.glob('result_id=*') if p.is_dir()
+        )
+
+    def size_mb(self, result_id: str) -> float:
+        """On-disk size of a result's partitions in MB."""
+        return sum(
+            f.stat().st_size for f in self._result_dir(result_id).rglob('*.parquet')
+        ) / (1024 * 1024)
+
+    def dataset(self, result_ids: Optional[Sequence[str]] = None) -> Optional[ds.Dataset]:
+        """
+        Open the dataset lazily.
+
+        Args:
+            result_ids: Restrict file discovery to these results (None = all)
+
+        Returns:
+            pyarrow Dataset with a schema unified across the selected files,
+            or None if no matching trajectories are stored
+        """
+        if result_ids is None:
+            files = sorted(self.root.rglob('*.parquet'))
+        else:
+            files = [
+                f for rid in dict.fromkeys(result_ids)
+                for f in sorted(self._result_dir(rid).rglob('*.parquet'))
+            ]
+        if not files:
+            return None
+
+        options = dict(
+            format='parquet',
+            partitioning=self._partitioning,
+            partition_base_dir=str(self.root),
+        )
+        dataset = ds.dataset([str(f) for f in files], **options)
+
+        # Runs may store different column sets; read footers only to unify
+        schema = pa.unify_schemas(
+            [fragment.physical_schema for fragment in dataset.get_fragments()]
+            + [PARTITION_SCHEMA]
+        )
+        if schema != dataset.schema:
+            dataset = ds.dataset([str(f) for f in files], schema=schema, **options)
+        return dataset
+
+    @staticmethod
+    def _time_filter(
+        start: Optional[datetime],
+        end: Optional[datetime]
+    ) -> Optional[ds.Expression]:
+        """
+        Row filter on timestamp plus year/month terms for partition pruning.
+
+        The range is inclusive of start and exclusive of end.
+        """
+        year, month, ts = ds.field('year'), ds.field('month'), ds.field('timestamp')
+        expr = None
+
+        def _naive(value: datetime) -> pa.Scalar:
+            value = pd.Timestamp(value)
+            if value.tz is not None:
+                value = value.tz_localize(None)
+            return pa.scalar(value.to_pydatetime(), pa.timestamp('ns'))
+
+        if start is not None:
+            start = pd.Timestamp(start)
+            expr = (
+                ((year > start.year) | ((year == start.year) & (month >= start.month)))
+                & (ts >= _naive(start))
+            )
+
+        if end is not None:
+            end = pd.Timestamp(end)
+            term = (
+                ((year < end.year) | ((year == end.year) & (month <= end.month)))
+                & (ts < _naive(end))
+            )
+            expr = term if expr is None else expr & term
+
+        return expr
+
+    def query(
+        self,
+        result_ids: Optional[Sequence[str]] = None,
+        columns: Optional[Sequence[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """
+        Load selected columns for a time window across results.
+
+        Args:
+            result_ids: Results to include (None = all)
+            columns: Trajectory columns to load (None = all)
+            start: Inclusive start of time window
+            end: Exclusive end of time window
+
+        Returns:
+            Long-format DataFrame indexed by timestamp with a result_id column
+
+        Example:
+            >>> store = TrajectoryStore("results/trajectories")
+            >>> week = store.query(result_ids=ids, columns=['E_battery_kwh'],
+            ...                    start=datetime(2024, 6, 3), end=datetime(2024, 6, 10))
+        """
+        dataset = self.dataset(result_ids)
+        if dataset is None:
+            empty = pd.DataFrame(columns=['result_id'] + list(columns or []))
+            return empty.set_index(pd.DatetimeIndex([], name='timestamp'))
+
+        if columns is None:
+            projection = [
+                name for name in dataset.schema.names
+                if name not in ('year', 'month')
+            ]
+        else:
+            projection = ['timestamp', 'result_id'] + [
+                c for c in columns if c not in ('timestamp', 'result_id')
+            ]
+
+        table = dataset.to_table(columns=projection, filter=self._time_filter(start, end))
+
+        df = table.to_pandas()
+        df = df.sort_values(['result_id', 'timestamp'], kind='stable')
+        return df.set_index('timestamp')
+
+    def read(self, result_id: str) -> pd.DataFrame:
+        """
+        Load the full trajectory of one result in its original layout.
+
+        Raises:
+            FileNotFoundError: If result_id has no stored trajectory
+        """
+        if not self.exists(result_id):
+            raise FileNotFoundError(f"No trajectory stored for '{result_id}'")
+
+        df = self.query(result_ids=[result_id]).drop(columns='result_id')
+        df.index.name = None
+        return df
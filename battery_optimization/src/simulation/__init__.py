@@ -1,20 +1,54 @@
 """
 Simulation orchestration module for battery optimization.
 
-Contains orchestrators for the three simulation modes:
+Contains orchestrators for the simulation modes:
 - RollingHorizonOrchestrator: Real-time operation with persistent state
 - MonthlyOrchestrator: Single or multi-month analysis
 - YearlyOrchestrator: Annual investment analysis with weekly solves
+- AnnualOrchestrator: Annual LP by monthly decomposition (benchmark)
+- ScreeningOrchestrator: Battery sizing sweep on representative periods
+- FleetOrchestrator: One run per site for many sites, in a process pool
+- ScenarioMatrixOrchestrator: Price × profile × battery scenarios, one comparison table
+
+Orchestrators accept an optional progress_callback (see progress.py).
 """
 
 from .rolling_horizon_orchestrator import RollingHorizonOrchestrator
 from .monthly_orchestrator import MonthlyOrchestrator
 from .yearly_orchestrator import YearlyOrchestrator
+from .annual_orchestrator import AnnualOrchestrator
+from .screening_orchestrator import ScreeningOrchestrator
+from .fleet_orchestrator import FleetOrchestrator, FleetSite, FleetSiteResult
+from .scenario_matrix_orchestrator import (
+    BatterySize,
+    ConsumptionProfile,
+    PriceScenario,
+    ScenarioMatrixConfig,
+    ScenarioMatrixOrchestrator,
+    ScenarioResult,
+)
 from .simulation_results import SimulationResults
+from .trajectory_buffer import TrajectoryBuffer
+from .progress import ProgressReporter, ProgressUpdate, log_progress
 
 __all__ = [
     'RollingHorizonOrchestrator',
     'MonthlyOrchestrator',
     'YearlyOrchestrator',
+    'AnnualOrchestrator',
+    'ScreeningOrchestrator',
+    'FleetOrchestrator',
+    'FleetSite',
+    'FleetSiteResult',
+    'ScenarioMatrixOrchestrator',
+    'ScenarioMatrixConfig',
+    'PriceScenario',
+    'ConsumptionProfile',
+    'BatterySize',
+    'ScenarioResult',
     'SimulationResults',
+    'TrajectoryBuffer',
+    'ProgressReporter',
+    'ProgressUpdate',
+    'log_progress',
 ]
@@ -0,0 +1,170 @@
+"""
+Annual Orchestrator for the annual LP by monthly decomposition.
+
+Solves the whole simulation period as one LP (months coupled through the
+battery energy at month boundaries) with core.annual_decomposition, and
+reports the lower bound next to the cost. This is the benchmark for the
+weekly (yearly mode) and monthly heuristics: a heuristic's annual cost minus
+the lower bound bounds its error.
+"""
+
+import logging
+from typing import Optional
+
+import pandas as pd
+
+from core.annual_decomposition import MonthWindow, solve_annual
+from core.solve_profile import SolveProfile
+from src.config.simulation_config import SimulationConfig
+from src.config.verbosity import apply_verbosity
+from src.data.data_manager import DataManager
+from src.optimization.monthly_lp_adapter import MonthlyLPAdapter
+from src.optimization.optimizer_factory import OptimizerFactory
+from src.simulation.progress import ProgressCallback, ProgressReporter
+from src.simulation.simulation_results import SimulationResults
+
+logger = logging.getLogger(__name__)
+
+
+class AnnualOrchestrator:
+    """
+    Orchestrator for the annual LP.
+
+    Optimizes every month of the loaded period jointly (Benders over the
+    month-boundary battery energies) to the configured optimality gap.
+    """
+
+    def __init__(self, config: SimulationConfig, progress_callback: Optional[ProgressCallback] = None):
+        """
+        Initialize annual orchestrator.
+
+        Args:
+            config: Simulation configuration (mode_specific.annual, progressive tariff)
+            progress_callback: Called when the decomposition finishes (default:
+                log a progress line)
+        """
+        self.config = config
+        self.progress_callback = progress_callback
+        self.data_manager = DataManager(config)
+
+    def run(self) -> SimulationResults:
+        """
+        Execute the annual optimization.
+
+        Returns:
+            SimulationResults with full trajectory, monthly summary and bounds
+
+        Raises:
+            ValueError: If the tariff mode is not progressive
+            RuntimeError: If a month LP or the master LP fails
+        """
+        apply_verbosity(self.config.verbosity)
+        logger.info("Annual optimization (monthly decomposition)")
+
+        data = self.data_manager.load_data()
+        logger.info("  Loaded %d timesteps: %s to %s (%s)",
+                    len(data), data.timestamps[0], data.timestamps[-1], data.resolution)
+
+        optimizer = OptimizerFactory.create('monthly', self.config)._core_optimizer
+        months = []
+        for period in data.timestamps.to_period('M').unique():
+            month_data = data.get_month(period.year, period.month)
+            months.append(MonthWindow(
+                month=period.month,
+                timestamps=month_data.timestamps,
+                pv_production=month_data.pv_production_kw,
+                load_consumption=month_data.consumption_kw,
+                spot_prices=month_data.prices_nok_per_kwh,
+            ))
+        logger.info("  Optimizing %d months jointly", len(months))
+
+        initial_soc_kwh = self.config.battery.capacity_kwh * (self.config.battery.initial_soc_percent / 100.0)
+        progress = ProgressReporter(1, "Annual decomposition", self.progress_callback,
+                                    self.config.progress_interval_percent)
+        annual = solve_annual(
+            optimizer,
+            months,
+            E_initial=initial_soc_kwh,
+            optimality_gap=self.config.annual.optimality_gap,
+            max_iterations=self.config.annual.max_iterations,
+            max_workers=self.config.annual.workers,
+        )
+        progress.advance()
+        progress.close()
+
+        # Trajectory and summaries from the month solutions at the best boundaries
+        all_trajectories = []
+        solve_profile = SolveProfile()
+        monthly_summaries = []
+        timestep_hours = 1.0 if data.resolution == 'PT60M' else 0.25
+        for window, core_result, start_kwh in zip(months, annual.months, annual.boundary_energy_kwh):
+            result = MonthlyLPAdapter.from_core_result(core_result)
+            solve_profile.add(result.timings)
+            all_trajectories.append(result.to_dataframe(window.timestamps))
+            monthly_summaries.append({
+                'year': window.timestamps[0].year,
+                'month': window.month,
+                'initial_energy_kwh': float(start_kwh),
+                'total_charged_kwh': float(result.P_charge.sum() * timestep_hours),
+                'total_discharged_kwh': float(result.P_discharge.sum() * timestep_hours),
+                'total_import_kwh': float(result.P_grid_import.sum() * timestep_hours),
+                'total_export_kwh': float(result.P_grid_export.sum() * timestep_hours),
+                'energy_cost_nok': float(result.energy_cost),
+                'power_cost_nok': float(result.power_cost) if result.power_cost is not None else 0.0,
+                'degradation_cost_nok': float(result.degradation_cost) if result.degradation_cost is not None else 0.0,
+                'total_cost_nok': float(result.objective_value),
+            })
+
+        trajectory_df = pd.concat(all_trajectories, axis=0)
+        monthly_summary_df = pd.DataFrame(monthly_summaries)
+        economic_metrics = self._calculate_economic_metrics(monthly_summary_df)
+        economic_metrics.update({
+            'lower_bound_nok': float(annual.lower_bound),
+            'optimality_gap': float(annual.gap),
+        })
+
+        logger.info("Optimization complete: %d months, total cost %.0f NOK (lower bound %.0f, gap %.2e, %d iterations)",
+                    len(months), economic_metrics['total_cost_nok'], annual.lower_bound, annual.gap,
+                    annual.iterations)
+
+        return SimulationResults(
+            mode='annual',
+            start_date=data.timestamps[0].to_pydatetime(),
+            end_date=data.timestamps[-1].to_pydatetime(),
+            trajectory=trajectory_df,
+            monthly_summary=monthly_summary_df,
+            economic_metrics=economic_metrics,
+            battery_final_state=None,
+            metadata={
+                'months_optimized': [window.month for window in months],
+                'boundary_energy_kwh': [float(e) for e in annual.boundary_energy_kwh],
+                'iterations': annual.iterations,
+                'converged': annual.converged,
+                'solve_profile': solve_profile.summary(),
+                'battery_capacity_kwh': self.config.battery.capacity_kwh,
+                'battery_power_kw': self.config.battery.power_kw,
+                'resolution': data.resolution,
+            }
+        )
+
+    def _calculate_economic_metrics(self, monthly_summary: pd.DataFrame) -> dict:
+        """
+        Calculate overall economic metrics from monthly summaries.
+
+        Args:
+            monthly_summary: DataFrame with monthly results
+
+        Returns:
+            Dictionary of economic metrics
+        """
+        return {
+            'total_charged_kwh': float(monthly_summary['total_charged_kwh'].sum()),
+            'total_discharged_kwh': float(monthly_summary['total_discharged_kwh'].sum()),
+            'total_import_kwh': float(monthly_summary['total_import_kwh'].sum()),
+            'total_export_kwh': float(monthly_summary['total_export_kwh'].sum()),
+            'total_energy_cost_nok': float(monthly_summary['energy_cost_nok'].sum()),
+            'total_power_cost_nok': float(monthly_summary['power_cost_nok'].sum()),
+            'total_degradation_cost_nok': float(monthly_summary['degradation_cost_nok'].sum()),
+            'total_cost_nok': float(monthly_summary['total_cost_nok'].sum()),
+            'avg_monthly_cost_nok': float(monthly_summary['total_cost_nok'].mean()),
+        }
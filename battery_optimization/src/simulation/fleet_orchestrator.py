@@ -0,0 +1,272 @@
+"""
+Fleet Orchestrator for batch runs over many sites.
+
+Runs the same simulation mode (typically yearly) for many sites/buildings
+that share a price area and tariff, but have their own PV production,
+consumption and battery size. Results of all sites go into one result
+catalog (src.persistence.ResultStorage).
+
+The shared price series is loaded once. Each site's production and
+consumption are aligned to the price timestamps and staged as .npy files,
+which workers memory-map instead of re-parsing CSVs. Sites are submitted to a
+process pool one task each, largest first, so idle workers pick up the next
+pending site (work stealing) and adding a site adds about one site's run time
+divided by the worker count.
+
+**Usage:**
+    from src.simulation import FleetOrchestrator, FleetSite
+
+    sites = [
+        FleetSite('school', 'data/pv/school.csv', 'data/load/school.csv', battery_kwh=100),
+        FleetSite('office', 'data/pv/office.csv', 'data/load/office.csv'),
+    ]
+    outcomes = FleetOrchestrator(config, sites, results_dir='results/fleet').run()
+"""
+
+import copy
+import logging
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from src.config.simulation_config import SimulationConfig
+from src.config.verbosity import apply_verbosity
+from src.data.data_manager import DataManager, TimeSeriesData
+from src.data.file_loaders import (
+    detect_resolution,
+    load_consumption_data,
+    load_price_data,
+    load_production_data,
+)
+from src.persistence import ResultStorage
+from src.simulation.annual_orchestrator import AnnualOrchestrator
+from src.simulation.monthly_orchestrator import MonthlyOrchestrator
+from src.simulation.progress import ProgressCallback, ProgressReporter
+from src.simulation.rolling_horizon_orchestrator import RollingHorizonOrchestrator
+from src.simulation.yearly_orchestrator import YearlyOrchestrator
+
+logger = logging.getLogger(__name__)
+
+# Orchestrators a fleet run can use per site
+SITE_ORCHESTRATORS = {
+    'yearly': YearlyOrchestrator,
+    'annual': AnnualOrchestrator,
+    'monthly': MonthlyOrchestrator,
+    'baseline': MonthlyOrchestrator,
+    'rolling_horizon': RollingHorizonOrchestrator,
+}
+
+
+@dataclass(frozen=True)
+class FleetSite:
+    """One site of a fleet: its own load, PV and (optionally) battery size."""
+    name: str
+    production_file: str
+    consumption_file: str
+    battery_kwh: Optional[float] = None  # None = fleet config's battery
+    battery_kw: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class FleetSiteResult:
+    """Outcome of one site's run (the full results are in the catalog)."""
+    site: str
+    result_id: Optional[str]
+    total_cost_nok: Optional[float] = None
+    execution_time_s: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+@dataclass(frozen=True)
+class _SiteTask:
+    """Picklable work item for a pool worker."""
+    site: FleetSite
+    config: SimulationConfig
+    stage_dir: str
+    site_index: int
+    resolution: str
+    results_dir: str
+    result_id: str
+
+
+def _load_site_data(task: _SiteTask) -> TimeSeriesData:
+    """Memory-map the shared prices and the site's series; drop steps the site has no data for."""
+    stage = Path(task.stage_dir)
+    timestamps = np.load(stage / 'timestamps.npy', mmap_mode='r')
+    prices = np.load(stage / 'prices.npy', mmap_mode='r')
+    series = np.load(stage / f'site_{task.site_index}.npy', mmap_mode='r')
+
+    valid = np.isfinite(series).all(axis=0)
+    return TimeSeriesData(
+        timestamps=pd.DatetimeIndex(timestamps[valid]),
+        prices_nok_per_kwh=prices[valid],
+        pv_production_kw=series[0, valid],
+        consumption_kw=series[1, valid],
+        resolution=task.resolution,
+    )
+
+
+def _run_site(task: _SiteTask) -> FleetSiteResult:
+    """Worker: run one site and save its results to the shared catalog."""
+    start = time.perf_counter()
+    try:
+        orchestrator = SITE_ORCHESTRATORS[task.config.mode](task.config, progress_callback=lambda update: None)
+        orchestrator.data_manager = DataManager(task.config, data=_load_site_data(task))
+        results = orchestrator.run()
+        results.metadata.setdefault('battery_kwh', task.config.battery.capacity_kwh)
+        results.metadata.setdefault('battery_kw', task.config.battery.power_kw)
+        results.metadata['execution_time_s'] = time.perf_counter() - start
+        results.metadata['fleet_site'] = task.site.name
+
+        result_id = ResultStorage(task.results_dir).save(
+            results, result_id=task.result_id, notes=f"fleet site: {task.site.name}")
+    except Exception as e:
+        return FleetSiteResult(task.site.name, None, execution_time_s=time.perf_counter() - start,
+                               error=f"{type(e).__name__}: {e}")
+
+    return FleetSiteResult(task.site.name, result_id, results.economic_metrics.get('total_cost_nok'),
+                           time.perf_counter() - start)
+
+
+class FleetOrchestrator:
+    """
+    Orchestrator for fleet runs.
+
+    Runs config.mode once per site in a process pool and stores every site's
+    results in one ResultStorage catalog.
+    """
+
+    def __init__(
+        self,
+        config: SimulationConfig,
+        sites: Sequence[FleetSite],
+        results_dir: Union[str, Path] = "results",
+        max_workers: Optional[int] = None,
+        progress_callback: Optional[ProgressCallback] = None
+    ):
+        """
+        Initialize fleet orchestrator.
+
+        Args:
+            config: Shared simulation configuration (mode, period, prices, tariff,
+                default battery); data_sources.prices_file is used for all sites
+            sites: Sites to run (names must be unique)
+            results_dir: ResultStorage directory holding the fleet's catalog
+            max_workers: Process pool size (default: CPU count; 1 = run in this process)
+            progress_callback: Called every config.progress_interval_percent of the
+                sites (default: log a progress line)
+        """
+        names = [site.name for site in sites]
+        if len(set(names)) != len(names):
+            raise ValueError("Fleet site names must be unique")
+        if config.mode not in SITE_ORCHESTRATORS:
+            raise ValueError(f"Fleet mode must be one of {list(SITE_ORCHESTRATORS)}, got '{config.mode}'")
+
+        self.config = config
+        self.sites = list(sites)
+        self.results_dir = Path(results_dir)
+        self.max_workers = max_workers
+        self.progress_callback = progress_callback
+
+    def site_config(self, site: FleetSite) -> SimulationConfig:
+        """Fleet config with the site's data files and battery size."""
+        config = copy.deepcopy(self.config)
+        config.data_sources.production_file = site.production_file
+        config.data_sources.consumption_file = site.consumption_file
+        if site.battery_kwh is not None:
+            config.battery.capacity_kwh = site.battery_kwh
+        if site.battery_kw is not None:
+            config.battery.power_kw = site.battery_kw
+        return config
+
+    def run(self) -> List[FleetSiteResult]:
+        """
+        Run all sites.
+
+        Returns:
+            FleetSiteResult per site, in site order (failed sites carry the error)
+        """
+        apply_verbosity(self.config.verbosity)
+        logger.info("Fleet simulation (%d sites, %s mode)", len(self.sites), self.config.mode)
+
+        # ResultStorage creates the catalog (and migrates legacy indexes) before workers open it
+        ResultStorage(self.results_dir)
+        run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        with tempfile.TemporaryDirectory(prefix='fleet_') as stage_dir:
+            tasks = self._stage(Path(stage_dir), run_id)
+            outcomes = self._execute(tasks)
+
+        failed = [o for o in outcomes if not o.success]
+        for outcome in failed:
+            logger.warning("Site '%s' failed - %s", outcome.site, outcome.error)
+        logger.info("Fleet simulation complete: %d/%d sites succeeded",
+                    len(outcomes) - len(failed), len(outcomes))
+
+        order = {site.name: i for i, site in enumerate(self.sites)}
+        return sorted(outcomes, key=lambda o: order[o.site])
+
+    def _stage(self, stage_dir: Path, run_id: str) -> List[_SiteTask]:
+        """Write shared prices and per-site series as .npy files; return tasks, largest first."""
+        price_timestamps, prices = load_price_data(self.config.data_sources.prices_file)
+        resolution = detect_resolution(price_timestamps)
+        np.save(stage_dir / 'timestamps.npy', price_timestamps.values.astype('datetime64[ns]'))
+        np.save(stage_dir / 'prices.npy', np.asarray(prices, dtype=float))
+        logger.info("  Loaded %d shared price steps (%s)", len(price_timestamps), resolution)
+
+        tasks = []
+        sizes = []
+        for index, site in enumerate(self.sites):
+            series = np.vstack([
+                self._reindex(*load_production_data(site.production_file), price_timestamps),
+                self._reindex(*load_consumption_data(site.consumption_file), price_timestamps),
+            ])
+            np.save(stage_dir / f'site_{index}.npy', series)
+            sizes.append(int(np.isfinite(series).all(axis=0).sum()))
+            tasks.append(_SiteTask(
+                site=site,
+                config=self.site_config(site),
+                stage_dir=str(stage_dir),
+                site_index=index,
+                resolution=resolution,
+                results_dir=str(self.results_dir),
+                result_id=f"fleet_{run_id}_{site.name}",
+            ))
+
+        # Longest runs first so no worker is left with a big site at the end
+        order = sorted(range(len(tasks)), key=lambda i: -sizes[i])
+        return [tasks[i] for i in order]
+
+    @staticmethod
+    def _reindex(timestamps: pd.DatetimeIndex, values: np.ndarray, target: pd.DatetimeIndex) -> np.ndarray:
+        """Values at the target timestamps (NaN where the site has no data)."""
+        return pd.Series(np.asarray(values, dtype=float), index=timestamps).reindex(target).to_numpy()
+
+    def _execute(self, tasks: List[_SiteTask]) -> List[FleetSiteResult]:
+        """Run tasks in a process pool (or in this process), reporting progress per site."""
+        progress = ProgressReporter(len(tasks), "Optimizing sites", self.progress_callback,
+                                    self.config.progress_interval_percent)
+        outcomes = []
+        if self.max_workers == 1 or len(tasks) < 2:
+            for task in tasks:
+                outcomes.append(_run_site(task))
+                progress.advance()
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = [pool.submit(_run_site, task) for task in tasks]
+                for future in as_completed(futures):
+                    outcomes.append(future.result())
+                    progress.advance()
+        progress.close()
+        return outcomes
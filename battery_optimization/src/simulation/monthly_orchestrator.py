@@ -4,18 +4,23 @@ Monthly Orchestrator for monthly battery optimization analysis.
 Runs single-solve optimizations for one or more months.
 """
 
+import logging
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 import pandas as pd
 import numpy as np
-from tqdm import tqdm
 
+from core.solve_profile import SolveProfile
 from src.config.simulation_config import SimulationConfig
+from src.config.verbosity import apply_verbosity
 from src.data.data_manager import DataManager, TimeSeriesData
 from src.optimization.base_optimizer import BaseOptimizer
 from src.optimization.optimizer_factory import OptimizerFactory
+from src.simulation.progress import ProgressCallback, ProgressReporter
 from src.simulation.simulation_results import SimulationResults
 
+logger = logging.getLogger(__name__)
+
 
 class MonthlyOrchestrator:
     """
@@ -24,14 +29,17 @@ class MonthlyOrchestrator:
     Runs full-month single-solve optimizations for specified months.
     """
 
-    def __init__(self, config: SimulationConfig):
+    def __init__(self, config: SimulationConfig, progress_callback: Optional[ProgressCallback] = None):
         """
         Initialize monthly orchestrator.
 
         Args:
             config: Simulation configuration
+            progress_callback: Called every config.progress_interval_percent of the
+                run (default: log a progress line)
         """
         self.config = config
+        self.progress_callback = progress_callback
         self.data_manager = DataManager(config)
         self.optimizer: Optional[BaseOptimizer] = None
 
@@ -45,32 +53,31 @@ class MonthlyOrchestrator:
         Raises:
             RuntimeError: If simulation fails
         """
-        print(f"\n{'='*70}")
-        print(f"Monthly Optimization")
-        print(f"{'='*70}")
+        apply_verbosity(self.config.verbosity)
+        logger.info("Monthly optimization")
 
         # Load data
-        print("Loading data...")
         data = self.data_manager.load_data()
-        print(f"  Loaded {len(data)} timesteps")
-        print(f"  Period: {data.timestamps[0]} to {data.timestamps[-1]}")
-        print(f"  Resolution: {data.resolution}")
+        logger.info("  Loaded %d timesteps: %s to %s (%s)",
+                    len(data), data.timestamps[0], data.timestamps[-1], data.resolution)
 
         # Create optimizer
-        print("\nCreating optimizer...")
         self.optimizer = OptimizerFactory.create_from_config(self.config)
 
         # Get list of months to optimize
         months_to_run = self.config.monthly.get_month_list()
         year = self.config.simulation_period.get_start_datetime().year
 
-        print(f"\nOptimizing months: {months_to_run}")
+        logger.info("  Optimizing months: %s", months_to_run)
 
         # Run optimization for each month
         all_trajectories = []
+        solve_profile = SolveProfile()
         monthly_summaries = []
 
-        for month in tqdm(months_to_run, desc="Optimizing months"):
+        progress = ProgressReporter(len(months_to_run), "Optimizing months", self.progress_callback,
+                                    self.config.progress_interval_percent)
+        for month in months_to_run:
             try:
                 # Extract month data
                 month_data = data.get_month(year, month)
@@ -88,6 +95,7 @@ class MonthlyOrchestrator:
                     spot_prices=month_data.prices_nok_per_kwh,
                     initial_soc_kwh=initial_soc_kwh,
                 )
+                solve_profile.add(result.timings)
 
                 # Convert to DataFrame
                 month_trajectory = result.to_dataframe(month_data.timestamps)
@@ -109,14 +117,17 @@ class MonthlyOrchestrator:
                 }
                 monthly_summaries.append(month_summary)
 
-                print(f"  Month {month}: Total cost = {result.objective_value:,.0f} NOK")
+                logger.info("  Month %d: Total cost = %.0f NOK", month, result.objective_value)
 
             except ValueError as e:
-                print(f"  Warning: Skipping month {month} - {e}")
+                logger.warning("Skipping month %d - %s", month, e)
                 continue
             except Exception as e:
-                print(f"  Error in month {month}: {e}")
                 raise RuntimeError(f"Monthly optimization failed for month {month}: {e}")
+            finally:
+                progress.advance()
+
+        progress.close()
 
         # Combine all trajectories
         trajectory_df = pd.concat(all_trajectories, axis=0)
@@ -127,9 +138,8 @@ class MonthlyOrchestrator:
         # Calculate overall economic metrics
         economic_metrics = self._calculate_economic_metrics(monthly_summary_df)
 
-        print(f"\nOptimization complete!")
-        print(f"  Total months: {len(monthly_summaries)}")
-        print(f"  Total cost: {economic_metrics['total_cost_nok']:,.0f} NOK")
+        logger.info("Optimization complete: %d months, total cost %.0f NOK",
+                    len(monthly_summaries), economic_metrics['total_cost_nok'])
 
         results = SimulationResults(
             mode='monthly',
@@ -141,6 +151,7 @@ class MonthlyOrchestrator:
             battery_final_state=None,
             metadata={
                 'months_optimized': months_to_run,
+                'solve_profile': solve_profile.summary(),
                 'battery_capacity_kwh': self.config.battery.capacity_kwh,
                 'battery_power_kw': self.config.battery.power_kw,
                 'resolution': data.resolution,
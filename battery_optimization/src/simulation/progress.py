@@ -0,0 +1,89 @@
+"""
+Progress reporting for long simulation loops.
+
+Orchestrators advance a ProgressReporter once per loop step; it calls the
+progress callback only every `interval_percent` of the loop (and once at the
+end), so reporting costs an integer comparison per step.
+
+Custom callbacks receive a ProgressUpdate:
+
+    def on_progress(update: ProgressUpdate) -> None:
+        print(f"{update.desc}: {update.fraction:.0%}")
+
+    RollingHorizonOrchestrator(config, progress_callback=on_progress).run()
+
+The default callback logs one INFO line per report.
+"""
+
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ProgressUpdate:
+    """Snapshot of a loop's progress."""
+    desc: str
+    completed: int
+    total: int
+    elapsed_s: float
+
+    @property
+    def fraction(self) -> float:
+        return self.completed / self.total if self.total else 1.0
+
+
+ProgressCallback = Callable[[ProgressUpdate], None]
+
+
+def log_progress(update: ProgressUpdate) -> None:
+    """Default callback: one log line per report."""
+    logger.info("  %s: %d/%d (%.0f%%, %.1f s)", update.desc, update.completed, update.total,
+                100 * update.fraction, update.elapsed_s)
+
+
+class ProgressReporter:
+    """Throttled progress callback for a loop of known length."""
+
+    def __init__(self,
+                 total: int,
+                 desc: str,
+                 callback: Optional[ProgressCallback] = None,
+                 interval_percent: float = 10.0):
+        """
+        Args:
+            total: Number of loop steps
+            desc: Label passed in every update
+            callback: Called with a ProgressUpdate (default: log_progress)
+            interval_percent: Report every this share of `total` [%]
+        """
+        self.total = total
+        self.desc = desc
+        self.callback = callback or log_progress
+        self.completed = 0
+        self._every = max(1, math.ceil(total * interval_percent / 100))
+        self._next = self._every
+        self._reported = 0
+        self._start = time.perf_counter()
+
+    def advance(self, n: int = 1) -> None:
+        """Count `n` completed steps, reporting when an interval is crossed."""
+        self.completed += n
+        if self.completed >= self._next:
+            self._next = (self.completed // self._every + 1) * self._every
+            self._report()
+
+    def close(self) -> None:
+        """Report the final state (also after an early exit from the loop)."""
+        if self._reported != self.completed or self.completed == 0:
+            self._report()
+
+    def _report(self) -> None:
+        self._reported = self.completed
+        self.callback(ProgressUpdate(self.desc, self.completed, self.total,
+                                     time.perf_counter() - self._start))
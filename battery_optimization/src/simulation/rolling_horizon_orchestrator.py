@@ -3,20 +3,107 @@ Rolling Horizon Orchestrator for real-time battery optimization.
 
 Manages persistent state and executes rolling 24h optimizations with configurable
 update frequency.
+
+Execution policies:
+- periodic: re-solve every `execute_steps` timesteps and commit the plan in between
+- event_triggered: keep executing the current plan until a trigger fires (net load
+  deviates from the plan, day-ahead prices are published, the monthly peak is
+  threatened, a new month starts, or the plan reaches max_plan_age_hours)
+
+With forecast='models' the optimizer sees forecasts from src.forecasting instead
+of realized data, and executed grid flows absorb the forecast error.
 """
 
+import logging
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Dict
 import pandas as pd
 import numpy as np
-from tqdm import tqdm
 
+from core.solve_profile import SolveProfile, SolveTimings
 from src.config.simulation_config import SimulationConfig
+from src.config.verbosity import apply_verbosity
 from src.data.data_manager import DataManager, TimeSeriesData
-from src.optimization.base_optimizer import BaseOptimizer
+from src.forecasting import ForecastProvider
+from src.optimization.base_optimizer import BaseOptimizer, OptimizationResult
 from src.optimization.optimizer_factory import OptimizerFactory
-from src.operational.state_manager import BatterySystemState
+from src.optimization.rolling_horizon_adapter import RollingHorizonAdapter
+from src.operational.state_manager import (
+    BatterySystemState,
+    PeakPenaltyTable,
+    calculate_average_power_tariff_rate,
+    months_since_epoch,
+)
+from src.simulation.progress import ProgressCallback, ProgressReporter
 from src.simulation.simulation_results import SimulationResults
+from src.simulation.trajectory_buffer import TrajectoryBuffer
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ExecutionStats:
+    """Re-optimization statistics for one rolling horizon run."""
+    policy: str
+    steps: int = 0
+    solves: int = 0
+    windows_pruned: int = 0  # Solves answered without the LP (see core.window_pruning)
+    solve_time_s: float = 0.0
+    triggers: Dict[str, int] = field(default_factory=dict)
+    spot_energy_cost_nok: float = 0.0  # Realized (import - export) × spot price
+    max_peak_kw: float = 0.0           # Highest realized grid import
+    profile: SolveProfile = field(default_factory=SolveProfile)
+
+    def record_solve(self, trigger: str, solve_time_s: float, timings: Optional[SolveTimings] = None,
+                     pruned: bool = False):
+        """Count one solve, the trigger that caused it and its phase timings."""
+        self.solves += 1
+        self.windows_pruned += pruned
+        self.solve_time_s += solve_time_s
+        self.triggers[trigger] = self.triggers.get(trigger, 0) + 1
+        self.profile.add(timings)
+
+    @property
+    def solves_avoided(self) -> int:
+        """Solves saved relative to re-optimizing every timestep."""
+        return self.steps - self.solves
+
+    @property
+    def lp_solves(self) -> int:
+        """Solves that ran the LP."""
+        return self.solves - self.windows_pruned
+
+    def to_dict(self) -> dict:
+        return {
+            'policy': self.policy,
+            'steps': self.steps,
+            'solves': self.solves,
+            'solves_avoided': self.solves_avoided,
+            'windows_pruned': self.windows_pruned,
+            'lp_solves': self.lp_solves,
+            'solve_fraction': self.solves / self.steps if self.steps else 0.0,
+            'solve_time_s': self.solve_time_s,
+            'triggers': dict(self.triggers),
+            'spot_energy_cost_nok': self.spot_energy_cost_nok,
+            'max_peak_kw': self.max_peak_kw,
+        }
+
+
+@dataclass
+class _Plan:
+    """Most recent optimization result and how far it has been executed."""
+    result: OptimizationResult
+    solved_at: datetime
+    net_load_kw: np.ndarray  # Forecast net load the plan was optimized for
+    executable_steps: int    # Leading steps at native resolution
+    step: int = 0            # Next step to execute
+
+    @property
+    def peak_penalty(self) -> float:
+        """Adaptive peak penalty the plan was optimized with [NOK/kW] (NaN if unknown)."""
+        penalty = self.result.adaptive_peak_penalty
+        return np.nan if penalty is None else penalty
 
 
 class RollingHorizonOrchestrator:
@@ -27,14 +114,17 @@ class RollingHorizonOrchestrator:
     across the entire simulation period.
     """
 
-    def __init__(self, config: SimulationConfig):
+    def __init__(self, config: SimulationConfig, progress_callback: Optional[ProgressCallback] = None):
         """
         Initialize rolling horizon orchestrator.
 
         Args:
             config: Simulation configuration
+            progress_callback: Called every config.progress_interval_percent of the
+                run (default: log a progress line)
         """
         self.config = config
+        self.progress_callback = progress_callback
         self.data_manager = DataManager(config)
         self.optimizer: Optional[BaseOptimizer] = None
         self.battery_state: Optional[BatterySystemState] = None
@@ -49,23 +139,18 @@ class RollingHorizonOrchestrator:
         Raises:
             RuntimeError: If simulation fails
         """
-        print(f"\n{'='*70}")
-        print(f"Rolling Horizon Simulation")
-        print(f"{'='*70}")
+        apply_verbosity(self.config.verbosity)
+        logger.info("Rolling horizon simulation")
 
         # Load data
-        print("Loading data...")
         data = self.data_manager.load_data()
-        print(f"  Loaded {len(data)} timesteps")
-        print(f"  Period: {data.timestamps[0]} to {data.timestamps[-1]}")
-        print(f"  Resolution: {data.resolution}")
+        logger.info("  Loaded %d timesteps: %s to %s (%s)",
+                    len(data), data.timestamps[0], data.timestamps[-1], data.resolution)
 
         # Create optimizer
-        print("\nCreating optimizer...")
         self.optimizer = OptimizerFactory.create_from_config(self.config)
 
         # Initialize battery state
-        print("\nInitializing battery state...")
         initial_soc_kwh = self.config.battery.capacity_kwh * (self.config.battery.initial_soc_percent / 100.0)
         start_datetime = data.timestamps[0].to_pydatetime()
         self.battery_state = BatterySystemState(
@@ -74,116 +159,180 @@ class RollingHorizonOrchestrator:
             month_start_date=start_datetime.replace(day=1, hour=0, minute=0, second=0, microsecond=0),
             last_update=start_datetime,
         )
-        print(f"  Initial SOC: {self.battery_state.current_soc_percent:.1f}%")
+        logger.info("  Initial SOC: %.1f%%", self.battery_state.current_soc_percent)
+
+        rh_config = self.config.rolling_horizon
+        forecast_provider = None
+        if rh_config.forecast == 'models':
+            forecast_provider = ForecastProvider(data, publication_hour=rh_config.price_publication_hour)
+            logger.info("  Forecasts precomputed in %.0f ms", forecast_provider.precompute_time_s * 1000)
 
         # Run rolling horizon iterations
-        print("\nRunning rolling horizon optimization...")
+        horizon_hours = rh_config.horizon_hours
+        timestep_hours = 1.0 if data.resolution == 'PT60M' else 0.25
+        execute_steps = self._execute_steps(timestep_hours)
+        max_plan_age_steps = max(1, int(round(rh_config.max_plan_age_hours / timestep_hours)))
+        logger.info("  Execution policy: %s (%d step(s) per solve%s)", rh_config.execution_policy, execute_steps,
+                    ', event triggers' if rh_config.execution_policy == 'event_triggered' else '')
+
+        # Plans only need the steps a policy can execute before its next re-solve
+        if isinstance(self.optimizer, RollingHorizonAdapter):
+            max_steps = execute_steps if rh_config.execution_policy == 'periodic' else max_plan_age_steps
+            self.optimizer.keep_steps = max_steps + 1
+
+            # Adaptive peak penalty of every window in one pass (the windows see realized data)
+            rate = calculate_average_power_tariff_rate(self.optimizer.config.tariff)
+            self.battery_state.power_tariff_rate_nok_per_kw = rate
+            if rh_config.forecast == 'perfect':
+                self.optimizer.peak_penalty_table = PeakPenaltyTable(
+                    data.timestamps, data.consumption_kw - data.pv_production_kw, horizon_hours, rate
+                )
 
-        # Calculate number of iterations
-        horizon_hours = self.config.rolling_horizon.horizon_hours
-        update_freq_hours = self.config.rolling_horizon.update_frequency_minutes / 60.0
+        # Calculate number of timesteps to simulate
         end_datetime = data.timestamps[-1].to_pydatetime()
         total_hours = (end_datetime - start_datetime).total_seconds() / 3600
 
-        num_iterations = int(total_hours / update_freq_hours)
-
-        # Pre-allocate arrays for better performance (C1 fix)
-        trajectory_arrays = {
-            'timestamp': np.empty(num_iterations, dtype='datetime64[ns]'),
-            'P_charge_kw': np.zeros(num_iterations),
-            'P_discharge_kw': np.zeros(num_iterations),
-            'P_grid_import_kw': np.zeros(num_iterations),
-            'P_grid_export_kw': np.zeros(num_iterations),
-            'E_battery_kwh': np.zeros(num_iterations),
-            'P_curtail_kw': np.zeros(num_iterations),
-            'soc_percent': np.zeros(num_iterations),
-        }
-
-        current_time = start_datetime
-        completed_iterations = 0
+        num_iterations = min(int(total_hours / timestep_hours), len(data))
 
-        for i in tqdm(range(num_iterations), desc="Optimizing"):
-            # Extract window
-            try:
-                # Allow partial windows to handle DST transitions (spring forward/fall back)
-                window_data = data.get_window(current_time, horizon_hours, allow_partial=True)
-            except ValueError:
-                # Reached end of data
-                break
-
-            # Run optimization
-            try:
-                result = self.optimizer.optimize(
-                    timestamps=window_data.timestamps,
-                    pv_production=window_data.pv_production_kw,
-                    consumption=window_data.consumption_kw,
-                    spot_prices=window_data.prices_nok_per_kwh,
-                    battery_state=self.battery_state,
-                )
-            except Exception as e:
-                print(f"\nOptimization failed at {current_time}: {e}")
-                break
-
-            # Execute first control action
-            if len(result.P_charge) > 0:
-                # Update battery state with first timestep
-                timestep_hours = 1.0 if data.resolution == 'PT60M' else 0.25
-
-                # Calculate net power and energy change
-                net_power_kw = result.P_charge[0] - result.P_discharge[0]
-                energy_change_kwh = net_power_kw * timestep_hours * self.config.battery.efficiency
-
-                # Update SOC
-                new_soc = self.battery_state.current_soc_kwh + energy_change_kwh
-                new_soc = np.clip(
-                    new_soc,
-                    self.config.battery.capacity_kwh * self.config.battery.min_soc_percent / 100.0,
-                    self.config.battery.capacity_kwh * self.config.battery.max_soc_percent / 100.0
-                )
+        # Pre-allocated record per executed step
+        trajectory = TrajectoryBuffer(num_iterations, [
+            'P_charge_kw', 'P_discharge_kw', 'P_grid_import_kw', 'P_grid_export_kw',
+            'E_battery_kwh', 'P_curtail_kw', 'soc_percent', 'peak_penalty_nok_per_kw',
+        ])
+        timestamp_values = data.timestamps.values
+        month_of_step = months_since_epoch(data.timestamps.as_unit('ns').asi8)
 
-                # Update state
-                self.battery_state.current_soc_kwh = new_soc
+        stats = ExecutionStats(policy=rh_config.execution_policy)
+        plan = None
+        completed_iterations = 0
 
-                # Track monthly peak (simplified - actual implementation would need tariff logic)
-                grid_import = result.P_grid_import[0]
-                if current_time.month != self.battery_state.month_start_date.month:
-                    # Month boundary - reset peak
-                    self.battery_state.current_monthly_peak_kw = grid_import
-                    self.battery_state.month_start_date = current_time
+        progress = ProgressReporter(num_iterations, "Optimizing", self.progress_callback,
+                                    self.config.progress_interval_percent)
+        for i in range(num_iterations):
+            current_time = data.timestamps[i].to_pydatetime()
+            realized_net_load_kw = data.consumption_kw[i] - data.pv_production_kw[i]
+
+            trigger = self._reoptimization_trigger(
+                plan, current_time, realized_net_load_kw, execute_steps, max_plan_age_steps
+            )
+
+            if trigger is not None:
+                # Extract window
+                try:
+                    # Allow partial windows to handle DST transitions (spring forward/fall back)
+                    window_data = data.get_window(current_time, horizon_hours, allow_partial=True)
+                except ValueError:
+                    # Reached end of data
+                    break
+
+                if forecast_provider is not None:
+                    pv_kw, consumption_kw, prices = forecast_provider.window(i, len(window_data))
                 else:
-                    self.battery_state.current_monthly_peak_kw = max(
-                        self.battery_state.current_monthly_peak_kw,
-                        grid_import
+                    pv_kw = window_data.pv_production_kw
+                    consumption_kw = window_data.consumption_kw
+                    prices = window_data.prices_nok_per_kwh
+
+                # Run optimization
+                try:
+                    result = self.optimizer.optimize(
+                        timestamps=window_data.timestamps,
+                        pv_production=pv_kw,
+                        consumption=consumption_kw,
+                        spot_prices=prices,
+                        battery_state=self.battery_state,
                     )
+                except Exception as e:
+                    logger.error("Optimization failed at %s: %s", current_time, e)
+                    break
+
+                if len(result.P_charge) == 0:
+                    break
+
+                plan = _Plan(
+                    result=result,
+                    solved_at=current_time,
+                    net_load_kw=consumption_kw - pv_kw,
+                    executable_steps=self._executable_steps(result),
+                )
+                stats.record_solve(trigger, result.solve_time_seconds, result.timings, result.pruned)
+
+            # Execute the next committed step of the current plan
+            j = plan.step
+            plan.step += 1
+
+            # Update SOC along the plan's battery dynamics (E_battery[j+1] is the
+            # energy after step j, so committed steps stay consistent with the plan).
+            # A one-step window at the end of the data has no successor; hold the SOC.
+            next_energy = (plan.result.E_battery[j + 1] if j + 1 < len(plan.result.E_battery)
+                           else self.battery_state.current_soc_kwh)
+            new_soc = np.clip(
+                next_energy,
+                self.config.battery.capacity_kwh * self.config.battery.min_soc_percent / 100.0,
+                self.config.battery.capacity_kwh * self.config.battery.max_soc_percent / 100.0
+            )
+
+            # Update state
+            self.battery_state.current_soc_kwh = new_soc
+
+            # The grid absorbs the difference between realized and forecast net load
+            grid_import = plan.result.P_grid_import[j]
+            grid_export = plan.result.P_grid_export[j]
+            deviation_kw = realized_net_load_kw - plan.net_load_kw[j]
+            if deviation_kw != 0.0:
+                net_grid_kw = grid_import - grid_export + deviation_kw
+                grid_import = max(net_grid_kw, 0.0)
+                grid_export = max(-net_grid_kw, 0.0)
+
+            # Track monthly peak (simplified - actual implementation would need tariff logic)
+            if month_of_step[i] != self.battery_state.month_index:
+                # Month boundary - reset peak
+                self.battery_state.current_monthly_peak_kw = grid_import
+                self.battery_state.month_start_ns = timestamp_values[i].astype(np.int64)
+            else:
+                self.battery_state.current_monthly_peak_kw = max(
+                    self.battery_state.current_monthly_peak_kw,
+                    grid_import
+                )
 
-                # Store first timestep result in pre-allocated arrays
-                trajectory_arrays['timestamp'][i] = np.datetime64(window_data.timestamps[0])
-                trajectory_arrays['P_charge_kw'][i] = result.P_charge[0]
-                trajectory_arrays['P_discharge_kw'][i] = result.P_discharge[0]
-                trajectory_arrays['P_grid_import_kw'][i] = result.P_grid_import[0]
-                trajectory_arrays['P_grid_export_kw'][i] = result.P_grid_export[0]
-                trajectory_arrays['E_battery_kwh'][i] = result.E_battery[0]
-                trajectory_arrays['P_curtail_kw'][i] = result.P_curtail[0]
-                trajectory_arrays['soc_percent'][i] = (result.E_battery[0] / self.config.battery.capacity_kwh) * 100.0
+            # Store executed step
+            trajectory.append(
+                timestamp_values[i],
+                plan.result.P_charge[j],
+                plan.result.P_discharge[j],
+                grid_import,
+                grid_export,
+                plan.result.E_battery[j],
+                plan.result.P_curtail[j],
+                (plan.result.E_battery[j] / self.config.battery.capacity_kwh) * 100.0,
+                plan.peak_penalty,
+            )
 
-                completed_iterations += 1
+            stats.steps += 1
+            completed_iterations += 1
+            progress.advance()
 
-            # Advance time by update frequency
-            current_time += timedelta(hours=update_freq_hours)
+        progress.close()
 
-        # Trim arrays to actual completed iterations
-        if completed_iterations < num_iterations:
-            for key in trajectory_arrays:
-                trajectory_arrays[key] = trajectory_arrays[key][:completed_iterations]
+        current_time = start_datetime + timedelta(hours=completed_iterations * timestep_hours)
 
-        # Convert to DataFrame
-        trajectory_df = pd.DataFrame(trajectory_arrays)
-        trajectory_df.set_index('timestamp', inplace=True)
+        # Completed iterations as DataFrame
+        trajectory_df = trajectory.to_dataframe()
 
         # Create results
-        print(f"\nSimulation complete!")
-        print(f"  Total timesteps: {len(trajectory_df)}")
-        print(f"  Final SOC: {self.battery_state.current_soc_percent:.1f}%")
+        logger.info("Simulation complete: %d timesteps, final SOC %.1f%%",
+                    len(trajectory_df), self.battery_state.current_soc_percent)
+
+        if len(trajectory_df) > 0:
+            net_import_kw = trajectory_df['P_grid_import_kw'].values - trajectory_df['P_grid_export_kw'].values
+            stats.spot_energy_cost_nok = float(
+                np.sum(net_import_kw * data.prices_nok_per_kwh[:len(trajectory_df)]) * timestep_hours
+            )
+            stats.max_peak_kw = float(trajectory_df['P_grid_import_kw'].max())
+        execution_stats = stats.to_dict()
+        logger.info("  LP solves: %d (%d avoided, %d pruned, %.1fs solving)",
+                    stats.lp_solves, stats.solves_avoided, stats.windows_pruned, stats.solve_time_s)
+        if stats.profile.n_solves and logger.isEnabledFor(logging.INFO):
+            logger.info('    ' + stats.profile.format_table().replace('\n', '\n    '))
 
         # Calculate economic metrics (simplified)
         economic_metrics = self._calculate_economic_metrics(trajectory_df, data)
@@ -199,6 +348,10 @@ class RollingHorizonOrchestrator:
             metadata={
                 'horizon_hours': horizon_hours,
                 'update_frequency_minutes': self.config.rolling_horizon.update_frequency_minutes,
+                'execute_steps': execute_steps,
+                'forecast': rh_config.forecast,
+                'execution_stats': execution_stats,
+                'solve_profile': stats.profile.summary(),
                 'battery_capacity_kwh': self.config.battery.capacity_kwh,
                 'battery_power_kw': self.config.battery.power_kw,
             }
@@ -206,6 +359,87 @@ class RollingHorizonOrchestrator:
 
         return results
 
+    def _execute_steps(self, timestep_hours: float) -> int:
+        """
+        Plan steps committed per solve under the periodic policy.
+
+        Defaults to the update frequency expressed in timesteps.
+        """
+        rh_config = self.config.rolling_horizon
+        if rh_config.execute_steps is not None:
+            return rh_config.execute_steps
+        return max(1, int(round(rh_config.update_frequency_minutes / 60.0 / timestep_hours)))
+
+    @staticmethod
+    def _executable_steps(result: OptimizationResult) -> int:
+        """
+        Number of plan steps that can be committed before re-solving.
+
+        Step j needs E_battery[j+1] for the state update, and coarsened
+        horizons are only executable in their native-resolution part.
+        """
+        n_steps = len(result.E_battery) - 1
+        dt = result.timestep_hours
+        if dt is not None and len(dt) > 0:
+            coarse = np.flatnonzero(dt > dt[0] + 1e-9)
+            if len(coarse):
+                n_steps = min(n_steps, int(coarse[0]))
+        return max(1, n_steps)
+
+    def _reoptimization_trigger(
+        self,
+        plan: Optional[_Plan],
+        current_time: datetime,
+        realized_net_load_kw: float,
+        execute_steps: int,
+        max_plan_age_steps: int
+    ) -> Optional[str]:
+        """
+        Decide whether to re-optimize before executing the next timestep.
+
+        Args:
+            plan: Current plan (None before the first solve)
+            current_time: Start of the timestep about to be executed
+            realized_net_load_kw: Observed load - PV for this timestep
+            execute_steps: Steps per solve (periodic policy)
+            max_plan_age_steps: Maximum steps between solves (event_triggered policy)
+
+        Returns:
+            Trigger name, or None to keep executing the current plan
+        """
+        if plan is None:
+            return 'initial'
+        if plan.step >= plan.executable_steps:
+            return 'plan_exhausted'
+
+        rh_config = self.config.rolling_horizon
+        if rh_config.execution_policy == 'periodic':
+            return 'periodic' if plan.step >= execute_steps else None
+
+        if plan.step >= max_plan_age_steps:
+            return 'max_age'
+        if current_time.month != plan.solved_at.month:
+            return 'new_month'
+
+        # Day-ahead prices published since the plan was made
+        publication = current_time.replace(
+            hour=rh_config.price_publication_hour, minute=0, second=0, microsecond=0
+        )
+        if plan.solved_at < publication <= current_time:
+            return 'new_prices'
+
+        # Net load deviation is absorbed by the grid at a fixed battery setpoint
+        deviation_kw = realized_net_load_kw - plan.net_load_kw[plan.step]
+        if abs(deviation_kw) >= rh_config.deviation_threshold_kw:
+            return 'deviation'
+
+        realized_import_kw = plan.result.P_grid_import[plan.step] + deviation_kw
+        if (deviation_kw > 0 and realized_import_kw
+                >= self.battery_state.current_monthly_peak_kw - rh_config.peak_margin_kw):
+            return 'peak'
+
+        return None
+
     def _calculate_economic_metrics(
         self,
         trajectory: pd.DataFrame,
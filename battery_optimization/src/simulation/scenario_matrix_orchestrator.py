@@ -0,0 +1,441 @@
+"""
+Scenario Matrix Orchestrator for multi-year / multi-scenario batch analysis.
+
+Crosses price scenarios (price years, optionally stressed) × consumption
+profiles × battery sizes, runs config.mode once per combination in a process
+pool and returns one comparison table.
+
+Each input file is read once. Price scenarios are staged as .npy files, and
+every profile is shifted to each price year and aligned to its timestamps
+once, so workers memory-map their inputs instead of re-parsing CSVs. The
+month/week LPs share their constraint matrices through the process-wide LP
+templates of core.lp_monthly_optimizer: scenarios with the same battery size
+and horizon length only fill in prices and loads. Tasks are submitted grouped
+by battery size for that reason.
+
+Modes cost their own results differently (the no-battery baseline only
+prices spot energy, the LPs use their tariff approximations), so every
+scenario's grid flows are also priced with core.economic_cost under the
+config's tariff: grid_cost_nok and savings_nok compare like with like.
+
+**Usage:**
+    from src.simulation import ScenarioMatrixConfig, ScenarioMatrixOrchestrator
+
+    matrix = ScenarioMatrixConfig.from_yaml('configs/scenario_matrix_2023_2025.yaml')
+    comparison = ScenarioMatrixOrchestrator(matrix).run()
+    print(comparison[['price', 'profile', 'battery_kwh', 'grid_cost_nok', 'savings_nok']])
+"""
+
+import copy
+import logging
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from src.config.legacy_config_adapter import load_tariff_profile
+from src.config.simulation_config import SimulationConfig
+from src.config.verbosity import apply_verbosity
+from src.data.data_manager import DataManager, TimeSeriesData
+from src.data.file_loaders import (
+    detect_resolution,
+    load_consumption_data,
+    load_price_data,
+    load_production_data,
+)
+from src.simulation.fleet_orchestrator import SITE_ORCHESTRATORS
+from src.simulation.progress import ProgressCallback, ProgressReporter
+from core.economic_cost import calculate_total_cost
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PriceScenario:
+    """
+    Spot prices of one scenario: a price file, optionally stressed.
+
+    Stressed prices are scale × (daily mean + spread × (price - daily mean)) + offset.
+    """
+    name: str
+    file: str
+    scale: float = 1.0     # Multiplies all prices
+    spread: float = 1.0    # Multiplies deviations from the daily mean (intraday volatility)
+    offset: float = 0.0    # Added to all prices [NOK/kWh]
+
+    def apply(self, timestamps: pd.DatetimeIndex, prices: np.ndarray) -> np.ndarray:
+        """Stressed prices [NOK/kWh]."""
+        prices = np.asarray(prices, dtype=float)
+        if self.spread != 1.0:
+            daily_mean = pd.Series(prices).groupby(np.asarray(timestamps.normalize())).transform('mean').to_numpy()
+            prices = daily_mean + self.spread * (prices - daily_mean)
+        return self.scale * prices + self.offset
+
+
+@dataclass(frozen=True)
+class ConsumptionProfile:
+    """Load profile of one scenario (with its own PV, or the base config's)."""
+    name: str
+    consumption_file: str
+    production_file: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class BatterySize:
+    """Battery of one scenario (capacity_kwh = 0: no battery, the reference)."""
+    capacity_kwh: float
+    power_kw: float
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One cell of the scenario matrix."""
+    price: PriceScenario
+    profile: ConsumptionProfile
+    battery: BatterySize
+
+    @property
+    def name(self) -> str:
+        return f"{self.price.name}/{self.profile.name}/{self.battery.capacity_kwh:g}kWh_{self.battery.power_kw:g}kW"
+
+
+@dataclass(frozen=True)
+class ScenarioResult:
+    """Outcome of one scenario's run."""
+    scenario: Scenario
+    economic_metrics: Dict[str, float] = field(default_factory=dict)
+    execution_time_s: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class ScenarioMatrixConfig:
+    """
+    Scenario matrix: base simulation config and the scenario axes.
+
+    YAML layout:
+        base_config: configs/yearly_2024.yaml
+        workers: 4                       # optional (default: CPU count; 1 = in process)
+        output_file: results/matrix.csv  # optional
+        prices:
+          - {name: '2023', file: data/spot_prices/NO2_2023_real.csv}
+          - {name: 2024_spread_x2, file: data/spot_prices/NO2_2024_60min_real.csv, spread: 2.0}
+        profiles:
+          - {name: commercial, consumption_file: data/consumption/commercial_2024.csv}
+        batteries:
+          - {capacity_kwh: 0, power_kw: 0}
+          - {capacity_kwh: 80, power_kw: 60}
+    """
+    base_config: SimulationConfig
+    prices: List[PriceScenario]
+    profiles: List[ConsumptionProfile]
+    batteries: List[BatterySize]
+    workers: Optional[int] = None
+    output_file: Optional[str] = None
+
+    @classmethod
+    def from_yaml(cls, yaml_path: Union[str, Path]) -> "ScenarioMatrixConfig":
+        """
+        Load scenario matrix from YAML file.
+
+        Raises:
+            FileNotFoundError: If the YAML or base config file doesn't exist
+            ValueError: If an axis is missing or empty
+        """
+        yaml_path = Path(yaml_path)
+        if not yaml_path.exists():
+            raise FileNotFoundError(f"Scenario matrix file not found: {yaml_path}")
+
+        with open(yaml_path, 'r') as f:
+            matrix_dict = yaml.safe_load(f) or {}
+
+        for axis in ('base_config', 'prices', 'profiles', 'batteries'):
+            if not matrix_dict.get(axis):
+                raise ValueError(f"Scenario matrix needs a non-empty '{axis}'")
+
+        config = cls(
+            base_config=SimulationConfig.from_yaml(matrix_dict['base_config']),
+            prices=[PriceScenario(**{**p, 'name': str(p['name'])}) for p in matrix_dict['prices']],
+            profiles=[ConsumptionProfile(**{**p, 'name': str(p['name'])}) for p in matrix_dict['profiles']],
+            batteries=[BatterySize(**b) for b in matrix_dict['batteries']],
+            workers=matrix_dict.get('workers'),
+            output_file=matrix_dict.get('output_file'),
+        )
+        config.validate()
+        return config
+
+    def validate(self) -> None:
+        """
+        Validate scenario axes.
+
+        Raises:
+            ValueError: If entries repeat within an axis or the mode has no per-scenario orchestrator
+        """
+        for axis, names in (('price', [p.name for p in self.prices]),
+                            ('profile', [p.name for p in self.profiles]),
+                            ('battery', self.batteries)):
+            if len(set(names)) != len(names):
+                raise ValueError(f"Scenario matrix {axis} entries must be unique")
+        if self.base_config.mode not in SITE_ORCHESTRATORS:
+            raise ValueError(
+                f"Scenario matrix mode must be one of {list(SITE_ORCHESTRATORS)}, got '{self.base_config.mode}'"
+            )
+
+    @property
+    def scenarios(self) -> List[Scenario]:
+        """All combinations, grouped by battery size."""
+        return [Scenario(price, profile, battery)
+                for battery in self.batteries for price in self.prices for profile in self.profiles]
+
+
+@dataclass(frozen=True)
+class _ScenarioTask:
+    """Picklable work item for a pool worker."""
+    scenario: Scenario
+    config: SimulationConfig
+    stage_dir: str
+    price_index: int
+    profile_index: int
+    resolution: str
+
+
+def _load_scenario_data(task: _ScenarioTask) -> TimeSeriesData:
+    """Memory-map the scenario's prices and aligned profile; drop steps the profile has no data for."""
+    stage = Path(task.stage_dir)
+    timestamps = np.load(stage / f'timestamps_{task.price_index}.npy', mmap_mode='r')
+    prices = np.load(stage / f'prices_{task.price_index}.npy', mmap_mode='r')
+    series = np.load(stage / f'profile_{task.price_index}_{task.profile_index}.npy', mmap_mode='r')
+
+    valid = np.isfinite(series).all(axis=0)
+    return TimeSeriesData(
+        timestamps=pd.DatetimeIndex(timestamps[valid]),
+        prices_nok_per_kwh=prices[valid],
+        pv_production_kw=series[0, valid],
+        consumption_kw=series[1, valid],
+        resolution=task.resolution,
+    )
+
+
+def _grid_cost(config: SimulationConfig, trajectory: pd.DataFrame, data: TimeSeriesData) -> Dict[str, float]:
+    """Energy + peak cost of the trajectory's grid flows under the config's tariff."""
+    prices = pd.Series(data.prices_nok_per_kwh, index=data.timestamps).reindex(trajectory.index).to_numpy()
+    timestep_hours = pd.Timedelta(minutes=int(data.resolution[2:-1])) / pd.Timedelta(hours=1)
+    cost = calculate_total_cost(
+        trajectory['P_grid_import_kw'].to_numpy(),
+        trajectory['P_grid_export_kw'].to_numpy(),
+        trajectory.index,
+        prices,
+        timestep_hours,
+        load_tariff_profile(config.infrastructure.tariffs),
+    )
+    return {
+        'grid_energy_cost_nok': float(cost['energy_cost_nok']),
+        'grid_peak_cost_nok': float(cost['peak_cost_nok']),
+        'grid_cost_nok': float(cost['total_cost_nok']),
+    }
+
+
+def _run_scenario(task: _ScenarioTask) -> ScenarioResult:
+    """Worker: run one scenario."""
+    start = time.perf_counter()
+    try:
+        data = _load_scenario_data(task)
+        orchestrator = SITE_ORCHESTRATORS[task.config.mode](task.config, progress_callback=lambda update: None)
+        orchestrator.data_manager = DataManager(task.config, data=data)
+        results = orchestrator.run()
+        grid_cost = _grid_cost(task.config, results.trajectory, data)
+    except Exception as e:
+        return ScenarioResult(task.scenario, execution_time_s=time.perf_counter() - start,
+                              error=f"{type(e).__name__}: {e}")
+
+    metrics = {key: float(value) for key, value in results.economic_metrics.items()
+               if isinstance(value, (int, float, np.number))}
+    metrics.update(grid_cost)
+    return ScenarioResult(task.scenario, metrics, time.perf_counter() - start)
+
+
+def _shift_to_year(timestamps: pd.DatetimeIndex, values: np.ndarray, year: int) -> pd.Series:
+    """Profile moved to `year` by calendar date (like load_production_data); Feb 29 is dropped."""
+    series = pd.Series(np.asarray(values, dtype=float), index=timestamps)
+    if timestamps[0].year != year:
+        series.index = timestamps + pd.DateOffset(years=year - timestamps[0].year)
+        series = series[~series.index.duplicated()]
+    return series
+
+
+class ScenarioMatrixOrchestrator:
+    """
+    Orchestrator for scenario matrices.
+
+    Runs the base config's mode for every price × profile × battery
+    combination and compares them in one table.
+    """
+
+    def __init__(self, matrix: ScenarioMatrixConfig, progress_callback: Optional[ProgressCallback] = None):
+        """
+        Initialize scenario matrix orchestrator.
+
+        Args:
+            matrix: Base config and scenario axes
+            progress_callback: Called every progress_interval_percent of the
+                scenarios (default: log a progress line)
+        """
+        matrix.validate()
+        self.matrix = matrix
+        self.config = matrix.base_config
+        self.progress_callback = progress_callback
+
+    def scenario_config(self, scenario: Scenario, year: int) -> SimulationConfig:
+        """Base config with the scenario's battery and files, its period moved to the price year."""
+        config = copy.deepcopy(self.config)
+        config.battery.capacity_kwh = scenario.battery.capacity_kwh
+        config.battery.power_kw = scenario.battery.power_kw
+        config.data_sources.prices_file = scenario.price.file
+        config.data_sources.consumption_file = scenario.profile.consumption_file
+        if scenario.profile.production_file is not None:
+            config.data_sources.production_file = scenario.profile.production_file
+
+        period = config.simulation_period
+        years = pd.DateOffset(years=year - period.get_start_datetime().year)
+        period.start_date = (period.get_start_datetime() + years).date().isoformat()
+        period.end_date = (period.get_end_datetime() + years).date().isoformat()
+        return config
+
+    def run(self) -> pd.DataFrame:
+        """
+        Run all scenarios.
+
+        Returns:
+            Comparison table, one row per scenario in matrix order: scenario
+            columns, the mode's economic metrics, grid cost under the tariff,
+            savings_nok (grid cost saved against the same price and profile
+            without battery, if the matrix has a 0 kWh battery),
+            execution_time_s and error
+        """
+        apply_verbosity(self.config.verbosity)
+        scenarios = self.matrix.scenarios
+        logger.info("Scenario matrix: %d prices × %d profiles × %d batteries = %d scenarios (%s mode)",
+                    len(self.matrix.prices), len(self.matrix.profiles), len(self.matrix.batteries),
+                    len(scenarios), self.config.mode)
+
+        with tempfile.TemporaryDirectory(prefix='scenarios_') as stage_dir:
+            tasks = self._stage(Path(stage_dir), scenarios)
+            outcomes = self._execute(tasks)
+
+        failed = [o for o in outcomes if not o.success]
+        for outcome in failed:
+            logger.warning("Scenario '%s' failed - %s", outcome.scenario.name, outcome.error)
+        logger.info("Scenario matrix complete: %d/%d scenarios succeeded",
+                    len(outcomes) - len(failed), len(outcomes))
+
+        order = {scenario: i for i, scenario in enumerate(scenarios)}
+        comparison = self.comparison_table(sorted(outcomes, key=lambda o: order[o.scenario]))
+        if self.matrix.output_file:
+            output_file = Path(self.matrix.output_file)
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+            comparison.to_csv(output_file, index=False)
+            logger.info("  Comparison table saved to %s", output_file)
+        return comparison
+
+    @staticmethod
+    def comparison_table(outcomes: List[ScenarioResult]) -> pd.DataFrame:
+        """One row per scenario; savings_nok is grid_cost_nok saved against the 0 kWh battery of the same price and profile."""
+        rows = []
+        for outcome in outcomes:
+            scenario = outcome.scenario
+            rows.append({
+                'price': scenario.price.name,
+                'profile': scenario.profile.name,
+                'battery_kwh': scenario.battery.capacity_kwh,
+                'battery_kw': scenario.battery.power_kw,
+                **outcome.economic_metrics,
+                'execution_time_s': outcome.execution_time_s,
+                'error': outcome.error,
+            })
+        table = pd.DataFrame(rows)
+        if 'grid_cost_nok' not in table:
+            return table
+
+        reference = table[table['battery_kwh'] == 0].drop_duplicates(['price', 'profile'])
+        if len(reference):
+            reference_cost = table[['price', 'profile']].merge(
+                reference[['price', 'profile', 'grid_cost_nok']], on=['price', 'profile'], how='left'
+            )['grid_cost_nok'].to_numpy()
+            table.insert(table.columns.get_loc('grid_cost_nok') + 1, 'savings_nok',
+                         reference_cost - table['grid_cost_nok'].to_numpy())
+        return table
+
+    def _stage(self, stage_dir: Path, scenarios: List[Scenario]) -> List[_ScenarioTask]:
+        """Write each price scenario and each profile aligned to it as .npy files; return tasks."""
+        price_files: Dict[str, Tuple[pd.DatetimeIndex, np.ndarray]] = {}
+        years = []
+        resolutions = []
+        for i, price in enumerate(self.matrix.prices):
+            if price.file not in price_files:
+                price_files[price.file] = load_price_data(price.file)
+            timestamps, prices = price_files[price.file]
+            np.save(stage_dir / f'timestamps_{i}.npy', timestamps.values.astype('datetime64[ns]'))
+            np.save(stage_dir / f'prices_{i}.npy', price.apply(timestamps, prices))
+            years.append(timestamps[0].year)
+            resolutions.append(detect_resolution(timestamps))
+        logger.info("  Loaded %d price files for %d price scenarios", len(price_files), len(self.matrix.prices))
+
+        profile_files: Dict[Tuple[str, str], Tuple[pd.DatetimeIndex, np.ndarray]] = {}
+        for j, profile in enumerate(self.matrix.profiles):
+            production_file = profile.production_file or self.config.data_sources.production_file
+            for kind, file, loader in (('production', production_file, load_production_data),
+                                       ('consumption', profile.consumption_file, load_consumption_data)):
+                if (kind, file) not in profile_files:
+                    profile_files[(kind, file)] = loader(file)
+
+            for i, price in enumerate(self.matrix.prices):
+                target = price_files[price.file][0]
+                series = np.vstack([
+                    _shift_to_year(*profile_files[(kind, file)], years[i]).reindex(target).to_numpy()
+                    for kind, file in (('production', production_file), ('consumption', profile.consumption_file))
+                ])
+                np.save(stage_dir / f'profile_{i}_{j}.npy', series)
+        logger.info("  Loaded %d profile files, aligned to %d price years",
+                    len(profile_files), len(set(years)))
+
+        price_index = {price: i for i, price in enumerate(self.matrix.prices)}
+        profile_index = {profile: j for j, profile in enumerate(self.matrix.profiles)}
+        return [
+            _ScenarioTask(
+                scenario=scenario,
+                config=self.scenario_config(scenario, years[price_index[scenario.price]]),
+                stage_dir=str(stage_dir),
+                price_index=price_index[scenario.price],
+                profile_index=profile_index[scenario.profile],
+                resolution=resolutions[price_index[scenario.price]],
+            )
+            for scenario in scenarios
+        ]
+
+    def _execute(self, tasks: List[_ScenarioTask]) -> List[ScenarioResult]:
+        """Run tasks in a process pool (or in this process), reporting progress per scenario."""
+        progress = ProgressReporter(len(tasks), "Running scenarios", self.progress_callback,
+                                    self.config.progress_interval_percent)
+        outcomes = []
+        if self.matrix.workers == 1 or len(tasks) < 2:
+            for task in tasks:
+                outcomes.append(_run_scenario(task))
+                progress.advance()
+        else:
+            with ProcessPoolExecutor(max_workers=self.matrix.workers) as pool:
+                futures = [pool.submit(_run_scenario, task) for task in tasks]
+                for future in as_completed(futures):
+                    outcomes.append(future.result())
+                    progress.advance()
+        progress.close()
+        return outcomes
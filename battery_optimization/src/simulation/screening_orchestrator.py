@@ -0,0 +1,388 @@
+"""
+Screening Orchestrator for fast battery sizing.
+
+Sweeps the dimensioning grid on a compressed year (k-means representative
+days or weeks, weighted, with SOC linking), reports the compression error
+against the full year on a few anchor sizes and re-runs only the best
+candidates at full resolution.
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+import numpy as np
+
+from src.config.simulation_config import SimulationConfig, DimensioningConfig
+from src.config.legacy_config_adapter import create_legacy_config
+from src.config.verbosity import apply_verbosity
+from src.data.data_manager import DataManager, TimeSeriesData
+from src.simulation.progress import ProgressCallback, ProgressReporter
+from src.simulation.simulation_results import SimulationResults
+
+logger = logging.getLogger(__name__)
+
+
+class ScreeningOrchestrator:
+    """
+    Orchestrator for representative-period screening of battery sizes.
+
+    Cost model: every candidate is solved once on the compressed year
+    (clustering is shared across candidates). Full-year monthly LP runs are
+    limited to the no-battery reference, the anchor sizes and the top-N
+    screened candidates, so 100+ sizes cost roughly as much as a handful of
+    full-year runs.
+    """
+
+    def __init__(self, config: SimulationConfig, progress_callback: Optional[ProgressCallback] = None):
+        """
+        Initialize screening orchestrator.
+
+        Args:
+            config: Simulation configuration (mode='screening')
+            progress_callback: Called every config.progress_interval_percent of
+                each sweep (default: log a progress line)
+        """
+        self.config = config
+        self.progress_callback = progress_callback
+        self.data_manager = DataManager(config)
+        self._full_year_cache: Dict[Tuple[float, float], Dict] = {}
+
+    def run(self) -> SimulationResults:
+        """
+        Execute screening sweep and full-resolution verification.
+
+        Returns:
+            SimulationResults for the best verified candidate, with the full
+            candidate table in `candidates`
+
+        Raises:
+            RuntimeError: If no candidate could be screened
+        """
+        screening = self.config.screening
+
+        apply_verbosity(self.config.verbosity)
+        logger.info("Screening (representative %s)", screening.period_type)
+
+        # Load data
+        data = self.data_manager.load_data()
+        logger.info("  Loaded %d timesteps: %s to %s (%s)",
+                    len(data), data.timestamps[0], data.timestamps[-1], data.resolution)
+
+        # Representative periods are built from hourly data
+        hourly = data.resample_to('PT60M')
+
+        candidates = self._candidate_sizes()
+        logger.info("  Candidates: %d battery sizes", len(candidates))
+
+        # Cluster once, reuse for every candidate
+        logger.info("  Selecting %d representative %s", screening.n_periods, screening.period_type)
+        compressor = self._create_compressor()
+        selection = self._select_periods(compressor, hourly)
+
+        reference = self._screen_size(compressor, hourly, 0.0, 0.0, selection)
+        if reference['status'] != 'optimal':
+            raise RuntimeError("Screening reference (no battery) failed")
+        reference_cost = reference['annual_total_cost']
+
+        rows = []
+        progress = ProgressReporter(len(candidates), "Screening sizes", self.progress_callback,
+                                    self.config.progress_interval_percent)
+        for battery_kwh, battery_kw in candidates:
+            screened = self._screen_size(compressor, hourly, battery_kwh, battery_kw, selection)
+            progress.advance()
+            if screened['status'] != 'optimal':
+                logger.warning("Screening failed for %.0f kWh / %.0f kW", battery_kwh, battery_kw)
+                continue
+
+            savings = reference_cost - screened['annual_total_cost']
+            rows.append({
+                'battery_kwh': battery_kwh,
+                'battery_kw': battery_kw,
+                'screened_annual_cost_nok': screened['annual_total_cost'],
+                'screened_annual_savings_nok': savings,
+                'screened_npv_nok': self._calculate_npv(savings, battery_kwh, battery_kw),
+            })
+        progress.close()
+
+        if not rows:
+            raise RuntimeError("No battery size could be screened")
+
+        candidates_df = pd.DataFrame(rows)
+
+        # Full-year verification: reference, anchors and top-N
+        logger.info("  Running full-year reference (no battery)")
+        full_reference_cost = self._run_full_year(data, 0.0, 0.0)['total_cost_nok']
+
+        anchors = self._select_anchor_sizes(candidates_df)
+        top = candidates_df.nlargest(screening.top_n, 'screened_npv_nok')
+        verify = list(dict.fromkeys(anchors + list(zip(top['battery_kwh'], top['battery_kw']))))
+
+        logger.info("  Verifying %d sizes at full resolution (%d anchors, top %d)",
+                    len(verify), len(anchors), len(top))
+        progress = ProgressReporter(len(verify), "Full-year runs", self.progress_callback,
+                                    self.config.progress_interval_percent)
+        for battery_kwh, battery_kw in verify:
+            self._run_full_year(data, battery_kwh, battery_kw)
+            progress.advance()
+        progress.close()
+
+        full_savings = []
+        for _, row in candidates_df.iterrows():
+            full = self._full_year_cache.get((row['battery_kwh'], row['battery_kw']))
+            full_savings.append(
+                full_reference_cost - full['total_cost_nok'] if full is not None else np.nan
+            )
+
+        candidates_df['full_annual_savings_nok'] = full_savings
+        candidates_df['full_npv_nok'] = [
+            self._calculate_npv(s, kwh, kw) if not np.isnan(s) else np.nan
+            for s, kwh, kw in zip(full_savings, candidates_df['battery_kwh'], candidates_df['battery_kw'])
+        ]
+        candidates_df['compression_error_pct'] = np.where(
+            candidates_df['full_annual_savings_nok'].abs() > 1e-9,
+            (candidates_df['screened_annual_savings_nok'] - candidates_df['full_annual_savings_nok'])
+            / candidates_df['full_annual_savings_nok'].abs() * 100,
+            np.nan
+        )
+        candidates_df['is_anchor'] = [
+            (kwh, kw) in anchors
+            for kwh, kw in zip(candidates_df['battery_kwh'], candidates_df['battery_kw'])
+        ]
+
+        # Best verified candidate
+        best = candidates_df.loc[candidates_df['full_npv_nok'].idxmax()]
+        best_full = self._full_year_cache[(best['battery_kwh'], best['battery_kw'])]
+
+        anchor_errors = candidates_df.loc[candidates_df['is_anchor'], 'compression_error_pct']
+
+        logger.info("Screening complete: %d candidates screened, %d full-year runs",
+                    len(candidates_df), len(self._full_year_cache))
+        if anchor_errors.notna().any():
+            logger.info("  Anchor compression error: %.1f%% (mean abs)", anchor_errors.abs().mean())
+        logger.info("  Best size: %.0f kWh / %.0f kW (NPV %.0f NOK)",
+                    best['battery_kwh'], best['battery_kw'], best['full_npv_nok'])
+
+        economic_metrics = {
+            'best_battery_kwh': float(best['battery_kwh']),
+            'best_battery_kw': float(best['battery_kw']),
+            'best_annual_savings_nok': float(best['full_annual_savings_nok']),
+            'best_npv_nok': float(best['full_npv_nok']),
+            'reference_annual_cost_nok': float(full_reference_cost),
+            'total_cost_nok': float(best_full['total_cost_nok']),
+            'anchor_compression_error_pct': float(anchor_errors.abs().mean()) if anchor_errors.notna().any() else float('nan'),
+        }
+
+        results = SimulationResults(
+            mode='screening',
+            start_date=data.timestamps[0].to_pydatetime(),
+            end_date=data.timestamps[-1].to_pydatetime(),
+            trajectory=best_full['trajectory'],
+            monthly_summary=best_full['monthly_summary'],
+            economic_metrics=economic_metrics,
+            battery_final_state=None,
+            metadata={
+                'period_type': screening.period_type,
+                'n_periods': screening.n_periods,
+                'aggregation_hours': screening.aggregation_hours,
+                'n_candidates': len(candidates_df),
+                'n_full_year_runs': len(self._full_year_cache),
+                'battery_capacity_kwh': float(best['battery_kwh']),
+                'battery_power_kw': float(best['battery_kw']),
+                'resolution': data.resolution,
+            },
+            candidates=candidates_df,
+        )
+
+        return results
+
+    def _candidate_sizes(self) -> List[Tuple[float, float]]:
+        """
+        Build (kWh, kW) candidate grid from dimensioning ranges.
+
+        Returns:
+            List of (battery_kwh, battery_kw) within the C-rate limit
+        """
+        dimensioning = self.config.dimensioning or DimensioningConfig()
+
+        energies = np.arange(*dimensioning.energy_range_kwh)
+        powers = np.arange(*dimensioning.power_range_kw)
+
+        return [
+            (float(e), float(p))
+            for e in energies
+            for p in powers
+            if p / e <= dimensioning.slsqp_c_rate_max
+        ]
+
+    def _create_compressor(self):
+        """Create representative-period optimizer from screening config."""
+        # Imported lazily: core module pulls in sklearn
+        from core.representative_periods import (
+            RepresentativeDaysOptimizer,
+            RepresentativeWeeksOptimizer,
+        )
+
+        screening = self.config.screening
+        legacy_config = create_legacy_config(self.config)
+        if screening.period_type == "weeks":
+            return RepresentativeWeeksOptimizer(
+                n_representative_weeks=screening.n_periods,
+                aggregation_hours=screening.aggregation_hours,
+                linking_type='hard',
+                config=legacy_config,
+            )
+        return RepresentativeDaysOptimizer(
+            n_representative_days=screening.n_periods,
+            aggregation_hours=screening.aggregation_hours,
+            linking_type='hard',
+            config=legacy_config,
+        )
+
+    def _select_periods(self, compressor, hourly: TimeSeriesData) -> Tuple:
+        """Run clustering once for all candidates."""
+        args = (
+            hourly.timestamps,
+            hourly.pv_production_kw,
+            hourly.consumption_kw,
+            hourly.prices_nok_per_kwh,
+        )
+        if self.config.screening.period_type == "weeks":
+            return compressor.select_representative_weeks(*args)
+        return compressor.select_representative_days(*args)
+
+    def _screen_size(
+        self,
+        compressor,
+        hourly: TimeSeriesData,
+        battery_kwh: float,
+        battery_kw: float,
+        selection: Tuple
+    ) -> Dict:
+        """Solve one battery size on the compressed year."""
+        return compressor.optimize(
+            hourly.timestamps,
+            hourly.pv_production_kw,
+            hourly.consumption_kw,
+            hourly.prices_nok_per_kwh,
+            battery_kwh=battery_kwh,
+            battery_kw=battery_kw,
+            selection=selection,
+        )
+
+    def _select_anchor_sizes(self, candidates: pd.DataFrame) -> List[Tuple[float, float]]:
+        """
+        Pick anchor sizes spread evenly over the candidate grid.
+
+        Args:
+            candidates: Screened candidate table
+
+        Returns:
+            List of (battery_kwh, battery_kw) anchors
+        """
+        n_anchors = min(self.config.screening.n_anchor_sizes, len(candidates))
+        if n_anchors == 0:
+            return []
+
+        ordered = candidates.sort_values(['battery_kwh', 'battery_kw']).reset_index(drop=True)
+        positions = np.unique(np.linspace(0, len(ordered) - 1, n_anchors).round().astype(int))
+
+        return [(ordered.loc[i, 'battery_kwh'], ordered.loc[i, 'battery_kw']) for i in positions]
+
+    def _run_full_year(self, data: TimeSeriesData, battery_kwh: float, battery_kw: float) -> Dict:
+        """
+        Monthly LP over every month in the data at full resolution (cached).
+
+        Args:
+            data: Full-resolution time series
+            battery_kwh: Battery capacity (0 for reference)
+            battery_kw: Battery power (0 for reference)
+
+        Returns:
+            Dict with total_cost_nok, trajectory and monthly_summary
+        """
+        key = (battery_kwh, battery_kw)
+        if key in self._full_year_cache:
+            return self._full_year_cache[key]
+
+        from core.lp_monthly_optimizer import MonthlyLPOptimizer
+
+        optimizer = MonthlyLPOptimizer(
+            create_legacy_config(self.config),
+            resolution=data.resolution,
+            battery_kwh=battery_kwh,
+            battery_kw=battery_kw,
+        )
+        timestep_hours = 1.0 if data.resolution == 'PT60M' else 0.25
+        initial_soc_kwh = battery_kwh * (self.config.battery.initial_soc_percent / 100.0)
+
+        trajectories = []
+        monthly_summaries = []
+        year_months = sorted(set(zip(data.timestamps.year, data.timestamps.month)))
+
+        for year, month in year_months:
+            month_data = data.get_month(year, month)
+            result = optimizer.optimize_month(
+                month_idx=month,
+                pv_production=month_data.pv_production_kw,
+                load_consumption=month_data.consumption_kw,
+                spot_prices=month_data.prices_nok_per_kwh,
+                timestamps=month_data.timestamps,
+                E_initial=initial_soc_kwh,
+            )
+            if not result.success:
+                raise RuntimeError(
+                    f"Full-year run failed for {battery_kwh} kWh / {battery_kw} kW "
+                    f"in {year}-{month:02d}: {result.message}"
+                )
+
+            trajectories.append(pd.DataFrame({
+                'timestamp': month_data.timestamps,
+                'P_charge_kw': result.P_charge,
+                'P_discharge_kw': result.P_discharge,
+                'P_grid_import_kw': result.P_grid_import,
+                'P_grid_export_kw': result.P_grid_export,
+                'E_battery_kwh': result.E_battery,
+                'P_curtail_kw': result.P_curtail,
+            }).set_index('timestamp'))
+
+            monthly_summaries.append({
+                'year': year,
+                'month': month,
+                'total_charged_kwh': float(result.P_charge.sum() * timestep_hours),
+                'total_discharged_kwh': float(result.P_discharge.sum() * timestep_hours),
+                'total_import_kwh': float(result.P_grid_import.sum() * timestep_hours),
+                'total_export_kwh': float(result.P_grid_export.sum() * timestep_hours),
+                'energy_cost_nok': float(result.energy_cost),
+                'power_cost_nok': float(result.power_cost),
+                'degradation_cost_nok': float(result.degradation_cost),
+                'total_cost_nok': float(result.energy_cost + result.power_cost + result.degradation_cost),
+            })
+
+        monthly_summary = pd.DataFrame(monthly_summaries)
+        full = {
+            'total_cost_nok': float(monthly_summary['total_cost_nok'].sum()),
+            'trajectory': pd.concat(trajectories, axis=0),
+            'monthly_summary': monthly_summary,
+        }
+        self._full_year_cache[key] = full
+
+        return full
+
+    def _calculate_npv(self, annual_savings: float, battery_kwh: float, battery_kw: float) -> float:
+        """
+        Net present value of a battery size.
+
+        Args:
+            annual_savings: Annual cost reduction vs no battery [NOK/year]
+            battery_kwh: Battery capacity [kWh]
+            battery_kw: Battery power [kW]
+
+        Returns:
+            NPV [NOK] over the configured project lifetime
+        """
+        economic = self.config.economic
+        years = np.arange(1, economic.project_years + 1)
+        annuity_factor = float(np.sum(1.0 / (1.0 + economic.discount_rate) ** years))
+        investment = self.config.battery_economics.get_total_battery_cost(battery_kwh, battery_kw)
+
+        return annual_savings * annuity_factor - investment
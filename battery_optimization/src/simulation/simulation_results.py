@@ -5,6 +5,7 @@ Provides unified result structure for all simulation modes.
 Supports comprehensive metadata tracking and multiple persistence formats.
 """
 
+import logging
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional, Dict, Any, TYPE_CHECKING
@@ -21,6 +22,8 @@ if TYPE_CHECKING:
     from src.infrastructure.pricing import PriceData
     from src.infrastructure.weather import SolarProductionData
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class SimulationResults:
@@ -30,7 +33,7 @@ class SimulationResults:
     Contains full trajectory data, aggregated metrics, and economic analysis.
     """
     # Metadata
-    mode: str  # 'rolling_horizon', 'monthly', or 'yearly'
+    mode: str  # 'rolling_horizon', 'monthly', 'yearly' or 'screening'
     start_date: datetime
     end_date: datetime
 
@@ -49,6 +52,9 @@ class SimulationResults:
     # Metadata about simulation
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+    # Candidate table (screening mode only)
+    candidates: Optional[pd.DataFrame] = None
+
     def __post_init__(self):
         """Validate and compute derived metrics."""
         if self.trajectory.empty:
@@ -103,6 +109,11 @@ class SimulationResults:
         metadata_path = output_dir / 'metadata.csv'
         pd.DataFrame([self.metadata]).to_csv(metadata_path, index=False)
 
+        # Save screening candidates
+        if self.candidates is not None:
+            candidates_path = output_dir / 'screening_candidates.csv'
+            self.candidates.to_csv(candidates_path, index=False)
+
     def to_plots(self, output_dir: Path) -> None:
         """
         Generate and save visualization plots.
@@ -116,7 +127,7 @@ class SimulationResults:
         try:
             import matplotlib.pyplot as plt
         except ImportError:
-            print("Warning: matplotlib not available, skipping plots")
+            logger.warning("matplotlib not available, skipping plots")
             return
 
         # Plot 1: Battery SOC over time
@@ -339,4 +350,4 @@ class SimulationResults:
         with open(report_path, 'w') as f:
             f.write(self.to_report())
 
-        print(f"Results saved to: {output_dir.absolute()}")
+        logger.info("Results saved to: %s", output_dir.absolute())
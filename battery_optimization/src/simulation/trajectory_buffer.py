@@ -0,0 +1,64 @@
+"""
+Preallocated trajectory buffer for step-by-step simulations.
+
+Executed steps are written as records of one structured NumPy array (a
+timestamp plus one float64 field per column), allocated once for the whole
+run. This keeps 8760-35k step runs free of per-step allocations and stores
+each step contiguously; the DataFrame is built once at the end.
+
+**Usage:**
+    buffer = TrajectoryBuffer(len(timestamps), ['P_charge_kw', 'E_battery_kwh'])
+    for i in range(len(timestamps)):
+        buffer.append(timestamps.values[i], p_charge, energy)
+    trajectory = buffer.to_dataframe()
+"""
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+
+class TrajectoryBuffer:
+    """Fixed-capacity record buffer, one record per executed step."""
+
+    def __init__(self, capacity: int, columns: Sequence[str], index_name: str = 'timestamp'):
+        """
+        Initialize buffer.
+
+        Args:
+            capacity: Maximum number of steps
+            columns: Float columns, in the order append() takes the values
+            index_name: Name of the timestamp field (the DataFrame index)
+        """
+        self.index_name = index_name
+        self.columns = list(columns)
+        self.dtype = np.dtype([(index_name, 'datetime64[ns]')] + [(name, 'f8') for name in self.columns])
+        self.records = np.zeros(capacity, dtype=self.dtype)
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Number of steps written."""
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self.records)
+
+    def append(self, timestamp: np.datetime64, *values: float) -> None:
+        """
+        Write the next step.
+
+        Args:
+            timestamp: Step start (np.datetime64, e.g. an element of DatetimeIndex.values)
+            *values: One value per column, in column order
+
+        Raises:
+            IndexError: If the buffer is full
+        """
+        self.records[self._size] = (timestamp, *values)
+        self._size += 1
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Written steps as a DataFrame indexed by timestamp."""
+        return pd.DataFrame(self.records[:self._size]).set_index(self.index_name)
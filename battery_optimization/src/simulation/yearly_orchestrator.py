@@ -4,19 +4,24 @@ Yearly Orchestrator for annual investment analysis.
 Runs 52 weekly optimizations with persistent state for profitability analysis.
 """
 
+import logging
 from datetime import datetime
 from typing import Optional
 import pandas as pd
 import numpy as np
-from tqdm import tqdm
 
+from core.solve_profile import SolveProfile
 from src.config.simulation_config import SimulationConfig
+from src.config.verbosity import apply_verbosity
 from src.data.data_manager import DataManager, TimeSeriesData
 from src.optimization.base_optimizer import BaseOptimizer
 from src.optimization.optimizer_factory import OptimizerFactory
 from src.operational.state_manager import BatterySystemState
+from src.simulation.progress import ProgressCallback, ProgressReporter
 from src.simulation.simulation_results import SimulationResults
 
+logger = logging.getLogger(__name__)
+
 
 class YearlyOrchestrator:
     """
@@ -26,14 +31,17 @@ class YearlyOrchestrator:
     annual investment analysis.
     """
 
-    def __init__(self, config: SimulationConfig):
+    def __init__(self, config: SimulationConfig, progress_callback: Optional[ProgressCallback] = None):
         """
         Initialize yearly orchestrator.
 
         Args:
             config: Simulation configuration
+            progress_callback: Called every config.progress_interval_percent of the
+                run (default: log a progress line)
         """
         self.config = config
+        self.progress_callback = progress_callback
         self.data_manager = DataManager(config)
         self.optimizer: Optional[BaseOptimizer] = None
         self.battery_state: Optional[BatterySystemState] = None
@@ -48,39 +56,36 @@ class YearlyOrchestrator:
         Raises:
             RuntimeError: If simulation fails
         """
-        print(f"\n{'='*70}")
-        print(f"Yearly Simulation (52 Weekly Optimizations)")
-        print(f"{'='*70}")
+        apply_verbosity(self.config.verbosity)
+        logger.info("Yearly simulation (%d weekly optimizations)", self.config.yearly.weeks)
 
         # Load data
-        print("Loading data...")
         data = self.data_manager.load_data()
-        print(f"  Loaded {len(data)} timesteps")
-        print(f"  Period: {data.timestamps[0]} to {data.timestamps[-1]}")
-        print(f"  Resolution: {data.resolution}")
+        logger.info("  Loaded %d timesteps: %s to %s (%s)",
+                    len(data), data.timestamps[0], data.timestamps[-1], data.resolution)
 
         # Create optimizer
-        print("\nCreating optimizer...")
         self.optimizer = OptimizerFactory.create_from_config(self.config)
 
         # Initialize battery state
-        print("\nInitializing battery state...")
         initial_soc_kwh = self.config.battery.capacity_kwh * (self.config.battery.initial_soc_percent / 100.0)
         self.battery_state = BatterySystemState(
             current_soc_kwh=initial_soc_kwh,
             battery_capacity_kwh=self.config.battery.capacity_kwh,
         )
-        print(f"  Initial SOC: {self.battery_state.current_soc_percent:.1f}%")
+        logger.info("  Initial SOC: %.1f%%", self.battery_state.current_soc_percent)
 
         # Get year from data
         year = data.timestamps[0].year
 
         # Run weekly optimizations
-        print(f"\nRunning {self.config.yearly.weeks} weekly optimizations...")
         all_trajectories = []
+        solve_profile = SolveProfile()
         weekly_summaries = []
 
-        for week in tqdm(range(1, self.config.yearly.weeks + 1), desc="Optimizing weeks"):
+        progress = ProgressReporter(self.config.yearly.weeks, "Optimizing weeks", self.progress_callback,
+                                    self.config.progress_interval_percent)
+        for week in range(1, self.config.yearly.weeks + 1):
             try:
                 # Extract week data
                 week_data = data.get_week(year, week)
@@ -93,6 +98,7 @@ class YearlyOrchestrator:
                     spot_prices=week_data.prices_nok_per_kwh,
                     battery_state=self.battery_state,
                 )
+                solve_profile.add(result.timings)
 
                 # Update battery state with final SOC from this week
                 if result.E_battery_final is not None:
@@ -122,11 +128,14 @@ class YearlyOrchestrator:
                 weekly_summaries.append(week_summary)
 
             except ValueError as e:
-                print(f"  Warning: Skipping week {week} - {e}")
+                logger.warning("Skipping week %d - %s", week, e)
                 continue
             except Exception as e:
-                print(f"  Error in week {week}: {e}")
                 raise RuntimeError(f"Weekly optimization failed for week {week}: {e}")
+            finally:
+                progress.advance()
+
+        progress.close()
 
         # Combine all trajectories
         trajectory_df = pd.concat(all_trajectories, axis=0)
@@ -140,10 +149,9 @@ class YearlyOrchestrator:
         # Calculate overall economic metrics
         economic_metrics = self._calculate_economic_metrics(weekly_summary_df, monthly_summary_df)
 
-        print(f"\nYearly simulation complete!")
-        print(f"  Total weeks: {len(weekly_summaries)}")
-        print(f"  Final SOC: {self.battery_state.current_soc_percent:.1f}%")
-        print(f"  Annual cost: {economic_metrics['total_cost_nok']:,.0f} NOK")
+        logger.info("Yearly simulation complete: %d weeks, final SOC %.1f%%, annual cost %.0f NOK",
+                    len(weekly_summaries), self.battery_state.current_soc_percent,
+                    economic_metrics['total_cost_nok'])
 
         results = SimulationResults(
             mode='yearly',
@@ -155,6 +163,7 @@ class YearlyOrchestrator:
             battery_final_state=self.battery_state,
             metadata={
                 'weeks_optimized': self.config.yearly.weeks,
+                'solve_profile': solve_profile.summary(),
                 'horizon_hours': self.config.yearly.horizon_hours,
                 'battery_capacity_kwh': self.config.battery.capacity_kwh,
                 'battery_power_kw': self.config.battery.power_kw,
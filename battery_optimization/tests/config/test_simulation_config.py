@@ -16,6 +16,7 @@ from src.config.simulation_config import (
     RollingHorizonModeConfig,
     MonthlyModeConfig,
     YearlyModeConfig,
+    ScreeningModeConfig,
     SimulationPeriodConfig,
 )
 
@@ -126,6 +127,35 @@ class TestYearlyModeConfig:
         assert config.weeks == 53
 
 
+class TestScreeningModeConfig:
+    """Test screening mode configuration."""
+
+    def test_defaults(self):
+        """Test default screening mode settings."""
+        config = ScreeningModeConfig()
+        assert config.period_type == "days"
+        assert config.n_periods == 25
+        assert config.aggregation_hours == 1
+        assert config.top_n == 5
+
+    def test_validate_aggregation_must_divide_period(self, tmp_path):
+        """Test aggregation hours must divide the period length."""
+        for filename in ["prices.csv", "production.csv", "consumption.csv"]:
+            (tmp_path / filename).touch()
+
+        config = SimulationConfig(
+            mode="screening",
+            data_sources=DataSourceConfig(
+                prices_file=str(tmp_path / "prices.csv"),
+                production_file=str(tmp_path / "production.csv"),
+                consumption_file=str(tmp_path / "consumption.csv"),
+            ),
+            screening=ScreeningModeConfig(period_type="days", aggregation_hours=5),
+        )
+        with pytest.raises(ValueError, match="aggregation_hours"):
+            config.validate()
+
+
 class TestSimulationPeriodConfig:
     """Test simulation period configuration."""
 
@@ -179,6 +209,10 @@ class TestSimulationConfig:
         mode_config = config.get_mode_config()
         assert isinstance(mode_config, YearlyModeConfig)
 
+        config = SimulationConfig(mode="screening")
+        mode_config = config.get_mode_config()
+        assert isinstance(mode_config, ScreeningModeConfig)
+
     def test_validate_valid_config(self, tmp_path):
         """Test validation of valid configuration."""
         # Create dummy data files
@@ -424,6 +458,41 @@ output_dir: "results/yearly"
         assert config.yearly.horizon_hours == 168
         assert config.yearly.weeks == 52
 
+    def test_from_yaml_screening(self, temp_yaml_dir, sample_data_files):
+        """Test loading screening configuration from YAML."""
+        yaml_content = f"""
+mode: screening
+time_resolution: PT60M
+
+data_sources:
+  prices_file: "{sample_data_files['prices']}"
+  production_file: "{sample_data_files['production']}"
+  consumption_file: "{sample_data_files['consumption']}"
+
+mode_specific:
+  screening:
+    period_type: weeks
+    n_periods: 10
+    top_n: 3
+
+dimensioning:
+  energy_range_kwh: [20, 101, 40]
+  power_range_kw: [10, 51, 20]
+"""
+
+        yaml_path = temp_yaml_dir / "screening_config.yaml"
+        with open(yaml_path, 'w') as f:
+            f.write(yaml_content)
+
+        config = SimulationConfig.from_yaml(yaml_path)
+
+        assert config.mode == "screening"
+        assert config.screening.period_type == "weeks"
+        assert config.screening.n_periods == 10
+        assert config.screening.top_n == 3
+        assert config.screening.n_anchor_sizes == 3
+        assert config.dimensioning.energy_range_kwh == (20, 101, 40)
+
     def test_from_yaml_missing_file(self):
         """Test loading from non-existent YAML file."""
         with pytest.raises(FileNotFoundError):
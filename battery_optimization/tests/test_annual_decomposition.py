@@ -0,0 +1,160 @@
+"""
+Tests for the annual LP by monthly decomposition.
+
+Tests validate:
+- Month SOC marginals are the derivatives of the month cost
+- Bounds bracket the optimum and meet the optimality gap
+- The result is at least as good as a grid search over the boundary energy
+- Sequential and threaded month solves agree
+- Annual mode runs through config and orchestrator
+"""
+
+import numpy as np
+import pytest
+import yaml
+
+from core.annual_decomposition import MonthWindow, solve_annual
+from src.config.simulation_config import SimulationConfig
+from src.data.data_manager import DataManager
+from src.optimization.optimizer_factory import OptimizerFactory
+from src.simulation import AnnualOrchestrator
+
+
+def _config(tariff_mode='progressive'):
+    config = SimulationConfig.from_yaml('configs/working_config.yaml')
+    config.mode = 'annual'
+    config.simulation_period.start_date = '2024-04-01'
+    config.simulation_period.end_date = '2024-06-30'
+    config.tariff_mode = tariff_mode
+    return config
+
+
+def _setup(tariff_mode='progressive'):
+    config = _config(tariff_mode)
+    data = DataManager(config).load_data()
+    months = []
+    for month in (4, 5, 6):
+        month_data = data.get_month(2024, month)
+        months.append(MonthWindow(month, month_data.timestamps, month_data.pv_production_kw,
+                                  month_data.consumption_kw, month_data.prices_nok_per_kwh))
+    optimizer = OptimizerFactory.create('monthly', config)._core_optimizer
+    return optimizer, months
+
+
+@pytest.fixture(scope='module')
+def setup():
+    return _setup()
+
+
+def _solve_month(optimizer, window, E_initial, E_final=None):
+    return optimizer.optimize_month(window.month, window.pv_production, window.load_consumption,
+                                    window.spot_prices, window.timestamps,
+                                    E_initial=E_initial, E_final=E_final)
+
+
+class TestSocMarginals:
+    """Duals of the boundary energy constraints"""
+
+    def test_finite_differences(self, setup):
+        optimizer, months = setup
+        window = months[1]
+        delta = 0.5
+
+        base = _solve_month(optimizer, window, 30.0, 50.0)
+        g_in, g_out = base.soc_marginals
+        cost_in = _solve_month(optimizer, window, 30.0 + delta, 50.0).objective_value
+        cost_out = _solve_month(optimizer, window, 30.0, 50.0 + delta).objective_value
+
+        assert (cost_in - base.objective_value) / delta == pytest.approx(g_in, abs=1e-3)
+        assert (cost_out - base.objective_value) / delta == pytest.approx(g_out, abs=1e-3)
+
+    def test_free_final_energy(self, setup):
+        optimizer, months = setup
+
+        assert _solve_month(optimizer, months[0], 40.0).soc_marginals[1] == 0.0
+
+
+class TestSolveAnnual:
+    """Benders over the month boundaries"""
+
+    def test_bounds_and_gap(self, setup):
+        optimizer, months = setup
+
+        result = solve_annual(optimizer, months, E_initial=40.0, optimality_gap=1e-4)
+
+        assert result.converged
+        assert result.lower_bound <= result.upper_bound + 1e-6
+        assert result.gap <= 1e-4
+        assert sum(m.objective_value for m in result.months) == pytest.approx(result.upper_bound)
+        assert result.boundary_energy_kwh[0] == 40.0
+        for m, month in enumerate(result.months):
+            assert month.E_battery_final == pytest.approx(result.boundary_energy_kwh[m + 1], abs=1e-6)
+
+    def test_beats_grid_search(self, setup):
+        optimizer, months = setup
+        result = solve_annual(optimizer, months[:2], E_initial=40.0, optimality_gap=1e-5)
+
+        grid = min(
+            _solve_month(optimizer, months[0], 40.0, s).objective_value
+            + _solve_month(optimizer, months[1], s).objective_value
+            for s in np.linspace(8.0, 72.0, 9)
+        )
+
+        assert result.upper_bound <= grid + 1e-6
+        assert result.lower_bound <= grid + 1e-6
+
+    def test_fixed_final_energy(self, setup):
+        optimizer, months = setup
+
+        result = solve_annual(optimizer, months, E_initial=40.0, E_final=40.0)
+
+        assert result.months[-1].E_battery_final == pytest.approx(40.0, abs=1e-6)
+
+    def test_sequential_matches_threaded(self, setup):
+        optimizer, months = setup
+
+        sequential = solve_annual(optimizer, months, E_initial=40.0, max_workers=1)
+        threaded = solve_annual(optimizer, months, E_initial=40.0, max_workers=3)
+
+        assert threaded.upper_bound == pytest.approx(sequential.upper_bound)
+        assert threaded.iterations == sequential.iterations
+
+    def test_exact_tariff_rejected(self):
+        optimizer, months = _setup('exact')
+
+        with pytest.raises(ValueError, match='progressive'):
+            solve_annual(optimizer, months, E_initial=40.0)
+
+
+class TestAnnualMode:
+    """Config and orchestrator"""
+
+    def test_orchestrator(self):
+        config = _config()
+        config.validate()
+
+        results = AnnualOrchestrator(config, progress_callback=lambda update: None).run()
+
+        assert results.mode == 'annual'
+        assert list(results.monthly_summary['month']) == [4, 5, 6]
+        metrics = results.economic_metrics
+        assert metrics['lower_bound_nok'] <= metrics['total_cost_nok'] + 1e-6
+        assert metrics['optimality_gap'] <= config.annual.optimality_gap
+        assert results.metadata['boundary_energy_kwh'][0] == 40.0
+
+    def test_yaml(self, tmp_path):
+        config = _config()
+        config.annual.optimality_gap = 1e-5
+        config.annual.workers = 2
+        config.to_yaml(tmp_path / 'config.yaml')
+
+        raw = yaml.safe_load((tmp_path / 'config.yaml').read_text())
+        (tmp_path / 'annual.yaml').write_text(yaml.safe_dump({'mode': 'annual', 'mode_specific': raw['mode_specific']}))
+
+        assert SimulationConfig.from_yaml(tmp_path / 'annual.yaml').get_mode_config() == config.annual
+
+    def test_exact_tariff_invalid(self):
+        config = _config('exact')
+
+        with pytest.raises(ValueError, match='progressive'):
+            config.validate()
@@ -0,0 +1,182 @@
+"""
+Tests for dual-value attribution from HiGHS marginals.
+
+Tests validate:
+- Rolling horizon and monthly LP optimizers return duals sliced per constraint block
+- DualValueAttributor consumes optimizer results without a PuLP re-solve
+- Vectorized arbitrage/self-consumption match the reference loop semantics
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config.legacy_config_adapter import get_global_legacy_config
+from src.operational.state_manager import BatterySystemState
+from src.optimization.dual_value_attribution import (
+    DualValueAttributor,
+    DualVariables,
+    ValueAttribution,
+)
+from core.rolling_horizon_optimizer import RollingHorizonOptimizer
+from core.lp_monthly_optimizer import MonthlyLPOptimizer
+
+
+DUAL_KEYS = set(DualVariables.__dataclass_fields__)
+
+
+def _daily_profiles(T):
+    """Hourly PV/load/price profiles with a clear evening price peak."""
+    hours = np.arange(T) % 24
+    pv = np.clip(40 * np.sin((hours - 6) / 12 * np.pi), 0, None)
+    load = 30 + 10 * ((hours >= 8) & (hours <= 18))
+    prices = 0.5 + 0.8 * ((hours >= 17) & (hours <= 20)) - 0.3 * (hours <= 5)
+    return pv, load.astype(float), prices
+
+
+def _random_duals(rng, T):
+    return DualVariables(**{key: rng.normal(size=T) for key in DUAL_KEYS})
+
+
+class TestOptimizerDuals:
+    """Duals are attached to optimizer results on request"""
+
+    def test_rolling_horizon_returns_duals(self):
+        optimizer = RollingHorizonOptimizer(
+            config=get_global_legacy_config(),
+            battery_kwh=80,
+            battery_kw=40,
+            horizon_hours=24,
+            resolution='PT60M'
+        )
+        pv, load, prices = _daily_profiles(24)
+        timestamps = pd.date_range('2024-06-03', periods=24, freq='h')
+        state = BatterySystemState(current_soc_kwh=40.0, battery_capacity_kwh=80)
+
+        result = optimizer.optimize_window(state, pv, load, prices, timestamps,
+                                           return_duals=True)
+
+        assert result.success
+        assert set(result.duals) == DUAL_KEYS
+        for values in result.duals.values():
+            assert len(values) == 24
+        # Serving 1 kWh more load never makes the optimum cheaper
+        assert np.all(result.duals['energy_balance'] >= -1e-9)
+
+    def test_rolling_horizon_duals_off_by_default(self):
+        optimizer = RollingHorizonOptimizer(
+            config=get_global_legacy_config(),
+            battery_kwh=80,
+            battery_kw=40,
+            horizon_hours=24,
+            resolution='PT60M'
+        )
+        pv, load, prices = _daily_profiles(24)
+        timestamps = pd.date_range('2024-06-03', periods=24, freq='h')
+        state = BatterySystemState(current_soc_kwh=40.0, battery_capacity_kwh=80)
+
+        result = optimizer.optimize_window(state, pv, load, prices, timestamps)
+
+        assert result.duals is None
+
+    def test_monthly_lp_returns_duals(self):
+        optimizer = MonthlyLPOptimizer(
+            config=get_global_legacy_config(),
+            resolution='PT60M',
+            battery_kwh=80,
+            battery_kw=40
+        )
+        T = 72
+        pv, load, prices = _daily_profiles(T)
+        timestamps = pd.date_range('2024-06-03', periods=T, freq='h')
+
+        result = optimizer.optimize_month(6, pv, load, prices, timestamps,
+                                          E_initial=40.0, return_duals=True)
+
+        assert result.success
+        assert set(result.duals) == DUAL_KEYS
+        assert len(result.duals['soc_dynamics']) == T
+
+    def test_attribute_from_result_needs_duals(self):
+        attributor = DualValueAttributor()
+
+        class _NoDuals:
+            duals = None
+
+        with pytest.raises(ValueError):
+            attributor.extract_duals_from_result(_NoDuals())
+
+    def test_attribute_from_result(self):
+        optimizer = RollingHorizonOptimizer(
+            config=get_global_legacy_config(),
+            battery_kwh=80,
+            battery_kw=40,
+            horizon_hours=48,
+            resolution='PT60M'
+        )
+        pv, load, prices = _daily_profiles(48)
+        timestamps = pd.date_range('2024-06-03', periods=48, freq='h')
+        state = BatterySystemState(current_soc_kwh=40.0, battery_capacity_kwh=80)
+        result = optimizer.optimize_window(state, pv, load, prices, timestamps,
+                                           return_duals=True)
+
+        values = DualValueAttributor().attribute_from_result(
+            result, prices, np.full(48, 0.3), pv, battery_capacity_kwh=80
+        )
+
+        assert isinstance(values, ValueAttribution)
+        assert np.isfinite(values.total_net_value)
+
+
+class TestVectorizedAttribution:
+    """Vectorized calculations match the original per-timestep loops"""
+
+    def test_arbitrage_matches_loop(self):
+        rng = np.random.default_rng(0)
+        T = 200
+        duals = _random_duals(rng, T)
+        charge = np.where(rng.random(T) > 0.5, rng.random(T) * 20, 0.0)
+        discharge = np.where(charge == 0, rng.random(T) * 20, 0.0)
+        prices = rng.random(T)
+        pv = rng.random(T) * 10
+
+        expected = 0.0
+        for t in range(T - 1):
+            price_spread = prices[t+1] - prices[t]
+            dual_spread = duals.soc_dynamics[t+1] - duals.soc_dynamics[t]
+            if np.sign(price_spread) == np.sign(dual_spread) and dual_spread != 0:
+                if charge[t] > 0:
+                    expected += max(charge[t] - pv[t], 0) * abs(dual_spread)
+                elif discharge[t] > 0:
+                    expected += discharge[t] * abs(dual_spread)
+
+        actual = DualValueAttributor().calculate_arbitrage_value(
+            duals, charge, discharge, prices, pv
+        )
+
+        assert actual == pytest.approx(expected)
+
+    def test_self_consumption_matches_loop(self):
+        rng = np.random.default_rng(1)
+        T = 200
+        duals = _random_duals(rng, T)
+        charge = np.where(rng.random(T) > 0.6, rng.random(T) * 20, 0.0)
+        discharge = np.where(charge == 0, rng.random(T) * 20, 0.0)
+        prices = rng.random(T)
+        tariff = np.full(T, 0.3)
+        pv = rng.random(T) * 10
+
+        expected = 0.0
+        for t in range(24, T):
+            if discharge[t] > 0:
+                pv_charge = sum(min(charge[t-i], pv[t-i]) for i in range(1, 25))
+                grid_charge = sum(max(0, charge[t-i] - pv[t-i]) for i in range(1, 25))
+                total = pv_charge + grid_charge
+                pv_fraction = pv_charge / total if total > 0 else 0
+                expected += discharge[t] * pv_fraction * (prices[t] + tariff[t])
+
+        actual = DualValueAttributor().calculate_self_consumption_value(
+            duals, discharge, prices, tariff, pv, charge
+        )
+
+        assert actual == pytest.approx(expected)
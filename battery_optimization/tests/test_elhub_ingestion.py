@@ -0,0 +1,107 @@
+"""
+Tests for streaming ingestion of raw Elhub meter exports (Måleverdier).
+
+Tests validate:
+- Readings are pivoted per meter into kW, in Oslo local time
+- The latest registration wins and other qualities are dropped
+- Chunk size does not change the result
+- Parsed exports are cached and reused while the source is unchanged
+- load_consumption_data accepts raw exports
+"""
+
+import pandas as pd
+import pytest
+
+from src.data import file_loaders
+from src.data.file_loaders import load_consumption_data, load_elhub_export
+
+HEADER = 'Fra;Til;Målenavn;Volum;Enhet;Kvalitet;Registreringstidspunkt'
+
+
+def _row(start, meter, volume, quality='Målt', registered='2024-01-03 01:00:00+01:00', minutes=60, unit='KWH'):
+    start = pd.Timestamp(start, tz='Europe/Oslo')
+    end = start + pd.Timedelta(minutes=minutes)
+    return f"{start.isoformat(sep=' ')};{end.isoformat(sep=' ')};{meter};{volume};{unit};{quality};{registered}"
+
+
+@pytest.fixture
+def export(tmp_path):
+    rows = [
+        _row('2024-01-01 00:00', 'KWH 60 Forbruk', 10.0),
+        _row('2024-01-01 01:00', 'KWH 60 Forbruk', 12.0),
+        _row('2024-01-01 02:00', 'KWH 60 Forbruk', 14.0),
+        _row('2024-01-01 00:00', 'KWH 60 Produksjon', 1.0),
+        _row('2024-01-01 01:00', 'KWH 60 Produksjon', 2000.0, unit='WH'),
+        # Corrected reading registered later replaces the first one
+        _row('2024-01-01 01:00', 'KWH 60 Forbruk', 13.0, registered='2024-01-05 01:00:00+01:00'),
+        # Estimated readings are dropped by default
+        _row('2024-01-01 03:00', 'KWH 60 Forbruk', 99.0, quality='Estimert'),
+    ]
+    path = tmp_path / 'Måleverdier.csv'
+    path.write_text('\n'.join([HEADER] + rows) + '\n', encoding='utf-8')
+    return path
+
+
+class TestElhubExport:
+    """Parsing, de-duplication and pivoting"""
+
+    def test_pivot_per_meter_in_kw(self, export, tmp_path):
+        meters = load_elhub_export(export, cache_dir=tmp_path / 'cache')
+
+        assert list(meters.columns) == ['KWH 60 Forbruk', 'KWH 60 Produksjon']
+        assert list(meters.index) == list(pd.date_range('2024-01-01', periods=3, freq='h'))
+        assert list(meters['KWH 60 Forbruk']) == [10.0, 13.0, 14.0]
+        assert meters['KWH 60 Produksjon'].iloc[:2].tolist() == [1.0, 2.0]
+        assert pd.isna(meters['KWH 60 Produksjon'].iloc[2])
+
+    def test_quarter_hour_volumes_to_kw(self, tmp_path):
+        path = tmp_path / 'export.csv'
+        path.write_text('\n'.join([HEADER, _row('2024-06-01 12:00', 'KWH 15 Forbruk', 5.0, minutes=15)]) + '\n',
+                        encoding='utf-8')
+
+        assert load_elhub_export(path, use_cache=False).iloc[0, 0] == pytest.approx(20.0)
+
+    def test_other_qualities(self, export, tmp_path):
+        meters = load_elhub_export(export, qualities=('Målt', 'Estimert'), cache_dir=tmp_path / 'cache')
+
+        assert meters.loc['2024-01-01 03:00', 'KWH 60 Forbruk'] == 99.0
+
+    def test_chunk_size_does_not_matter(self, export, tmp_path):
+        whole = load_elhub_export(export, use_cache=False, cache_dir=tmp_path / 'a')
+        chunked = load_elhub_export(export, chunksize=2, use_cache=False, cache_dir=tmp_path / 'b')
+
+        pd.testing.assert_frame_equal(whole, chunked)
+
+    def test_not_an_export(self, tmp_path):
+        path = tmp_path / 'load.csv'
+        path.write_text('timestamp,consumption_kw\n2024-01-01 00:00:00,1.0\n', encoding='utf-8')
+
+        with pytest.raises(ValueError, match='Elhub'):
+            load_elhub_export(path)
+
+
+class TestCache:
+    """Parquet input cache"""
+
+    def test_second_load_reads_cache(self, export, tmp_path, monkeypatch):
+        first = load_elhub_export(export, cache_dir=tmp_path / 'cache')
+        monkeypatch.setattr(file_loaders, '_read_elhub_readings', lambda *args: pytest.fail('re-parsed export'))
+
+        pd.testing.assert_frame_equal(load_elhub_export(export, cache_dir=tmp_path / 'cache'), first)
+
+    def test_changed_export_is_reparsed(self, export, tmp_path):
+        load_elhub_export(export, cache_dir=tmp_path / 'cache')
+        with open(export, 'a', encoding='utf-8') as f:
+            f.write(_row('2024-01-01 03:00', 'KWH 60 Forbruk', 7.0) + '\n')
+
+        assert load_elhub_export(export, cache_dir=tmp_path / 'cache')['KWH 60 Forbruk'].iloc[-1] == 7.0
+
+
+class TestConsumptionLoader:
+    """Raw exports as consumption input"""
+
+    def test_uses_consumption_meter(self, export):
+        timestamps, consumption = load_consumption_data(export)
+
+        assert list(consumption) == [10.0, 13.0, 14.0]
+        assert timestamps[0] == pd.Timestamp('2024-01-01 00:00')
@@ -0,0 +1,195 @@
+"""
+Tests for rolling horizon execution policies.
+
+Tests validate:
+- Periodic policy commits k plan steps per solve
+- Event-triggered policy re-solves on deviation, peak, prices, month and age
+- Executed SOC follows the plan's battery dynamics
+- Execution policy settings are serialized and validated
+"""
+
+import io
+import contextlib
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from src.config.simulation_config import SimulationConfig
+from src.data.data_manager import DataManager, TimeSeriesData
+from src.operational.state_manager import BatterySystemState
+from src.optimization.base_optimizer import OptimizationResult
+from src.simulation.rolling_horizon_orchestrator import RollingHorizonOrchestrator, _Plan
+
+
+def _config(**rolling_horizon):
+    config = SimulationConfig.from_yaml('configs/working_config.yaml')
+    config.simulation_period.start_date = '2024-06-03'
+    config.simulation_period.end_date = '2024-06-05'
+    for key, value in rolling_horizon.items():
+        setattr(config.rolling_horizon, key, value)
+    return config
+
+
+def _data():
+    """Four days of hourly PV/load/price with daily structure."""
+    timestamps = pd.date_range('2024-06-03', periods=96, freq='h')
+    hours = timestamps.hour.values
+    rng = np.random.default_rng(3)
+    return TimeSeriesData(
+        timestamps=timestamps,
+        prices_nok_per_kwh=0.5 + 0.5 * ((hours >= 17) & (hours <= 20)) - 0.2 * (hours < 5),
+        pv_production_kw=np.clip(80 * np.sin((hours - 6) / 12 * np.pi), 0, None),
+        consumption_kw=30 + 20 * ((hours >= 8) & (hours <= 17)) + 5 * rng.random(96),
+        resolution='PT60M',
+    )
+
+
+def _run(config):
+    orchestrator = RollingHorizonOrchestrator(config)
+    orchestrator.data_manager = DataManager(config, data=_data())
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        return orchestrator.run(), orchestrator
+
+
+class TestPolicies:
+    """End-to-end runs on synthetic data"""
+
+    def test_default_re_solves_every_timestep(self):
+        results, _ = _run(_config())
+        stats = results.metadata['execution_stats']
+
+        assert stats['policy'] == 'periodic'
+        assert stats['solves'] == stats['steps'] == 48
+        assert results.metadata['execute_steps'] == 1
+
+    def test_periodic_commits_k_steps(self):
+        results, orchestrator = _run(_config(execute_steps=4))
+        stats = results.metadata['execution_stats']
+
+        assert stats['solves'] == 12
+        assert stats['triggers'] == {'initial': 1, 'periodic': 11}
+        assert orchestrator.optimizer.keep_steps == 5
+
+    def test_update_frequency_sets_default_k(self):
+        results, _ = _run(_config(update_frequency_minutes=180))
+
+        assert results.metadata['execute_steps'] == 3
+        assert results.metadata['execution_stats']['solves'] == 16
+
+    def test_executed_soc_follows_plan(self):
+        results, orchestrator = _run(_config(execute_steps=6))
+        trajectory = results.trajectory
+
+        eta_c = orchestrator.optimizer._core_optimizer.eta_charge
+        eta_d = orchestrator.optimizer._core_optimizer.eta_discharge
+        energy_in = eta_c * trajectory['P_charge_kw'] - trajectory['P_discharge_kw'] / eta_d
+        np.testing.assert_allclose(
+            np.diff(trajectory['E_battery_kwh']), energy_in.values[:-1], atol=1e-6
+        )
+
+    def test_event_triggered_with_perfect_forecast(self):
+        results, _ = _run(_config(execution_policy='event_triggered', max_plan_age_hours=6))
+        stats = results.metadata['execution_stats']
+
+        # Realized net load equals the forecast, so only time-based triggers fire
+        assert set(stats['triggers']) <= {'initial', 'max_age', 'new_prices', 'plan_exhausted'}
+        assert stats['triggers']['new_prices'] >= 1
+        assert stats['solves'] < stats['steps'] / 4
+
+
+class TestTriggers:
+    """_reoptimization_trigger decisions"""
+
+    @pytest.fixture
+    def orchestrator(self):
+        orchestrator = RollingHorizonOrchestrator(_config(
+            execution_policy='event_triggered', deviation_threshold_kw=10.0, peak_margin_kw=2.0
+        ))
+        orchestrator.battery_state = BatterySystemState(
+            current_soc_kwh=40.0, battery_capacity_kwh=80.0, current_monthly_peak_kw=50.0
+        )
+        return orchestrator
+
+    @staticmethod
+    def _plan(solved_at=datetime(2024, 6, 3, 8), step=1, grid_import=40.0):
+        n = 24
+        result = OptimizationResult(
+            P_charge=np.zeros(n),
+            P_discharge=np.zeros(n),
+            P_grid_import=np.full(n, grid_import),
+            P_grid_export=np.zeros(n),
+            E_battery=np.full(n, 40.0),
+            P_curtail=np.zeros(n),
+            objective_value=0.0,
+            energy_cost=0.0,
+        )
+        return _Plan(result=result, solved_at=solved_at, net_load_kw=np.full(n, grid_import),
+                     executable_steps=n - 1, step=step)
+
+    def _trigger(self, orchestrator, plan, current_time=datetime(2024, 6, 3, 9), net_load_kw=40.0):
+        return orchestrator._reoptimization_trigger(
+            plan, current_time, net_load_kw, execute_steps=1, max_plan_age_steps=6
+        )
+
+    def test_keeps_plan_without_events(self, orchestrator):
+        assert self._trigger(orchestrator, self._plan()) is None
+
+    def test_initial_and_exhausted(self, orchestrator):
+        assert self._trigger(orchestrator, None) == 'initial'
+        assert self._trigger(orchestrator, self._plan(step=23)) == 'plan_exhausted'
+
+    def test_max_age(self, orchestrator):
+        assert self._trigger(orchestrator, self._plan(step=6)) == 'max_age'
+
+    def test_new_month(self, orchestrator):
+        plan = self._plan(solved_at=datetime(2024, 6, 30, 23))
+        assert self._trigger(orchestrator, plan, current_time=datetime(2024, 7, 1, 0)) == 'new_month'
+
+    def test_new_prices(self, orchestrator):
+        plan = self._plan(solved_at=datetime(2024, 6, 3, 12))
+        assert self._trigger(orchestrator, plan, current_time=datetime(2024, 6, 3, 13)) == 'new_prices'
+        plan = self._plan(solved_at=datetime(2024, 6, 3, 13))
+        assert self._trigger(orchestrator, plan, current_time=datetime(2024, 6, 3, 14)) is None
+
+    @pytest.mark.parametrize("net_load_kw", [52.0, 28.0])
+    def test_deviation(self, orchestrator, net_load_kw):
+        assert self._trigger(orchestrator, self._plan(), net_load_kw=net_load_kw) == 'deviation'
+
+    def test_peak_threatened(self, orchestrator):
+        # +9 kW stays below the deviation threshold but reaches the peak margin
+        assert self._trigger(orchestrator, self._plan(), net_load_kw=49.0) == 'peak'
+        assert self._trigger(orchestrator, self._plan(), net_load_kw=47.0) is None
+
+    def test_periodic_ignores_events(self, orchestrator):
+        orchestrator.config.rolling_horizon.execution_policy = 'periodic'
+
+        assert self._trigger(orchestrator, self._plan(step=0), net_load_kw=90.0) is None
+        assert self._trigger(orchestrator, self._plan(step=1)) == 'periodic'
+
+
+def test_config_serialization(tmp_path):
+    config = _config(execution_policy='event_triggered', execute_steps=3, max_plan_age_hours=8.0,
+                     deviation_threshold_kw=15.0, peak_margin_kw=1.0, price_publication_hour=12)
+
+    config.to_yaml(tmp_path / 'config.yaml')
+
+    rolling_horizon = yaml.safe_load(
+        (tmp_path / 'config.yaml').read_text()
+    )['mode_specific']['rolling_horizon']
+
+    assert rolling_horizon['execution_policy'] == 'event_triggered'
+    assert rolling_horizon['execute_steps'] == 3
+    assert rolling_horizon['max_plan_age_hours'] == 8.0
+    assert rolling_horizon['deviation_threshold_kw'] == 15.0
+    assert rolling_horizon['peak_margin_kw'] == 1.0
+    assert rolling_horizon['price_publication_hour'] == 12
+
+
+def test_invalid_execution_policy():
+    config = _config(execution_policy='adaptive')
+
+    with pytest.raises(ValueError, match="execution_policy"):
+        config.validate()
@@ -0,0 +1,98 @@
+"""
+Tests for fleet runs (many sites, one catalog).
+
+Tests validate:
+- Memory-mapped site data matches file-based loading
+- Every site is stored in one catalog with its own battery size
+- Pool and in-process runs give the same results
+- Failed sites are reported without stopping the fleet
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config.simulation_config import SimulationConfig
+from src.data.data_manager import DataManager
+from src.persistence import ResultStorage
+from src.simulation import FleetOrchestrator, FleetSite
+from src.simulation import fleet_orchestrator
+
+
+def _config():
+    config = SimulationConfig.from_yaml('configs/working_config.yaml')
+    config.mode = 'monthly'
+    config.monthly.months = [6]
+    return config
+
+
+def _site(tmp_path, name, scale, **battery):
+    """Site with the project's PV and load profiles scaled by `scale`."""
+    config = _config()
+    pv = pd.read_csv(config.data_sources.production_file, index_col=0)
+    load = pd.read_csv(config.data_sources.consumption_file, index_col=0)
+    production_file = tmp_path / f'{name}_pv.csv'
+    consumption_file = tmp_path / f'{name}_load.csv'
+    (pv * scale).to_csv(production_file)
+    (load * scale).to_csv(consumption_file)
+    return FleetSite(name, str(production_file), str(consumption_file), **battery)
+
+
+@pytest.fixture
+def sites(tmp_path):
+    return [_site(tmp_path, 'school', 0.5), _site(tmp_path, 'office', 1.5, battery_kwh=120, battery_kw=50)]
+
+
+class TestStaging:
+    """Shared prices and memory-mapped site series"""
+
+    def test_site_data_matches_file_loading(self, tmp_path, sites):
+        fleet = FleetOrchestrator(_config(), sites, results_dir=tmp_path / 'results')
+        tasks = fleet._stage(tmp_path, 'run')
+        task = next(t for t in tasks if t.site.name == 'office')
+
+        staged = DataManager(task.config, data=fleet_orchestrator._load_site_data(task)).load_data()
+        loaded = DataManager(task.config).load_data()
+
+        assert staged.timestamps.equals(loaded.timestamps)
+        np.testing.assert_allclose(staged.prices_nok_per_kwh, loaded.prices_nok_per_kwh)
+        np.testing.assert_allclose(staged.pv_production_kw, loaded.pv_production_kw)
+        np.testing.assert_allclose(staged.consumption_kw, loaded.consumption_kw)
+
+    def test_duplicate_site_names(self, sites):
+        with pytest.raises(ValueError, match='unique'):
+            FleetOrchestrator(_config(), sites + sites[:1])
+
+
+class TestFleetRun:
+    """Site runs and the shared catalog"""
+
+    def test_sites_in_one_catalog(self, tmp_path, sites):
+        outcomes = FleetOrchestrator(_config(), sites, results_dir=tmp_path, max_workers=1).run()
+
+        assert [o.site for o in outcomes] == ['school', 'office']
+        assert all(o.success for o in outcomes)
+        catalog = {meta.result_id: meta for meta in ResultStorage(tmp_path).catalog.query()}
+        office = catalog[outcomes[1].result_id]
+        assert office.notes == 'fleet site: office'
+        assert (office.battery_kwh, office.battery_kw) == (120, 50)
+        assert catalog[outcomes[0].result_id].battery_kwh == 80
+        assert office.total_cost_nok == pytest.approx(outcomes[1].total_cost_nok)
+
+    def test_pool_matches_in_process(self, tmp_path, sites):
+        sequential = FleetOrchestrator(_config(), sites, results_dir=tmp_path / 'seq', max_workers=1).run()
+        pooled = FleetOrchestrator(_config(), sites, results_dir=tmp_path / 'pool', max_workers=2).run()
+
+        assert [o.site for o in pooled] == [o.site for o in sequential]
+        for seq, pool in zip(sequential, pooled):
+            assert pool.total_cost_nok == pytest.approx(seq.total_cost_nok)
+
+    def test_failed_site_is_reported(self, tmp_path, sites):
+        broken = FleetSite('broken', sites[0].production_file, sites[0].consumption_file, battery_kw=-10)
+
+        outcomes = FleetOrchestrator(_config(), [sites[0], broken], results_dir=tmp_path, max_workers=1).run()
+
+        assert outcomes[0].success
+        assert not outcomes[1].success
+        assert outcomes[1].result_id is None
+        assert len(ResultStorage(tmp_path).catalog.query()) == 1
@@ -0,0 +1,189 @@
+"""
+Tests for the forecasting subsystem.
+
+Tests validate:
+- Incremental update()/forecast() matches vectorized precompute() windows
+- Seasonal naive repeats the previous season
+- Day-ahead prices are exact up to the publication boundary
+- Clear-sky persistence scales the envelope by the observed clearness
+- Rolling horizon orchestrator runs on model forecasts
+"""
+
+import io
+import contextlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config.simulation_config import SimulationConfig
+from src.data.data_manager import DataManager, TimeSeriesData
+from src.forecasting import (
+    ClearSkyPersistenceForecaster,
+    DayAheadPriceForecaster,
+    ForecastProvider,
+    SeasonalNaiveForecaster,
+    SeasonalSmoothingForecaster,
+    clear_sky_profile,
+    ewma,
+    known_price_end,
+)
+from src.simulation.rolling_horizon_orchestrator import RollingHorizonOrchestrator
+
+
+TIMESTAMPS = pd.date_range('2024-06-01', periods=24 * 21, freq='h')
+
+
+def _series(seed=0):
+    """Three weeks of hourly PV, load and price with daily structure."""
+    rng = np.random.default_rng(seed)
+    hours = TIMESTAMPS.hour.values
+    n = len(TIMESTAMPS)
+    clear_sky = 60 * np.clip(np.sin((hours - 5) / 14 * np.pi), 0, None)
+    return {
+        'clear_sky': clear_sky,
+        'pv': clear_sky * rng.uniform(0.2, 1.0, n),
+        'load': 30 + 10 * np.sin(hours / 24 * 2 * np.pi) + rng.normal(0, 2, n),
+        'price': 0.6 + 0.3 * ((hours >= 17) & (hours <= 20)) + rng.normal(0, 0.05, n),
+    }
+
+
+def _assert_paths_match(forecaster, values, horizon=30):
+    table = forecaster.precompute(values)
+    for i in range(len(values) - horizon):
+        np.testing.assert_allclose(forecaster.forecast(horizon), table.window(i, horizon), atol=1e-10)
+        forecaster.update(values[i])
+
+
+class TestIncrementalMatchesPrecompute:
+    """O(1) updates and vectorized backtest tables give identical forecasts"""
+
+    def test_ewma_matches_recursion(self):
+        values = np.random.default_rng(1).normal(size=50)
+        expected, state = [], 2.0
+        for value in values:
+            state = 0.3 * value + 0.7 * state
+            expected.append(state)
+
+        np.testing.assert_allclose(ewma(values, 0.3, 2.0), expected)
+
+    def test_seasonal_smoothing(self):
+        _assert_paths_match(SeasonalSmoothingForecaster(season_steps=24), _series()['load'])
+
+    def test_weekly_season_longer_than_horizon(self):
+        _assert_paths_match(SeasonalSmoothingForecaster(season_steps=168), _series()['load'])
+
+    def test_clear_sky_persistence(self):
+        data = _series()
+        _assert_paths_match(ClearSkyPersistenceForecaster(data['clear_sky']), data['pv'])
+
+    def test_day_ahead_price(self):
+        prices = _series()['price']
+        _assert_paths_match(DayAheadPriceForecaster(TIMESTAMPS, prices), prices, horizon=48)
+
+
+class TestForecasters:
+    """Forecast behaviour on known series"""
+
+    def test_seasonal_naive_exact_on_periodic_series(self):
+        values = np.tile(np.arange(24.0), 5)
+        table = SeasonalNaiveForecaster(24).precompute(values)
+
+        for i in (24, 37, 90):
+            np.testing.assert_allclose(table.window(i, 30), values[i:i + 30])
+
+    def test_unseen_phases_use_mean_of_seen(self):
+        forecaster = SeasonalNaiveForecaster(24)
+        for value in (1.0, 3.0):
+            forecaster.update(value)
+
+        np.testing.assert_allclose(forecaster.forecast(3), [2.0, 2.0, 2.0])
+
+    def test_published_prices_are_exact(self):
+        prices = _series()['price']
+        table = DayAheadPriceForecaster(TIMESTAMPS, prices).precompute()
+
+        # 09:00: only today's prices are known; 14:00: tomorrow's as well
+        np.testing.assert_allclose(table.window(9, 15), prices[9:24])
+        assert not np.allclose(table.window(9, 16)[-1], prices[24])
+        np.testing.assert_allclose(table.window(14, 34), prices[14:48])
+
+    def test_publication_boundary(self):
+        known_end = known_price_end(TIMESTAMPS, publication_hour=13)
+
+        assert known_end[12] == 24
+        assert known_end[13] == 48
+        assert known_end[-1] == len(TIMESTAMPS)
+
+    def test_clear_sky_constant_clearness(self):
+        clear_sky = _series()['clear_sky']
+        forecaster = ClearSkyPersistenceForecaster(clear_sky, alpha=1.0, alpha_mean=1.0)
+        for value in 0.7 * clear_sky[:30]:
+            forecaster.update(value)
+
+        np.testing.assert_allclose(forecaster.forecast(24), 0.7 * clear_sky[30:54])
+
+    def test_clear_sky_profile_is_envelope(self):
+        data = _series()
+        profile = clear_sky_profile(TIMESTAMPS, data['pv'], window_days=7)
+
+        assert np.all(profile >= data['pv'] - 1e-12)
+        assert np.all(profile <= data['clear_sky'] + 1e-12)
+
+    def test_invalid_parameters(self):
+        with pytest.raises(ValueError):
+            SeasonalSmoothingForecaster(season_steps=0)
+        with pytest.raises(ValueError):
+            SeasonalSmoothingForecaster(season_steps=24, alpha=0.0)
+
+
+class TestOrchestratorForecasts:
+    """Rolling horizon simulation on model forecasts"""
+
+    @staticmethod
+    def _data():
+        series = _series()
+        return TimeSeriesData(
+            timestamps=TIMESTAMPS,
+            prices_nok_per_kwh=series['price'],
+            pv_production_kw=series['pv'],
+            consumption_kw=series['load'],
+            resolution='PT60M',
+        )
+
+    def _run(self, **rolling_horizon):
+        config = SimulationConfig.from_yaml('configs/working_config.yaml')
+        config.simulation_period.start_date = '2024-06-01'
+        config.simulation_period.end_date = '2024-06-21'
+        for key, value in rolling_horizon.items():
+            setattr(config.rolling_horizon, key, value)
+
+        orchestrator = RollingHorizonOrchestrator(config)
+        orchestrator.data_manager = DataManager(config, data=self._data())
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            return orchestrator.run()
+
+    def test_provider_window_shapes(self):
+        provider = ForecastProvider(self._data())
+        pv, load, prices = provider.window(100, 24)
+
+        assert pv.shape == load.shape == prices.shape == (24,)
+        assert np.all(pv >= 0) and np.all(load >= 0)
+
+    def test_models_forecast_runs_and_grid_absorbs_error(self):
+        data = self._data()
+        results = self._run(forecast='models', execute_steps=4)
+        trajectory = results.trajectory
+        n = len(trajectory)
+
+        assert results.metadata['forecast'] == 'models'
+        # Realized grid balance holds against realized load and PV
+        balance = (trajectory['P_grid_import_kw'] - trajectory['P_grid_export_kw']
+                   - trajectory['P_charge_kw'] + trajectory['P_discharge_kw']
+                   - trajectory['P_curtail_kw'])
+        np.testing.assert_allclose(balance, data.consumption_kw[:n] - data.pv_production_kw[:n], atol=1e-6)
+
+    def test_deviation_trigger_fires_on_forecast_error(self):
+        results = self._run(forecast='models', execution_policy='event_triggered', deviation_threshold_kw=5.0)
+
+        assert results.metadata['execution_stats']['triggers'].get('deviation', 0) > 0
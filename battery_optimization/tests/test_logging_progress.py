@@ -0,0 +1,194 @@
+"""
+Tests for run-level verbosity and progress reporting.
+
+Tests validate:
+- ProgressReporter calls back once per interval and once at the end
+- Verbosity sets the package logger levels and is serialized and validated
+- Orchestrators report progress through the callback instead of printing
+- Optimizer construction and solves are silent below DEBUG
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from src.config.legacy_config_adapter import get_global_legacy_config
+from src.config.simulation_config import SimulationConfig
+from src.config.verbosity import PACKAGE_LOGGERS, apply_verbosity
+from src.data.data_manager import DataManager, TimeSeriesData
+from src.simulation.progress import ProgressReporter, ProgressUpdate
+from src.simulation.rolling_horizon_orchestrator import RollingHorizonOrchestrator
+from src.operational.state_manager import BatterySystemState
+from core.rolling_horizon_optimizer import RollingHorizonOptimizer
+
+
+@pytest.fixture(autouse=True)
+def _restore_logger_levels():
+    levels = {name: logging.getLogger(name).level for name in PACKAGE_LOGGERS}
+    yield
+    for name, level in levels.items():
+        logging.getLogger(name).setLevel(level)
+
+
+def _config(**overrides):
+    config = SimulationConfig.from_yaml('configs/working_config.yaml')
+    config.simulation_period.start_date = '2024-06-03'
+    config.simulation_period.end_date = '2024-06-05'
+    for key, value in overrides.items():
+        setattr(config, key, value)
+    return config
+
+
+def _data():
+    """Four days of hourly PV/load/price with daily structure."""
+    timestamps = pd.date_range('2024-06-03', periods=96, freq='h')
+    hours = timestamps.hour.values
+    return TimeSeriesData(
+        timestamps=timestamps,
+        prices_nok_per_kwh=0.5 + 0.5 * ((hours >= 17) & (hours <= 20)),
+        pv_production_kw=np.clip(80 * np.sin((hours - 6) / 12 * np.pi), 0, None),
+        consumption_kw=30 + 20 * ((hours >= 8) & (hours <= 17)),
+        resolution='PT60M',
+    )
+
+
+class TestProgressReporter:
+    """Throttling of progress callbacks"""
+
+    def test_reports_once_per_interval(self):
+        updates = []
+        progress = ProgressReporter(100, "Steps", updates.append, interval_percent=25)
+        for _ in range(100):
+            progress.advance()
+        progress.close()
+
+        assert [u.completed for u in updates] == [25, 50, 75, 100]
+        assert updates[-1].fraction == 1.0
+        assert updates[-1].desc == "Steps"
+
+    def test_close_reports_early_exit(self):
+        updates = []
+        progress = ProgressReporter(100, "Steps", updates.append, interval_percent=50)
+        for _ in range(30):
+            progress.advance()
+        progress.close()
+
+        assert [u.completed for u in updates] == [30]
+        assert updates[-1].fraction == pytest.approx(0.3)
+
+    def test_short_loop_reports_every_step(self):
+        updates = []
+        progress = ProgressReporter(3, "Months", updates.append, interval_percent=10)
+        for _ in range(3):
+            progress.advance()
+        progress.close()
+
+        assert [u.completed for u in updates] == [1, 2, 3]
+
+    def test_default_callback_logs(self, caplog):
+        with caplog.at_level(logging.INFO, logger='src.simulation.progress'):
+            progress = ProgressReporter(2, "Weeks")
+            progress.advance(2)
+            progress.close()
+
+        assert "Weeks: 2/2 (100%" in caplog.text
+
+    def test_empty_loop_reports_once(self):
+        updates = []
+        ProgressReporter(0, "Nothing", updates.append).close()
+
+        assert updates == [ProgressUpdate("Nothing", 0, 0, updates[0].elapsed_s)]
+
+
+class TestVerbosityConfig:
+    """Verbosity levels and config round-trip"""
+
+    @pytest.mark.parametrize("verbosity, level", [
+        ('quiet', logging.WARNING), ('info', logging.INFO), ('debug', logging.DEBUG),
+    ])
+    def test_apply_verbosity_sets_package_levels(self, verbosity, level):
+        apply_verbosity(verbosity)
+
+        assert logging.getLogger('src').level == level
+        assert logging.getLogger('core').level == level
+
+    def test_unknown_verbosity_raises(self):
+        with pytest.raises(ValueError, match="verbosity"):
+            apply_verbosity('loud')
+
+    def test_config_serialization(self, tmp_path):
+        config = _config(verbosity='quiet', progress_interval_percent=25.0)
+        config.to_yaml(tmp_path / 'config.yaml')
+
+        raw = yaml.safe_load((tmp_path / 'config.yaml').read_text())
+
+        assert raw['verbosity'] == 'quiet'
+        assert raw['progress_interval_percent'] == 25.0
+
+    def test_defaults(self):
+        config = SimulationConfig()
+
+        assert config.verbosity == 'info'
+        assert config.progress_interval_percent == 10.0
+
+    @pytest.mark.parametrize("overrides", [
+        {'verbosity': 'loud'},
+        {'progress_interval_percent': 0.0},
+        {'progress_interval_percent': 150.0},
+    ])
+    def test_validate_rejects_invalid_settings(self, overrides):
+        with pytest.raises(ValueError):
+            _config(**overrides).validate()
+
+
+class TestOrchestratorOutput:
+    """Orchestrator progress goes through the callback, not stdout"""
+
+    def test_progress_callback_and_no_prints(self, capsys):
+        updates = []
+        config = _config(verbosity='quiet', progress_interval_percent=50.0)
+        orchestrator = RollingHorizonOrchestrator(config, progress_callback=updates.append)
+        orchestrator.data_manager = DataManager(config, data=_data())
+
+        results = orchestrator.run()
+
+        assert capsys.readouterr().out == ""
+        assert [u.completed for u in updates] == [24, 48]
+        assert updates[-1].total == results.metadata['execution_stats']['steps']
+
+    def test_quiet_suppresses_info_logs(self, caplog):
+        config = _config(verbosity='quiet')
+        orchestrator = RollingHorizonOrchestrator(config, progress_callback=lambda update: None)
+        orchestrator.data_manager = DataManager(config, data=_data())
+
+        with caplog.at_level(logging.NOTSET):
+            apply_verbosity('quiet')
+            orchestrator.run()
+
+        assert not [r for r in caplog.records if r.levelno < logging.WARNING]
+
+
+class TestOptimizerOutput:
+    """Optimizer is silent unless debug logging is enabled"""
+
+    def test_construction_and_solve_print_nothing(self, capsys):
+        apply_verbosity('info')
+        optimizer = RollingHorizonOptimizer(config=get_global_legacy_config(), battery_kwh=80,
+                                            battery_kw=60, horizon_hours=24)
+        data = _data()
+        state = BatterySystemState(current_soc_kwh=40.0, battery_capacity_kwh=80)
+        optimizer.optimize_window(state, data.pv_production_kw[:24], data.consumption_kw[:24],
+                                  data.prices_nok_per_kwh[:24], data.timestamps[:24], verbose=True)
+
+        assert capsys.readouterr().out == ""
+
+    def test_debug_logs_construction(self, caplog):
+        apply_verbosity('debug')
+        with caplog.at_level(logging.DEBUG, logger='core.rolling_horizon_optimizer'):
+            RollingHorizonOptimizer(config=get_global_legacy_config(), battery_kwh=80,
+                                    battery_kw=60, horizon_hours=24)
+
+        assert any(r.levelno == logging.DEBUG for r in caplog.records)
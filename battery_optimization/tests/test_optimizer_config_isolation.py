@@ -0,0 +1,119 @@
+"""
+Tests for per-optimizer legacy configs (no mutable global config).
+
+Tests validate:
+- Legacy configs are frozen and picklable
+- OptimizerFactory gives every optimizer the battery limits and tariff of its SimulationConfig
+- Differently configured optimizers run concurrently in threads with sequential results
+"""
+
+import dataclasses
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from src.config.legacy_config_adapter import create_legacy_config, get_global_legacy_config
+from src.config.simulation_config import SimulationConfig
+from src.optimization.optimizer_factory import OptimizerFactory
+
+
+def _config(min_soc_percent=10.0, tariffs=None):
+    config = SimulationConfig.from_yaml('configs/working_config.yaml')
+    config.battery.min_soc_percent = min_soc_percent
+    if tariffs is not None:
+        config.infrastructure.tariffs = str(tariffs)
+    return config
+
+
+@pytest.fixture
+def doubled_tariff(tmp_path):
+    """Lnett 2024 tariff with every power bracket twice as expensive."""
+    with open('configs/infrastructure/tariffs_lnett_2024.yaml', encoding='utf-8') as f:
+        data = yaml.safe_load(f)
+    for bracket in data['tariff_profile']['power']['brackets']:
+        bracket['cost_nok_month'] *= 2
+    path = tmp_path / 'tariffs_doubled.yaml'
+    path.write_text(yaml.safe_dump(data), encoding='utf-8')
+    return path
+
+
+def _day():
+    timestamps = pd.date_range('2024-06-03', periods=24, freq='h')
+    hours = timestamps.hour.values
+    pv = np.clip(60 * np.sin((hours - 6) / 12 * np.pi), 0, None)
+    load = 30 + 15 * ((hours >= 8) & (hours <= 17))
+    prices = 0.5 + 0.4 * ((hours >= 17) & (hours <= 20))
+    return timestamps, pv, load, prices
+
+
+class TestLegacyConfig:
+    """Frozen, picklable configs"""
+
+    def test_frozen(self):
+        config = create_legacy_config(_config())
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            config.battery.min_soc = 0.3
+
+    def test_pickle_roundtrip(self):
+        config = create_legacy_config(_config(min_soc_percent=20.0))
+        restored = pickle.loads(pickle.dumps(config))
+
+        assert restored == config
+        assert restored.tariff.get_power_cost(30) == config.tariff.get_power_cost(30)
+
+    def test_default_is_shared_and_unchanged(self):
+        create_legacy_config(_config(min_soc_percent=30.0))
+
+        assert get_global_legacy_config() is get_global_legacy_config()
+        assert get_global_legacy_config().battery.min_soc == pytest.approx(0.1)
+
+
+class TestFactory:
+    """Optimizers get their own config"""
+
+    def test_battery_limits_from_simulation_config(self):
+        optimizer = OptimizerFactory.create_from_config(_config(min_soc_percent=25.0))
+
+        assert optimizer.config.battery.min_soc == pytest.approx(0.25)
+        assert optimizer._core_optimizer.SOC_min == pytest.approx(0.25)
+
+    @pytest.mark.parametrize('mode', ['rolling_horizon', 'monthly', 'yearly'])
+    def test_tariff_file_from_simulation_config(self, mode, doubled_tariff):
+        default = OptimizerFactory.create(mode, _config())
+        doubled = OptimizerFactory.create(mode, _config(tariffs=doubled_tariff))
+
+        assert doubled.config.tariff.get_power_cost(30) == 2 * default.config.tariff.get_power_cost(30)
+
+    def test_optimizer_pickles(self):
+        optimizer = OptimizerFactory.create_from_config(_config(min_soc_percent=20.0))
+        restored = pickle.loads(pickle.dumps(optimizer))
+
+        assert restored._core_optimizer.SOC_min == pytest.approx(0.2)
+
+
+class TestConcurrentScenarios:
+    """Heterogeneous optimizers in one process"""
+
+    def test_threads_match_sequential(self, doubled_tariff):
+        optimizers = [
+            OptimizerFactory.create_from_config(_config(min_soc_percent=soc, tariffs=tariffs))
+            for soc in (10.0, 30.0)
+            for tariffs in (None, doubled_tariff)
+        ]
+        timestamps, pv, load, prices = _day()
+
+        def run(optimizer):
+            return optimizer.optimize(timestamps, pv, load, prices, initial_soc_kwh=40.0)
+
+        sequential = [run(o) for o in optimizers]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            threaded = list(pool.map(run, optimizers))
+
+        for seq, thr in zip(sequential, threaded):
+            np.testing.assert_allclose(thr.E_battery, seq.E_battery)
+        assert sequential[0].E_battery.min() < sequential[2].E_battery.min()
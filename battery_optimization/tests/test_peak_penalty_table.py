@@ -0,0 +1,135 @@
+"""
+Tests for the vectorized adaptive peak penalty.
+
+Tests validate:
+- adaptive_peak_penalty matches BatterySystemState.calculate_adaptive_peak_penalty
+- PeakPenaltyTable forward maxima and month-day tables match per-window computation
+- Table lookups match the per-window penalty
+- Rolling horizon results expose the penalty per executed step
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config.simulation_config import SimulationConfig
+from src.operational.state_manager import BatterySystemState, PeakPenaltyTable, adaptive_peak_penalty
+from src.simulation import RollingHorizonOrchestrator
+
+RATE = 60.0
+
+
+@pytest.fixture
+def period():
+    timestamps = pd.date_range('2024-01-29', '2024-03-02 23:00', freq='h')
+    rng = np.random.default_rng(7)
+    net_load = 40 * np.sin(np.arange(len(timestamps)) / 5.0) + rng.normal(0, 10, len(timestamps))
+    return timestamps, net_load
+
+
+def _window_penalty(timestamps, net_load, step, monthly_peak_kw, horizon_hours):
+    """Penalty as the optimizer computes it per window."""
+    start = timestamps[step]
+    mask = (timestamps >= start) & (timestamps < start + pd.Timedelta(hours=horizon_hours))
+    window = net_load[mask]
+    state = BatterySystemState(current_monthly_peak_kw=monthly_peak_kw, last_update=start,
+                               power_tariff_rate_nok_per_kw=RATE)
+    return state.calculate_adaptive_peak_penalty(max(0, window[0]), np.maximum(0, window))
+
+
+class TestAdaptivePeakPenalty:
+    """Vectorized penalty formula"""
+
+    def test_matches_state_method(self):
+        rng = np.random.default_rng(0)
+        peak = rng.choice([0.0, 30.0, 60.0], 50)
+        current = rng.uniform(0, 80, 50)
+        forecast = current + rng.uniform(0, 20, 50)
+        remaining = rng.integers(0, 31, 50)
+        elapsed = rng.integers(0, 31, 50)
+
+        vectorized = adaptive_peak_penalty(RATE, peak, current, forecast, remaining, elapsed)
+
+        for i in range(50):
+            day = datetime(2024, 1, 1 + int(elapsed[i]))
+            state = BatterySystemState(current_monthly_peak_kw=peak[i], last_update=day,
+                                       power_tariff_rate_nok_per_kw=RATE)
+            expected = adaptive_peak_penalty(RATE, peak[i], current[i], forecast[i],
+                                             state.days_remaining_in_month, state.days_elapsed_in_month)
+            assert state.calculate_adaptive_peak_penalty(current[i], np.array([forecast[i]])) == expected
+        assert vectorized == pytest.approx([
+            adaptive_peak_penalty(RATE, peak[i], current[i], forecast[i], remaining[i], elapsed[i])
+            for i in range(50)
+        ])
+
+    def test_no_tariff(self):
+        assert adaptive_peak_penalty(0.0, 50.0, 60.0, 70.0, 10, 5) == 0.0
+        assert np.array_equal(adaptive_peak_penalty(0.0, np.ones(3) * 50, 60.0, 70.0, 10, 5), np.zeros(3))
+
+
+class TestPeakPenaltyTable:
+    """Precomputed penalty inputs"""
+
+    @pytest.mark.parametrize('horizon_hours', [1, 24, 168])
+    def test_forward_maxima(self, period, horizon_hours):
+        timestamps, net_load = period
+        table = PeakPenaltyTable(timestamps, net_load, horizon_hours, RATE)
+
+        imports = np.maximum(0, net_load)
+        expected = [imports[i:i + horizon_hours].max() for i in range(len(imports))]
+
+        np.testing.assert_array_equal(table.max_forecast_kw, expected)
+
+    def test_month_day_tables(self, period):
+        timestamps, net_load = period
+        table = PeakPenaltyTable(timestamps, net_load, 24, RATE)
+
+        np.testing.assert_array_equal(table.days_elapsed, timestamps.day - 1)
+        np.testing.assert_array_equal(table.days_remaining, timestamps.days_in_month - timestamps.day)
+
+    def test_lookup_matches_window(self, period):
+        timestamps, net_load = period
+        table = PeakPenaltyTable(timestamps, net_load, 24, RATE)
+
+        for step in range(0, len(timestamps), 13):
+            for peak in (0.0, 25.0, 45.0):
+                assert table.step_of(timestamps[step]) == step
+                assert table.penalty(step, peak) == pytest.approx(
+                    _window_penalty(timestamps, net_load, step, peak, 24))
+
+    def test_penalties(self, period):
+        timestamps, net_load = period
+        table = PeakPenaltyTable(timestamps, net_load, 24, RATE)
+        peaks = np.linspace(0, 60, 100)
+
+        np.testing.assert_allclose(table.penalties(peaks), [table.penalty(i, p) for i, p in enumerate(peaks)])
+
+    def test_unknown_step(self, period):
+        timestamps, net_load = period
+        table = PeakPenaltyTable(timestamps, net_load, 24, RATE)
+
+        with pytest.raises(KeyError):
+            table.step_of(timestamps[0] + pd.Timedelta(minutes=30))
+
+
+class TestRollingHorizonPenalty:
+    """Penalty in the rolling horizon trajectory"""
+
+    def test_trajectory_column(self):
+        config = SimulationConfig.from_yaml('configs/working_config.yaml')
+        config.mode = 'rolling_horizon'
+        config.simulation_period.start_date = '2024-06-01'
+        config.simulation_period.end_date = '2024-06-02'
+        config.rolling_horizon.execute_steps = 6
+
+        orchestrator = RollingHorizonOrchestrator(config, progress_callback=lambda update: None)
+        results = orchestrator.run()
+
+        penalty = results.trajectory['peak_penalty_nok_per_kw']
+        table = orchestrator.optimizer.peak_penalty_table
+        assert penalty.notna().all() and (penalty > 0).all()
+        assert penalty.iloc[0] == pytest.approx(table.penalty(0, 0.0))
+        # Constant over the steps executed from one plan
+        assert penalty.iloc[:6].nunique() == 1
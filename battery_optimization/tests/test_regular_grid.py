@@ -0,0 +1,164 @@
+"""
+Tests for regular-grid resampling and alignment.
+
+Tests validate:
+- Downsampling matches DataFrame.resample, also with gaps, NaN and DST changes
+- Upsampling holds, splits or interpolates inside the original intervals
+- Irregular input falls back to pandas
+- Alignment matches pandas intersection + reindex
+- time_aggregation helpers bin by clock hour with timestamps
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.time_aggregation import (
+    aggregate_15min_to_hourly_peak,
+    align_regular,
+    ensure_15min_resolution,
+    grid_step_ns,
+    resample_regular,
+    upsample_hourly_to_15min,
+)
+from src.data.file_loaders import align_timeseries, resample_timeseries
+
+
+def _pandas_resample(timestamps, values, method, freq='60min'):
+    resampled = getattr(pd.DataFrame({'value': values}, index=timestamps).resample(freq), method)()
+    return resampled.index, resampled['value'].values
+
+
+def _local_quarters(start, end):
+    """Naive Oslo time as produced by load_price_data (DST gap/duplicate removed)."""
+    timestamps = pd.date_range(start, end, freq='15min', tz='Europe/Oslo', inclusive='left').tz_localize(None)
+    return timestamps[~timestamps.duplicated()]
+
+
+class TestGridStep:
+    """Regular grid detection"""
+
+    def test_gaps_allowed(self):
+        timestamps = pd.date_range('2024-01-01', periods=10, freq='h').delete([3, 4])
+
+        assert grid_step_ns(timestamps) == 3600 * 10**9
+
+    def test_irregular(self):
+        timestamps = pd.DatetimeIndex(['2024-01-01 00:00', '2024-01-01 01:00', '2024-01-01 01:40'])
+
+        assert grid_step_ns(timestamps) is None
+
+
+class TestDownsample:
+    """15-min to hourly"""
+
+    @pytest.mark.parametrize('method', ['mean', 'sum', 'max'])
+    def test_matches_pandas_across_dst_gap(self, method):
+        timestamps = _local_quarters('2024-03-30 22:15', '2024-04-01')
+        values = np.random.default_rng(0).random(len(timestamps))
+        values[7] = np.nan
+
+        index, result = resample_regular(timestamps, values, 60, method)
+        expected_index, expected = _pandas_resample(timestamps, values, method)
+
+        assert index.equals(expected_index)
+        np.testing.assert_allclose(result, expected, equal_nan=True)
+
+    def test_matches_pandas_tz_aware_autumn(self):
+        timestamps = pd.date_range('2024-10-26', '2024-10-28', freq='15min', tz='Europe/Oslo', inclusive='left')
+        values = np.random.default_rng(1).random(len(timestamps))
+
+        index, result = resample_regular(timestamps, values, 60, 'mean')
+        expected_index, expected = _pandas_resample(timestamps, values, 'mean')
+
+        assert len(index) == 49
+        assert index.equals(expected_index)
+        np.testing.assert_allclose(result, expected)
+
+    def test_irregular_falls_back_to_pandas(self):
+        timestamps = pd.DatetimeIndex(['2024-01-01 00:00', '2024-01-01 00:20', '2024-01-01 01:10'])
+        values = np.array([1.0, 2.0, 3.0])
+
+        assert resample_regular(timestamps, values, 60, 'mean') is None
+        index, result = resample_timeseries(timestamps, values, 'PT60M', 'mean')
+        np.testing.assert_allclose(result, [1.5, 3.0])
+
+
+class TestUpsample:
+    """Hourly to 15-min"""
+
+    def test_hold_split_and_interpolate(self):
+        timestamps = pd.date_range('2024-01-01', periods=3, freq='h')
+        values = np.array([4.0, 8.0, 0.0])
+
+        index, held = resample_regular(timestamps, values, 15, 'mean')
+        _, split = resample_regular(timestamps, values, 15, 'sum')
+        _, interpolated = resample_regular(timestamps, values, 15, 'interpolate')
+
+        assert index.equals(pd.date_range('2024-01-01', periods=12, freq='15min'))
+        assert list(held[:5]) == [4.0] * 4 + [8.0]
+        assert split.sum() == pytest.approx(values.sum())
+        np.testing.assert_allclose(interpolated[:6], [4, 5, 6, 7, 8, 6])
+
+    def test_no_quarters_in_dst_gap(self):
+        timestamps = pd.date_range('2024-03-31 00:00', '2024-03-31 05:00', freq='h', tz='Europe/Oslo',
+                                   inclusive='left').tz_localize(None)
+
+        index, _ = resample_timeseries(timestamps, np.ones(len(timestamps)), 'PT15M', 'mean')
+
+        assert len(index) == 4 * len(timestamps)
+        assert not (index.hour == 2).any()
+
+
+class TestAlign:
+    """Common timestamps"""
+
+    def test_matches_pandas(self):
+        hours = pd.date_range('2024-01-01', periods=500, freq='h')
+        series = [hours, hours[10:-20], hours.delete([50, 51, 300])]
+        values = [np.arange(len(ts), dtype=float) for ts in series]
+
+        common, aligned = align_regular(series, values)
+        expected = hours[10:-20].delete([40, 41, 290])
+
+        assert common.equals(expected)
+        for ts, v, a in zip(series, values, aligned):
+            np.testing.assert_array_equal(a, pd.Series(v, index=ts).reindex(expected).values)
+
+    def test_unsorted_falls_back(self):
+        hours = pd.date_range('2024-01-01', periods=4, freq='h')
+        shuffled = hours[[2, 0, 3, 1]]
+
+        assert align_regular([hours, shuffled], [np.zeros(4), np.arange(4.0)]) is None
+        common, aligned = align_timeseries([hours, shuffled], [np.zeros(4), np.arange(4.0)])
+        np.testing.assert_array_equal(aligned[1], [1.0, 3.0, 0.0, 2.0])
+
+    def test_no_overlap(self):
+        hours = pd.date_range('2024-01-01', periods=4, freq='h')
+
+        with pytest.raises(ValueError, match='overlapping'):
+            align_timeseries([hours, hours + pd.Timedelta(days=1)], [np.zeros(4), np.zeros(4)])
+
+
+class TestTimeAggregation:
+    """core.time_aggregation with timestamps"""
+
+    def test_hourly_peak_with_partial_hour(self):
+        timestamps = pd.date_range('2024-01-01 00:30', periods=6, freq='15min')
+        power = pd.Series([1.0, 5.0, 2.0, 3.0, 9.0, 4.0], index=timestamps)
+
+        peaks = aggregate_15min_to_hourly_peak(power, timestamps)
+
+        assert list(peaks.index.hour) == [0, 1]
+        assert list(peaks) == [5.0, 9.0]
+
+    def test_upsample_and_ensure_15min_skip_dst_gap(self):
+        timestamps = pd.date_range('2024-03-31 00:00', '2024-03-31 05:00', freq='h', tz='Europe/Oslo',
+                                   inclusive='left').tz_localize(None)
+        hourly = pd.Series(np.arange(len(timestamps), dtype=float), index=timestamps)
+
+        upsampled = upsample_hourly_to_15min(hourly, timestamps)
+        _, index = ensure_15min_resolution(hourly.values, timestamps, 'PT60M')
+
+        assert upsampled.index.equals(index)
+        assert upsampled[pd.Timestamp('2024-03-31 03:45')] == 2.0
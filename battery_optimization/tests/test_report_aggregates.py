@@ -0,0 +1,149 @@
+"""
+Tests for the shared report aggregate cube and parallel report rendering.
+
+Tests validate:
+- Cube roll-ups match per-panel resampling of the trajectory
+- Energies are in kWh at any resolution
+- Cubes are cached per result ID
+- render_reports renders report sets in job order, in a pool or sequentially
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.reporting import (
+    AggregateCube,
+    BatteryOperationReport,
+    ReportJob,
+    SimulationResult,
+    clear_aggregate_cache,
+    get_aggregate_cube,
+    render_reports,
+)
+from core.reporting import aggregates
+
+
+def _result(name='scenario', freq='h', periods=24 * 366, seed=0, **metadata):
+    timestamps = pd.date_range('2024-01-01', periods=periods, freq=freq)
+    rng = np.random.default_rng(seed)
+    n = len(timestamps)
+    return SimulationResult(
+        scenario_name=name,
+        timestamp=timestamps,
+        production_dc_kw=50 * rng.random(n),
+        production_ac_kw=48 * rng.random(n),
+        consumption_kw=40 * rng.random(n),
+        grid_power_kw=rng.normal(0, 30, n),
+        battery_power_ac_kw=rng.normal(0, 20, n),
+        battery_soc_kwh=80 * rng.random(n),
+        curtailment_kw=rng.random(n),
+        spot_price=rng.random(n),
+        cost_summary={},
+        battery_config={'capacity_kwh': 80, 'power_kw': 40},
+        strategy_config={},
+        simulation_metadata=dict(metadata),
+    )
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    clear_aggregate_cache()
+    yield
+    clear_aggregate_cache()
+
+
+class TestAggregateCube:
+    """Roll-ups and slicing"""
+
+    def test_weekly_rollup_matches_resample(self):
+        df = _result().to_dataframe()
+        weekly = AggregateCube.from_dataframe(df).rollup('W')
+
+        expected = df.resample('W').agg({
+            'production_ac_kw': 'sum',
+            'battery_power_ac_kw': lambda x: x[x > 0].sum(),
+            'battery_soc_kwh': 'mean',
+            'grid_power_kw': 'max',
+        })
+        assert np.allclose(weekly['production_kwh'], expected['production_ac_kw'])
+        assert np.allclose(weekly['charge_kwh'], expected['battery_power_ac_kw'])
+        assert np.allclose(weekly['soc_mean_kwh'], expected['battery_soc_kwh'])
+        assert np.allclose(weekly['peak_import_kw'], expected['grid_power_kw'].clip(lower=0))
+
+    def test_pt15m_energies_in_kwh(self):
+        df = _result(freq='15min', periods=96 * 7).to_dataframe()
+        cube = AggregateCube.from_dataframe(df)
+
+        assert cube.timestep_hours == 0.25
+        assert cube.totals()['production_kwh'] == pytest.approx(df['production_ac_kw'].sum() * 0.25)
+        assert (cube.daily['n_steps'] == 96).all()
+
+    def test_slice_and_monthly_rollup(self):
+        cube = AggregateCube.from_dataframe(_result().to_dataframe())
+        february = cube.slice(pd.Timestamp('2024-02-01'), pd.Timestamp('2024-03-01'))
+
+        assert len(february.daily) == 29
+        monthly = cube.rollup('MS')
+        assert monthly.loc['2024-02-01', 'consumption_kwh'] == pytest.approx(
+            february.totals()['consumption_kwh'])
+
+    def test_report_tables_use_cube(self, tmp_path):
+        result = _result()
+        report = BatteryOperationReport(result, tmp_path, period='1month', start_date='2024-02-01')
+
+        assert len(report.aggregates.daily) == 30
+        assert report.aggregates.daily.index[0] == pd.Timestamp('2024-02-01')
+
+
+class TestCache:
+    """Cubes are computed once per result"""
+
+    def test_same_result_hits_cache(self):
+        result = _result()
+
+        assert get_aggregate_cube(result) is get_aggregate_cube(result)
+
+    def test_result_id_is_cache_key(self):
+        first = get_aggregate_cube(_result(seed=1, result_id='abc'))
+        second = get_aggregate_cube(_result(seed=2, result_id='abc'))
+        other = get_aggregate_cube(_result(seed=2, result_id='def'))
+
+        assert first is second
+        assert other is not first
+
+    def test_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(aggregates, 'CUBE_CACHE_SIZE', 2)
+        results = [_result(periods=48, result_id=f'r{i}') for i in range(3)]
+        cubes = [get_aggregate_cube(r) for r in results]
+
+        assert get_aggregate_cube(results[2]) is cubes[2]
+        assert get_aggregate_cube(results[0]) is not cubes[0]
+
+
+class TestRenderReports:
+    """Report sets across scenarios"""
+
+    def _jobs(self, tmp_path):
+        return [
+            ReportJob('battery_operation', {
+                'result': _result(name=f'size_{i}', seed=i, result_id=f'size_{i}'),
+                'output_dir': tmp_path / f'size_{i}',
+                'period': period,
+            })
+            for i in range(3)
+            for period in ('3weeks', '1month')
+        ]
+
+    def test_parallel_matches_job_order(self, tmp_path):
+        paths = render_reports(self._jobs(tmp_path), max_workers=2)
+
+        assert len(paths) == 6
+        assert all(p.exists() for p in paths)
+        assert [p.parts[-4] for p in paths] == [f'size_{i}' for i in range(3) for _ in range(2)]
+        assert paths[0].name.startswith('battery_operation_3weeks')
+
+    def test_sequential(self, tmp_path):
+        paths = render_reports(self._jobs(tmp_path)[:2], parallel=False)
+
+        assert [p.stem for p in paths] == ['battery_operation_3weeks', 'battery_operation_1month']
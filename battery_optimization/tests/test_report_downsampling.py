@@ -0,0 +1,149 @@
+"""
+Tests for report downsampling and WebGL traces.
+
+Tests validate:
+- LTTB/MinMax-LTTB keep endpoints, the point budget and the global extremes
+- Dense traces switch to Scattergl
+- BatteryOperationReport downsamples annual PT15M trajectories
+- Zoom resampling embeds the full-resolution series in the HTML
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from core.reporting import SimulationResult, BatteryOperationReport
+from core.reporting.downsampling import (
+    downsample_indices,
+    lttb_indices,
+    minmax_indices,
+    point_budget,
+    scatter_class,
+    zoom_resampling_script,
+)
+
+
+def _annual_result(freq='15min'):
+    timestamps = pd.date_range('2024-01-01', '2024-12-31 23:45', freq=freq)
+    n = len(timestamps)
+    rng = np.random.default_rng(7)
+    hours = timestamps.hour.values
+    production = np.clip(60 * np.sin((hours - 6) / 12 * np.pi), 0, None)
+    return SimulationResult(
+        scenario_name='annual_pt15m',
+        timestamp=timestamps,
+        production_dc_kw=production * 1.05,
+        production_ac_kw=production,
+        consumption_kw=30 + 10 * rng.random(n),
+        grid_power_kw=rng.normal(0, 30, n),
+        battery_power_ac_kw=rng.normal(0, 20, n),
+        battery_soc_kwh=80 * rng.random(n),
+        curtailment_kw=rng.random(n),
+        spot_price=0.5 + 0.2 * rng.random(n),
+        cost_summary={},
+        battery_config={'capacity_kwh': 80, 'power_kw': 40},
+        strategy_config={},
+        simulation_metadata={},
+    )
+
+
+def _report(tmp_path, **kwargs):
+    return BatteryOperationReport(
+        _annual_result(), tmp_path, period='custom',
+        start_date='2024-01-01', end_date='2024-12-31', **kwargs
+    )
+
+
+class TestDownsampling:
+    """Point selection"""
+
+    def test_lttb_keeps_endpoints_and_budget(self):
+        y = np.sin(np.linspace(0, 20, 5000))
+        idx = lttb_indices(np.arange(5000.0), y, 200)
+
+        assert len(idx) == 200
+        assert idx[0] == 0 and idx[-1] == 4999
+        assert np.all(np.diff(idx) > 0)
+
+    def test_lttb_follows_shape(self):
+        x = np.arange(10000.0)
+        y = np.sin(x / 500)
+        idx = lttb_indices(x, y, 500)
+
+        assert np.interp(x, x[idx], y[idx]) == pytest.approx(y, abs=0.01)
+
+    def test_minmax_keeps_bucket_extremes(self):
+        y = np.zeros(1002)
+        y[1 + 5] = 3.0
+        y[1 + 507] = -2.0
+        idx = minmax_indices(y, 10)
+
+        assert {0, 1001, 6, 508} <= set(idx)
+
+    def test_single_spike_survives(self):
+        y = np.zeros(35136)
+        y[12345] = 90.0
+        y[30000] = -50.0
+        idx = downsample_indices(y, 1600)
+
+        assert 12345 in idx and 30000 in idx
+        assert len(idx) <= 1602
+
+    def test_short_series_unchanged(self):
+        assert np.array_equal(downsample_indices(np.arange(10.0), 100), np.arange(10))
+
+    def test_nan_values_are_tolerated(self):
+        y = np.random.default_rng(0).random(5000)
+        y[::7] = np.nan
+        idx = downsample_indices(y, 300)
+
+        assert np.nanargmax(y) in idx
+
+    def test_point_budget_and_trace_class(self):
+        assert point_budget(800, 2.0) == 1600
+        assert scatter_class(5000) is go.Scattergl
+        assert scatter_class(500) is go.Scatter
+
+
+class TestBatteryOperationReport:
+    """Annual PT15M reports"""
+
+    def test_annual_report_is_downsampled(self, tmp_path):
+        report = _report(tmp_path)
+        fig = report._create_figure()
+
+        series = [t for t in fig.data if isinstance(t, (go.Scatter, go.Scattergl, go.Bar))]
+        assert len(report.df) > 30000
+        assert max(len(t.x) for t in series) <= report.max_points + 2
+        assert any(isinstance(t, go.Scattergl) for t in series)
+        # Scattergl has no stackgroup
+        assert isinstance(next(t for t in series if t.name == 'Energy Cost'), go.Scatter)
+
+    def test_peak_import_kept(self, tmp_path):
+        report = _report(tmp_path)
+        fig = report._create_figure()
+
+        grid_import = next(t for t in fig.data if t.name == 'Grid Import')
+        assert max(grid_import.y) == pytest.approx(report.df['grid_power_kw'].max())
+
+    def test_downsampling_shrinks_html(self, tmp_path):
+        full = _report(tmp_path / 'full', downsample=False).generate()
+        small = _report(tmp_path / 'small').generate()
+
+        assert small.stat().st_size < full.stat().st_size / 5
+
+    def test_zoom_resampling_embeds_full_series(self, tmp_path):
+        report = _report(tmp_path, zoom_resampling=True)
+        html = report.generate().read_text(encoding='utf-8')
+
+        assert 'plotly_relayout' in html
+        assert len(report._zoom_series) >= 10
+        assert all(len(y) == len(report.df) for y in report._zoom_series.values())
+
+    def test_zoom_script_config(self):
+        x = pd.date_range('2024-01-01', periods=96, freq='15min', tz='Europe/Oslo')
+        script = zoom_resampling_script(x, {0: np.arange(96.0)}, 20)
+
+        assert "'{plot_id}'" in script
+        assert '"budget": 20' in script
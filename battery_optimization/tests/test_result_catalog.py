@@ -0,0 +1,125 @@
+"""
+Tests for the SQLite result catalog behind ResultStorage.
+
+Tests validate:
+- Save/load/delete round-trip through the catalog
+- SQL-backed filtering, sorting and pagination in list_results
+- Migration from the legacy result_index.json
+- Concurrent writers sharing one catalog file
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.persistence import ResultStorage, ResultCatalog, ResultMetadata, StorageFormat
+from src.simulation.simulation_results import SimulationResults
+
+
+def _results(battery_kwh, total_cost, mode='monthly', start='2024-01-01'):
+    timestamps = pd.date_range(start, periods=24, freq='h')
+    trajectory = pd.DataFrame({
+        'P_charge_kw': np.zeros(24),
+        'P_discharge_kw': np.zeros(24),
+        'P_grid_import_kw': np.full(24, 10.0),
+        'P_grid_export_kw': np.zeros(24),
+        'E_battery_kwh': np.zeros(24),
+        'P_curtail_kw': np.zeros(24),
+    }, index=timestamps)
+    return SimulationResults(
+        mode=mode,
+        start_date=timestamps[0].to_pydatetime(),
+        end_date=timestamps[-1].to_pydatetime(),
+        trajectory=trajectory,
+        monthly_summary=pd.DataFrame({'total_cost_nok': [total_cost]}),
+        economic_metrics={'total_cost_nok': total_cost},
+        metadata={'battery_kwh': battery_kwh, 'battery_kw': battery_kwh / 2},
+    )
+
+
+def _metadata(result_id, battery_kwh, total_cost, mode='monthly'):
+    return ResultMetadata(
+        result_id=result_id,
+        created_at=datetime(2024, 6, 1, 12, 0),
+        mode=mode,
+        start_date=datetime(2024, 1, 1),
+        end_date=datetime(2024, 12, 31),
+        battery_kwh=battery_kwh,
+        battery_kw=battery_kwh / 2,
+        storage_format='pickle',
+        file_path=f'{result_id}/results.pkl',
+        file_size_mb=0.1,
+        total_cost_nok=total_cost,
+    )
+
+
+class TestResultStorageCatalog:
+    """ResultStorage keeps its index in SQLite"""
+
+    def test_save_load_delete_round_trip(self, tmp_path):
+        storage = ResultStorage(tmp_path, default_format=StorageFormat.PICKLE)
+
+        result_id = storage.save(_results(80, 1234.0), result_id='run_a')
+
+        assert storage.get_metadata(result_id).battery_kwh == 80
+        assert storage.load(result_id).economic_metrics['total_cost_nok'] == 1234.0
+
+        # A fresh instance sees the same catalog
+        assert 'run_a' in ResultStorage(tmp_path).index
+
+        storage.delete(result_id)
+        with pytest.raises(KeyError):
+            storage.get_metadata(result_id)
+
+    def test_list_results_filters_sorts_and_paginates(self, tmp_path):
+        storage = ResultStorage(tmp_path)
+        storage.catalog.add_many([
+            _metadata(f'run_{i}', battery_kwh=20 * i, total_cost=1000 - 10 * i)
+            for i in range(1, 11)
+        ] + [_metadata('yearly_run', 100, 500.0, mode='yearly')])
+
+        monthly = storage.list_results(mode='monthly', battery_kwh_min=60, battery_kwh_max=140)
+        assert {m.result_id for m in monthly} == {'run_3', 'run_4', 'run_5', 'run_6', 'run_7'}
+
+        cheapest = storage.list_results(order_by='total_cost_nok', descending=False, limit=3)
+        assert [m.result_id for m in cheapest] == ['yearly_run', 'run_10', 'run_9']
+
+        page_2 = storage.list_results(mode='monthly', order_by='battery_kwh',
+                                      descending=False, limit=4, offset=4)
+        assert [m.battery_kwh for m in page_2] == [100, 120, 140, 160]
+
+        assert storage.get_storage_stats()['results_by_mode'] == {'monthly': 10, 'yearly': 1}
+
+    def test_invalid_sort_column(self, tmp_path):
+        storage = ResultStorage(tmp_path)
+
+        with pytest.raises(ValueError, match="order_by"):
+            storage.list_results(order_by="notes; DROP TABLE results")
+
+    def test_migrates_legacy_json_index(self, tmp_path):
+        legacy = {m.result_id: m.to_dict() for m in (
+            _metadata('old_a', 40, 900.0), _metadata('old_b', 60, 800.0)
+        )}
+        (tmp_path / 'result_index.json').write_text(json.dumps(legacy))
+
+        storage = ResultStorage(tmp_path)
+
+        assert set(storage.index) == {'old_a', 'old_b'}
+        assert not (tmp_path / 'result_index.json').exists()
+        assert (tmp_path / 'result_index.json.migrated').exists()
+
+    def test_concurrent_writers(self, tmp_path):
+        catalog = ResultCatalog(tmp_path / 'catalog.sqlite')
+
+        def write(i):
+            # Separate catalog objects mimic independent sizing workers
+            ResultCatalog(tmp_path / 'catalog.sqlite').add(_metadata(f'w{i}', i, float(i)))
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(write, range(64)))
+
+        assert catalog.count() == 64
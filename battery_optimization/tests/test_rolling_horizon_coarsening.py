@@ -0,0 +1,122 @@
+"""
+Tests for the coarsened (multi-resolution) rolling horizon.
+
+Tests validate:
+- Block layout of coarsening schedules
+- Single-step blocks reproduce the native-resolution LP
+- Per-step Δt in dynamics, costs and degradation for coarse blocks
+- Full and compact formulations agree on coarsened horizons
+"""
+
+import io
+import contextlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config.legacy_config_adapter import get_global_legacy_config
+from src.operational.state_manager import BatterySystemState
+from core.rolling_horizon_optimizer import RollingHorizonOptimizer
+from core.time_aggregation import coarsening_block_lengths, aggregate_to_blocks
+
+
+def _optimizer(resolution='PT15M', compact=False, coarsening=None):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return RollingHorizonOptimizer(
+            config=get_global_legacy_config(),
+            battery_kwh=80,
+            battery_kw=40,
+            horizon_hours=168,
+            resolution=resolution,
+            compact=compact,
+            coarsening=coarsening
+        )
+
+
+def _week(freq='15min'):
+    """One week of PV/load/price with daily structure."""
+    timestamps = pd.date_range('2024-03-04', periods=168 * (4 if freq == '15min' else 1), freq=freq)
+    rng = np.random.default_rng(7)
+    hours = timestamps.hour.values + timestamps.minute.values / 60
+    n = len(timestamps)
+    pv = np.clip(100 * np.sin((hours - 6) / 12 * np.pi), 0, None) * (0.6 + 0.4 * rng.random(n))
+    load = 25 + 15 * ((hours >= 8) & (hours <= 17)) + 10 * rng.random(n)
+    spot = 0.6 + 0.4 * ((hours >= 17) & (hours <= 20)) - 0.3 * (hours < 5) + 0.2 * rng.standard_normal(n)
+    return timestamps, pv, load, spot
+
+
+def _state():
+    return BatterySystemState(current_soc_kwh=40.0, battery_capacity_kwh=80, current_monthly_peak_kw=30.0)
+
+
+class TestBlockLayout:
+    """coarsening_block_lengths / aggregate_to_blocks"""
+
+    def test_weekly_quarter_hour_schedule(self):
+        blocks = coarsening_block_lengths(672, 0.25, [(6, 1), (48, 4)])
+
+        assert blocks.sum() == 672
+        assert len(blocks) == 24 + 42 + 30
+        assert np.all(blocks[:24] == 1) and np.all(blocks[24:66] == 4) and np.all(blocks[66:] == 16)
+
+    def test_blocks_are_cut_at_breakpoints_and_horizon_end(self):
+        blocks = coarsening_block_lengths(10, 1.0, [(1, 4), (7, 2)])
+
+        np.testing.assert_array_equal(blocks, [1, 4, 2, 2, 1])
+
+    @pytest.mark.parametrize("coarsening", [[(0, 1)], [(6, 1), (6, 4)], [(6, 0.1)]])
+    def test_invalid_schedules(self, coarsening):
+        with pytest.raises(ValueError):
+            coarsening_block_lengths(672, 0.25, coarsening)
+
+    def test_block_means(self):
+        values = np.arange(7.0)
+
+        np.testing.assert_allclose(aggregate_to_blocks(values, [1, 2, 4]), [0.0, 1.5, 4.5])
+        np.testing.assert_allclose(aggregate_to_blocks(values, [1, 2, 4], how='max'), [0.0, 2.0, 6.0])
+
+
+def test_single_step_blocks_match_native_horizon():
+    timestamps, pv, load, spot = _week('h')
+    native = _optimizer('PT60M').optimize_window(_state(), pv, load, spot, timestamps)
+    coarsened = _optimizer('PT60M', coarsening=[(24, 1)]).optimize_window(_state(), pv, load, spot, timestamps)
+
+    assert coarsened.objective_value == pytest.approx(native.objective_value, rel=1e-9)
+    np.testing.assert_allclose(coarsened.timestep_hours, 1.0)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_coarsened_horizon_uses_per_step_dt(compact):
+    timestamps, pv, load, spot = _week()
+    optimizer = _optimizer(compact=compact, coarsening=[(6, 1), (48, 4)])
+
+    result = optimizer.optimize_window(_state(), pv, load, spot, timestamps)
+
+    assert result.success
+    assert len(result.P_charge) == 96
+    dt = result.timestep_hours
+    assert dt[0] == 0.25 and dt[-1] == 4.0 and dt.sum() == pytest.approx(168.0)
+
+    # Energy balance against block means
+    blocks = coarsening_block_lengths(672, 0.25, optimizer.coarsening)
+    balance = (result.P_grid_import - result.P_grid_export - result.P_charge
+               + result.P_discharge - result.P_curtail)
+    np.testing.assert_allclose(balance, aggregate_to_blocks(load - pv, blocks), atol=1e-6)
+
+    # Battery dynamics scale with each step's duration
+    energy_in = (optimizer.eta_charge * result.P_charge - result.P_discharge / optimizer.eta_discharge) * dt
+    np.testing.assert_allclose(np.diff(result.E_battery), energy_in[:-1], atol=1e-6)
+
+    # Calendar degradation floor scales with duration too
+    assert np.all(result.DP_total >= optimizer.dp_cal_per_hour * dt - 1e-12)
+
+
+def test_compact_matches_full_on_coarsened_horizon():
+    timestamps, pv, load, spot = _week()
+    coarsening = [(6, 1), (48, 4)]
+
+    full = _optimizer(coarsening=coarsening).optimize_window(_state(), pv, load, spot, timestamps)
+    compact = _optimizer(compact=True, coarsening=coarsening).optimize_window(_state(), pv, load, spot, timestamps)
+
+    assert compact.objective_value == pytest.approx(full.objective_value, rel=1e-6)
@@ -0,0 +1,84 @@
+"""
+Tests for the compact rolling horizon LP formulation.
+
+Tests validate:
+- Identical optimum to the full formulation across a year of weekly windows
+- Reconstructed degradation and export/curtailment series are consistent
+"""
+
+import io
+import contextlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config.legacy_config_adapter import get_global_legacy_config
+from src.operational.state_manager import BatterySystemState
+from core.rolling_horizon_optimizer import RollingHorizonOptimizer
+
+
+def _optimizer(compact):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return RollingHorizonOptimizer(
+            config=get_global_legacy_config(),
+            battery_kwh=80,
+            battery_kw=40,
+            horizon_hours=168,
+            resolution='PT60M',
+            compact=compact
+        )
+
+
+def _year():
+    """Hourly 2024 with seasonal PV (export limit binds in summer) and negative prices."""
+    rng = np.random.default_rng(3)
+    timestamps = pd.date_range('2024-01-01', periods=8784, freq='h')
+    hours = timestamps.hour.values
+    doy = timestamps.dayofyear.values
+    season = 0.3 + 0.7 * np.sin(doy / 366 * np.pi)
+    pv = np.clip(120 * np.sin((hours - 6) / 12 * np.pi), 0, None) * season * (0.6 + 0.4 * rng.random(8784))
+    load = 25 + 15 * ((hours >= 8) & (hours <= 17)) + 5 * rng.random(8784)
+    spot = (0.6 + 0.5 * np.sin(doy / 366 * 2 * np.pi) + 0.4 * ((hours >= 17) & (hours <= 20))
+            - 0.3 * (hours < 5) + 0.2 * rng.standard_normal(8784))
+    spot[(doy > 150) & (doy < 170) & (hours > 11) & (hours < 15)] = -0.2
+    return timestamps, pv, load, spot
+
+
+def test_compact_matches_full_formulation_over_year():
+    full, compact = _optimizer(False), _optimizer(True)
+    timestamps, pv, load, spot = _year()
+    T = full.T
+
+    for week in range(len(timestamps) // T):
+        window = slice(week * T, (week + 1) * T)
+        state = BatterySystemState(
+            current_soc_kwh=40.0,
+            battery_capacity_kwh=80,
+            current_monthly_peak_kw=20.0 * (week % 3)
+        )
+        args = (pv[window], load[window], spot[window], timestamps[window])
+
+        reference = full.optimize_window(state, *args)
+        reduced = compact.optimize_window(state, *args)
+
+        assert reference.success and reduced.success
+        assert reduced.objective_value == pytest.approx(reference.objective_value, rel=1e-6, abs=1e-6)
+
+
+def test_compact_reconstructs_eliminated_series():
+    compact = _optimizer(True)
+    timestamps, pv, load, spot = _year()
+    window = slice(24 * 170, 24 * 170 + compact.T)  # Summer week with negative prices
+    state = BatterySystemState(current_soc_kwh=40.0, battery_capacity_kwh=80)
+
+    result = compact.optimize_window(state, pv[window], load[window], spot[window], timestamps[window])
+
+    assert result.success
+    delta = np.diff(result.E_battery, prepend=40.0)
+    np.testing.assert_allclose(result.E_delta_pos - result.E_delta_neg, delta, atol=1e-9)
+    np.testing.assert_allclose(result.DOD_abs, np.abs(delta) / 80, atol=1e-9)
+    assert np.all(result.DP_total >= result.dp_cal_per_timestep - 1e-12)
+    balance = (result.P_grid_import - result.P_grid_export - result.P_charge
+               + result.P_discharge - result.P_curtail)
+    np.testing.assert_allclose(balance, load[window] - pv[window], atol=1e-6)
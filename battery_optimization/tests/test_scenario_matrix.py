@@ -0,0 +1,202 @@
+"""
+Tests for the scenario matrix runner and shared LP templates.
+
+Tests validate:
+- LP templates are shared between optimizers of the same battery and horizon
+- Solves from templates match the per-solve constraint build
+- Price stress scenarios keep daily means
+- Staged inputs match the file loaders; profiles move to the price year
+- Pool and in-process runs agree; savings are against the 0 kWh battery
+- YAML loading and axis validation
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from src.config.simulation_config import SimulationConfig
+from src.data.data_manager import DataManager
+from src.optimization.optimizer_factory import OptimizerFactory
+from src.simulation import (
+    BatterySize,
+    ConsumptionProfile,
+    PriceScenario,
+    ScenarioMatrixConfig,
+    ScenarioMatrixOrchestrator,
+)
+from src.simulation.scenario_matrix_orchestrator import _load_scenario_data
+from core.lp_monthly_optimizer import clear_lp_templates
+
+PRICES_2023 = 'data/spot_prices/NO2_2023_real.csv'
+PRICES_2024 = 'data/spot_prices/NO2_2024_60min_real.csv'
+
+
+def _base_config():
+    config = SimulationConfig.from_yaml('configs/working_config.yaml')
+    config.mode = 'monthly'
+    config.simulation_period.start_date = '2024-06-01'
+    config.simulation_period.end_date = '2024-06-07'
+    return config
+
+
+def _matrix(**kwargs):
+    config = _base_config()
+    return ScenarioMatrixConfig(
+        base_config=config,
+        prices=[PriceScenario('2023', PRICES_2023), PriceScenario('2024', PRICES_2024)],
+        profiles=[ConsumptionProfile('commercial', config.data_sources.consumption_file)],
+        batteries=[BatterySize(0, 0), BatterySize(80, 60)],
+        **kwargs,
+    )
+
+
+def _core_optimizer(capacity_kwh=80.0):
+    config = _base_config()
+    config.battery.capacity_kwh = capacity_kwh
+    return OptimizerFactory.create('monthly', config)._core_optimizer
+
+
+class TestLPTemplates:
+    """Constraint matrices shared across solves"""
+
+    def test_shared_by_battery_and_horizon(self):
+        clear_lp_templates()
+
+        template = _core_optimizer().lp_template(168)
+
+        assert _core_optimizer().lp_template(168) is template
+        assert _core_optimizer().lp_template(24) is not template
+        assert _core_optimizer(60.0).lp_template(168) is not template
+        assert not template.b_eq.flags.writeable
+
+    def test_solve_unchanged(self):
+        config = _base_config()
+        data = DataManager(config).load_data()
+        optimizer = _core_optimizer()
+        args = (6, data.pv_production_kw, data.consumption_kw, data.prices_nok_per_kwh, data.timestamps)
+
+        clear_lp_templates()
+        first = optimizer.optimize_month(*args, E_initial=40.0)
+        again = optimizer.optimize_month(*args, E_initial=20.0)
+        clear_lp_templates()
+        fresh = optimizer.optimize_month(*args, E_initial=20.0)
+
+        assert first.success and again.success
+        assert again.objective_value == pytest.approx(fresh.objective_value)
+        np.testing.assert_allclose(again.E_battery, fresh.E_battery, atol=1e-6)
+        assert again.E_battery[0] != pytest.approx(first.E_battery[0])
+
+
+class TestPriceScenario:
+    """Price stress transform"""
+
+    def test_spread_keeps_daily_mean(self):
+        timestamps = pd.date_range('2024-01-01', periods=72, freq='h')
+        prices = np.random.default_rng(3).uniform(0.2, 2.0, 72)
+
+        stressed = PriceScenario('x2', PRICES_2024, spread=2.0).apply(timestamps, prices)
+
+        days = np.asarray(timestamps.normalize())
+        np.testing.assert_allclose(pd.Series(stressed).groupby(days).mean(),
+                                   pd.Series(prices).groupby(days).mean())
+        np.testing.assert_allclose(np.diff(stressed[:24]), 2.0 * np.diff(prices[:24]))
+
+    def test_scale_and_offset(self):
+        timestamps = pd.date_range('2024-01-01', periods=3, freq='h')
+
+        prices = PriceScenario('s', PRICES_2024, scale=1.5, offset=0.1).apply(timestamps, np.array([1.0, 2.0, 3.0]))
+
+        np.testing.assert_allclose(prices, [1.6, 3.1, 4.6])
+
+
+class TestScenarioMatrixOrchestrator:
+    """Staging, execution and comparison"""
+
+    def test_staged_matches_loaded(self, tmp_path):
+        matrix = _matrix()
+        orchestrator = ScenarioMatrixOrchestrator(matrix)
+        tasks = orchestrator._stage(tmp_path, matrix.scenarios)
+
+        task = next(t for t in tasks if t.scenario.price.name == '2024')
+        staged = _load_scenario_data(task)
+        loaded = DataManager(task.config).load_data()
+        period = (staged.timestamps >= loaded.timestamps[0]) & (staged.timestamps <= loaded.timestamps[-1])
+
+        assert staged.timestamps[period].equals(loaded.timestamps)
+        np.testing.assert_allclose(staged.prices_nok_per_kwh[period], loaded.prices_nok_per_kwh)
+        np.testing.assert_allclose(staged.consumption_kw[period], loaded.consumption_kw)
+        np.testing.assert_allclose(staged.pv_production_kw[period], loaded.pv_production_kw)
+
+    def test_profile_moved_to_price_year(self, tmp_path):
+        matrix = _matrix()
+        orchestrator = ScenarioMatrixOrchestrator(matrix)
+        tasks = orchestrator._stage(tmp_path, matrix.scenarios)
+
+        task = next(t for t in tasks if t.scenario.price.name == '2023')
+        staged = _load_scenario_data(task)
+
+        assert task.config.simulation_period.start_date == '2023-06-01'
+        assert set(staged.timestamps.year) == {2023}
+        assert np.isfinite(staged.consumption_kw).all()
+
+    def test_pool_matches_in_process(self):
+        sequential = ScenarioMatrixOrchestrator(_matrix(workers=1), progress_callback=lambda update: None).run()
+        pooled = ScenarioMatrixOrchestrator(_matrix(workers=2), progress_callback=lambda update: None).run()
+
+        assert sequential['error'].isna().all()
+        assert list(sequential['price']) == ['2023', '2024', '2023', '2024']
+        np.testing.assert_allclose(pooled['grid_cost_nok'], sequential['grid_cost_nok'])
+        np.testing.assert_allclose(pooled['total_cost_nok'], sequential['total_cost_nok'])
+
+    def test_savings_against_reference(self):
+        table = ScenarioMatrixOrchestrator(_matrix(workers=1), progress_callback=lambda update: None).run()
+
+        reference = table[table['battery_kwh'] == 0].set_index('price')['grid_cost_nok']
+        battery = table[table['battery_kwh'] == 80].set_index('price')
+
+        assert (table.loc[table['battery_kwh'] == 0, 'savings_nok'] == 0).all()
+        np.testing.assert_allclose(battery['savings_nok'], reference[battery.index] - battery['grid_cost_nok'])
+        assert (battery['savings_nok'] > 0).all()
+
+    def test_output_file(self, tmp_path):
+        output_file = tmp_path / 'out' / 'comparison.csv'
+
+        table = ScenarioMatrixOrchestrator(_matrix(workers=1, output_file=str(output_file)),
+                                           progress_callback=lambda update: None).run()
+
+        assert len(pd.read_csv(output_file)) == len(table)
+
+
+class TestScenarioMatrixConfig:
+    """YAML loading and validation"""
+
+    def test_from_yaml(self, tmp_path):
+        (tmp_path / 'matrix.yaml').write_text(yaml.safe_dump({
+            'base_config': 'configs/working_config.yaml',
+            'workers': 2,
+            'prices': [{'name': 2024, 'file': PRICES_2024, 'spread': 1.5}],
+            'profiles': [{'name': 'commercial', 'consumption_file': 'data/consumption/commercial_2024.csv'}],
+            'batteries': [{'capacity_kwh': 0, 'power_kw': 0}, {'capacity_kwh': 80, 'power_kw': 60}],
+        }))
+
+        matrix = ScenarioMatrixConfig.from_yaml(tmp_path / 'matrix.yaml')
+
+        assert matrix.prices == [PriceScenario('2024', PRICES_2024, spread=1.5)]
+        assert matrix.workers == 2
+        assert len(matrix.scenarios) == 2
+        assert matrix.base_config.mode == 'rolling_horizon'
+
+    def test_duplicate_entries(self):
+        matrix = _matrix()
+        matrix.batteries.append(BatterySize(80, 60))
+
+        with pytest.raises(ValueError, match='battery'):
+            matrix.validate()
+
+    def test_unsupported_mode(self):
+        matrix = _matrix()
+        matrix.base_config.mode = 'screening'
+
+        with pytest.raises(ValueError, match='mode'):
+            matrix.validate()
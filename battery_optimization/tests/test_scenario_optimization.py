@@ -0,0 +1,178 @@
+"""
+Tests for scenario-based (stochastic) rolling horizon optimization.
+
+Tests validate:
+- One scenario (or identical scenarios) reproduces optimize_window()
+- Non-anticipative first step and shared vs. per-scenario peaks
+- Scenario weights, input validation and coarsened horizons
+- Constraint matrices are reused across re-optimizations
+"""
+
+import io
+import contextlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config.legacy_config_adapter import get_global_legacy_config
+from src.operational.state_manager import BatterySystemState
+from core.rolling_horizon_optimizer import RollingHorizonOptimizer
+
+
+def _optimizer(coarsening=None):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return RollingHorizonOptimizer(
+            config=get_global_legacy_config(),
+            battery_kwh=80,
+            battery_kw=40,
+            horizon_hours=24,
+            resolution='PT15M',
+            compact=True,
+            coarsening=coarsening
+        )
+
+
+def _day():
+    """One day of 15-min PV/load/price with daily structure."""
+    timestamps = pd.date_range('2024-03-04', periods=96, freq='15min')
+    rng = np.random.default_rng(7)
+    hours = timestamps.hour.values + timestamps.minute.values / 60
+    pv = np.clip(100 * np.sin((hours - 6) / 12 * np.pi), 0, None) * (0.6 + 0.4 * rng.random(96))
+    load = 25 + 15 * ((hours >= 8) & (hours <= 17)) + 10 * rng.random(96)
+    spot = 0.6 + 0.4 * ((hours >= 17) & (hours <= 20)) - 0.3 * (hours < 5)
+    return timestamps, pv, load, spot
+
+
+def _scenarios(pv, load, S, seed=3):
+    rng = np.random.default_rng(seed)
+    pv_sc = np.clip(pv * (1 + 0.3 * rng.standard_normal((S, len(pv)))), 0, None)
+    load_sc = load * (1 + 0.15 * rng.standard_normal((S, len(load))))
+    pv_sc[:, 0], load_sc[:, 0] = pv[0], load[0]  # Current step is measured
+    return pv_sc, load_sc
+
+
+def _state():
+    return BatterySystemState(current_soc_kwh=40.0, battery_capacity_kwh=80, current_monthly_peak_kw=30.0)
+
+
+@pytest.mark.parametrize("shared_peak", [False, True])
+def test_single_scenario_matches_deterministic(shared_peak):
+    timestamps, pv, load, spot = _day()
+    optimizer = _optimizer()
+
+    deterministic = optimizer.optimize_window(_state(), pv, load, spot, timestamps)
+    single = optimizer.optimize_scenarios(_state(), pv, load, spot, timestamps, shared_peak=shared_peak)
+    repeated = optimizer.optimize_scenarios(
+        _state(), np.tile(pv, (4, 1)), np.tile(load, (4, 1)), spot, timestamps, shared_peak=shared_peak
+    )
+
+    assert single.success and repeated.success
+    assert single.objective_value == pytest.approx(deterministic.objective_value, rel=1e-6)
+    assert repeated.objective_value == pytest.approx(deterministic.objective_value, rel=1e-6)
+    assert single.P_grid_import.shape == (1, 96)
+
+
+class TestTwoStageStructure:
+    """Non-anticipativity and peak coupling"""
+
+    def test_first_setpoint_is_non_anticipative(self):
+        timestamps, pv, load, spot = _day()
+        pv_sc, load_sc = _scenarios(pv, load, S=6)
+
+        result = _optimizer().optimize_scenarios(_state(), pv_sc, load_sc, spot, timestamps)
+
+        assert result.success and result.n_scenarios == 6
+        np.testing.assert_allclose(result.P_charge[:, 0], result.P_charge[0, 0], atol=1e-7)
+        np.testing.assert_allclose(result.P_discharge[:, 0], result.P_discharge[0, 0], atol=1e-7)
+        assert result.next_battery_setpoint_kw == pytest.approx(
+            result.P_charge[0, 0] - result.P_discharge[0, 0]
+        )
+        # Later steps adapt to each scenario
+        assert np.ptp(result.P_grid_import[:, 1:], axis=0).max() > 1.0
+
+    def test_per_scenario_peaks_cover_their_imports(self):
+        timestamps, pv, load, spot = _day()
+        pv_sc, load_sc = _scenarios(pv, load, S=6)
+
+        result = _optimizer().optimize_scenarios(_state(), pv_sc, load_sc, spot, timestamps)
+
+        assert np.all(result.P_monthly_peak_new >= result.P_grid_import.max(axis=1) - 1e-6)
+        assert np.all(result.P_monthly_peak_new >= 30.0 - 1e-9)
+
+    def test_shared_peak_covers_every_scenario(self):
+        timestamps, pv, load, spot = _day()
+        pv_sc, load_sc = _scenarios(pv, load, S=6)
+        optimizer = _optimizer()
+
+        shared = optimizer.optimize_scenarios(_state(), pv_sc, load_sc, spot, timestamps, shared_peak=True)
+        expected = optimizer.optimize_scenarios(_state(), pv_sc, load_sc, spot, timestamps)
+
+        assert np.ptp(shared.P_monthly_peak_new) == 0.0
+        assert shared.P_monthly_peak_new[0] >= shared.P_grid_import.max() - 1e-6
+        # The shared peak restricts the recourse problem
+        assert shared.objective_value >= expected.objective_value - 1e-6
+
+
+def test_weights_are_normalized():
+    timestamps, pv, load, spot = _day()
+    pv_sc, load_sc = _scenarios(pv, load, S=3)
+    optimizer = _optimizer()
+
+    weighted = optimizer.optimize_scenarios(_state(), pv_sc, load_sc, spot, timestamps, weights=[2, 1, 1])
+    dominant = optimizer.optimize_scenarios(
+        _state(), pv_sc, load_sc, spot, timestamps, weights=[1e6, 1e-6, 1e-6]
+    )
+    first = optimizer.optimize_scenarios(_state(), pv_sc[0], load_sc[0], spot, timestamps)
+
+    np.testing.assert_allclose(weighted.weights, [0.5, 0.25, 0.25])
+    assert weighted.energy_cost == pytest.approx(weighted.weights @ weighted.scenario_energy_cost)
+    assert dominant.objective_value == pytest.approx(first.objective_value, rel=1e-3)
+
+
+@pytest.mark.parametrize("kwargs", [
+    dict(weights=[1.0, -1.0]),
+    dict(weights=[1.0, 1.0, 1.0]),
+    dict(load_scenarios=np.zeros((3, 96))),
+    dict(pv_scenarios=np.zeros((2, 95))),
+])
+def test_invalid_inputs(kwargs):
+    timestamps, pv, load, spot = _day()
+    pv_sc, load_sc = _scenarios(pv, load, S=2)
+    inputs = dict(pv_scenarios=pv_sc, load_scenarios=load_sc, spot_price_scenarios=spot,
+                  timestamps=timestamps)
+    inputs.update(kwargs)
+
+    with pytest.raises(ValueError):
+        _optimizer().optimize_scenarios(_state(), **inputs)
+
+
+def test_price_scenarios_and_coarsened_horizon():
+    timestamps, pv, load, spot = _day()
+    pv_sc, load_sc = _scenarios(pv, load, S=4)
+    spot_sc = spot * np.array([[0.8], [1.0], [1.2], [1.5]])
+
+    result = _optimizer(coarsening=[(2, 1), (12, 4)]).optimize_scenarios(
+        _state(), pv_sc, load_sc, spot_sc, timestamps
+    )
+
+    assert result.success
+    assert result.P_charge.shape == (4, 8 + 10 + 3)
+    assert result.timestep_hours.sum() == pytest.approx(24.0)
+
+
+def test_constraint_matrices_are_reused():
+    timestamps, pv, load, spot = _day()
+    optimizer = _optimizer()
+
+    pv_sc, load_sc = _scenarios(pv, load, S=5, seed=1)
+    first = optimizer.optimize_scenarios(_state(), pv_sc, load_sc, spot, timestamps)
+    matrices = optimizer._scenario_lp[1]
+
+    pv_sc, load_sc = _scenarios(pv, load, S=5, seed=2)
+    optimizer.optimize_scenarios(_state(), pv_sc, load_sc, spot, timestamps)
+    assert optimizer._scenario_lp[1] is matrices
+
+    optimizer.optimize_scenarios(_state(), pv_sc[:3], load_sc[:3], spot, timestamps)
+    assert optimizer._scenario_lp[1] is not matrices
+    assert first.success
@@ -0,0 +1,150 @@
+"""
+Tests for representative-period screening.
+
+Tests validate:
+- Weighted, SOC-linked monthly LP used for compressed years
+- Candidate grid construction in ScreeningOrchestrator
+- Vectorized period features and the on-disk cluster cache
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config.legacy_config_adapter import get_global_legacy_config
+from src.config.simulation_config import SimulationConfig, DimensioningConfig
+from src.simulation.screening_orchestrator import ScreeningOrchestrator
+from core.lp_monthly_optimizer import MonthlyLPOptimizer
+from core import representative_periods
+from core.representative_periods import RepresentativeDaysOptimizer, _period_features
+
+
+def _three_days():
+    """Three hourly days with cheap nights and expensive evenings."""
+    T = 72
+    hours = np.arange(T) % 24
+    pv = np.clip(30 * np.sin((hours - 6) / 12 * np.pi), 0, None)
+    load = np.full(T, 25.0)
+    prices = 0.4 + 0.9 * ((hours >= 17) & (hours <= 20))
+    timestamps = pd.date_range('2024-03-04', periods=T, freq='h')
+    return timestamps, pv, load, prices
+
+
+@pytest.fixture
+def optimizer():
+    return MonthlyLPOptimizer(
+        get_global_legacy_config(),
+        resolution='PT60M',
+        battery_kwh=60,
+        battery_kw=30
+    )
+
+
+class TestWeightedLinkedLP:
+    """Representative-period extensions of MonthlyLPOptimizer.optimize_month"""
+
+    def test_period_linking_makes_days_soc_neutral(self, optimizer):
+        timestamps, pv, load, prices = _three_days()
+
+        result = optimizer.optimize_month(1, pv, load, prices, timestamps,
+                                          E_initial=30.0, period_length=24)
+
+        assert result.success
+        day_end_soc = result.E_battery[[23, 47, 71]]
+        np.testing.assert_allclose(day_end_soc, 30.0, atol=1e-6)
+
+    def test_uniform_weights_scale_energy_cost(self):
+        # No battery: dispatch is fixed, so only the cost weighting differs
+        optimizer = MonthlyLPOptimizer(get_global_legacy_config(), resolution='PT60M',
+                                       battery_kwh=0, battery_kw=0)
+        timestamps, pv, load, prices = _three_days()
+
+        unweighted = optimizer.optimize_month(1, pv, load, prices, timestamps, E_initial=0.0)
+        weighted = optimizer.optimize_month(1, pv, load, prices, timestamps, E_initial=0.0,
+                                            timestep_weights=np.full(72, 2.0))
+
+        assert weighted.energy_cost == pytest.approx(2.0 * unweighted.energy_cost, rel=1e-4)
+
+    def test_period_length_must_divide_horizon(self, optimizer):
+        timestamps, pv, load, prices = _three_days()
+
+        with pytest.raises(ValueError, match="period_length"):
+            optimizer.optimize_month(1, pv, load, prices, timestamps, period_length=25)
+
+
+class TestCandidateGrid:
+    """Candidate sizes come from the dimensioning ranges"""
+
+    def test_grid_respects_c_rate_limit(self):
+        config = SimulationConfig(
+            mode="screening",
+            dimensioning=DimensioningConfig(
+                energy_range_kwh=(10.0, 31.0, 10.0),
+                power_range_kw=(10.0, 61.0, 25.0),
+                slsqp_c_rate_max=2.0,
+            ),
+        )
+
+        candidates = ScreeningOrchestrator(config)._candidate_sizes()
+
+        assert (10.0, 10.0) in candidates
+        assert (10.0, 35.0) not in candidates  # 3.5C
+        assert (30.0, 60.0) in candidates
+        assert all(kw / kwh <= 2.0 for kwh, kw in candidates)
+
+
+def _hourly_year():
+    """Leap-year hourly PV/load/price series with seasonal PV."""
+    rng = np.random.default_rng(0)
+    timestamps = pd.date_range('2024-01-01', periods=8784, freq='h')
+    hours = timestamps.hour.values
+    season = 0.5 + 0.5 * np.sin(timestamps.dayofyear.values / 366 * np.pi)
+    pv = np.clip(100 * np.sin((hours - 6) / 12 * np.pi), 0, None) * season
+    load = 30 + 10 * rng.random(8784)
+    prices = 0.5 + rng.random(8784)
+    return timestamps, pv, load, prices
+
+
+class TestRepresentativeDaySelection:
+    """Period features and memoized clustering"""
+
+    def test_quarter_hourly_features_match_hourly(self):
+        timestamps, pv, load, prices = _hourly_year()
+        timestamps_15 = pd.date_range(timestamps[0], periods=4 * len(timestamps), freq='15min')
+
+        hourly, _ = _period_features(timestamps, pv, load, prices, 24)
+        quarter, day_starts = _period_features(
+            timestamps_15, np.repeat(pv, 4), np.repeat(load, 4), np.repeat(prices, 4), 24
+        )
+
+        assert quarter.shape == (366, 10)
+        assert day_starts[1] == pd.Timestamp('2024-01-02')
+        np.testing.assert_allclose(quarter, hourly)
+
+    def test_cached_assignment_skips_clustering(self, tmp_path, monkeypatch):
+        timestamps, pv, load, prices = _hourly_year()
+        optimizer = RepresentativeDaysOptimizer(12, aggregation_hours=1, cache_dir=tmp_path)
+
+        first = optimizer.select_representative_days(timestamps, pv, load, prices)
+
+        def _fail(*args, **kwargs):
+            raise AssertionError("clustering should be served from cache")
+
+        monkeypatch.setattr(representative_periods, '_cluster_periods', _fail)
+        second = optimizer.select_representative_days(timestamps, pv, load, prices)
+
+        assert second[0] == first[0]
+        np.testing.assert_array_equal(second[1], first[1])
+        np.testing.assert_array_equal(second[2]['day_weights'], first[2]['day_weights'])
+        assert second[2]['day_weights'].sum() == 366
+
+    def test_cache_key_depends_on_k_and_aggregation(self):
+        timestamps, pv, load, prices = _hourly_year()
+        make_key = representative_periods.ClusterCache.make_key
+
+        base = make_key(timestamps, pv, load, prices, 'days', 12, 1)
+
+        assert make_key(timestamps, pv, load, prices, 'days', 12, 1) == base
+        assert make_key(timestamps, pv, load, prices, 'days', 13, 1) != base
+        assert make_key(timestamps, pv, load, prices, 'days', 12, 2) != base
+        assert make_key(timestamps, pv * 1.01, load, prices, 'days', 12, 1) != base
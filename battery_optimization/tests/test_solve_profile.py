@@ -0,0 +1,186 @@
+"""
+Tests for per-phase solve timings.
+
+Tests validate:
+- PhaseTimer accumulates laps per phase
+- SolveProfile aggregates p50/p95/max per phase
+- Rolling horizon (full and compact) and monthly LP results carry timings
+- Orchestrator metadata includes the run-level solve profile
+- Result catalog stores the total solve time (including old databases)
+"""
+
+import io
+import contextlib
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config.legacy_config_adapter import get_global_legacy_config
+from src.config.simulation_config import SimulationConfig
+from src.data.data_manager import DataManager, TimeSeriesData
+from src.operational.state_manager import BatterySystemState
+from src.persistence import ResultCatalog, ResultStorage, StorageFormat
+from src.persistence.metadata_builder import MetadataBuilder
+from src.persistence.result_catalog import _SCHEMA
+from src.simulation.rolling_horizon_orchestrator import RollingHorizonOrchestrator
+from src.simulation.simulation_results import SimulationResults
+from core.lp_monthly_optimizer import MonthlyLPOptimizer
+from core.rolling_horizon_optimizer import RollingHorizonOptimizer
+from core.solve_profile import PHASES, PhaseTimer, SolveProfile, SolveTimings
+
+
+def _window(T=24, start='2024-06-03'):
+    timestamps = pd.date_range(start, periods=T, freq='h')
+    hours = timestamps.hour.values
+    pv = np.clip(60 * np.sin((hours - 6) / 12 * np.pi), 0, None)
+    load = 30 + 20 * ((hours >= 8) & (hours <= 17))
+    prices = 0.5 + 0.5 * ((hours >= 17) & (hours <= 20)) - 0.2 * (hours < 5)
+    return pv, load, prices, timestamps
+
+
+def _assert_timed(timings, solve_time_seconds):
+    assert isinstance(timings, SolveTimings)
+    for phase in PHASES:
+        assert getattr(timings, f"{phase}_ns") > 0
+    assert timings.total_seconds == pytest.approx(solve_time_seconds)
+    assert timings.n_variables > 0 and timings.n_nonzeros > 0
+    assert timings.iterations is not None and timings.iterations >= 0
+
+
+class TestSolveProfile:
+    """Timer and aggregation"""
+
+    def test_phase_timer_accumulates_laps(self):
+        timer = PhaseTimer()
+        timer.lap('tariff')
+        timer.lap('solve')
+        timer.lap('solve')
+
+        timings = timer.timings
+        assert timings.tariff_ns > 0 and timings.solve_ns > 0
+        assert timings.assembly_ns == 0
+        assert timings.total_ns == timings.tariff_ns + timings.solve_ns + timings.extraction_ns
+
+    def test_summary_percentiles(self):
+        profile = SolveProfile()
+        for ms in range(1, 101):
+            profile.add(SolveTimings(solve_ns=ms * 1_000_000, assembly_ns=1_000_000, iterations=ms))
+        profile.add(None)
+
+        summary = profile.summary()
+        solve = summary['phases']['solve']
+        assert summary['n_solves'] == 100
+        assert solve['p50_ms'] == pytest.approx(50.5)
+        assert solve['p95_ms'] == pytest.approx(95.05)
+        assert solve['max_ms'] == pytest.approx(100.0)
+        assert summary['phases']['total']['total_s'] == pytest.approx(5.05 + 0.1)
+        assert sum(summary['phases'][p]['share'] for p in PHASES) == pytest.approx(1.0)
+        assert summary['iterations_max'] == 100
+        assert 'solve' in profile.format_table()
+
+    def test_empty_profile(self):
+        assert SolveProfile().summary() == {'n_solves': 0}
+
+
+class TestOptimizerTimings:
+    """Every solve path fills SolveTimings"""
+
+    @pytest.mark.parametrize('compact', [False, True])
+    def test_rolling_horizon_window(self, compact):
+        with contextlib.redirect_stdout(io.StringIO()):
+            optimizer = RollingHorizonOptimizer(
+                config=get_global_legacy_config(), battery_kwh=80, battery_kw=40,
+                horizon_hours=24, resolution='PT60M', compact=compact
+            )
+        state = BatterySystemState(current_soc_kwh=40.0, battery_capacity_kwh=80)
+
+        result = optimizer.optimize_window(state, *_window())
+
+        assert result.success
+        _assert_timed(result.timings, result.solve_time_seconds)
+
+    def test_monthly_lp(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            optimizer = MonthlyLPOptimizer(get_global_legacy_config(), resolution='PT60M',
+                                           battery_kwh=60, battery_kw=30)
+            pv, load, prices, timestamps = _window(72)
+            result = optimizer.optimize_month(6, pv, load, prices, timestamps, E_initial=30.0)
+
+        assert result.success
+        _assert_timed(result.timings, result.timings.total_seconds)
+
+
+class TestRunProfile:
+    """Solve profile in simulation and storage metadata"""
+
+    def test_orchestrator_metadata(self):
+        config = SimulationConfig.from_yaml('configs/working_config.yaml')
+        config.simulation_period.start_date = '2024-06-03'
+        config.simulation_period.end_date = '2024-06-04'
+        config.rolling_horizon.execute_steps = 4
+        pv, load, prices, timestamps = _window(72)
+
+        orchestrator = RollingHorizonOrchestrator(config)
+        orchestrator.data_manager = DataManager(config, data=TimeSeriesData(
+            timestamps=timestamps, prices_nok_per_kwh=prices, pv_production_kw=pv,
+            consumption_kw=load, resolution='PT60M',
+        ))
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            results = orchestrator.run()
+
+        profile = results.metadata['solve_profile']
+        assert profile['n_solves'] == results.metadata['execution_stats']['solves']
+        assert set(profile['phases']) == set(PHASES) | {'total'}
+
+    def test_storage_records_solve_time(self, tmp_path):
+        profile = SolveProfile()
+        profile.add(SolveTimings(solve_ns=2_000_000_000, iterations=10))
+        timestamps = pd.date_range('2024-01-01', periods=24, freq='h')
+        results = SimulationResults(
+            mode='rolling_horizon',
+            start_date=timestamps[0].to_pydatetime(),
+            end_date=timestamps[-1].to_pydatetime(),
+            trajectory=pd.DataFrame({
+                column: np.full(24, 10.0) for column in
+                ('P_charge_kw', 'P_discharge_kw', 'P_grid_import_kw', 'P_grid_export_kw',
+                 'E_battery_kwh', 'P_curtail_kw')
+            }, index=timestamps),
+            monthly_summary=pd.DataFrame(),
+            economic_metrics={},
+            metadata={'battery_kwh': 80, 'battery_kw': 40, 'solve_profile': profile.summary()},
+        )
+
+        storage = ResultStorage(tmp_path, default_format=StorageFormat.PICKLE)
+        result_id = storage.save(results, result_id='timed')
+
+        assert storage.get_metadata(result_id).solve_time_s == pytest.approx(2.0)
+        assert storage.list_results(order_by='solve_time_s')[0].result_id == 'timed'
+
+    def test_catalog_adds_column_to_old_database(self, tmp_path):
+        db_path = tmp_path / 'catalog.db'
+        with sqlite3.connect(db_path) as conn:
+            conn.executescript(_SCHEMA.replace("    solve_time_s     REAL,\n", ""))
+            conn.execute("INSERT INTO results (result_id, created_at, mode, start_date, end_date, battery_kwh, "
+                         "battery_kw, storage_format, file_path, file_size_mb) "
+                         "VALUES ('old', '2024-01-01', 'monthly', '2024-01-01', '2024-12-31', 80, 40, "
+                         "'pickle', 'old/results.pkl', 0.1)")
+
+        catalog = ResultCatalog(db_path)
+
+        assert catalog.get('old').solve_time_s is None
+        with sqlite3.connect(db_path) as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(results)")}
+        assert 'solve_time_s' in columns
+
+    def test_metadata_builder(self):
+        profile = SolveProfile()
+        profile.add(SolveTimings(solve_ns=500_000_000, iterations=12))
+
+        builder = MetadataBuilder().set_optimizer(method='rolling_horizon', solver='HiGHS')
+        metadata = builder.set_solve_profile(profile).build()
+
+        assert metadata['solve_profile']['n_solves'] == 1
+        assert metadata['optimizer']['solve_time_s'] == pytest.approx(0.5)
+        assert metadata['optimizer']['iterations'] == 12
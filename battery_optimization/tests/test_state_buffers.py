@@ -0,0 +1,126 @@
+"""
+Tests for the compact battery state, truncated plans and trajectory buffer.
+
+Tests validate:
+- BatterySystemState keeps integer epoch times behind the datetime API
+- Calendar properties and month resets match the calendar
+- States pickle, also from the former dataclass state
+- keep_steps returns the leading steps of the full plan with full-horizon costs
+- TrajectoryBuffer records steps into one structured array
+"""
+
+import io
+import contextlib
+import pickle
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config.legacy_config_adapter import get_global_legacy_config
+from src.operational.state_manager import BatterySystemState, epoch_ns, months_since_epoch
+from src.simulation.trajectory_buffer import TrajectoryBuffer
+from core.rolling_horizon_optimizer import RollingHorizonOptimizer
+
+
+class TestBatterySystemState:
+    """Slots, epoch times and calendar math"""
+
+    def test_slots_and_epoch_times(self):
+        state = BatterySystemState(current_soc_kwh=40.0, battery_capacity_kwh=80.0,
+                                   last_update=datetime(2024, 2, 10, 6))
+
+        assert not hasattr(state, '__dict__')
+        assert state.last_update_ns == pd.Timestamp('2024-02-10 06:00').value
+        assert state.last_update == datetime(2024, 2, 10, 6)
+        assert state.month_start_date == datetime(2024, 2, 1)
+        assert state.month_index == months_since_epoch(epoch_ns(datetime(2024, 2, 20)))
+
+    def test_days_in_leap_february(self):
+        state = BatterySystemState(last_update=datetime(2024, 2, 10, 23, 30))
+
+        assert state.days_remaining_in_month == 19
+        assert state.days_elapsed_in_month == 9
+
+    def test_month_reset_on_measurement(self):
+        state = BatterySystemState(last_update=datetime(2024, 1, 31, 22))
+        state.update_from_measurement(datetime(2024, 1, 31, 23), 40.0, 55.0)
+        state.update_from_measurement(pd.Timestamp('2024-02-01 00:00'), 40.0, 30.0)
+
+        assert state.current_monthly_peak_kw == 30.0
+        assert state.month_start_date == datetime(2024, 2, 1)
+        assert state.days_remaining_in_month == 28
+
+    def test_tz_aware_uses_wall_clock(self):
+        assert epoch_ns(pd.Timestamp('2024-06-01 00:30', tz='Europe/Oslo')) == pd.Timestamp('2024-06-01 00:30').value
+
+    def test_pickle_and_former_dataclass_state(self):
+        state = BatterySystemState(current_soc_kwh=12.0, battery_capacity_kwh=80.0,
+                                   current_monthly_peak_kw=44.0, last_update=datetime(2024, 3, 5, 7))
+
+        assert pickle.loads(pickle.dumps(state)) == state
+
+        legacy = BatterySystemState.__new__(BatterySystemState)
+        legacy.__setstate__({
+            'current_soc_kwh': 12.0, 'battery_capacity_kwh': 80.0, 'current_monthly_peak_kw': 44.0,
+            'month_start_date': datetime(2024, 3, 1), 'last_update': datetime(2024, 3, 5, 7),
+            'power_tariff_rate_nok_per_kw': 0.0,
+        })
+        assert legacy == state
+
+
+@pytest.fixture
+def window():
+    timestamps = pd.date_range('2024-06-03', periods=24, freq='h')
+    hours = timestamps.hour.values
+    pv = np.clip(80 * np.sin((hours - 6) / 12 * np.pi), 0, None)
+    load = 30 + 20 * ((hours >= 8) & (hours <= 17))
+    prices = 0.5 + 0.5 * ((hours >= 17) & (hours <= 20))
+    return pv, load, prices, timestamps
+
+
+class TestKeepSteps:
+    """Plans truncated to the executed steps"""
+
+    def test_head_of_full_plan(self, window):
+        with contextlib.redirect_stdout(io.StringIO()):
+            optimizer = RollingHorizonOptimizer(config=get_global_legacy_config(), battery_kwh=80,
+                                                battery_kw=40, horizon_hours=24, resolution='PT60M')
+        state = BatterySystemState(current_soc_kwh=40.0, battery_capacity_kwh=80)
+
+        full = optimizer.optimize_window(state, *window)
+        head = optimizer.optimize_window(state, *window, keep_steps=3)
+
+        assert len(head.P_charge) == len(head.timestep_hours) == 3
+        assert len(head.E_battery) == 4
+        assert head.horizon_steps == 24
+        np.testing.assert_allclose(head.P_grid_import, full.P_grid_import[:3])
+        np.testing.assert_allclose(head.E_battery, full.E_battery[:4])
+        assert head.E_battery_final == pytest.approx(full.E_battery_final)
+        assert head.objective_value_actual == pytest.approx(full.objective_value_actual)
+        assert not np.shares_memory(head.P_charge, full.P_charge)
+
+
+class TestTrajectoryBuffer:
+    """Structured record buffer"""
+
+    def test_records_to_dataframe(self):
+        timestamps = pd.date_range('2024-01-01', periods=4, freq='h')
+        buffer = TrajectoryBuffer(4, ['P_charge_kw', 'E_battery_kwh'])
+        for i in range(3):
+            buffer.append(timestamps.values[i], float(i), 10.0 * i)
+
+        frame = buffer.to_dataframe()
+
+        assert len(buffer) == 3
+        assert frame.index.equals(pd.DatetimeIndex(timestamps[:3], name='timestamp'))
+        assert list(frame.columns) == ['P_charge_kw', 'E_battery_kwh']
+        assert list(frame['E_battery_kwh']) == [0.0, 10.0, 20.0]
+
+    def test_full_buffer(self):
+        buffer = TrajectoryBuffer(1, ['P_charge_kw'])
+        buffer.append(np.datetime64('2024-01-01T00:00'), 1.0)
+
+        with pytest.raises(IndexError):
+            buffer.append(np.datetime64('2024-01-01T01:00'), 1.0)
@@ -0,0 +1,155 @@
+"""
+Tests for the exact step-function power tariff (bracket enumeration).
+
+Tests validate:
+- Step cost and candidate brackets follow the billed tariff
+- Exact mode is never worse than the progressive schedule billed at step cost
+- Exact mode matches a brute-force sweep over peak caps
+- Monthly LP exact mode reports the step cost of the peak reached
+- SimulationConfig.tariff_mode reaches the optimizers
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config.legacy_config_adapter import get_global_legacy_config
+from src.config.simulation_config import SimulationConfig
+from src.optimization.optimizer_factory import OptimizerFactory
+from src.operational.state_manager import BatterySystemState
+from core import rolling_horizon_optimizer
+from core.lp_monthly_optimizer import MonthlyLPOptimizer
+from core.rolling_horizon_optimizer import RollingHorizonOptimizer
+from core.step_tariff import BRACKET_EDGE_KW, bracket_caps, solve_brackets, step_tariff_cost
+
+
+BRACKETS = [(0, 2, 136), (2, 5, 232), (5, 10, 372), (10, 25, 972), (25, 50, 1772), (50, float('inf'), 2572)]
+
+
+def _day(seed=0, periods=96, freq='15min'):
+    timestamps = pd.date_range('2024-01-15', periods=periods, freq=freq)
+    hours = timestamps.hour.values + timestamps.minute.values / 60
+    rng = np.random.default_rng(seed)
+    pv = np.clip(30 * np.sin((hours - 7) / 10 * np.pi), 0, None)
+    load = 22 + 8 * np.sin((hours - 10) / 24 * 2 * np.pi) + 6 * rng.random(periods)
+    prices = 0.6 + 0.4 * np.sin((hours - 12) / 24 * 2 * np.pi)
+    return timestamps, pv, load, prices
+
+
+def _optimizer(**kwargs):
+    return RollingHorizonOptimizer(
+        config=get_global_legacy_config(), battery_kwh=40, battery_kw=20, horizon_hours=24, **kwargs
+    )
+
+
+def _state(peak=0.0):
+    return BatterySystemState(current_soc_kwh=20.0, battery_capacity_kwh=40, current_monthly_peak_kw=peak)
+
+
+class TestBrackets:
+    """Step cost and candidate brackets"""
+
+    def test_step_cost_matches_tariff(self):
+        tariff = get_global_legacy_config().tariff
+        brackets = tariff.power_brackets
+
+        for peak in [0.0, 1.99, 2.0, 24.9, 25.0, 49.99, 75.0, 150.0]:
+            assert step_tariff_cost(brackets, peak) == tariff.get_power_cost(peak)
+
+    def test_caps_skip_unreachable_brackets(self):
+        caps = bracket_caps(BRACKETS, current_peak_kw=6.0, max_peak_kw=40.0)
+
+        assert caps == pytest.approx([10.0, 25.0, 40.0], abs=1e-2)
+
+    def test_caps_never_below_current_peak(self):
+        assert bracket_caps(BRACKETS, current_peak_kw=9.9999, max_peak_kw=70.0)[0] == pytest.approx(9.9999)
+
+    def test_sequential_and_threaded_agree(self):
+        caps = [1.0, 2.0, 3.0]
+
+        assert solve_brackets(lambda cap: cap ** 2, caps, max_workers=1) == \
+            solve_brackets(lambda cap: cap ** 2, caps)
+
+
+class TestRollingHorizonExact:
+    """Exact mode of the rolling horizon optimizer"""
+
+    @pytest.mark.parametrize('peak', [0.0, 27.0])
+    def test_not_worse_than_progressive(self, peak):
+        timestamps, pv, load, prices = _day()
+        progressive = _optimizer().optimize_window(_state(peak), pv, load, prices, timestamps)
+        exact = _optimizer(tariff_mode='exact').optimize_window(_state(peak), pv, load, prices, timestamps)
+
+        assert exact.success
+        assert exact.objective_value_actual <= progressive.objective_value_actual + 1e-6
+
+    def test_matches_brute_force_peak_sweep(self, monkeypatch):
+        timestamps, pv, load, prices = _day(seed=1)
+        exact = _optimizer(tariff_mode='exact').optimize_window(_state(), pv, load, prices, timestamps)
+
+        # Same selection over a 0.5 kW grid of peak caps plus the bracket edges
+        edges = [to_kw - BRACKET_EDGE_KW for _, to_kw, _ in get_global_legacy_config().tariff.power_brackets]
+        sweep = sorted(set(np.arange(0.5, 70.01, 0.5)) | {e for e in edges if e < 70})
+        monkeypatch.setattr(rolling_horizon_optimizer, 'bracket_caps', lambda *args: sweep)
+        brute = _optimizer(tariff_mode='exact', tariff_workers=1).optimize_window(
+            _state(), pv, load, prices, timestamps)
+
+        assert exact.objective_value_actual == pytest.approx(brute.objective_value_actual, rel=1e-6)
+
+    def test_reports_peak_reached(self):
+        timestamps, pv, load, prices = _day(seed=2)
+        state = _state(peak=12.0)
+        tariff = get_global_legacy_config().tariff
+        result = _optimizer(tariff_mode='exact').optimize_window(state, pv, load, prices, timestamps)
+
+        peak = max(12.0, result.P_grid_import.max())
+        assert result.peak_penalty_actual == pytest.approx(
+            tariff.get_power_cost(peak) - tariff.get_power_cost(12.0))
+
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError, match='tariff_mode'):
+            _optimizer(tariff_mode='milp')
+
+
+class TestMonthlyExact:
+    """Exact mode of the monthly LP"""
+
+    def test_step_cost_of_peak_reached(self):
+        timestamps, pv, load, prices = _day(periods=24 * 31, freq='h')
+        tariff = get_global_legacy_config().tariff
+        results = {
+            mode: MonthlyLPOptimizer(get_global_legacy_config(), battery_kwh=40, battery_kw=20,
+                                     tariff_mode=mode).optimize_month(1, pv, load, prices, timestamps, E_initial=20)
+            for mode in ('progressive', 'exact')
+        }
+        exact = results['exact']
+
+        assert exact.success
+        assert exact.P_peak == pytest.approx(exact.P_grid_import.max())
+        assert exact.power_cost == tariff.get_power_cost(exact.P_peak)
+        billed = {
+            mode: r.energy_cost + r.degradation_cost + tariff.get_power_cost(r.P_grid_import.max())
+            for mode, r in results.items()
+        }
+        assert billed['exact'] <= billed['progressive'] + 1e-6
+
+
+class TestConfig:
+    """tariff_mode from SimulationConfig"""
+
+    @pytest.mark.parametrize('mode', ['rolling_horizon', 'monthly'])
+    def test_factory_passes_tariff_mode(self, mode):
+        config = SimulationConfig.from_yaml('configs/working_config.yaml')
+        config.tariff_mode = 'exact'
+        config.validate()
+
+        optimizer = OptimizerFactory.create(mode, config)
+
+        assert optimizer._core_optimizer.tariff_mode == 'exact'
+
+    def test_invalid_config_mode(self):
+        config = SimulationConfig.from_yaml('configs/working_config.yaml')
+        config.tariff_mode = 'step'
+
+        with pytest.raises(ValueError, match='tariff_mode'):
+            config.validate()
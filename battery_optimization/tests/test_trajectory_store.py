@@ -0,0 +1,99 @@
+"""
+Tests for the partitioned Parquet trajectory store.
+
+Tests validate:
+- Hive layout (result_id/year/month) and full-trajectory round-trip
+- Column projection, time-window filtering and result_id selection
+- ResultStorage integration for Parquet-format results
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.persistence import ResultStorage, StorageFormat, TrajectoryStore
+from src.simulation.simulation_results import SimulationResults
+
+
+def _trajectory(offset=0.0, periods=24 * 60):
+    timestamps = pd.date_range('2024-01-01', periods=periods, freq='h')
+    return pd.DataFrame({
+        'P_charge_kw': np.zeros(periods),
+        'P_discharge_kw': np.zeros(periods),
+        'P_grid_import_kw': np.full(periods, 10.0),
+        'P_grid_export_kw': np.zeros(periods),
+        'E_battery_kwh': np.arange(periods) + offset,
+        'P_curtail_kw': np.zeros(periods),
+    }, index=timestamps)
+
+
+class TestTrajectoryStore:
+    """Partitioned dataset read/write"""
+
+    def test_round_trip_and_layout(self, tmp_path):
+        store = TrajectoryStore(tmp_path)
+        trajectory = _trajectory()
+
+        store.write('run_a', trajectory)
+
+        assert (tmp_path / 'result_id=run_a' / 'year=2024' / 'month=2').is_dir()
+        pd.testing.assert_frame_equal(store.read('run_a'), trajectory, check_freq=False)
+
+    def test_query_projects_columns_and_window(self, tmp_path):
+        store = TrajectoryStore(tmp_path)
+        for i, rid in enumerate(['run_a', 'run_b', 'run_c']):
+            store.write(rid, _trajectory(offset=1000 * i))
+
+        week = store.query(
+            result_ids=['run_a', 'run_c'],
+            columns=['E_battery_kwh'],
+            start=datetime(2024, 2, 5),
+            end=datetime(2024, 2, 12),
+        )
+
+        assert list(week.columns) == ['result_id', 'E_battery_kwh']
+        assert set(week['result_id']) == {'run_a', 'run_c'}
+        assert len(week) == 2 * 7 * 24
+        assert week.index.min() == pd.Timestamp('2024-02-05')
+        assert week.index.max() == pd.Timestamp('2024-02-11 23:00')
+
+    def test_overwrite_drops_stale_months(self, tmp_path):
+        store = TrajectoryStore(tmp_path)
+        store.write('run_a', _trajectory())
+
+        store.write('run_a', _trajectory(periods=24))
+
+        assert len(store.read('run_a')) == 24
+        assert not (tmp_path / 'result_id=run_a' / 'year=2024' / 'month=2').exists()
+
+
+class TestResultStorageTrajectories:
+    """ResultStorage writes trajectories into the shared dataset"""
+
+    def test_parquet_results_load_and_query(self, tmp_path):
+        storage = ResultStorage(tmp_path, default_format=StorageFormat.PARQUET)
+        trajectory = _trajectory()
+        results = SimulationResults(
+            mode='monthly',
+            start_date=trajectory.index[0].to_pydatetime(),
+            end_date=trajectory.index[-1].to_pydatetime(),
+            trajectory=trajectory,
+            monthly_summary=pd.DataFrame({'total_cost_nok': [1.0, 2.0]}),
+            economic_metrics={'total_cost_nok': 3.0},
+            metadata={'battery_kwh': 80, 'battery_kw': 40},
+        )
+
+        storage.save(results, result_id='run_a')
+
+        assert not (tmp_path / 'run_a' / 'trajectory.parquet').exists()
+        loaded = storage.load('run_a')
+        pd.testing.assert_frame_equal(loaded.trajectory, trajectory, check_freq=False)
+
+        day = storage.query_trajectories(columns=['P_grid_import_kw'],
+                                         start=datetime(2024, 1, 2),
+                                         end=datetime(2024, 1, 3))
+        assert len(day) == 24
+
+        storage.delete('run_a')
+        assert storage.query_trajectories().empty
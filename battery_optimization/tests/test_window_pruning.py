@@ -0,0 +1,190 @@
+"""
+Tests for price-spread pruning of rolling horizon windows.
+
+Tests validate:
+- progressive_tariff_fill matches the progressive tariff LP
+- storage_margin detects windows where storing energy pays
+- Pruned windows have the LP objective (full, compact and exact tariff)
+- Windows with storage value, peak risk or curtailment need the LP
+- Pruning is configured through YAML and counted in the execution stats
+"""
+
+import io
+import contextlib
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+from scipy.optimize import linprog
+
+from src.config.legacy_config_adapter import get_global_legacy_config
+from src.config.simulation_config import SimulationConfig
+from src.data.data_manager import DataManager, TimeSeriesData
+from src.operational.state_manager import BatterySystemState
+from src.simulation.rolling_horizon_orchestrator import RollingHorizonOrchestrator
+from core.rolling_horizon_optimizer import RollingHorizonOptimizer
+from core.window_pruning import progressive_tariff_fill, prune_window, storage_margin
+
+
+def _optimizer(**kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return RollingHorizonOptimizer(config=get_global_legacy_config(), battery_kwh=80, battery_kw=60,
+                                       horizon_hours=24, resolution='PT60M', **kwargs)
+
+
+@pytest.fixture
+def falling_prices():
+    """Winter evening window: no PV, spot prices falling faster than round-trip losses recover."""
+    timestamps = pd.date_range('2024-01-10 16:00', periods=24, freq='h')
+    hours = timestamps.hour.values
+    pv = np.zeros(24)
+    load = 30 + 10 * ((hours >= 8) & (hours <= 17))
+    prices = np.linspace(3.0, 0.3, 24)
+    return pv, load, prices, timestamps
+
+
+class TestProgressiveTariffFill:
+    """Closed-form bracket fill"""
+
+    @pytest.mark.parametrize('peak_kw', [0.0, 1.5, 7.0, 24.0, 55.0, 99.0])
+    def test_matches_lp(self, peak_kw):
+        optimizer = _optimizer()
+        p, c = optimizer.p_trinn, optimizer.c_trinn
+        n = len(p)
+        peak_kw = min(peak_kw, p.sum())
+
+        # z[i+1] <= z[i], sum p·z = peak
+        A_ub = np.zeros((n - 1, n))
+        A_ub[np.arange(n - 1), np.arange(1, n)] = 1
+        A_ub[np.arange(n - 1), np.arange(n - 1)] = -1
+        lp = linprog(c, A_ub=A_ub, b_ub=np.zeros(n - 1), A_eq=p[None, :], b_eq=[peak_kw],
+                     bounds=[(0, 1)] * n, method='highs')
+
+        z = progressive_tariff_fill(p, c, peak_kw)
+
+        assert np.dot(p, z) == pytest.approx(peak_kw)
+        assert np.all(np.diff(z) <= 1e-12) and z.min() >= 0 and z.max() <= 1
+        assert np.dot(c, z) == pytest.approx(lp.fun, abs=1e-9)
+
+    def test_peak_above_brackets(self):
+        with pytest.raises(ValueError, match='exceeds'):
+            progressive_tariff_fill(np.array([2.0, 3.0]), np.array([1.0, 2.0]), 6.0)
+
+
+class TestStorageMargin:
+    """Value bound of storing energy"""
+
+    def test_spread_against_losses(self):
+        net_load = np.full(4, 10.0)
+        flat = np.full(4, 1.0)
+
+        assert storage_margin(net_load, flat, flat * 0.1, 0.9) == pytest.approx(-0.1)
+        assert storage_margin(net_load, np.array([1.0, 1.0, 1.2, 5.0]), flat * 0.1, 0.9) == pytest.approx(0.08)
+
+    def test_surplus_charges_at_export_value(self):
+        net_load = np.array([-10.0, 10.0, 10.0, 10.0])
+        c_import = np.full(4, 1.0)
+
+        assert storage_margin(net_load, c_import, np.full(4, 0.1), 0.9) == pytest.approx(0.8)
+
+    def test_last_step_moves_no_energy(self):
+        net_load = np.full(3, 10.0)
+
+        assert storage_margin(net_load, np.array([1.0, 1.0, 9.0]), np.zeros(3), 0.9) < 0
+        assert storage_margin(net_load[:2], np.ones(2), np.zeros(2), 0.9) == -np.inf
+
+
+class TestPrunedWindows:
+    """Pruned schedules against the LP"""
+
+    @pytest.mark.parametrize('options', [{}, {'compact': True}, {'tariff_mode': 'exact'}])
+    @pytest.mark.parametrize('soc_kwh', [8.0, 40.0, 72.0])
+    def test_same_objective_as_lp(self, falling_prices, options, soc_kwh):
+        state = BatterySystemState(current_soc_kwh=soc_kwh, battery_capacity_kwh=80,
+                                   current_monthly_peak_kw=45.0)
+
+        lp = _optimizer(**options).optimize_window(state, *falling_prices)
+        pruned = _optimizer(prune_windows=True, **options).optimize_window(state, *falling_prices)
+
+        assert pruned.pruned and not lp.pruned
+        assert pruned.success
+        assert pruned.objective_value == pytest.approx(lp.objective_value, abs=1e-6)
+        assert pruned.objective_value_actual == pytest.approx(lp.objective_value_actual, abs=1e-6)
+        assert pruned.E_battery_final == pytest.approx(lp.E_battery_final, abs=1e-6)
+        assert np.all(pruned.P_charge == 0)
+        np.testing.assert_allclose(pruned.P_grid_import - pruned.P_grid_export + pruned.P_discharge,
+                                   falling_prices[1] - falling_prices[0], atol=1e-9)
+
+    def test_keep_steps(self, falling_prices):
+        state = BatterySystemState(current_soc_kwh=40.0, battery_capacity_kwh=80, current_monthly_peak_kw=45.0)
+        optimizer = _optimizer(prune_windows=True)
+
+        full = optimizer.optimize_window(state, *falling_prices)
+        head = optimizer.optimize_window(state, *falling_prices, keep_steps=3)
+
+        assert head.pruned and len(head.P_discharge) == 3
+        np.testing.assert_allclose(head.E_battery, full.E_battery[:4])
+
+    def test_storage_value_needs_lp(self, falling_prices):
+        pv, load, prices, timestamps = falling_prices
+        state = BatterySystemState(current_soc_kwh=40.0, battery_capacity_kwh=80, current_monthly_peak_kw=45.0)
+
+        result = _optimizer(prune_windows=True).optimize_window(state, pv, load, prices[::-1].copy(), timestamps)
+
+        assert not result.pruned
+
+    def test_peak_at_stake_needs_lp(self, falling_prices):
+        state = BatterySystemState(current_soc_kwh=40.0, battery_capacity_kwh=80, current_monthly_peak_kw=35.0)
+
+        assert not _optimizer(prune_windows=True).optimize_window(state, *falling_prices).pruned
+
+    def test_curtailment_needs_lp(self):
+        net_load = np.full(4, -80.0)
+        prices = np.full(4, 1.0)
+
+        schedule = prune_window(net_load, prices, prices * 0.5, np.ones(4), 40.0, 8.0, 72.0, 60.0, 0.95, 0.95,
+                                import_limit_kw=70.0, export_limit_kw=70.0, current_peak_kw=0.0,
+                                free_cycling_kwh=np.zeros(4), cycling_cost_per_kwh=0.0)
+
+        assert schedule is None
+
+    def test_duals_need_lp(self, falling_prices):
+        state = BatterySystemState(current_soc_kwh=40.0, battery_capacity_kwh=80, current_monthly_peak_kw=45.0)
+
+        result = _optimizer(prune_windows=True).optimize_window(state, *falling_prices, return_duals=True)
+
+        assert not result.pruned and result.duals is not None
+
+
+class TestPruningConfig:
+    """YAML and execution stats"""
+
+    def test_yaml_setting(self, tmp_path):
+        config = SimulationConfig.from_yaml('configs/working_config.yaml')
+        assert config.rolling_horizon.prune_windows is False
+
+        config.rolling_horizon.prune_windows = True
+        config.to_yaml(tmp_path / 'config.yaml')
+
+        rolling_horizon = yaml.safe_load((tmp_path / 'config.yaml').read_text())['mode_specific']['rolling_horizon']
+        assert rolling_horizon['prune_windows'] is True
+
+    def test_stats_count_pruned_windows(self):
+        # Falling prices; an early load spike sets the monthly peak above the later load
+        timestamps = pd.date_range('2024-01-10', periods=48, freq='h')
+        data = TimeSeriesData(timestamps=timestamps, prices_nok_per_kwh=np.linspace(6.0, 0.1, 48),
+                              pv_production_kw=np.zeros(48), consumption_kw=np.where(np.arange(48) < 2, 60.0, 30.0),
+                              resolution='PT60M')
+        config = SimulationConfig.from_yaml('configs/working_config.yaml')
+        config.simulation_period.start_date = '2024-01-10'
+        config.simulation_period.end_date = '2024-01-11'
+        config.rolling_horizon.prune_windows = True
+        config.rolling_horizon.execute_steps = 4
+
+        orchestrator = RollingHorizonOrchestrator(config, progress_callback=lambda update: None)
+        orchestrator.data_manager = DataManager(config, data=data)
+        stats = orchestrator.run().metadata['execution_stats']
+
+        assert stats['windows_pruned'] > 0
+        assert stats['lp_solves'] == stats['solves'] - stats['windows_pruned']